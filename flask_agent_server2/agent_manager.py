@@ -14,6 +14,9 @@ from typing import Dict, Any, Optional, List, Callable
 from datetime import datetime
 import importlib.util
 import traceback
+import concurrent.futures
+
+from config import Config
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -25,12 +28,22 @@ class AgentManager:
     Supports multiple agent types and execution patterns
     """
     
-    def __init__(self, agent_path: str = None):
+    def __init__(self, agent_path: str = None, timeout: Optional[float] = None, max_concurrency: Optional[int] = None):
         self.agent = None
         self.agent_type = None
         self.agent_info = {}
         self.execution_queue = queue.Queue()
         self.agent_path = agent_path or os.environ.get('AGENT_PATH', './agents/oracle_agent')
+        self.timeout = timeout or Config.AGENT_TIMEOUT
+        self.max_concurrency = max_concurrency or Config.AGENT_MAX_CONCURRENCY
+        
+        # Persistent event loop for async agents (see _start_async_executor)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._executor_lock = threading.Lock()
+        self._in_flight: Dict[str, List[concurrent.futures.Future]] = {}
+        self.executor_stats = {'submitted': 0, 'completed': 0, 'failed': 0, 'timed_out': 0, 'cancelled': 0}
         
         # Load the agent
         self._load_agent()
@@ -244,6 +257,18 @@ class AgentManager:
                 }
             }
             
+        except TimeoutError:
+            logger.error(f"Agent call for session {session_id} timed out after {self.timeout}s")
+            return {
+                'response': "The agent took too long to respond. Please try again.",
+                'metadata': {'error': True, 'timeout': True, 'timeout_seconds': self.timeout}
+            }
+        except concurrent.futures.CancelledError:
+            logger.info(f"Agent call for session {session_id} was cancelled")
+            return {
+                'response': "The request was cancelled.",
+                'metadata': {'error': True, 'cancelled': True}
+            }
         except Exception as e:
             logger.error(f"Error processing message: {e}")
             logger.error(traceback.format_exc())
@@ -293,27 +318,63 @@ class AgentManager:
             raise
     
     def _execute_async(self, message: str, context: Dict[str, Any]) -> str:
-        """Execute async agent"""
+        """Execute async agent on the persistent event loop"""
+        if hasattr(self.agent, 'arun'):
+            run = self.agent.arun
+        elif hasattr(self.agent, 'async_run'):
+            run = self.agent.async_run
+        else:
+            raise Exception("No async method found")
+        
+        result = self._run_on_loop(run(message), context['session_id'])
+        if isinstance(result, dict):
+            return result.get('response', str(result))
+        return str(result)
+    
+    def _run_on_loop(self, coro, session_id: str) -> Any:
+        """
+        Submit a coroutine to the executor loop and wait for its result
+        The timeout covers waiting for a concurrency slot; on timeout the task is cancelled
+        """
+        self._start_async_executor()
+        future = asyncio.run_coroutine_threadsafe(self._run_limited(coro), self._loop)
+        with self._executor_lock:
+            self.executor_stats['submitted'] += 1
+            self._in_flight.setdefault(session_id, []).append(future)
         try:
-            # Create a new event loop for this execution
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            if hasattr(self.agent, 'arun'):
-                result = loop.run_until_complete(self.agent.arun(message))
-            elif hasattr(self.agent, 'async_run'):
-                result = loop.run_until_complete(self.agent.async_run(message))
-            else:
-                raise Exception("No async method found")
-            
-            loop.close()
-            
-            if isinstance(result, dict):
-                return result.get('response', str(result))
-            return str(result)
+            result = future.result(timeout=self.timeout)
+            self._count('completed')
+            return result
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            self._count('timed_out')
+            raise TimeoutError(f"Agent call timed out after {self.timeout}s")
+        except concurrent.futures.CancelledError:
+            self._count('cancelled')
+            raise
         except Exception as e:
+            self._count('failed')
             logger.error(f"Error in async execution: {e}")
             raise
+        finally:
+            with self._executor_lock:
+                futures = self._in_flight.get(session_id, [])
+                if future in futures:
+                    futures.remove(future)
+                if not futures:
+                    self._in_flight.pop(session_id, None)
+    
+    def _count(self, key: str):
+        with self._executor_lock:
+            self.executor_stats[key] += 1
+    
+    async def _run_limited(self, coro) -> Any:
+        """Run a coroutine once one of max_concurrency slots is free"""
+        try:
+            async with self._semaphore:
+                return await coro
+        finally:
+            coro.close()  # No-op once awaited; stops "never awaited" warnings when cancelled while queued
     
     def _execute_callable(self, message: str, context: Dict[str, Any]) -> str:
         """Execute callable agent"""
@@ -385,10 +446,61 @@ class AgentManager:
             raise
     
     def _start_async_executor(self):
-        """Start a background thread for async execution if needed"""
-        # This is for agents that require a persistent event loop
-        # Implement if your agent needs this pattern
-        pass
+        """
+        Start the long-lived event loop thread for async agents
+        One loop serves every message, so clients, sessions and connections created
+        by the agent survive between calls
+        """
+        with self._executor_lock:
+            if self._loop_thread and self._loop_thread.is_alive():
+                return
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+            
+            def run_loop():
+                asyncio.set_event_loop(loop)
+                self._semaphore = asyncio.Semaphore(self.max_concurrency)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+                loop.close()
+            
+            self._loop = loop
+            self._loop_thread = threading.Thread(target=run_loop, name='agent-async-executor', daemon=True)
+            self._loop_thread.start()
+            ready.wait()
+            logger.info(f"Started async agent executor (max {self.max_concurrency} concurrent calls)")
+    
+    def cancel(self, session_id: str) -> int:
+        """Cancel a session's in-flight agent calls; returns how many were cancelled"""
+        with self._executor_lock:
+            futures = list(self._in_flight.get(session_id, []))
+        return sum(1 for future in futures if future.cancel())
+    
+    def get_executor_stats(self) -> Dict[str, Any]:
+        """Get executor counters and the number of in-flight calls"""
+        with self._executor_lock:
+            in_flight = sum(len(futures) for futures in self._in_flight.values())
+        return {
+            **self.executor_stats,
+            'running': bool(self._loop_thread and self._loop_thread.is_alive()),
+            'in_flight': in_flight,
+            'max_concurrency': self.max_concurrency,
+            'timeout': self.timeout,
+        }
+    
+    def shutdown(self, timeout: float = 5):
+        """Cancel in-flight calls and stop the executor loop"""
+        with self._executor_lock:
+            loop, thread = self._loop, self._loop_thread
+            futures = [future for futures in self._in_flight.values() for future in futures]
+        if not loop or not thread:
+            return
+        for future in futures:
+            future.cancel()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        self._loop = None
+        self._loop_thread = None
 
 
 # Create a wrapper specifically for ADK agents
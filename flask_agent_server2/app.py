@@ -3,7 +3,7 @@ Flask Server for ADK Agent Deployment
 Acts as a proxy to ADK server and provides web interface
 """
 
-from flask import Flask, render_template, request, jsonify, session, send_from_directory, Response
+from flask import Flask, render_template, request, jsonify, session, send_from_directory, Response, stream_with_context
 from flask_socketio import SocketIO, emit, join_room, leave_room
 from flask_cors import CORS
 import uuid
@@ -18,6 +18,11 @@ import time
 import time
 
 from config import Config, setup_google_cloud_auth
+from event_parser import ADKEventParser, extract_json_block, iter_json_array
+from job_queue import JobManager, JobStore, IN_FLIGHT_STATUSES, COMPLETED
+from response_cache import DATA_REFRESH_TOOLS, create_response_cache
+from session_cache import KnownSessionCache
+from session_store import create_session_store
 
 # Configure logging
 logging.basicConfig(
@@ -43,16 +48,16 @@ socketio = SocketIO(app, cors_allowed_origins="*")
 ADK_BASE_URL = os.environ.get('ADK_BASE_URL', 'http://localhost:8000')
 ADK_TIMEOUT = int(os.environ.get('ADK_TIMEOUT', '300'))
 
-# Session store for web UI (in production, use Redis)
-active_sessions = {}
+# Session store for web UI (Redis when REDIS_URL is set, bounded in-memory otherwise)
+session_store = create_session_store(Config)
 
-# Store for parallel universe data
-parallel_universe_data = {
-    'status': 'pending',
-    'data': None,
-    'error': None,
-    'timestamp': None
-}
+# Background jobs (parallel universe analysis), one in-flight job per user
+job_manager = JobManager(
+    JobStore(Config.JOB_RESULTS_DIR),
+    max_workers=Config.JOB_WORKERS,
+    result_ttl=Config.JOB_RESULT_TTL
+)
+PARALLEL_UNIVERSE_JOB = 'parallel_universe_analysis'
 
 # Available agents configuration
 AVAILABLE_AGENTS = {
@@ -104,19 +109,76 @@ class ADKClient:
         except requests.exceptions.RequestException as e:
             logger.error(f"ADK API request failed: {e}")
             raise
+    
+    def stream_events(self, endpoint, **kwargs):
+        """
+        Stream server-sent events from ADK, yielding each parsed event as it arrives
+        The upstream connection is closed as soon as the consumer stops iterating
+        """
+        kwargs.setdefault('headers', {'Accept': 'text/event-stream'})
+        response = self.request('POST', endpoint, stream=True, **kwargs)
+        try:
+            for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+                if not line or not line.startswith('data:'):
+                    continue
+                payload = line[5:].strip()
+                try:
+                    yield json.loads(payload)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping malformed SSE payload: {payload[:100]}")
+        finally:
+            response.close()
+    
+    def stream_json_events(self, endpoint, **kwargs):
+        """
+        Stream the JSON event array returned by ADK /run, yielding each event once decoded
+        Stopping iteration closes the connection without reading the rest of the body
+        """
+        response = self.request('POST', endpoint, stream=True, **kwargs)
+        try:
+            yield from iter_json_array(response.iter_content(chunk_size=65536))
+        finally:
+            response.close()
 
 
 # Initialize ADK client
 adk_client = ADKClient(ADK_BASE_URL)
 
+# ADK sessions known to exist, so steady-state chat turns skip the existence check
+known_sessions = KnownSessionCache(
+    max_size=Config.ADK_SESSION_CACHE_SIZE,
+    ttl=Config.ADK_SESSION_CACHE_TTL
+)
+
+# Final responses to repeated questions, per app, user and Fi MCP data version
+response_cache = create_response_cache(Config)
+
+
+def cache_chat_response(app_name, user_id, user_message, response_text, function_calls, use_cache=True):
+    """
+    Remember a completed agent turn for repeat questions
+    A turn that refreshed the user's Fi MCP data invalidates their earlier answers first,
+    so only answers computed on the new data are served
+    """
+    if any(call.get('name') in DATA_REFRESH_TOOLS for call in function_calls):
+        version = response_cache.invalidate_user(user_id)
+        logger.info(f"Fi MCP data refreshed for user {user_id}, response cache version {version}")
+    if use_cache:
+        response_cache.put(app_name, user_id, user_message, response_text.strip())
+
 
 def ensure_adk_session(app_name, user_id, session_id):
     """Ensure session exists in ADK before running agent"""
+    session_key = (app_name, user_id, session_id)
+    if known_sessions.contains(session_key):
+        return True
+    
     try:
         # First check if session exists
         try:
             response = adk_client.request('GET', f'/apps/{app_name}/users/{user_id}/sessions/{session_id}')
             logger.info(f"Session {session_id} already exists for user {user_id}")
+            known_sessions.add(session_key)
             return True
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 404:
@@ -128,6 +190,7 @@ def ensure_adk_session(app_name, user_id, session_id):
                     json={"additionalProp1": {}}
                 )
                 logger.info(f"Session created successfully: {create_response.status_code}")
+                known_sessions.add(session_key)
                 return True
             else:
                 logger.error(f"Error checking session: {e}")
@@ -137,128 +200,206 @@ def ensure_adk_session(app_name, user_id, session_id):
         raise
 
 
-def run_parallel_universe_analysis():
-    """Run parallel universe analysis in background"""
-    global parallel_universe_data
+def _is_session_not_found(error):
+    """Check whether an ADK error means the session no longer exists upstream"""
+    return (
+        isinstance(error, requests.exceptions.HTTPError)
+        and error.response is not None
+        and error.response.status_code == 404
+    )
+
+
+def run_adk_agent(adk_request):
+    """
+    Call ADK /run for a session ensured by ensure_adk_session
+    If ADK no longer knows the session (e.g. it restarted), the cached entry is
+    dropped and the session is recreated once before retrying
+    """
+    app_name = adk_request.get('appName')
+    user_id = adk_request.get('userId')
+    session_id = adk_request.get('sessionId')
     
     try:
-        logger.info("Starting parallel universe analysis...")
-        parallel_universe_data['status'] = 'processing'
-        
-        # First check if parallel_universe_agent is available
-        try:
-            apps_response = adk_client.request('GET', '/list-apps')
-            available_apps = apps_response.json()
-            logger.info(f"Available apps: {available_apps}")
-            
-            if 'parallel_universe_agent' not in available_apps:
-                logger.warning("parallel_universe_agent not found in available apps")
-                parallel_universe_data['status'] = 'error'
-                parallel_universe_data['error'] = 'Parallel universe agent not available'
-                return
-        except Exception as e:
-            logger.error(f"Failed to list apps: {e}")
-        
-        # Generate unique IDs for this run
-        user_id = f"parallel_user_{uuid.uuid4().hex[:8]}"
-        session_id = f"parallel_session_{uuid.uuid4().hex[:8]}"
-        app_name = "parallel_universe_agent"
-        
-        # Ensure session exists
+        return adk_client.request('POST', '/run', json=adk_request)
+    except requests.exceptions.HTTPError as e:
+        if not _is_session_not_found(e):
+            raise
+        logger.info(f"ADK lost session {session_id} for user {user_id}, recreating")
+        known_sessions.discard((app_name, user_id, session_id))
         ensure_adk_session(app_name, user_id, session_id)
-        
-        # Prepare request
-        adk_request = {
-            "appName": app_name,
-            "userId": user_id,
-            "sessionId": session_id,
-            "newMessage": {
-                "parts": [
-                    {
-                        "text": "This will utilize all available MCP data to generate the final JSON response"
-                    }
-                ],
-                "role": "user"
-            },
-            "streaming": False
-        }
-        
-        logger.info(f"Sending request to parallel universe agent: {json.dumps(adk_request, indent=2)}")
-        
-        # Make request
-        response = adk_client.request('POST', '/run', json=adk_request)
-        events = response.json()
-        
-        # Process events to extract the final JSON
-        final_json = None
-        all_text = ""
-        
-        logger.info(f"Processing {len(events)} events from parallel universe agent")
-        
-        # First, try to find the insight synthesizer agent's output
+        return adk_client.request('POST', '/run', json=adk_request)
+
+
+def _stream_with_session_retry(open_events, adk_request):
+    """Yield events from open_events(), recreating a lost ADK session once like run_adk_agent"""
+    app_name = adk_request.get('appName')
+    user_id = adk_request.get('userId')
+    session_id = adk_request.get('sessionId')
+    
+    events = open_events()
+    try:
+        first_event = next(events, None)
+    except requests.exceptions.HTTPError as e:
+        if not _is_session_not_found(e):
+            raise
+        logger.info(f"ADK lost session {session_id} for user {user_id}, recreating")
+        known_sessions.discard((app_name, user_id, session_id))
+        ensure_adk_session(app_name, user_id, session_id)
+        events = open_events()
+        first_event = next(events, None)
+    
+    try:
+        if first_event is not None:
+            yield first_event
+        yield from events
+    finally:
+        events.close()
+
+
+def stream_adk_agent(adk_request):
+    """Streaming counterpart of run_adk_agent, yielding events from ADK /run_sse"""
+    return _stream_with_session_retry(
+        lambda: adk_client.stream_events('/run_sse', json=adk_request),
+        adk_request
+    )
+
+
+def iter_adk_run_events(adk_request):
+    """Events of ADK /run, decoded incrementally instead of buffering the whole response"""
+    return _stream_with_session_retry(
+        lambda: adk_client.stream_json_events('/run', json=adk_request),
+        adk_request
+    )
+
+
+def find_parallel_universe_analysis(events):
+    """
+    Scan events in one pass for a ```json block holding parallel_universe_analysis
+    Stops reading as soon as the insight synthesizer's block is found; blocks from other
+    agents are kept as a fallback. Returns (analysis or None, parser)
+    """
+    parser = ADKEventParser()
+    final_json = None
+    try:
         for event in events:
-            if event.get('author') == 'insight_synthesizer_agent':
-                if event.get('content', {}).get('parts'):
-                    for part in event['content']['parts']:
-                        if part.get('text'):
-                            text = part['text']
-                            logger.info(f"Found insight synthesizer output, length: {len(text)}")
-                            if text.strip().startswith('```json') and text.strip().endswith('```'):
-                                json_str = text.strip()[7:-3]  # Remove ```json and ```
-                                try:
-                                    parsed_data = json.loads(json_str)
-                                    if 'parallel_universe_analysis' in parsed_data:
-                                        final_json = parsed_data
-                                        logger.info("Successfully parsed parallel universe analysis from insight synthesizer")
-                                        break
-                                except json.JSONDecodeError as e:
-                                    logger.error(f"JSON decode error: {e}")
-        
-        # If not found in insight synthesizer, check all events
-        if not final_json:
-            for event in events:
-                if event.get('content', {}).get('parts'):
-                    for part in event['content']['parts']:
-                        if part.get('text'):
-                            all_text += part['text']
-                            text = part['text']
-                            if text.strip().startswith('```json') and text.strip().endswith('```'):
-                                json_str = text.strip()[7:-3]  # Remove ```json and ```
-                                try:
-                                    parsed_data = json.loads(json_str)
-                                    if 'parallel_universe_analysis' in parsed_data:
-                                        final_json = parsed_data
-                                        logger.info("Found parallel universe analysis in general events")
-                                except json.JSONDecodeError:
-                                    pass
-        
-        if final_json:
-            parallel_universe_data['status'] = 'completed'
-            parallel_universe_data['data'] = final_json
-            parallel_universe_data['timestamp'] = datetime.now().isoformat()
-            logger.info("Parallel universe analysis completed successfully")
-            logger.info(f"Data keys: {list(final_json.keys())}")
-        else:
-            logger.error("No valid parallel universe analysis data found in response")
-            logger.error(f"Total text collected: {len(all_text)} characters")
-            if all_text:
-                logger.error(f"First 500 chars: {all_text[:500]}")
-            parallel_universe_data['status'] = 'error'
-            parallel_universe_data['error'] = "No valid parallel universe analysis data found in response"
-            
-    except Exception as e:
-        logger.error(f"Parallel universe analysis failed: {str(e)}", exc_info=True)
-        parallel_universe_data['status'] = 'error'
-        parallel_universe_data['error'] = str(e)
-        parallel_universe_data['timestamp'] = datetime.now().isoformat()
+            for text in parser.feed(event):
+                parsed_data = extract_json_block(text, 'parallel_universe_analysis')
+                if parsed_data is None:
+                    continue
+                final_json = parsed_data
+                if event.get('author') == 'insight_synthesizer_agent':
+                    logger.info("Successfully parsed parallel universe analysis from insight synthesizer")
+                    return final_json, parser
+                logger.info("Found parallel universe analysis in general events")
+    finally:
+        events.close()
+    return final_json, parser
+
+
+def run_parallel_universe_analysis(job):
+    """Run parallel universe analysis for the job's user, returning the final JSON"""
+    logger.info(f"Starting parallel universe analysis for user {job.user_id} (job {job.job_id})")
+    job.update_progress('Checking parallel universe agent availability')
+    
+    # First check if parallel_universe_agent is available
+    try:
+        apps_response = adk_client.request('GET', '/list-apps')
+        available_apps = apps_response.json()
+        logger.info(f"Available apps: {available_apps}")
+        
+        if 'parallel_universe_agent' not in available_apps:
+            logger.warning("parallel_universe_agent not found in available apps")
+            raise RuntimeError('Parallel universe agent not available')
+    except (requests.exceptions.RequestException, ValueError) as e:
+        logger.error(f"Failed to list apps: {e}")
+    
+    job.raise_if_cancelled()
+    
+    # One ADK session per job, owned by the requesting user
+    user_id = job.user_id
+    session_id = f"parallel_session_{job.job_id[:8]}"
+    app_name = "parallel_universe_agent"
+    
+    # Ensure session exists
+    ensure_adk_session(app_name, user_id, session_id)
+    
+    # Prepare request
+    adk_request = {
+        "appName": app_name,
+        "userId": user_id,
+        "sessionId": session_id,
+        "newMessage": {
+            "parts": [
+                {
+                    "text": "This will utilize all available MCP data to generate the final JSON response"
+                }
+            ],
+            "role": "user"
+        },
+        "streaming": False
+    }
+    
+    logger.info(f"Sending request to parallel universe agent: {json.dumps(adk_request, indent=2)}")
+    job.update_progress('Analyzing your financial decisions across parallel universes')
+    
+    # Read events as they arrive, stopping once the analysis is found or the job is cancelled
+    final_json, parser = find_parallel_universe_analysis(
+        job.cancellable(iter_adk_run_events(adk_request))
+    )
+    logger.info(f"Processed {parser.event_count} events from parallel universe agent")
+    
+    if not final_json:
+        logger.error("No valid parallel universe analysis data found in response")
+        all_text = parser.text
+        logger.error(f"Total text collected: {len(all_text)} characters")
+        if all_text:
+            logger.error(f"First 500 chars: {all_text[:500]}")
+        raise RuntimeError("No valid parallel universe analysis data found in response")
+    
+    logger.info("Parallel universe analysis completed successfully")
+    logger.info(f"Data keys: {list(final_json.keys())}")
+    return final_json
 
 
-def start_background_analysis():
-    """Start parallel universe analysis in a background thread"""
-    thread = threading.Thread(target=run_parallel_universe_analysis)
-    thread.daemon = True
-    thread.start()
-    logger.info("Background parallel universe analysis thread started")
+def start_background_analysis(user_id):
+    """Queue parallel universe analysis for a user, joining the job already in flight"""
+    return job_manager.submit(PARALLEL_UNIVERSE_JOB, user_id, run_parallel_universe_analysis)
+
+
+def get_web_user_id():
+    """User id of the current browser session, created on first use"""
+    if 'user_id' not in session:
+        session['user_id'] = str(uuid.uuid4())
+    return session['user_id']
+
+
+def parallel_universe_payload(job):
+    """Job state in the shape the timeline UI expects"""
+    if job is None:
+        return {'status': 'pending', 'data': None, 'error': None, 'timestamp': None, 'job_id': None, 'progress': None}
+    return {
+        'status': job.status,
+        'data': job.result,
+        'error': job.error,
+        'timestamp': job.to_dict(include_result=False)['finished_at'],
+        'job_id': job.job_id,
+        'progress': job.progress
+    }
+
+
+def user_room(user_id):
+    """Socket.IO room that receives a user's background job updates"""
+    return f"user_{user_id}"
+
+
+def broadcast_job_update(job):
+    """Push parallel universe job progress and results to the user's room"""
+    if job.kind != PARALLEL_UNIVERSE_JOB:
+        return
+    socketio.emit('parallel_universe_update', parallel_universe_payload(job), to=user_room(job.user_id))
+
+
+job_manager.add_listener(broadcast_job_update)
 
 
 # ===== ADK API Proxy Endpoints =====
@@ -316,6 +457,7 @@ def create_session_with_id(app_name, user_id, session_id):
             f'/apps/{app_name}/users/{user_id}/sessions/{session_id}',
             json=request.json
         )
+        known_sessions.add((app_name, user_id, session_id))
         return response.json(), response.status_code
     except Exception as e:
         return jsonify({'error': str(e)}), 503
@@ -324,6 +466,7 @@ def create_session_with_id(app_name, user_id, session_id):
 @app.route('/apps/<app_name>/users/<user_id>/sessions/<session_id>', methods=['DELETE'])
 def delete_session(app_name, user_id, session_id):
     """Proxy to ADK delete session endpoint"""
+    known_sessions.discard((app_name, user_id, session_id))
     try:
         response = adk_client.request('DELETE', f'/apps/{app_name}/users/{user_id}/sessions/{session_id}')
         return jsonify({}), response.status_code
@@ -347,7 +490,7 @@ def agent_run():
         ensure_adk_session(app_name, user_id, session_id)
         
         # Now run the agent
-        response = adk_client.request('POST', '/run', json=request_data)
+        response = run_adk_agent(request_data)
         return response.json(), response.status_code
     except Exception as e:
         return jsonify({'error': str(e)}), 503
@@ -355,7 +498,7 @@ def agent_run():
 
 @app.route('/run_sse', methods=['POST'])
 def agent_run_sse():
-    """Proxy to ADK run endpoint (non-streaming) with session creation"""
+    """Proxy to ADK run_sse endpoint, forwarding events to the client as they arrive"""
     try:
         request_data = request.json
         app_name = request_data.get('appName', 'oracle_agent')
@@ -368,13 +511,29 @@ def agent_run_sse():
         # Ensure session exists before running
         ensure_adk_session(app_name, user_id, session_id)
         
-        # Set streaming to false and call /run endpoint
-        request_data['streaming'] = False
-        response = adk_client.request('POST', '/run', json=request_data)
-        return response.json(), response.status_code
-        
+        # Open the upstream stream before returning so connection errors still map to 503
+        events = stream_adk_agent(request_data)
+        first_event = next(events, None)
     except Exception as e:
         return jsonify({'error': str(e)}), 503
+    
+    def generate():
+        try:
+            if first_event is not None:
+                yield f"data: {json.dumps(first_event)}\n\n"
+            for event in events:
+                yield f"data: {json.dumps(event)}\n\n"
+        except Exception as e:
+            logger.error(f"SSE proxy stream failed: {e}")
+            yield f"data: {json.dumps({'error': str(e)})}\n\n"
+        finally:
+            events.close()
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
 
 
 # ===== Web UI Endpoints =====
@@ -402,14 +561,13 @@ def chat_interface(agent_name):
     
     # Create agent-specific session
     session_key = f"{agent_name}_{session['session_id']}"
-    if session_key not in active_sessions:
-        active_sessions[session_key] = {
+    if session_key not in session_store:
+        session_store.create(session_key, {
             'created_at': session['created_at'],
-            'messages': [],
             'context': {},
             'user_id': session['user_id'],
             'agent_name': agent_name
-        }
+        })
     
     # Get agent info
     agent_info = AVAILABLE_AGENTS.get(agent_name, {})
@@ -427,38 +585,70 @@ def chat_interface(agent_name):
 @app.route('/timeline')
 def timeline_view():
     """Timeline visualization page"""
-    # Check if analysis needs to be triggered
-    if parallel_universe_data['status'] == 'pending':
+    # Start an analysis for this user unless one is running or a result is available
+    user_id = get_web_user_id()
+    latest = job_manager.get_latest(PARALLEL_UNIVERSE_JOB, user_id)
+    if latest is None or latest.status not in IN_FLIGHT_STATUSES + (COMPLETED,):
         logger.info("Timeline view accessed, triggering analysis if not started")
-        start_background_analysis()
+        start_background_analysis(user_id)
     return render_template('timeline.html')
 
 
 @app.route('/api/parallel-universe-data')
 def get_parallel_universe_data():
-    """API endpoint to get parallel universe analysis data"""
-    return jsonify(parallel_universe_data)
+    """API endpoint to get the current user's latest parallel universe analysis"""
+    job = job_manager.get_latest(PARALLEL_UNIVERSE_JOB, get_web_user_id())
+    return jsonify(parallel_universe_payload(job))
 
 
 @app.route('/api/parallel-universe-status')
 def get_parallel_universe_status():
     """Debug endpoint to check parallel universe analysis status"""
+    payload = parallel_universe_payload(job_manager.get_latest(PARALLEL_UNIVERSE_JOB, get_web_user_id()))
     status = {
-        'current_status': parallel_universe_data['status'],
-        'has_data': parallel_universe_data['data'] is not None,
-        'last_updated': parallel_universe_data['timestamp'],
-        'error': parallel_universe_data.get('error')
+        'current_status': payload['status'],
+        'has_data': payload['data'] is not None,
+        'last_updated': payload['timestamp'],
+        'error': payload['error'],
+        'job_id': payload['job_id']
     }
-    if parallel_universe_data['data']:
-        status['data_keys'] = list(parallel_universe_data['data'].keys())
+    if payload['data']:
+        status['data_keys'] = list(payload['data'].keys())
     return jsonify(status)
 
 
 @app.route('/api/trigger-parallel-analysis', methods=['POST'])
 def trigger_parallel_analysis():
-    """Manually trigger parallel universe analysis"""
-    start_background_analysis()
-    return jsonify({'status': 'Analysis triggered', 'message': 'Check back in a few moments for results'})
+    """Trigger parallel universe analysis, joining the user's in-flight job if there is one"""
+    job, created = start_background_analysis(get_web_user_id())
+    return jsonify({
+        'status': 'Analysis triggered' if created else 'Analysis already running',
+        'message': 'Check back in a few moments for results',
+        'job_id': job.job_id,
+        'job_status': job.status,
+        'deduplicated': not created
+    }), 202 if created else 200
+
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Status (and result, once completed) of one of the current user's jobs"""
+    job = job_manager.get(job_id)
+    if job is None or job.user_id != get_web_user_id():
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job.to_dict())
+
+
+@app.route('/api/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """Cancel one of the current user's queued or running jobs"""
+    job = job_manager.get(job_id)
+    if job is None or job.user_id != get_web_user_id():
+        return jsonify({'error': 'Job not found'}), 404
+    if job.status not in IN_FLIGHT_STATUSES:
+        return jsonify({'error': f'Job already {job.status}', 'job': job.to_dict(include_result=False)}), 409
+    job_manager.cancel(job_id)
+    return jsonify(job.to_dict(include_result=False))
 
 
 @app.route('/api/test-adk-connection')
@@ -514,10 +704,12 @@ def health_check():
         'status': 'healthy',
         'timestamp': datetime.now().isoformat(),
         'adk_connection': adk_status,
-        'active_sessions': len(active_sessions),
+        'active_sessions': len(session_store),
+        'known_adk_sessions': known_sessions.get_stats(),
+        'response_cache': response_cache.get_stats(),
         'google_cloud_auth': auth_status,
         'available_agents': list(AVAILABLE_AGENTS.keys()),
-        'parallel_universe_status': parallel_universe_data['status']
+        'background_jobs': job_manager.get_stats()
     })
 
 
@@ -539,8 +731,9 @@ def chat_api():
         # Get user_id from session store
         session_key = f"{app_name}_{session_id}"
         user_id = None
-        if session_key in active_sessions:
-            user_id = active_sessions[session_key].get('user_id')
+        session_data = session_store.get(session_key)
+        if session_data:
+            user_id = session_data.get('user_id')
         if not user_id:
             user_id = session.get('user_id', str(uuid.uuid4()))
         
@@ -550,6 +743,23 @@ def chat_api():
                 'error': 'Empty message'
             }), 400
         
+        # Repeat questions on unchanged data are answered from the response cache
+        use_cache = data.get('cache', True) is not False
+        cached = response_cache.get(app_name, user_id, user_message) if use_cache else None
+        if cached:
+            logger.info(f"Response cache hit for user {user_id} (similarity {cached['similarity']})")
+            session_store.append_messages(session_key, [
+                {'role': 'user', 'content': user_message, 'timestamp': datetime.now().isoformat()},
+                {'role': 'assistant', 'content': cached['response'], 'timestamp': datetime.now().isoformat()}
+            ])
+            return jsonify({
+                'success': True,
+                'response': cached['response'],
+                'metadata': {'cache': {'hit': True, 'similarity': cached['similarity'], 'age_seconds': cached['age_seconds']}},
+                'session_id': session_id,
+                'events': []
+            })
+        
         # Ensure session exists in ADK before running
         ensure_adk_session(app_name, user_id, session_id)
         
@@ -565,42 +775,30 @@ def chat_api():
             "streaming": False
         }
         
-        response = adk_client.request('POST', '/run', json=adk_request)
-        events = response.json()
-        
-        # Extract response text from events
-        response_text = ""
-        metadata = {}
+        # Extract response text and function calls in one pass as events are decoded
+        parser = ADKEventParser(keep_events=True)
+        for event in iter_adk_run_events(adk_request):
+            parser.feed(event)
         
-        logger.info(f"Processing {len(events)} events from ADK")
-        
-        for event in events:
-            logger.info(f"Event: {json.dumps(event, indent=2)}")
-            
-            if event.get('content', {}).get('parts'):
-                for part in event['content']['parts']:
-                    if part.get('text'):
-                        response_text += part['text']
-                    elif part.get('functionCall'):
-                        metadata.setdefault('function_calls', []).append(part['functionCall'])
-            
-            if event.get('usageMetadata'):
-                metadata['usage'] = event['usageMetadata']
+        logger.info(f"Processed {parser.event_count} events from ADK")
+        response_text = parser.text
+        metadata = parser.get_metadata()
+        events = parser.events
+        cache_chat_response(app_name, user_id, user_message, response_text, parser.function_calls, use_cache)
         
         # Update local session
-        if session_key in active_sessions:
-            active_sessions[session_key]['messages'].extend([
-                {
-                    'role': 'user',
-                    'content': user_message,
-                    'timestamp': datetime.now().isoformat()
-                },
-                {
-                    'role': 'assistant',
-                    'content': response_text.strip(),
-                    'timestamp': datetime.now().isoformat()
-                }
-            ])
+        session_store.append_messages(session_key, [
+            {
+                'role': 'user',
+                'content': user_message,
+                'timestamp': datetime.now().isoformat()
+            },
+            {
+                'role': 'assistant',
+                'content': response_text.strip(),
+                'timestamp': datetime.now().isoformat()
+            }
+        ])
         
         return jsonify({
             'success': True,
@@ -618,6 +816,17 @@ def chat_api():
         }), 500
 
 
+@app.route('/api/cache/invalidate', methods=['POST'])
+def invalidate_response_cache():
+    """Drop a user's cached responses, e.g. when their Fi MCP data changed outside a chat"""
+    data = request.get_json(silent=True) or {}
+    user_id = data.get('user_id') or session.get('user_id')
+    if not user_id:
+        return jsonify({'success': False, 'error': 'No user_id provided'}), 400
+    version = response_cache.invalidate_user(user_id)
+    return jsonify({'success': True, 'user_id': user_id, 'data_version': version})
+
+
 @app.route('/api/auth/status')
 def auth_status():
     """Check Google Cloud authentication status"""
@@ -663,6 +872,20 @@ def handle_join_session(data):
         emit('joined', {'session_id': session_id, 'agent_name': agent_name})
 
 
+@socketio.on('join_timeline')
+def handle_join_timeline(data=None):
+    """Subscribe the client to its user's job updates and send the current state"""
+    user_id = session.get('user_id')
+    if not user_id:
+        emit('parallel_universe_update', parallel_universe_payload(None))
+        return
+    join_room(user_room(user_id))
+    logger.info(f"Client {request.sid} joined {user_room(user_id)}")
+    emit('parallel_universe_update', parallel_universe_payload(
+        job_manager.get_latest(PARALLEL_UNIVERSE_JOB, user_id)
+    ))
+
+
 @socketio.on('disconnect')
 def handle_disconnect():
     """Handle client disconnection"""
@@ -671,7 +894,7 @@ def handle_disconnect():
 
 @socketio.on('chat_message')
 def handle_chat_message(data):
-    """Handle incoming chat message via WebSocket using /run endpoint (non-streaming)"""
+    """Handle incoming chat message via WebSocket, streaming partial text from ADK /run_sse"""
     try:
         session_id = data.get('session_id')
         user_message = data.get('message', '').strip()
@@ -684,8 +907,33 @@ def handle_chat_message(data):
         # Get user_id from session store
         session_key = f"{app_name}_{session_id}"
         user_id = 'default'
-        if session_key in active_sessions:
-            user_id = active_sessions[session_key].get('user_id', 'default')
+        session_data = session_store.get(session_key)
+        if session_data:
+            user_id = session_data.get('user_id', 'default')
+        
+        # Store user message
+        session_store.append_messages(session_key, [{
+            'role': 'user',
+            'content': user_message,
+            'timestamp': datetime.now().isoformat()
+        }])
+        
+        # Repeat questions on unchanged data are answered from the response cache
+        use_cache = data.get('cache', True) is not False
+        cached = response_cache.get(app_name, user_id, user_message) if use_cache else None
+        if cached:
+            logger.info(f"Response cache hit for user {user_id} (similarity {cached['similarity']})")
+            session_store.append_messages(session_key, [{
+                'role': 'assistant',
+                'content': cached['response'],
+                'timestamp': datetime.now().isoformat()
+            }])
+            emit('agent_response', {
+                'response': cached['response'],
+                'cached': True,
+                'timestamp': datetime.now().isoformat()
+            })
+            return
         
         # Ensure session exists in ADK before running
         ensure_adk_session(app_name, user_id, session_id)
@@ -693,15 +941,7 @@ def handle_chat_message(data):
         # Emit typing indicator
         emit('agent_typing', {'typing': True})
         
-        # Store user message
-        if session_key in active_sessions:
-            active_sessions[session_key]['messages'].append({
-                'role': 'user',
-                'content': user_message,
-                'timestamp': datetime.now().isoformat()
-            })
-        
-        # Call ADK /run endpoint (non-streaming)
+        # Call ADK /run_sse endpoint so partial text reaches the client as it is generated
         adk_request = {
             "appName": app_name,
             "userId": user_id,
@@ -710,36 +950,34 @@ def handle_chat_message(data):
                 "parts": [{"text": user_message}],
                 "role": "user"
             },
-            "streaming": False
+            "streaming": True
         }
         
-        response = adk_client.request('POST', '/run', json=adk_request)
-        events = response.json()
-        
-        # Extract response text from events
-        full_response = ""
+        # Partial events carry incremental text; the final (non-partial) events carry the full text
+        parser = ADKEventParser()
         
-        logger.info(f"Processing {len(events)} events from ADK")
-        
-        for event in events:
-            logger.info(f"Event content: {event.get('content', {})}")
+        for event in stream_adk_agent(adk_request):
+            if event.get('error'):
+                raise Exception(event['error'])
             
-            if event.get('content', {}).get('parts'):
-                for part in event['content']['parts']:
-                    if part.get('text'):
-                        full_response += part['text']
-                        logger.info(f"Added text: {part['text'][:100]}...")  # Log first 100 chars
+            texts = parser.feed(event)
+            if event.get('partial'):
+                for text in texts:
+                    emit('agent_response_chunk', {'chunk': text})
         
+        full_response = parser.text
+        cache_chat_response(app_name, user_id, user_message, full_response, parser.function_calls, use_cache)
+        
+        logger.info(f"Processed {parser.event_count} streamed events from ADK")
         logger.info(f"Final response length: {len(full_response)}")
-        logger.info(f"Full response: {full_response}")
         
         # Store complete response
-        if session_key in active_sessions and full_response:
-            active_sessions[session_key]['messages'].append({
+        if full_response:
+            session_store.append_messages(session_key, [{
                 'role': 'assistant',
                 'content': full_response,
                 'timestamp': datetime.now().isoformat()
-            })
+            }])
         
         # Send complete response to the specific client
         emit('agent_response', {
@@ -768,20 +1006,6 @@ if __name__ == '__main__':
     logger.info(f"Debug mode: {debug}")
     logger.info(f"Available agents: {list(AVAILABLE_AGENTS.keys())}")
     
-    # Start parallel universe analysis in background after a short delay
-    # Only in non-debug mode to avoid issues with reloader
-    if not debug:
-        def delayed_start():
-            time.sleep(5)  # Wait 5 seconds for server to fully start
-            logger.info("Starting delayed parallel universe analysis")
-            start_background_analysis()
-        
-        delay_thread = threading.Thread(target=delayed_start)
-        delay_thread.daemon = True
-        delay_thread.start()
-    else:
-        logger.info("Debug mode - skipping automatic parallel universe analysis")
-    
     socketio.run(
         app, 
         host='0.0.0.0', 
@@ -5,6 +5,8 @@ Configuration for Flask ADK Agent Server
 import os
 from datetime import timedelta
 
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
 
 class Config:
     """Base configuration"""
@@ -24,10 +26,28 @@ class Config:
     # Agent settings
     AGENT_PATH = os.environ.get('AGENT_PATH', './agents/oracle_agent')
     AGENT_TIMEOUT = int(os.environ.get('AGENT_TIMEOUT', 300))  # 5 minutes
+    AGENT_MAX_CONCURRENCY = int(os.environ.get('AGENT_MAX_CONCURRENCY', 8))  # Concurrent calls on the async agent loop
     
     # Session settings
-    MAX_SESSION_AGE = 24 * 60 * 60  # 24 hours in seconds
-    MAX_MESSAGES_PER_SESSION = 1000
+    MAX_SESSION_AGE = int(os.environ.get('MAX_SESSION_AGE', 24 * 60 * 60))  # 24 hours idle, in seconds
+    MAX_MESSAGES_PER_SESSION = int(os.environ.get('MAX_MESSAGES_PER_SESSION', 1000))
+    MAX_SESSIONS = int(os.environ.get('MAX_SESSIONS', 10000))  # In-memory store only; Redis relies on TTL
+    
+    # ADK session existence cache (skips the GET round-trip for known sessions)
+    ADK_SESSION_CACHE_SIZE = int(os.environ.get('ADK_SESSION_CACHE_SIZE', 10000))
+    ADK_SESSION_CACHE_TTL = int(os.environ.get('ADK_SESSION_CACHE_TTL', 300))  # 5 minutes
+    
+    # Background jobs (parallel universe analysis)
+    JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 2))
+    JOB_RESULTS_DIR = os.environ.get('JOB_RESULTS_DIR', os.path.join(BASE_DIR, 'job_results'))  # Empty to keep results in memory only
+    JOB_RESULT_TTL = int(os.environ.get('JOB_RESULT_TTL', 24 * 60 * 60))  # 24 hours
+    
+    # Response cache for repeated questions (keyed by app, user, Fi MCP data version and normalized query)
+    RESPONSE_CACHE_ENABLED = os.environ.get('RESPONSE_CACHE_ENABLED', 'true').lower() == 'true'
+    RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL', 15 * 60))  # 15 minutes
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', 5000))
+    RESPONSE_CACHE_SIMILARITY = float(os.environ.get('RESPONSE_CACHE_SIMILARITY', 1.0))  # 1.0 = exact normalized match only
+    RESPONSE_CACHE_EMBEDDING_MODEL = os.environ.get('RESPONSE_CACHE_EMBEDDING_MODEL', '')  # e.g. text-embedding-004; empty = token similarity
     
     # Rate limiting
     RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'false').lower() == 'true'
@@ -0,0 +1,127 @@
+"""
+Incremental ADK Event Parsing
+Decodes ADK /run event arrays as they arrive and extracts text and function calls in one pass
+"""
+
+import codecs
+import json
+import logging
+from typing import Dict, Any, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_json_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\n\r'
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """
+    Yield the elements of a JSON array of objects as soon as each one is complete
+    Consumed input is dropped from the buffer, so memory is bounded by the largest element
+    """
+    chunks = iter(chunks)
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    buffer = ''
+    pos = 0
+    started = False
+    exhausted = False
+
+    while True:
+        while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+            pos += 1
+
+        if pos < len(buffer):
+            char = buffer[pos]
+            if not started:
+                if char != '[':
+                    raise ValueError("Expected a JSON array of events")
+                started = True
+                pos += 1
+                continue
+            if char == ']':
+                return
+            if char == ',':
+                pos += 1
+                continue
+            try:
+                element, pos = _json_decoder.raw_decode(buffer, pos)
+                yield element
+                continue
+            except json.JSONDecodeError:
+                if exhausted:
+                    raise
+        elif exhausted:
+            raise ValueError("Unexpected end of JSON event array")
+
+        # Need more input to complete the current element
+        chunk = next(chunks, None)
+        if chunk is None:
+            exhausted = True
+            buffer = buffer[pos:] + text_decoder.decode(b'', final=True)
+        else:
+            buffer = buffer[pos:] + text_decoder.decode(chunk)
+        pos = 0
+
+
+def extract_json_block(text: str, required_key: str) -> Optional[Dict[str, Any]]:
+    """Parse a ```json fenced block, returning it only if it contains required_key"""
+    stripped = text.strip()
+    if not (stripped.startswith('```json') and stripped.endswith('```')):
+        return None
+    try:
+        parsed = json.loads(stripped[7:-3])  # Remove ```json and ```
+    except json.JSONDecodeError as e:
+        logger.error(f"JSON decode error: {e}")
+        return None
+    if isinstance(parsed, dict) and required_key in parsed:
+        return parsed
+    return None
+
+
+class ADKEventParser:
+    """
+    Single-pass accumulator over ADK events
+    Final text is collected as parts and joined once; partial (streamed) text is returned
+    from feed() but not accumulated, since the final event repeats it
+    """
+
+    def __init__(self, keep_events: bool = False):
+        self.event_count = 0
+        self.function_calls = []
+        self.usage = None
+        self.events = [] if keep_events else None
+        self._text_parts = []
+
+    def feed(self, event: Dict[str, Any]) -> List[str]:
+        """Consume one event, returning the texts it carries"""
+        self.event_count += 1
+        if self.events is not None:
+            self.events.append(event)
+        if event.get('usageMetadata'):
+            self.usage = event['usageMetadata']
+
+        partial = event.get('partial', False)
+        texts = []
+        for part in (event.get('content') or {}).get('parts') or []:
+            if part.get('text'):
+                texts.append(part['text'])
+            elif part.get('functionCall') and not partial:
+                self.function_calls.append(part['functionCall'])
+
+        if not partial:
+            self._text_parts.extend(texts)
+        return texts
+
+    @property
+    def text(self) -> str:
+        """All final text seen so far"""
+        return ''.join(self._text_parts)
+
+    def get_metadata(self) -> Dict[str, Any]:
+        """Function calls and the latest usage metadata, in the /api/chat response format"""
+        metadata = {}
+        if self.function_calls:
+            metadata['function_calls'] = self.function_calls
+        if self.usage:
+            metadata['usage'] = self.usage
+        return metadata
@@ -0,0 +1,310 @@
+"""
+Background Job Queue
+Runs long agent jobs on a bounded worker pool with per-user deduplication and persisted results
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Job statuses ('pending' and 'processing' match what the timeline UI already understands)
+PENDING = 'pending'
+PROCESSING = 'processing'
+COMPLETED = 'completed'
+ERROR = 'error'
+CANCELLED = 'cancelled'
+
+IN_FLIGHT_STATUSES = (PENDING, PROCESSING)
+
+
+class JobCancelled(Exception):
+    """Raised inside a job once cancellation has been requested"""
+    pass
+
+
+class Job:
+    """
+    A single background job
+    Job functions receive the Job and should check for cancellation between steps
+    """
+
+    def __init__(self, kind: str, user_id: str, job_id: Optional[str] = None):
+        self.job_id = job_id or uuid.uuid4().hex
+        self.kind = kind
+        self.user_id = user_id
+        self.status = PENDING
+        self.progress = None
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._cancel_requested = threading.Event()
+        self._future = None
+        self._notify = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_requested.is_set()
+
+    def update_progress(self, message: str) -> None:
+        """Record a human-readable progress step and notify listeners"""
+        self.progress = message
+        if self._notify:
+            self._notify(self)
+
+    def raise_if_cancelled(self) -> None:
+        """Stop the job at a safe point if cancellation was requested"""
+        if self.cancelled:
+            raise JobCancelled(f"Job {self.job_id} was cancelled")
+
+    def cancellable(self, iterable: Iterable) -> Iterator:
+        """Iterate while checking for cancellation, closing the source when stopped"""
+        try:
+            for item in iterable:
+                self.raise_if_cancelled()
+                yield item
+        finally:
+            close = getattr(iterable, 'close', None)
+            if close:
+                close()
+
+    def to_dict(self, include_result: bool = True) -> Dict[str, Any]:
+        def iso(timestamp):
+            return datetime.fromtimestamp(timestamp).isoformat() if timestamp else None
+
+        data = {
+            'job_id': self.job_id,
+            'kind': self.kind,
+            'user_id': self.user_id,
+            'status': self.status,
+            'progress': self.progress,
+            'error': self.error,
+            'created_at': iso(self.created_at),
+            'started_at': iso(self.started_at),
+            'finished_at': iso(self.finished_at)
+        }
+        if include_result:
+            data['result'] = self.result
+        return data
+
+    def to_record(self) -> Dict[str, Any]:
+        """Serializable record used for persistence"""
+        return {
+            'job_id': self.job_id,
+            'kind': self.kind,
+            'user_id': self.user_id,
+            'status': self.status,
+            'progress': self.progress,
+            'result': self.result,
+            'error': self.error,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at
+        }
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> 'Job':
+        job = cls(record['kind'], record['user_id'], job_id=record['job_id'])
+        for key in ('status', 'progress', 'result', 'error', 'created_at', 'started_at', 'finished_at'):
+            setattr(job, key, record.get(key))
+        return job
+
+
+class JobStore:
+    """
+    Persists job records as one JSON file per job, creating the directory on first write
+    With no directory configured, records only live in memory
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory
+
+    def _path(self, job_id: str) -> str:
+        return os.path.join(self.directory, f"{job_id}.json")
+
+    def save(self, job: Job) -> None:
+        if not self.directory:
+            return
+        path = self._path(job.job_id)
+        tmp_path = f"{path}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp_path, 'w') as f:
+                json.dump(job.to_record(), f)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.error(f"Failed to persist job {job.job_id}: {e}")
+
+    def delete(self, job_id: str) -> None:
+        if not self.directory:
+            return
+        try:
+            os.remove(self._path(job_id))
+        except FileNotFoundError:
+            pass
+
+    def load_all(self) -> List[Job]:
+        if not self.directory:
+            return []
+        if not os.path.isdir(self.directory):
+            return []
+        jobs = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(self.directory, name)) as f:
+                    jobs.append(Job.from_record(json.load(f)))
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Skipping unreadable job record {name}: {e}")
+        return jobs
+
+
+class JobManager:
+    """
+    Bounded worker pool for background jobs
+    At most one job per (kind, user_id) is in flight; submitting again joins it.
+    Finished jobs are kept for result_ttl seconds. Listeners are called with the
+    job on every status or progress change, from the worker thread
+    """
+
+    def __init__(self, store: JobStore, max_workers: int = 2, result_ttl: float = 24 * 60 * 60):
+        self.store = store
+        self.result_ttl = result_ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job-worker')
+        self._jobs = {}
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self._listeners = []
+        self.max_workers = max_workers
+        self._restore()
+
+    def add_listener(self, callback: Callable[[Job], None]) -> None:
+        """Register a callback for job status and progress changes"""
+        self._listeners.append(callback)
+
+    def _notify(self, job: Job) -> None:
+        for callback in self._listeners:
+            try:
+                callback(job)
+            except Exception as e:
+                logger.error(f"Job listener failed for {job.job_id}: {e}")
+
+    def _restore(self) -> None:
+        """Load persisted jobs; jobs that were running when the server stopped are marked failed"""
+        for job in self.store.load_all():
+            if job.status in IN_FLIGHT_STATUSES:
+                job.status = ERROR
+                job.error = 'Interrupted by server restart'
+                job.finished_at = time.time()
+                self.store.save(job)
+            self._jobs[job.job_id] = job
+        self._prune(time.time())
+
+    def _prune(self, now: float) -> None:
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at and now - job.finished_at > self.result_ttl
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+            self.store.delete(job_id)
+
+    def submit(self, kind: str, user_id: str, func: Callable[[Job], Any]) -> tuple:
+        """
+        Queue func(job) for the user, or join the job already in flight
+        Returns (job, created)
+        """
+        with self._lock:
+            self._prune(time.time())
+            existing = self._jobs.get(self._in_flight.get((kind, user_id)))
+            if existing and existing.status in IN_FLIGHT_STATUSES:
+                logger.info(f"Joining in-flight {kind} job {existing.job_id} for user {user_id}")
+                return existing, False
+
+            job = Job(kind, user_id)
+            job._notify = self._notify
+            self._jobs[job.job_id] = job
+            self._in_flight[(kind, user_id)] = job.job_id
+            self.store.save(job)
+            job._future = self._executor.submit(self._run, job, func)
+
+        logger.info(f"Queued {kind} job {job.job_id} for user {user_id}")
+        self._notify(job)
+        return job, True
+
+    def _run(self, job: Job, func: Callable[[Job], Any]) -> None:
+        with self._lock:
+            if job.cancelled:
+                return
+            job.status = PROCESSING
+            job.started_at = time.time()
+        self.store.save(job)
+        self._notify(job)
+
+        try:
+            result = func(job)
+            job.raise_if_cancelled()
+            self._finish(job, COMPLETED, result=result)
+        except JobCancelled:
+            logger.info(f"Job {job.job_id} stopped after cancellation")
+        except Exception as e:
+            logger.error(f"Job {job.job_id} failed: {e}", exc_info=True)
+            self._finish(job, ERROR, error=str(e))
+
+    def _finish(self, job: Job, status: str, result: Any = None, error: Optional[str] = None) -> None:
+        with self._lock:
+            if job.status not in IN_FLIGHT_STATUSES:
+                return
+            job.status = status
+            job.result = result
+            job.error = error
+            job.finished_at = time.time()
+            if self._in_flight.get((job.kind, job.user_id)) == job.job_id:
+                del self._in_flight[(job.kind, job.user_id)]
+        self.store.save(job)
+        self._notify(job)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """
+        Cancel a queued or running job
+        Running jobs stop at their next cancellation check; the job is reported
+        as cancelled immediately and a new submission starts a fresh job
+        """
+        job = self.get(job_id)
+        if job is None:
+            return None
+        job._cancel_requested.set()
+        if job._future is not None:
+            job._future.cancel()
+        self._finish(job, CANCELLED, error='Cancelled by user')
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def get_latest(self, kind: str, user_id: str) -> Optional[Job]:
+        """Most recent job of this kind for the user"""
+        with self._lock:
+            jobs = [job for job in self._jobs.values() if job.kind == kind and job.user_id == user_id]
+        return max(jobs, key=lambda job: job.created_at, default=None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+        return {'max_workers': self.max_workers, 'jobs': counts}
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
@@ -16,23 +16,33 @@
 
 from google.adk.agents import LlmAgent
 from google.adk.tools.agent_tool import AgentTool
-from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset, StdioServerParameters
 
 from . import prompt
+from .fanout import create_fanout_agent
+from .fi_mcp import get_fi_mcp_toolset, refresh_fi_mcp_data, scope_fi_mcp_cache
 from .sub_agents.financial_analyzer.agent import financial_analyzer_agent
 from .sub_agents.future_simulator.agent import future_simulator_agent
 from .sub_agents.scenario_modeler.agent import scenario_modeler_agent
 from .sub_agents.timeline_predictor.agent import timeline_predictor_agent
 from .sub_agents.financial_health_score.agent import financial_health_score_agent
+from .context_cache import record_context_cache_usage, use_context_cache
+from .history_compaction import compact_history
+from .model_router import model_for, route_model
+from .prompt_registry import register_prompt
 
-MODEL = "gemini-2.5-pro"
+MODEL = model_for("financial_analysis_coordinator")
 
-# Fi MCP toolset for the main analysis system
-fi_mcp_toolset = MCPToolset(
-    connection_params=StdioServerParameters(
-        command="npx",
-        args=["mcp-remote", "https://fi-mcp-dev-56426154949.us-central1.run.app/mcp/stream"]
-    )
+# Fi MCP toolset for the main analysis system (shared connection pool)
+fi_mcp_toolset = get_fi_mcp_toolset()
+
+# Both read Fi MCP directly and neither needs the other's output, so they can run side by side
+financial_baseline_agent = create_fanout_agent(
+    name="financial_baseline_agent",
+    description=(
+        "Runs the financial analyzer and the financial health score agents concurrently "
+        "and returns both outputs (financial_analysis_output and financial_health_score_output)."
+    ),
+    agents=[financial_analyzer_agent, financial_health_score_agent],
 )
 
 oracle_coordinator = LlmAgent(
@@ -44,16 +54,22 @@ oracle_coordinator = LlmAgent(
         "and quantitative assessment of financial scenarios and outcomes. "
         "Integrates multiple analytical sub-systems for complete financial evaluation."
     ),
-    instruction=prompt.ORACLE_COORDINATOR_PROMPT,
+    instruction=register_prompt("financial_analysis_coordinator", prompt.ORACLE_COORDINATOR_PROMPT),
     output_key="financial_analysis_output",
+    before_agent_callback=scope_fi_mcp_cache,  # Lets sub-agents share this user's cached Fi MCP data
     tools=[
         fi_mcp_toolset,  # Direct access to Fi MCP for the coordinator
+        refresh_fi_mcp_data,
+        AgentTool(agent=financial_baseline_agent),  # Steps 1 and 5 concurrently
         AgentTool(agent=financial_analyzer_agent),
         AgentTool(agent=future_simulator_agent),
         AgentTool(agent=scenario_modeler_agent),
         AgentTool(agent=timeline_predictor_agent),
         AgentTool(agent=financial_health_score_agent),
     ],
+    # Digest of older turns, then model choice, then the static prefix swapped for its cache handle
+    before_model_callback=[compact_history, route_model, use_context_cache],
+    after_model_callback=record_context_cache_usage,
 )
 
 root_agent = oracle_coordinator 
\ No newline at end of file
@@ -0,0 +1,176 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compaction of long conversation histories into a rolling digest before each model call"""
+
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LLMRegistry, LlmRequest, LlmResponse
+from google.genai import types
+
+logger = logging.getLogger(__name__)
+
+# Session state key holding the digest: {"text": ..., "turns": number of leading turns it replaces}
+DIGEST_STATE_KEY = "conversation_digest"
+
+# History token budget per agent; agents not listed are never compacted
+HISTORY_TOKEN_BUDGETS: Dict[str, int] = {
+    "financial_analysis_coordinator": 24000,
+    "tax_advisor_coordinator": 24000,
+    "insight_synthesizer_agent": 32000,
+}
+
+# Structured results that are carried verbatim next to the digest instead of being summarized
+PRESERVED_STATE_KEYS: Dict[str, Tuple[str, ...]] = {
+    "financial_analysis_coordinator": (
+        "financial_analysis_output", "financial_health_score_output", "future_scenarios_output",
+        "scenario_analysis_output", "timeline_predictions_output",
+    ),
+    "tax_advisor_coordinator": (
+        "tax_analyzer_output", "deduction_optimizer_output", "tax_planner_output", "tax_scenario_modeler_output",
+    ),
+    "insight_synthesizer_agent": ("insight_synthesis_output",),
+}
+
+KEEP_RECENT_TURNS = int(os.environ.get("HISTORY_KEEP_RECENT_TURNS", "3"))
+# Turns are folded in batches so a long chat doesn't pay for a digest call on every turn
+MIN_FOLD_TURNS = int(os.environ.get("HISTORY_MIN_FOLD_TURNS", "2"))
+DIGEST_MODEL = os.environ.get("HISTORY_DIGEST_MODEL", os.environ.get("FLASH_MODEL", "gemini-2.5-flash"))
+DIGEST_MAX_CHARS = 6000
+
+for _entry in filter(None, (item.strip() for item in os.environ.get("HISTORY_TOKEN_BUDGETS", "").split(","))):
+    _agent_name, _, _budget = _entry.partition("=")
+    if _budget.strip().isdigit():
+        HISTORY_TOKEN_BUDGETS[_agent_name.strip()] = int(_budget)
+    else:
+        logger.warning(f"Ignoring malformed HISTORY_TOKEN_BUDGETS entry: {_entry}")
+
+DIGEST_PROMPT = """Summarize the earlier part of a financial advisory conversation so it can replace those turns.
+Keep every figure, decision, goal, preference and open question the user stated, and the conclusions given.
+Drop greetings, repetition and formatting. Write at most 300 words of plain bullet points.
+
+{previous}Conversation to summarize:
+{transcript}"""
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough Gemini token count (about four characters per token)"""
+    return (len(text) + 3) // 4
+
+
+def _part_text(part: types.Part) -> str:
+    if part.text:
+        return part.text
+    if part.function_call:
+        return f"[call {part.function_call.name}({json.dumps(part.function_call.args or {}, default=str)})]"
+    if part.function_response:
+        return f"[{part.function_response.name} returned {json.dumps(part.function_response.response or {}, default=str)}]"
+    return ""
+
+
+def _content_text(content: types.Content) -> str:
+    return "\n".join(filter(None, (_part_text(part) for part in content.parts or [])))
+
+
+def _is_user_turn(content: types.Content) -> bool:
+    return content.role == "user" and any(part.text for part in content.parts or [])
+
+
+def split_turns(contents: List[types.Content]) -> List[List[types.Content]]:
+    """Group contents into turns, each starting at a user message (tool results stay with their turn)"""
+    turns: List[List[types.Content]] = []
+    for content in contents:
+        if _is_user_turn(content) or not turns:
+            turns.append([])
+        turns[-1].append(content)
+    return turns
+
+
+def _transcript(turns: List[List[types.Content]]) -> str:
+    return "\n\n".join(
+        f"{content.role}: {_content_text(content)}" for turn in turns for content in turn
+    )
+
+
+def _digest_contents(digest: str, state: Any, keys: Tuple[str, ...]) -> List[types.Content]:
+    text = f"Summary of the earlier conversation (older turns were compacted):\n{digest}"
+    preserved = [f"## {key}\n{state[key]}" for key in keys if state.get(key)]
+    if preserved:
+        text += "\n\nLatest structured results, verbatim:\n" + "\n\n".join(preserved)
+    return [
+        types.Content(role="user", parts=[types.Part(text=text)]),
+        types.Content(role="model", parts=[types.Part(text="Noted, I'll continue from this summary.")]),
+    ]
+
+
+async def summarize_turns(transcript: str, previous: str = "") -> str:
+    """Digest of older turns from the flash model, or a truncated transcript if the call fails"""
+    prompt = DIGEST_PROMPT.format(
+        previous=f"Summary so far:\n{previous}\n\n" if previous else "",
+        transcript=transcript,
+    )
+    request = LlmRequest(
+        model=DIGEST_MODEL,
+        contents=[types.Content(role="user", parts=[types.Part(text=prompt)])],
+    )
+    try:
+        text = ""
+        async for response in LLMRegistry.new_llm(DIGEST_MODEL).generate_content_async(request):
+            if response.content and response.content.parts:
+                text = "".join(part.text or "" for part in response.content.parts)
+        if text.strip():
+            return text.strip()[:DIGEST_MAX_CHARS]
+    except Exception as e:
+        logger.error(f"History digest failed, keeping a truncated transcript: {e}")
+    return (previous + "\n" + transcript).strip()[-DIGEST_MAX_CHARS:]
+
+
+async def compact_history(callback_context: CallbackContext, llm_request: LlmRequest) -> Optional[LlmResponse]:
+    """
+    before_model_callback: replace older turns with the rolling digest
+    ADK rebuilds contents from every session event on each call, so the stored digest is
+    applied every time; once the remaining history exceeds the agent's budget and at least
+    MIN_FOLD_TURNS turns precede the last KEEP_RECENT_TURNS, those turns are folded into the digest
+    """
+    agent_name = callback_context.agent_name
+    budget = HISTORY_TOKEN_BUDGETS.get(agent_name)
+    if not budget:
+        return None
+
+    turns = split_turns(llm_request.contents)
+    digest = callback_context.state.get(DIGEST_STATE_KEY) or {"text": "", "turns": 0}
+    covered = min(digest["turns"], max(len(turns) - 1, 0))
+    remaining = turns[covered:]
+    tokens = estimate_tokens(digest["text"]) + sum(estimate_tokens(_transcript([turn])) for turn in remaining)
+
+    fold = len(remaining) - KEEP_RECENT_TURNS
+    if tokens > budget and fold >= max(MIN_FOLD_TURNS, 1):
+        logger.info(f"Compacting {fold} turns of {agent_name} history (~{tokens} tokens, budget {budget})")
+        digest = {
+            "text": await summarize_turns(_transcript(remaining[:fold]), digest["text"]),
+            "turns": covered + fold,
+        }
+        callback_context.state[DIGEST_STATE_KEY] = digest
+        covered, remaining = digest["turns"], remaining[fold:]
+
+    if covered:
+        keys = PRESERVED_STATE_KEYS.get(agent_name, ())
+        llm_request.contents = _digest_contents(digest["text"], callback_context.state, keys) + [
+            content for turn in remaining for content in turn
+        ]
+    return None
@@ -13,4 +13,4 @@
 # limitations under the License.
 
 """Financial Health Score Oracle Sub-agent"""
-from .mcp_direct_calculator import calculate_fhs_direct, MCPDataValidationError 
\ No newline at end of file
+from .mcp_direct_calculator import calculate_fhs_direct, calculate_fhs_direct_batch, MCPDataValidationError 
\ No newline at end of file
@@ -0,0 +1,136 @@
+"""Benchmark - Scalar vs Batch Financial Health Score Calculation
+
+Usage: python -m oracle_agent.sub_agents.financial_health_score.benchmark_batch [num_users]
+"""
+
+import sys
+import time
+from typing import Dict, Any, List
+
+import numpy as np
+
+from .mcp_direct_calculator import DirectMCPCalculator, MCPDataValidationError, METRIC_COLUMNS
+
+ASSET_TYPES = [
+    'ASSET_TYPE_MUTUAL_FUND', 'ASSET_TYPE_INDIAN_SECURITIES', 'ASSET_TYPE_US_SECURITIES',
+    'ASSET_TYPE_SAVINGS_ACCOUNTS', 'ASSET_TYPE_EPF', 'ASSET_TYPE_GOLD'
+]
+DEPOSIT_TYPES = ['DEPOSIT_ACCOUNT_TYPE_SAVINGS', 'DEPOSIT_ACCOUNT_TYPE_CURRENT', 'DEPOSIT_ACCOUNT_TYPE_FIXED']
+
+
+def _units(value: float) -> Dict[str, str]:
+    return {'currencyCode': 'INR', 'units': str(round(value, 2))}
+
+
+def make_synthetic_payloads(num_users: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Generate Fi MCP shaped payloads with varied assets, accounts and transactions"""
+    rng = np.random.default_rng(seed)
+    payloads = []
+    for _ in range(num_users):
+        asset_types = rng.choice(ASSET_TYPES, size=rng.integers(0, 7), replace=True)
+        assets = [
+            {'netWorthAttribute': str(asset_type), 'value': _units(rng.uniform(1_000, 2_000_000))}
+            for asset_type in asset_types
+        ]
+        liabilities = [
+            {'netWorthAttribute': 'LIABILITY_TYPE_HOME_LOAN', 'value': _units(rng.uniform(0, 3_000_000))}
+            for _ in range(rng.integers(0, 3))
+        ]
+        accounts = {
+            f"acc_{j}": {
+                'accountDetails': {'accountType': {'depositAccountType': str(rng.choice(DEPOSIT_TYPES))}},
+                'depositSummary': {'currentBalance': _units(rng.uniform(0, 500_000))}
+            }
+            for j in range(rng.integers(0, 4))
+        }
+        income = rng.uniform(10_000, 300_000)
+        transactions = [
+            {'amount': _units(income if rng.random() < 0.1 else -rng.uniform(10, income / 8))}
+            for _ in range(rng.integers(1, 180))
+        ]
+        payload = {
+            'net_worth': {
+                'netWorthResponse': {
+                    'assetValues': assets,
+                    'liabilityValues': liabilities,
+                    'totalNetWorthValue': _units(rng.uniform(-1_000_000, 10_000_000))
+                },
+                'accountDetailsBulkResponse': {'accountDetailsMap': accounts}
+            },
+            'transactions': {'transactionResponse': {'transactions': transactions}}
+        }
+        if rng.random() < 0.5:
+            payload['epf'] = {'uanAccounts': [
+                {'rawDetails': {'overall_pf_balance': {'current_pf_balance': str(round(rng.uniform(0, 3_000_000), 2))}}}
+            ]}
+        payloads.append(payload)
+    return payloads
+
+
+def _score_scalar(calculator: DirectMCPCalculator, metrics: Dict[str, Any]) -> Dict[str, Any]:
+    """Scalar scoring of already parsed metrics (the part the columnar batch path replaces)"""
+    calculator._validate_parsed_metrics(metrics)
+    overall_score = calculator._calculate_weighted_score(calculator._calculate_all_factors(metrics))
+    return {'overall_score': overall_score, 'grade': calculator._get_grade_category(overall_score)['grade']}
+
+
+def run_benchmark(num_users: int = 10_000, seed: int = 0) -> Dict[str, Any]:
+    """
+    Time the scalar and batch paths on the same users and verify they agree
+    end_to_end starts from MCP payloads; scoring starts from a columnar metrics table
+    """
+    calculator = DirectMCPCalculator()
+    payloads = make_synthetic_payloads(num_users, seed)
+
+    start = time.perf_counter()
+    scalar_results = []
+    for payload in payloads:
+        try:
+            scalar_results.append(calculator.calculate_fhs_from_mcp(payload))
+        except MCPDataValidationError as e:
+            scalar_results.append({'error': str(e)})
+    scalar_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = calculator.calculate_fhs_batch(payloads)
+    batch_seconds = time.perf_counter() - start
+
+    metrics = batch[batch['error'].isna()][METRIC_COLUMNS]
+    metric_rows = metrics.to_dict('records')
+
+    start = time.perf_counter()
+    scalar_scores = [_score_scalar(calculator, row) for row in metric_rows]
+    scalar_scoring_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch_scores = calculator.calculate_fhs_batch(metrics)
+    batch_scoring_seconds = time.perf_counter() - start
+
+    mismatches = 0
+    for expected, (_, row) in zip(scalar_results, batch.iterrows()):
+        if 'error' in expected:
+            mismatches += expected['error'] != row['error']
+        else:
+            mismatches += expected['overall_score'] != row['overall_score'] or expected['grade'] != row['grade']
+    for expected, (_, row) in zip(scalar_scores, batch_scores.iterrows()):
+        mismatches += expected['overall_score'] != row['overall_score'] or expected['grade'] != row['grade']
+
+    return {
+        'num_users': num_users,
+        'end_to_end': {
+            'scalar_seconds': round(scalar_seconds, 3),
+            'batch_seconds': round(batch_seconds, 3),
+            'speedup': round(scalar_seconds / batch_seconds, 1)
+        },
+        'scoring': {
+            'scalar_seconds': round(scalar_scoring_seconds, 3),
+            'batch_seconds': round(batch_scoring_seconds, 3),
+            'speedup': round(scalar_scoring_seconds / batch_scoring_seconds, 1)
+        },
+        'mismatches': int(mismatches)
+    }
+
+
+if __name__ == '__main__':
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    print(run_benchmark(users))
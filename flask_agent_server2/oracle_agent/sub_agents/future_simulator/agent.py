@@ -17,12 +17,17 @@
 from google.adk import Agent
 
 from . import prompt
+from .monte_carlo import run_monte_carlo_simulation
+from ...model_router import model_for, route_model
+from ...prompt_registry import register_prompt
 
-MODEL = "gemini-2.5-pro"
+MODEL = model_for("future_simulator_agent")
 
 future_simulator_agent = Agent(
     model=MODEL,
     name="future_simulator_agent",
-    instruction=prompt.FUTURE_SIMULATOR_PROMPT,
+    instruction=register_prompt("future_simulator_agent", prompt.FUTURE_SIMULATOR_PROMPT),
     output_key="future_scenarios_output",
+    tools=[run_monte_carlo_simulation],
+    before_model_callback=route_model,
 ) 
\ No newline at end of file
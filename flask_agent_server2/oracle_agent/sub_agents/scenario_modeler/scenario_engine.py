@@ -0,0 +1,413 @@
+"""Batched Scenario Engine - Baseline vs Alternative Cash-Flow Projections for the Scenario Modeler"""
+
+from typing import Dict, Any, List, Optional
+import asyncio
+import math
+
+import numpy as np
+
+
+class ScenarioSpecError(Exception):
+    """Raised when a scenario spec or the baseline is incomplete or out of range"""
+    pass
+
+
+MIN_PATHS = 1_000
+MAX_PATHS = 100_000
+MAX_SCENARIOS = 20
+MAX_HORIZON_YEARS = 40
+SHORT_TERM_MONTHS = 6
+MEDIUM_TERM_MONTHS = 60
+
+# Declarative scenario fields and their "no change" values
+SCENARIO_FIELDS = {
+    'monthly_income_change': 0.0,    # rupees per month, negative for a pay cut or break
+    'income_change_pct': 0.0,        # relative income change, e.g. 0.3 for a 30% hike
+    'monthly_expense_change': 0.0,   # rupees per month in today's money
+    'one_time_cost': 0.0,            # rupees in today's money, e.g. wedding or down payment
+    'one_time_cost_month': 0,
+    'start_month': 0,                # month the recurring changes begin
+    'duration_months': 0,            # 0 keeps the recurring changes for the whole horizon
+    'equity_allocation_change': 0.0,
+    'return_shift': 0.0,             # change in expected annual equity return
+    'inflation_shift': 0.0,
+}
+
+
+class ScenarioEngine:
+    """
+    Projects the baseline and every alternative scenario through one monthly cash-flow model
+    Scenarios are rows and simulated paths are columns of a single state matrix; all scenarios
+    share the same market and inflation draws, so differences come from the scenario alone
+    """
+
+    def __init__(self, num_paths: int = 5_000, seed: int = 42):
+        if not MIN_PATHS <= num_paths <= MAX_PATHS:
+            raise ScenarioSpecError(f"num_paths must be between {MIN_PATHS:,} and {MAX_PATHS:,}")
+        self.num_paths = int(num_paths)
+        self.seed = int(seed)
+
+    def compare(
+        self,
+        baseline: Dict[str, float],
+        scenarios: List[Dict[str, Any]],
+        assumptions: Dict[str, float],
+        horizon_years: int,
+        goals: Optional[List[Dict[str, Any]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Run baseline and scenarios together and build the comparison matrix
+        baseline: current_net_worth, monthly_income, monthly_expenses, equity_allocation
+        scenarios: [{'name', **SCENARIO_FIELDS}]
+        assumptions: expected_equity_return, equity_volatility, expected_debt_return, debt_volatility,
+                     expected_inflation, inflation_volatility, annual_income_growth
+        goals: [{'name', 'target_amount' (today's rupees), 'target_years'}]
+        """
+        goals = goals or []
+        self._validate(baseline, scenarios, horizon_years, goals)
+        specs = [{'name': 'Baseline', **SCENARIO_FIELDS}] + [{**SCENARIO_FIELDS, **spec} for spec in scenarios]
+        months = int(horizon_years) * 12
+        rng = np.random.default_rng(self.seed)
+        n = self.num_paths
+
+        def column(field: str) -> np.ndarray:
+            return np.array([float(spec[field]) for spec in specs])[:, None]
+
+        equity_weight = np.clip(baseline.get('equity_allocation', 0.6) + column('equity_allocation_change'), 0, 1)
+        equity_mu = (1 + assumptions.get('expected_equity_return', 0.12) + column('return_shift')) ** (1 / 12) - 1
+        debt_mu = (1 + assumptions.get('expected_debt_return', 0.07)) ** (1 / 12) - 1
+        equity_sigma = assumptions.get('equity_volatility', 0.18) / math.sqrt(12)
+        debt_sigma = assumptions.get('debt_volatility', 0.02) / math.sqrt(12)
+        inflation_mean = assumptions.get('expected_inflation', 0.06) + column('inflation_shift')
+        inflation_vol = assumptions.get('inflation_volatility', 0.015)
+        income_growth = assumptions.get('annual_income_growth', 0.07)
+
+        start, duration = column('start_month'), column('duration_months')
+        end = np.where(duration > 0, start + duration, np.inf)
+        cost_month = column('one_time_cost_month')
+
+        initial = float(baseline['current_net_worth'])
+        wealth = np.full((len(specs), n), initial)
+        price_level = np.ones((len(specs), n))
+        income_level = float(baseline['monthly_income'])
+        ever_depleted = np.zeros((len(specs), n), dtype=bool)
+
+        # Short-term effects are measured from the month each scenario's change first bites
+        change_month = np.where(column('one_time_cost') > 0, np.minimum(start, cost_month), start)[:, 0].astype(int)
+        change_month = np.minimum(change_month, months - SHORT_TERM_MONTHS)
+        snapshot_months = {int(round(goal['target_years'] * 12)) for goal in goals}
+        snapshot_months |= {MEDIUM_TERM_MONTHS, months} | set((change_month + SHORT_TERM_MONTHS).tolist())
+        snapshots = {}
+        mean_income = np.empty((months, len(specs)))
+        mean_surplus = np.empty((months, len(specs)))
+
+        monthly_inflation = None
+        for month in range(months):
+            if month % 12 == 0:
+                yearly_inflation = inflation_mean + inflation_vol * rng.standard_normal(n)
+                monthly_inflation = (1 + yearly_inflation) ** (1 / 12) - 1
+                if month > 0:
+                    income_level *= 1 + income_growth
+
+            equity_draw = rng.standard_normal(n)
+            debt_draw = rng.standard_normal(n)
+            returns = (equity_weight * (equity_mu + equity_sigma * equity_draw)
+                       + (1 - equity_weight) * (debt_mu + debt_sigma * debt_draw))
+
+            active = (month >= start) & (month < end)
+            income = income_level * (1 + active * column('income_change_pct')) + active * column('monthly_income_change')
+            price_level *= 1 + monthly_inflation
+            expenses = (float(baseline['monthly_expenses']) + active * column('monthly_expense_change')) * price_level
+            one_time = (month == cost_month) * column('one_time_cost') * price_level
+
+            surplus = income - expenses - one_time
+            wealth = wealth * (1 + returns) + surplus
+            ever_depleted |= wealth < 0
+            mean_income[month] = income[:, 0]
+            mean_surplus[month] = surplus.mean(axis=1)
+
+            if month + 1 in snapshot_months:
+                snapshots[month + 1] = (wealth.copy(), price_level.copy())
+
+        return self._build_matrix(
+            specs, baseline, snapshots, change_month, mean_income, mean_surplus, ever_depleted, months, goals,
+            {
+                'baseline_equity_allocation': float(baseline.get('equity_allocation', 0.6)),
+                'expected_equity_return': assumptions.get('expected_equity_return', 0.12),
+                'equity_volatility': assumptions.get('equity_volatility', 0.18),
+                'expected_debt_return': assumptions.get('expected_debt_return', 0.07),
+                'debt_volatility': assumptions.get('debt_volatility', 0.02),
+                'expected_inflation': assumptions.get('expected_inflation', 0.06),
+                'inflation_volatility': inflation_vol,
+                'annual_income_growth': income_growth,
+            },
+        )
+
+    def _build_matrix(
+        self,
+        specs: List[Dict[str, Any]],
+        baseline: Dict[str, float],
+        snapshots: Dict[int, tuple],
+        change_month: np.ndarray,
+        mean_income: np.ndarray,
+        mean_surplus: np.ndarray,
+        ever_depleted: np.ndarray,
+        months: int,
+        goals: List[Dict[str, Any]],
+        assumptions: Dict[str, float],
+    ) -> Dict[str, Any]:
+        """Per-scenario outcomes, paired differences against the baseline and the goal probability matrix"""
+        final, final_prices = snapshots[months]
+        real_final = final / final_prices
+        initial = float(baseline['current_net_worth'])
+        years = months / 12
+
+        def median_at(month: int) -> np.ndarray:
+            return np.median(snapshots[month][0], axis=1) if month in snapshots else None
+
+        medium_term = median_at(MEDIUM_TERM_MONTHS)
+        p10, p50, p90 = np.percentile(final, (10, 50, 90), axis=1)
+        real_p50 = np.median(real_final, axis=1)
+
+        goal_probability = np.zeros((len(specs), len(goals)))
+        for j, goal in enumerate(goals):
+            wealth, prices = snapshots[int(round(goal['target_years'] * 12))]
+            goal_probability[:, j] = (wealth >= float(goal['target_amount']) * prices).mean(axis=1)
+
+        scenarios = []
+        for i, spec in enumerate(specs):
+            window = slice(change_month[i], change_month[i] + SHORT_TERM_MONTHS)
+            year = slice(change_month[i], change_month[i] + 12)
+            monthly_cash_flow = float(mean_surplus[window, i].mean())
+            net_worth_after = float(np.median(snapshots[change_month[i] + SHORT_TERM_MONTHS][0][i]))
+            expenses = float(baseline['monthly_expenses']) + float(spec['monthly_expense_change'])
+            income = mean_income[year, i].sum()
+            scenario = {
+                'name': spec['name'],
+                'short_term': {
+                    'starts_in_month': int(change_month[i]),
+                    'monthly_cash_flow': round(monthly_cash_flow),
+                    'monthly_cash_flow_change': round(monthly_cash_flow - float(mean_surplus[window, 0].mean())),
+                    'net_worth_after_6_months': round(net_worth_after),
+                    'emergency_cover_months': round(net_worth_after / expenses, 1) if expenses > 0 else None,
+                    'savings_rate_first_year': round(float(mean_surplus[year, i].sum() / income), 4) if income > 0 else None,
+                },
+                'medium_term': {
+                    'net_worth_at_5_years': round(float(medium_term[i])) if medium_term is not None else None,
+                },
+                'long_term': {
+                    'median_net_worth': round(float(p50[i])),
+                    'real_median_net_worth': round(float(real_p50[i])),
+                    'p10_net_worth': round(float(p10[i])),
+                    'p90_net_worth': round(float(p90[i])),
+                    'median_cagr': (
+                        round((float(p50[i]) / initial) ** (1 / years) - 1, 4) if initial > 0 and p50[i] > 0 else None
+                    ),
+                },
+                'risk': {
+                    'probability_of_depletion': round(float(ever_depleted[i].mean()), 4),
+                    'probability_of_loss': round(float((final[i] < initial).mean()), 4),
+                },
+                'goal_probabilities': {
+                    goal['name']: round(float(goal_probability[i, j]), 4) for j, goal in enumerate(goals)
+                },
+            }
+            if i:
+                # Same draws in every row, so path-by-path differences isolate the scenario
+                real_difference = (final[i] - final[0]) / final_prices[0]
+                scenario['versus_baseline'] = {
+                    'median_difference': round(float(p50[i] - p50[0])),
+                    'median_difference_pct': round(float((p50[i] - p50[0]) / abs(p50[0]) * 100), 1) if p50[0] else None,
+                    'real_value_of_change': round(float(np.median(real_difference))),
+                    'probability_better_than_baseline': round(float((final[i] > final[0]).mean()), 4),
+                    'goal_probability_change_pp': {
+                        goal['name']: round(float(goal_probability[i, j] - goal_probability[0, j]) * 100, 1)
+                        for j, goal in enumerate(goals)
+                    },
+                }
+            scenarios.append(scenario)
+
+        return {
+            'status': 'success',
+            'projection_parameters': {
+                'num_paths': self.num_paths,
+                'seed': self.seed,
+                'horizon_years': int(years),
+                'baseline': {key: float(value) for key, value in baseline.items()},
+                'assumptions': assumptions,
+            },
+            'scenarios': scenarios,
+            'goal_probability_matrix': [
+                {
+                    'goal': goal['name'],
+                    'target_amount': float(goal['target_amount']),
+                    'target_years': goal['target_years'],
+                    **{spec['name']: round(float(goal_probability[i, j]), 4) for i, spec in enumerate(specs)},
+                }
+                for j, goal in enumerate(goals)
+            ],
+            'best_scenario_by_median': specs[int(np.argmax(p50))]['name'],
+        }
+
+    def _validate(
+        self,
+        baseline: Dict[str, float],
+        scenarios: List[Dict[str, Any]],
+        horizon_years: int,
+        goals: List[Dict[str, Any]],
+    ) -> None:
+        """Validate the baseline, scenario specs, horizon and goals"""
+        required = ['current_net_worth', 'monthly_income', 'monthly_expenses']
+        missing = [key for key in required if baseline.get(key) is None]
+        if missing:
+            raise ScenarioSpecError(f"Missing baseline values: {missing}")
+        if baseline['monthly_income'] < 0 or baseline['monthly_expenses'] < 0:
+            raise ScenarioSpecError("Monthly income and expenses must be non-negative")
+        if not 1 <= horizon_years <= MAX_HORIZON_YEARS:
+            raise ScenarioSpecError(f"horizon_years must be between 1 and {MAX_HORIZON_YEARS}")
+        if not 1 <= len(scenarios) <= MAX_SCENARIOS:
+            raise ScenarioSpecError(f"Provide between 1 and {MAX_SCENARIOS} alternative scenarios")
+
+        names = [spec.get('name') for spec in scenarios]
+        if not all(names) or len(set(names)) != len(names) or 'Baseline' in names:
+            raise ScenarioSpecError("Every scenario needs a unique name other than 'Baseline'")
+        for spec in scenarios:
+            unknown = set(spec) - set(SCENARIO_FIELDS) - {'name'}
+            if unknown:
+                raise ScenarioSpecError(f"Scenario '{spec['name']}' has unknown fields: {sorted(unknown)}")
+            if spec.get('income_change_pct', 0) < -1 or spec.get('one_time_cost', 0) < 0:
+                raise ScenarioSpecError(f"Scenario '{spec['name']}' cuts income by over 100% or has a negative cost")
+            if not 0 <= spec.get('one_time_cost_month', 0) < horizon_years * 12:
+                raise ScenarioSpecError(f"Scenario '{spec['name']}' one_time_cost_month is outside the horizon")
+            if not 0 <= spec.get('start_month', 0) < horizon_years * 12:
+                raise ScenarioSpecError(f"Scenario '{spec['name']}' start_month is outside the horizon")
+            if spec.get('duration_months', 0) < 0:
+                raise ScenarioSpecError(f"Scenario '{spec['name']}' duration_months must be non-negative")
+
+        for goal in goals:
+            if goal['target_amount'] <= 0 or not 0 < goal['target_years'] <= horizon_years:
+                raise ScenarioSpecError(f"Goal '{goal['name']}' needs a positive amount and target_years within the horizon")
+
+
+async def compare_financial_scenarios(
+    current_net_worth: float,
+    monthly_income: float,
+    monthly_expenses: float,
+    scenario_names: List[str],
+    monthly_income_changes: Optional[List[float]] = None,
+    income_change_pcts: Optional[List[float]] = None,
+    monthly_expense_changes: Optional[List[float]] = None,
+    one_time_costs: Optional[List[float]] = None,
+    one_time_cost_months: Optional[List[int]] = None,
+    change_start_months: Optional[List[int]] = None,
+    change_duration_months: Optional[List[int]] = None,
+    equity_allocation_changes: Optional[List[float]] = None,
+    return_shifts: Optional[List[float]] = None,
+    inflation_shifts: Optional[List[float]] = None,
+    equity_allocation: float = 0.6,
+    horizon_years: int = 10,
+    annual_income_growth: float = 0.07,
+    expected_equity_return: float = 0.12,
+    equity_volatility: float = 0.18,
+    expected_debt_return: float = 0.07,
+    expected_inflation: float = 0.06,
+    goal_names: Optional[List[str]] = None,
+    goal_amounts: Optional[List[float]] = None,
+    goal_years: Optional[List[float]] = None,
+    num_paths: int = 5000,
+    seed: int = 42,
+) -> Dict[str, Any]:
+    """Projects the baseline and alternative what-if scenarios side by side and compares them.
+
+    Each scenario is a set of changes to the baseline; every list below has one value per
+    scenario name, and a missing list means no change of that kind. Amounts are in rupees
+    and rates are decimals (0.10 means 10%). The same inputs and seed give the same result.
+
+    Args:
+        current_net_worth: Current investable net worth in rupees.
+        monthly_income: Current monthly take-home income in rupees.
+        monthly_expenses: Current monthly expenses in rupees.
+        scenario_names: Names of the alternative scenarios, e.g. ["Job switch", "Home purchase"].
+        monthly_income_changes: Monthly income change in rupees (negative for a pay cut or career break).
+        income_change_pcts: Relative income change, e.g. 0.3 for a 30% hike or -1.0 for no income.
+        monthly_expense_changes: Monthly expense change in today's rupees, e.g. EMI or childcare.
+        one_time_costs: One-off cost in today's rupees, e.g. wedding or down payment.
+        one_time_cost_months: Months from now when each one-off cost is paid.
+        change_start_months: Months from now when the recurring changes begin.
+        change_duration_months: How long the recurring changes last, 0 for the whole horizon.
+        equity_allocation_changes: Change in the equity share of the portfolio, e.g. 0.2 or -0.3.
+        return_shifts: Change in expected annual equity return, e.g. -0.04 for a weak market.
+        inflation_shifts: Change in expected annual inflation, e.g. 0.02.
+        equity_allocation: Baseline equity share of the portfolio.
+        horizon_years: Number of years to project (1-40).
+        annual_income_growth: Yearly baseline income growth.
+        expected_equity_return: Expected annual equity return.
+        equity_volatility: Annual standard deviation of equity returns.
+        expected_debt_return: Expected annual return of the debt portion.
+        expected_inflation: Expected annual inflation of expenses.
+        goal_names: Goals for the probability matrix, e.g. ["Home purchase", "Retirement corpus"].
+        goal_amounts: Target net worth for each goal in today's rupees.
+        goal_years: Years from now by which each goal should be reached.
+        num_paths: Number of simulated paths (1,000 - 100,000).
+        seed: Random seed for reproducibility.
+
+    Returns:
+        For the baseline and each scenario the short-term cash flow and emergency cover,
+        5-year and final net worth (median, p10, p90, inflation-adjusted), CAGR, depletion
+        and loss probabilities and goal probabilities; for each scenario its difference
+        from the baseline and the probability it ends ahead; and the goal probability matrix.
+    """
+    scenario_lists = {
+        'monthly_income_change': monthly_income_changes,
+        'income_change_pct': income_change_pcts,
+        'monthly_expense_change': monthly_expense_changes,
+        'one_time_cost': one_time_costs,
+        'one_time_cost_month': one_time_cost_months,
+        'start_month': change_start_months,
+        'duration_months': change_duration_months,
+        'equity_allocation_change': equity_allocation_changes,
+        'return_shift': return_shifts,
+        'inflation_shift': inflation_shifts,
+    }
+    mismatched = [field for field, values in scenario_lists.items() if values and len(values) != len(scenario_names)]
+    if mismatched:
+        return {'status': 'error', 'error_message': f"Lists for {mismatched} must have one value per scenario name"}
+    scenarios = [
+        {'name': name, **{field: values[i] for field, values in scenario_lists.items() if values}}
+        for i, name in enumerate(scenario_names)
+    ]
+
+    goal_names = goal_names or []
+    goal_amounts = goal_amounts or []
+    goal_years = goal_years or []
+    if not len(goal_names) == len(goal_amounts) == len(goal_years):
+        return {'status': 'error', 'error_message': "goal_names, goal_amounts and goal_years must have the same length"}
+    goals = [
+        {'name': name, 'target_amount': amount, 'target_years': years}
+        for name, amount, years in zip(goal_names, goal_amounts, goal_years)
+    ]
+
+    try:
+        engine = ScenarioEngine(num_paths=num_paths, seed=seed)
+        # Up to 20 scenarios of 100k paths take seconds, so they run off the event loop
+        return await asyncio.to_thread(
+            engine.compare,
+            baseline={
+                'current_net_worth': current_net_worth,
+                'monthly_income': monthly_income,
+                'monthly_expenses': monthly_expenses,
+                'equity_allocation': equity_allocation,
+            },
+            scenarios=scenarios,
+            assumptions={
+                'expected_equity_return': expected_equity_return,
+                'equity_volatility': equity_volatility,
+                'expected_debt_return': expected_debt_return,
+                'expected_inflation': expected_inflation,
+                'annual_income_growth': annual_income_growth,
+            },
+            horizon_years=horizon_years,
+            goals=goals,
+        )
+    except ScenarioSpecError as e:
+        return {'status': 'error', 'error_message': str(e)}
@@ -0,0 +1,299 @@
+"""
+Semantic response cache for repeated agent questions
+Answers are keyed by app, user, the user's Fi MCP data version and a normalized form of the
+question, so a rephrasing of a question already answered on the same data skips the agent run
+"""
+
+import logging
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Agent tools whose call means the user's Fi MCP data changed or was re-fetched
+DATA_REFRESH_TOOLS = frozenset({'refresh_fi_mcp_data'})
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:\.[0-9]+)?")
+
+# Direction words (from, to, than, vs, before, after, into) are deliberately kept: together with
+# word order they tell "move FD to equity" from "move equity to FD"
+STOPWORDS = frozenset("""
+    a an the is are was were be been am do does did doing i me my mine we our us you your
+    what whats which who how when where why can could would should will shall please
+    of in on for at by with as and or s re ve ll d m
+    tell show give let know want like just now currently current right
+    there here some any much many also really
+""".split())
+
+# Words whose meaning depends on earlier turns; such questions are never served from cache
+CONTEXTUAL = frozenset("""
+    it its this that these those them they above previous earlier again else
+    another one second third option
+""".split())
+
+SYNONYMS = {
+    'fhs': 'health', 'wellness': 'health',
+    'taxes': 'tax', 'taxation': 'tax', 'itr': 'tax',
+    'regimes': 'regime', 'scheme': 'regime',
+    'retirement': 'retire', 'retiring': 'retire',
+    'investments': 'invest', 'investment': 'invest', 'investing': 'invest',
+    'savings': 'save', 'saving': 'save',
+}
+
+# Qualifiers that don't change what a question asks for. A similar (non-exact) match is only
+# served when the two questions are word for word the same apart from these: token or embedding
+# similarity alone can't tell "sell" from "buy", "more" from "less" or one fund from another
+NEUTRAL_TOKENS = frozenset("""
+    financial overall total exact exactly approximate approximately roughly actual actually
+    quick quickly brief briefly today
+""".split())
+
+Embedder = Callable[[str], Sequence[float]]
+
+
+def _stem(token: str) -> str:
+    token = SYNONYMS.get(token, token)
+    if len(token) > 4 and token.endswith('s') and not token.endswith('ss'):
+        token = token[:-1]
+    return token
+
+
+def normalize_query(text: str) -> Optional[Tuple[str, ...]]:
+    """
+    Content tokens of a question in order, or None when it can't be answered out of context
+    Contractions and stopwords are dropped; negations, direction words and word order are kept
+    """
+    lowered = text.lower().replace("n't", ' not').replace("'", ' ')
+    tokens = _TOKEN.findall(lowered)
+    if any(token in CONTEXTUAL for token in tokens):
+        return None
+    return tuple(_stem(token) for token in tokens if token not in STOPWORDS)
+
+
+def _token_similarity(a: Sequence[str], b: Sequence[str]) -> float:
+    """Cosine similarity of two token sets"""
+    a, b = set(a), set(b)
+    if not a or not b:
+        return 0.0
+    return len(a & b) / math.sqrt(len(a) * len(b))
+
+
+def _cosine(a: Sequence[float], b: Sequence[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class SemanticResponseCache:
+    """
+    Bounded, TTL-based cache of final agent responses
+    A lookup first tries the exact normalized question, then the most similar cached question
+    for the same app, user and data version. A similar match must differ only in neutral
+    qualifiers (NEUTRAL_TOKENS), so questions with different actions, entities or numbers never
+    match. Invalidating a user bumps their data version, dropping everything cached for them
+    """
+
+    def __init__(
+        self,
+        ttl: float = 900,
+        max_entries: int = 5000,
+        similarity_threshold: float = 1.0,
+        min_query_tokens: int = 2,
+        embedder: Optional[Embedder] = None
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self.min_query_tokens = min_query_tokens
+        self.embedder = embedder
+        self._entries = OrderedDict()  # (app, user, version, tokens) -> entry dict
+        self._buckets: Dict[tuple, set] = {}  # (app, user, version) -> cached token tuples
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def data_version(self, user_id: str) -> int:
+        """Current Fi MCP data version of a user"""
+        return self._versions.get(user_id, 0)
+
+    def _tokens(self, query: str) -> Optional[Tuple[str, ...]]:
+        tokens = normalize_query(query)
+        if tokens is None or len(tokens) < self.min_query_tokens:
+            return None
+        return tokens
+
+    def _embed(self, query: str) -> Optional[List[float]]:
+        if self.embedder is None:
+            return None
+        try:
+            return list(self.embedder(query))
+        except Exception as e:
+            logger.warning(f"Query embedding failed, falling back to token similarity: {e}")
+            return None
+
+    def _similarity(self, tokens, vector, entry) -> float:
+        # Apart from neutral qualifiers both questions must have the same words in the same order
+        if [t for t in tokens if t not in NEUTRAL_TOKENS] != [t for t in entry['tokens'] if t not in NEUTRAL_TOKENS]:
+            return 0.0
+        if vector is not None and entry['vector'] is not None:
+            return _cosine(vector, entry['vector'])
+        return _token_similarity(tokens, entry['tokens'])
+
+    def _remove(self, key: tuple) -> None:
+        self._entries.pop(key, None)
+        bucket = self._buckets.get(key[:3])
+        if bucket is not None:
+            bucket.discard(key[3])
+            if not bucket:
+                del self._buckets[key[:3]]
+
+    def get(self, app_name: str, user_id: str, query: str) -> Optional[Dict[str, Any]]:
+        """Cached response for a question, with the similarity and age of the match"""
+        if not self.enabled:
+            return None
+        tokens = self._tokens(query)
+        if tokens is None:
+            return None
+        vector = self._embed(query) if self.similarity_threshold < 1 else None
+
+        with self._lock:
+            bucket_key = (app_name, user_id, self.data_version(user_id))
+            now = time.monotonic()
+            exact_key = bucket_key + (tokens,)
+            if exact_key in self._entries:
+                candidates = [exact_key]
+            elif self.similarity_threshold < 1:
+                candidates = [bucket_key + (cached,) for cached in self._buckets.get(bucket_key, ())]
+            else:
+                candidates = []
+
+            best_key, best_score = None, 0.0
+            for key in candidates:
+                entry = self._entries[key]
+                if entry['expires_at'] < now:
+                    self._remove(key)
+                    continue
+                score = 1.0 if key == exact_key else self._similarity(tokens, vector, entry)
+                if score > best_score:
+                    best_key, best_score = key, score
+
+            if best_key is None or best_score < self.similarity_threshold:
+                self.misses += 1
+                return None
+            entry = self._entries[best_key]
+
+            self._entries.move_to_end(best_key)
+            self.hits += 1
+            if best_score < 1.0:
+                self.similar_hits += 1
+            return {
+                'response': entry['response'],
+                'metadata': entry['metadata'],
+                'similarity': round(best_score, 3),
+                'age_seconds': round(now - entry['created_at'], 1),
+            }
+
+    def put(self, app_name: str, user_id: str, query: str, response: str, metadata: Optional[Dict[str, Any]] = None) -> bool:
+        """Cache a final response under the user's current data version; returns whether it was cached"""
+        if not self.enabled or not response.strip():
+            return False
+        tokens = self._tokens(query)
+        if tokens is None:
+            return False
+        vector = self._embed(query)
+
+        with self._lock:
+            bucket_key = (app_name, user_id, self.data_version(user_id))
+            key = bucket_key + (tokens,)
+            now = time.monotonic()
+            self._entries[key] = {
+                'tokens': tokens,
+                'vector': vector,
+                'response': response,
+                'metadata': metadata or {},
+                'created_at': now,
+                'expires_at': now + self.ttl,
+            }
+            self._entries.move_to_end(key)
+            self._buckets.setdefault(bucket_key, set()).add(tokens)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+        return True
+
+    def invalidate_user(self, user_id: str) -> int:
+        """Drop a user's cached responses for every app by starting a new data version"""
+        with self._lock:
+            self._versions[user_id] = self.data_version(user_id) + 1
+            for key in [k for k in self._entries if k[1] == user_id]:
+                self._remove(key)
+            self.invalidations += 1
+            return self._versions[user_id]
+
+    def clear(self) -> None:
+        """Drop every cached response"""
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache size, thresholds and hit/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            'enabled': self.enabled,
+            'size': len(self._entries),
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl,
+            'similarity_threshold': self.similarity_threshold,
+            'semantic_embeddings': self.embedder is not None,
+            'hits': self.hits,
+            'similar_hits': self.similar_hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'invalidations': self.invalidations,
+        }
+
+
+def create_embedder(model: str) -> Optional[Embedder]:
+    """
+    Query embedder backed by a Gemini / Vertex AI embedding model
+    Returns None (token similarity only) when no model is configured or google-genai is missing
+    """
+    if not model:
+        return None
+    try:
+        from google import genai
+    except ImportError:
+        logger.warning("RESPONSE_CACHE_EMBEDDING_MODEL is set but google-genai is not installed, using token similarity")
+        return None
+
+    client = genai.Client()
+
+    def embed(text: str) -> Sequence[float]:
+        result = client.models.embed_content(model=model, contents=text)
+        return result.embeddings[0].values
+
+    return embed
+
+
+def create_response_cache(config) -> SemanticResponseCache:
+    """Create the response cache from configuration; a zero TTL disables it"""
+    return SemanticResponseCache(
+        ttl=config.RESPONSE_CACHE_TTL if config.RESPONSE_CACHE_ENABLED else 0,
+        max_entries=config.RESPONSE_CACHE_MAX_ENTRIES,
+        similarity_threshold=config.RESPONSE_CACHE_SIMILARITY,
+        embedder=create_embedder(config.RESPONSE_CACHE_EMBEDDING_MODEL)
+    )
@@ -0,0 +1,70 @@
+"""
+Known-session cache for the ADK proxy
+Remembers which ADK sessions are known to exist so chat turns can skip the existence check
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable
+
+
+class KnownSessionCache:
+    """
+    Bounded, TTL-based set of ADK session keys known to exist upstream
+    Keys are (app_name, user_id, session_id) triples; the least recently used
+    entries are evicted once max_size is reached
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: float = 300):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def contains(self, key: Hashable) -> bool:
+        """Check whether a session is known to exist, refreshing its LRU position"""
+        with self._lock:
+            expires_at = self._entries.get(key)
+            if expires_at is None or expires_at < time.monotonic():
+                if expires_at is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return False
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True
+
+    def add(self, key: Hashable) -> None:
+        """Record that a session exists upstream"""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = time.monotonic() + self.ttl
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def discard(self, key: Hashable) -> None:
+        """Forget a session, e.g. after it was deleted or ADK reported it missing"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Forget all sessions"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get cache size and hit/miss counters"""
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses
+        }
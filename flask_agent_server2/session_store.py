@@ -0,0 +1,238 @@
+"""
+Session Store for the Web UI
+Keeps per-session metadata and chat history with bounded memory usage
+"""
+
+import json
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Any, Optional, List
+
+logger = logging.getLogger(__name__)
+
+
+def _compact_message(message: Dict[str, Any]) -> tuple:
+    """Convert a message dict into a compact (role, content, epoch_seconds) record"""
+    timestamp = message.get('timestamp')
+    if isinstance(timestamp, str):
+        try:
+            timestamp = datetime.fromisoformat(timestamp).timestamp()
+        except ValueError:
+            timestamp = None
+    return (message.get('role', ''), message.get('content', ''), timestamp or time.time())
+
+
+def _expand_message(record) -> Dict[str, Any]:
+    """Convert a compact message record back into the dict format used by the UI"""
+    role, content, timestamp = record
+    return {
+        'role': role,
+        'content': content,
+        'timestamp': datetime.fromtimestamp(timestamp).isoformat()
+    }
+
+
+class SessionStore(ABC):
+    """
+    Base session store interface
+    Sessions hold metadata (user_id, agent_name, created_at, context) plus a
+    capped list of chat messages
+    """
+
+    def __init__(self, max_age: int, max_messages: int):
+        self.max_age = max_age
+        self.max_messages = max_messages
+
+    @abstractmethod
+    def create(self, key: str, data: Dict[str, Any]) -> None:
+        """Create a session with the given metadata (messages are managed separately)"""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get session metadata, or None if the session does not exist or expired"""
+
+    @abstractmethod
+    def get_messages(self, key: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get the most recent messages of a session, oldest first"""
+
+    @abstractmethod
+    def append_messages(self, key: str, messages: List[Dict[str, Any]]) -> None:
+        """Append messages to an existing session, dropping the oldest beyond the cap"""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Delete a session"""
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of stored sessions"""
+
+
+class InMemorySessionStore(SessionStore):
+    """
+    Process-local session store with LRU and idle-TTL eviction
+    Sessions are ordered by last access, so expired sessions are always at the front
+    """
+
+    def __init__(self, max_sessions: int, max_age: int, max_messages: int):
+        super().__init__(max_age, max_messages)
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _evict(self, now: float) -> None:
+        """Drop idle sessions past max_age, then least recently used beyond max_sessions"""
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if now - oldest['last_access'] <= self.max_age:
+                break
+            self._sessions.popitem(last=False)
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+
+    def _touch(self, key: str, now: float) -> Optional[Dict[str, Any]]:
+        entry = self._sessions.get(key)
+        if entry is None:
+            return None
+        if now - entry['last_access'] > self.max_age:
+            del self._sessions[key]
+            return None
+        entry['last_access'] = now
+        self._sessions.move_to_end(key)
+        return entry
+
+    def create(self, key: str, data: Dict[str, Any]) -> None:
+        now = time.time()
+        metadata = {k: v for k, v in data.items() if k != 'messages'}
+        with self._lock:
+            self._sessions[key] = {
+                'metadata': metadata,
+                'messages': [],
+                'last_access': now
+            }
+            self._sessions.move_to_end(key)
+            self._evict(now)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._touch(key, time.time())
+            return dict(entry['metadata']) if entry else None
+
+    def get_messages(self, key: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            entry = self._touch(key, time.time())
+            if entry is None:
+                return []
+            records = entry['messages'][-limit:] if limit else list(entry['messages'])
+        return [_expand_message(record) for record in records]
+
+    def append_messages(self, key: str, messages: List[Dict[str, Any]]) -> None:
+        records = [_compact_message(message) for message in messages]
+        with self._lock:
+            entry = self._touch(key, time.time())
+            if entry is None:
+                return
+            entry['messages'].extend(records)
+            overflow = len(entry['messages']) - self.max_messages
+            if overflow > 0:
+                del entry['messages'][:overflow]
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._sessions.pop(key, None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._evict(time.time())
+            return len(self._sessions)
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Redis-backed session store shared across server processes
+    Each session uses a metadata key and a capped message list, both expiring
+    after max_age of inactivity; memory-wide LRU is left to Redis' maxmemory policy
+    """
+
+    KEY_PREFIX = 'web_session'
+
+    def __init__(self, redis_url: str, max_age: int, max_messages: int):
+        super().__init__(max_age, max_messages)
+        import redis
+        self.redis = redis.Redis.from_url(redis_url, decode_responses=True)
+
+    def _meta_key(self, key: str) -> str:
+        return f"{self.KEY_PREFIX}:{key}:meta"
+
+    def _messages_key(self, key: str) -> str:
+        return f"{self.KEY_PREFIX}:{key}:messages"
+
+    def _refresh_ttl(self, pipe, key: str) -> None:
+        pipe.expire(self._meta_key(key), self.max_age)
+        pipe.expire(self._messages_key(key), self.max_age)
+
+    def create(self, key: str, data: Dict[str, Any]) -> None:
+        metadata = {k: v for k, v in data.items() if k != 'messages'}
+        pipe = self.redis.pipeline()
+        pipe.set(self._meta_key(key), json.dumps(metadata), ex=self.max_age)
+        pipe.delete(self._messages_key(key))
+        pipe.execute()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        pipe = self.redis.pipeline()
+        pipe.get(self._meta_key(key))
+        self._refresh_ttl(pipe, key)
+        raw = pipe.execute()[0]
+        return json.loads(raw) if raw else None
+
+    def get_messages(self, key: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        start = -limit if limit else 0
+        records = self.redis.lrange(self._messages_key(key), start, -1)
+        return [_expand_message(json.loads(record)) for record in records]
+
+    def append_messages(self, key: str, messages: List[Dict[str, Any]]) -> None:
+        if not messages or not self.redis.exists(self._meta_key(key)):
+            return
+        records = [json.dumps(_compact_message(message)) for message in messages]
+        pipe = self.redis.pipeline()
+        pipe.rpush(self._messages_key(key), *records)
+        pipe.ltrim(self._messages_key(key), -self.max_messages, -1)
+        self._refresh_ttl(pipe, key)
+        pipe.execute()
+
+    def delete(self, key: str) -> None:
+        self.redis.delete(self._meta_key(key), self._messages_key(key))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.redis.scan_iter(match=f"{self.KEY_PREFIX}:*:meta", count=1000))
+
+
+def create_session_store(config) -> SessionStore:
+    """
+    Create the session store selected by configuration
+    Uses Redis when REDIS_URL is set and the redis package is available
+    """
+    if config.REDIS_URL:
+        try:
+            store = RedisSessionStore(
+                config.REDIS_URL,
+                max_age=config.MAX_SESSION_AGE,
+                max_messages=config.MAX_MESSAGES_PER_SESSION
+            )
+            logger.info("Using Redis session store")
+            return store
+        except ImportError:
+            logger.warning("REDIS_URL is set but the redis package is not installed, using in-memory sessions")
+
+    return InMemorySessionStore(
+        max_sessions=config.MAX_SESSIONS,
+        max_age=config.MAX_SESSION_AGE,
+        max_messages=config.MAX_MESSAGES_PER_SESSION
+    )
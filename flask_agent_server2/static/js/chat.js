@@ -6,6 +6,7 @@
 let socket = null;
 let isConnected = false;
 let currentTheme = localStorage.getItem('theme') || 'light';
+let streamingMessage = null;
 
 // Initialize chat application
 function initializeChat() {
@@ -93,7 +94,12 @@ function initializeSocket() {
         }
     });
     
+    socket.on('agent_response_chunk', (data) => {
+        appendStreamingChunk(data.chunk);
+    });
+    
     socket.on('agent_response', (data) => {
+        clearStreamingMessage();
         addMessage(data.response, 'assistant', data.timestamp);
         hideTypingIndicator();
     });
@@ -107,6 +113,7 @@ function initializeSocket() {
     });
     
     socket.on('agent_error', (data) => {
+        clearStreamingMessage();
         addMessage(`Error: ${data.error}`, 'error');
         hideTypingIndicator();
     });
@@ -249,6 +256,31 @@ function addMessage(content, type, timestamp = null) {
     scrollToBottom();
 }
 
+// Append partial agent text to an in-progress message bubble
+function appendStreamingChunk(chunk) {
+    if (!streamingMessage) {
+        hideTypingIndicator();
+        addMessage('', 'assistant');
+        const messages = document.querySelectorAll('#chatMessages .assistant-message');
+        streamingMessage = {
+            element: messages[messages.length - 1],
+            text: ''
+        };
+    }
+    
+    streamingMessage.text += chunk;
+    streamingMessage.element.querySelector('.message-body').innerHTML = marked.parse(streamingMessage.text);
+    scrollToBottom();
+}
+
+// Remove the in-progress bubble once the final response arrives
+function clearStreamingMessage() {
+    if (streamingMessage) {
+        streamingMessage.element.remove();
+        streamingMessage = null;
+    }
+}
+
 // Show typing indicator
 function showTypingIndicator() {
     document.getElementById('typingIndicator').style.display = 'flex';
@@ -4,51 +4,45 @@
 
 let timelineData = null;
 let currentNodeHover = null;
+let timelineSocket = null;
 
 // Initialize timeline on page load
-async function initializeTimeline() {
-    try {
-        // Show loading state
-        showLoading();
+function initializeTimeline() {
+    // Show loading state
+    showLoading();
+    
+    if (typeof io === 'undefined') {
+        // Socket.IO client unavailable - fall back to polling
+        pollParallelUniverseData();
+        return;
+    }
+    
+    if (!timelineSocket) {
+        timelineSocket = io({
+            transports: ['websocket', 'polling'],
+            reconnection: true,
+        });
         
-        // Fetch parallel universe data
+        // The server pushes job progress and the final result to this user's room;
+        // re-join on every (re)connect so updates resume after a dropped connection
+        timelineSocket.on('connect', () => {
+            timelineSocket.emit('join_timeline');
+        });
+        timelineSocket.on('parallel_universe_update', handleAnalysisUpdate);
+    } else if (timelineSocket.connected) {
+        // Ask for the current state again (e.g. after triggering a new analysis)
+        timelineSocket.emit('join_timeline');
+    }
+}
+
+// Polling fallback used only when Socket.IO is not available
+async function pollParallelUniverseData() {
+    try {
         const response = await fetch('/api/parallel-universe-data');
         const result = await response.json();
         
-        console.log('API Response:', result);
-        
-        if (result.status === 'completed' && result.data) {
-            // Check if data has the expected structure
-            if (result.data.parallel_universe_analysis) {
-                timelineData = result.data.parallel_universe_analysis;
-            } else {
-                timelineData = result.data;
-            }
-            
-            console.log('Timeline Data:', timelineData);
-            
-            // Verify required data exists
-            if (timelineData.financial_timeline && timelineData.alternative_universes) {
-                renderTimeline();
-                hideLoading();
-                showMainContent();
-            } else {
-                console.error('Invalid data structure:', timelineData);
-                showError('Invalid data format received from analysis');
-            }
-        } else if (result.status === 'pending' || result.status === 'processing') {
-            // Show processing message
-            document.querySelector('.loading-text').textContent = 
-                'Processing your financial data... This may take a moment.';
-            // Retry after a delay
-            setTimeout(initializeTimeline, 3000);
-        } else if (result.status === 'error') {
-            showError(result.error || 'Failed to load timeline data');
-        } else {
-            // If no analysis has been started, show the trigger button
-            document.querySelector('.loading-text').textContent = 
-                'No analysis found. Click below to start.';
-            document.getElementById('loadingRetryButton').style.display = 'inline-flex';
+        if (handleAnalysisUpdate(result)) {
+            setTimeout(pollParallelUniverseData, 3000);
         }
     } catch (error) {
         console.error('Error loading timeline:', error);
@@ -56,6 +50,50 @@ async function initializeTimeline() {
     }
 }
 
+// Apply a parallel universe analysis update; returns true while the analysis is still running
+function handleAnalysisUpdate(result) {
+    console.log('Analysis update:', result);
+    
+    if (result.status === 'completed' && result.data) {
+        // Check if data has the expected structure
+        if (result.data.parallel_universe_analysis) {
+            timelineData = result.data.parallel_universe_analysis;
+        } else {
+            timelineData = result.data;
+        }
+        
+        console.log('Timeline Data:', timelineData);
+        
+        // Verify required data exists
+        if (timelineData.financial_timeline && timelineData.alternative_universes) {
+            renderTimeline();
+            hideLoading();
+            showMainContent();
+        } else {
+            console.error('Invalid data structure:', timelineData);
+            showError('Invalid data format received from analysis');
+        }
+        return false;
+    }
+    
+    if (result.status === 'pending' || result.status === 'processing') {
+        // Show processing message until the server pushes the result
+        document.querySelector('.loading-text').textContent = 
+            result.progress || 'Processing your financial data... This may take a moment.';
+        return true;
+    }
+    
+    if (result.status === 'error') {
+        showError(result.error || 'Failed to load timeline data');
+    } else {
+        // If no analysis has been started, show the trigger button
+        document.querySelector('.loading-text').textContent = 
+            'No analysis found. Click below to start.';
+        document.getElementById('loadingRetryButton').style.display = 'inline-flex';
+    }
+    return false;
+}
+
 // Load test data for debugging
 function loadTestData() {
     timelineData = {
@@ -179,7 +217,7 @@ async function triggerNewAnalysis() {
         });
         
         if (response.ok) {
-            setTimeout(initializeTimeline, 2000);
+            initializeTimeline();
         } else {
             showError('Failed to start analysis. Please try again.');
         }
@@ -16,24 +16,40 @@
 
 from google.adk.agents import LlmAgent
 from google.adk.tools.agent_tool import AgentTool
-from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset, StdioServerParameters
 
 from . import prompt
+from .execution_plan import build_execution_plan
+from .fi_mcp import get_fi_mcp_toolset, refresh_fi_mcp_data, scope_fi_mcp_cache
 
 # Direct imports from sub-agent modules
 from .sub_agents.tax_analyzer.agent import tax_analyzer_agent
 from .sub_agents.deduction_optimizer.agent import deduction_optimizer_agent
 from .sub_agents.tax_planner.agent import tax_planner_agent
 from .sub_agents.tax_scenario_modeler.agent import tax_scenario_modeler_agent
+from .context_cache import record_context_cache_usage, use_context_cache
+from .history_compaction import compact_history
+from .model_router import model_for, route_model
+from .prompt_registry import register_prompt
 
-MODEL = "gemini-2.5-pro"
+MODEL = model_for("tax_advisor_coordinator")
 
-# Fi MCP toolset for accessing financial data for tax calculations
-fi_mcp_toolset = MCPToolset(
-    connection_params=StdioServerParameters(
-        command="npx",
-        args=["mcp-remote", "https://fi-mcp-dev-56426154949.us-central1.run.app/mcp/stream"]
-    )
+# Fi MCP toolset for accessing financial data for tax calculations (shared connection pool)
+fi_mcp_toolset = get_fi_mcp_toolset()
+
+# Full review: the analyzer and deduction optimizer only need Fi MCP data and run together,
+# then the planner and scenario modeler run together on their outputs
+full_tax_review_agent = build_execution_plan(
+    name="full_tax_review_agent",
+    description=(
+        "Runs a complete tax review: tax analysis and deduction discovery concurrently, then "
+        "strategic planning and scenario analysis concurrently on their results. Returns all "
+        "four outputs with per-stage timings."
+    ),
+    agents=[tax_analyzer_agent, deduction_optimizer_agent, tax_planner_agent, tax_scenario_modeler_agent],
+    depends_on={
+        tax_planner_agent.name: [tax_analyzer_agent.name, deduction_optimizer_agent.name],
+        tax_scenario_modeler_agent.name: [tax_analyzer_agent.name, deduction_optimizer_agent.name],
+    },
 )
 
 tax_advisor_coordinator = LlmAgent(
@@ -45,15 +61,21 @@ tax_advisor_coordinator = LlmAgent(
         "Delivers calculated, evidence-based recommendations for tax regime selection, "
         "deduction optimization, and strategic tax planning with transparent methodology."
     ),
-    instruction=prompt.TAX_ADVISOR_COORDINATOR_PROMPT,
+    instruction=register_prompt("tax_advisor_coordinator", prompt.TAX_ADVISOR_COORDINATOR_PROMPT),
     output_key="tax_advisor_coordinator_output",
+    before_agent_callback=scope_fi_mcp_cache,  # Lets sub-agents share this user's cached Fi MCP data
     tools=[
         fi_mcp_toolset,  # Direct access to Fi MCP for financial data
+        refresh_fi_mcp_data,
+        AgentTool(agent=full_tax_review_agent),  # All four teams in two concurrent stages
         AgentTool(agent=tax_analyzer_agent),
         AgentTool(agent=deduction_optimizer_agent),
         AgentTool(agent=tax_planner_agent),
         AgentTool(agent=tax_scenario_modeler_agent),
     ],
+    # Digest of older turns, then model choice, then the static prefix swapped for its cache handle
+    before_model_callback=[compact_history, route_model, use_context_cache],
+    after_model_callback=record_context_cache_usage,
 )
 
 root_agent = tax_advisor_coordinator 
\ No newline at end of file
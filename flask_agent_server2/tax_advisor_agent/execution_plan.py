@@ -0,0 +1,112 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Dependency-aware execution plan for the tax advisor sub-agents"""
+
+import logging
+import time
+from typing import Any, AsyncGenerator, Dict, List, Optional
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events.event import Event, EventActions
+from google.genai import types
+
+from .fanout import create_fanout_agent, format_outputs
+
+logger = logging.getLogger(__name__)
+
+# State key holding the per-stage timings of the latest plan run
+TIMINGS_STATE_KEY = "tax_execution_timings"
+
+
+class ExecutionPlanAgent(BaseAgent):
+    """
+    Runs its fan-out stages in order
+    Each stage's merged output event is the handoff the next stage's agents (which run in
+    their own branches) read; the final event carries every output and the stage timings
+    """
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        timings: List[Dict[str, Any]] = []
+        plan_started = time.perf_counter()
+
+        for number, stage in enumerate(self.sub_agents, start=1):
+            started = time.perf_counter()
+            async for event in stage.run_async(ctx):
+                yield event
+            timings.append({
+                "stage": number,
+                "agents": stage.branch_names,
+                "seconds": round(time.perf_counter() - started, 2),
+            })
+
+        total = round(time.perf_counter() - plan_started, 2)
+        logger.info(f"{self.name} finished in {total}s ({len(timings)} stages)")
+        keys = [key for stage in self.sub_agents for key in stage.output_keys]
+        text = format_outputs(ctx.session.state, keys)
+        text += "\n\n## Execution timings\n" + self.format_timings(timings, total)
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=text)]),
+            actions=EventActions(state_delta={TIMINGS_STATE_KEY: timings}),
+        )
+
+    @staticmethod
+    def format_timings(timings: List[Dict[str, Any]], total: Optional[float] = None) -> str:
+        lines = [f"- Stage {t['stage']} ({', '.join(t['agents'])}): {t['seconds']}s" for t in timings]
+        if total is not None:
+            lines.append(f"- Total: {total}s")
+        return "\n".join(lines)
+
+
+def build_execution_plan(
+    name: str,
+    description: str,
+    agents: List[BaseAgent],
+    depends_on: Optional[Dict[str, List[str]]] = None,
+) -> ExecutionPlanAgent:
+    """
+    Group agents into fan-out stages by dependency depth: an agent runs in the first stage
+    after every agent it depends on, and agents sharing a stage run concurrently
+    """
+    depends_on = depends_on or {}
+    by_name = {agent.name: agent for agent in agents}
+    unknown = {dep for deps in depends_on.values() for dep in deps} | set(depends_on)
+    unknown -= set(by_name)
+    if unknown:
+        raise ValueError(f"Unknown agents in execution plan: {sorted(unknown)}")
+
+    depth: Dict[str, int] = {}
+    while len(depth) < len(agents):
+        ready = [
+            agent.name for agent in agents
+            if agent.name not in depth and all(dep in depth for dep in depends_on.get(agent.name, []))
+        ]
+        if not ready:
+            raise ValueError(f"Circular dependencies between {sorted(set(by_name) - set(depth))}")
+        for agent_name in ready:
+            depth[agent_name] = 1 + max((depth[dep] for dep in depends_on.get(agent_name, [])), default=-1)
+
+    stages = [
+        create_fanout_agent(
+            f"{name}_stage_{level + 1}",
+            f"Stage {level + 1} of {name}",
+            [agent for agent in agents if depth[agent.name] == level],
+        )
+        for level in range(max(depth.values()) + 1)
+    ]
+    return ExecutionPlanAgent(name=name, description=description, sub_agents=stages)
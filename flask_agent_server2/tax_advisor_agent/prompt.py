@@ -66,6 +66,7 @@ Your analysis leverages comprehensive financial data including:
 - **Transaction History**: Bank transactions with detailed narrations and spending patterns
 - **Investment Data**: Mutual fund transactions, EPF contribution details, portfolio allocation
 - **Account Information**: Banking relationships and financial institution connections
+- **Data Freshness**: Fi MCP responses are cached and shared with your analysis teams; call refresh_fi_mcp_data only when the user reports changed accounts or explicitly asks for fresh data
 
 **Analysis Teams**: Your specialized analysis teams have access to current tax regulations and policy updates through web search, ensuring recommendations reflect the latest tax laws and calculation methods.
 
@@ -73,6 +74,9 @@ Analysis Process:
 
 You coordinate 4 specialized analysis teams in a structured process:
 
+**Full Tax Review (Team: full_tax_review_agent)**:
+For a complete tax review, or any query that needs all four teams, call full_tax_review_agent once instead of calling the teams one after another. It runs tax_analyzer and deduction_optimizer concurrently (both work from Fi MCP data), then tax_planner and tax_scenario_modeler concurrently on their results. It returns all four outputs plus per-stage execution timings. Call an individual team only when the query needs just that team (for example a single what-if question).
+
 **Step 1: Financial Tax Analysis (Team: tax_analyzer)**
 - Input: Complete Fi MCP financial data (transactions, EPF, investments, net worth)
 - Action: Comprehensive baseline tax analysis with regime selection recommendation
@@ -0,0 +1,143 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Registry of agent instruction prompts: token counts, budgets and query-dependent sections"""
+
+import logging
+import re
+from typing import Any, Callable, Dict, List, NamedTuple, Sequence, Tuple, Union
+
+from google.adk.agents.readonly_context import ReadonlyContext
+
+logger = logging.getLogger(__name__)
+
+# Instruction token budget per agent, checked at registration and enforced by test_prompt_registry.py
+# For agents with sections the budget applies to the full prompt (every section included)
+PROMPT_TOKEN_BUDGETS: Dict[str, int] = {
+    "financial_analysis_coordinator": 2800,
+    "financial_analyzer_agent": 1600,
+    "financial_health_score_agent": 1900,
+    "future_simulator_agent": 2000,
+    "scenario_modeler_agent": 2500,
+    "timeline_predictor_agent": 3000,
+    "tax_advisor_coordinator": 3400,
+    "tax_analyzer_agent": 2200,
+    "deduction_optimizer_agent": 2300,
+    "tax_planner_agent": 3300,
+    "tax_scenario_modeler_agent": 4600,
+    "insight_synthesizer_agent": 2400,
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough Gemini token count (about four characters per token)"""
+    return (len(text) + 3) // 4
+
+
+class PromptSection(NamedTuple):
+    """Optional block of a prompt, included when the query mentions one of its keywords"""
+    name: str
+    text: str
+    keywords: Tuple[str, ...]
+
+
+def _query_text(context: ReadonlyContext) -> str:
+    """Text of the message that started this run (the coordinator's request for AgentTool sub-agents)"""
+    content = context.user_content
+    if not content or not content.parts:
+        return ""
+    return " ".join(part.text for part in content.parts if part.text)
+
+
+class RegisteredPrompt:
+    """
+    An agent's instruction, measured once at registration
+    The sent prompt is base + the sections the query needs + closing; a query that matches
+    no section keyword gets every section
+    """
+
+    def __init__(self, agent_name: str, base: str, sections: Sequence[PromptSection] = (), closing: str = ""):
+        self.agent_name = agent_name
+        self.base = base
+        self.sections = list(sections)
+        self.closing = closing
+        self.budget = PROMPT_TOKEN_BUDGETS.get(agent_name)
+        self._patterns = {
+            section.name: re.compile("|".join(r"\b" + re.escape(keyword) for keyword in section.keywords))
+            for section in self.sections
+        }
+        self.base_tokens = estimate_tokens(base + closing)
+        self.section_tokens = {section.name: estimate_tokens(section.text) for section in self.sections}
+        self.full_text = self.compose([section.name for section in self.sections])
+        self.full_tokens = estimate_tokens(self.full_text)
+        self.calls = 0
+        self.tokens_sent = 0
+
+    def select_sections(self, query: str) -> List[str]:
+        lowered = query.lower()
+        matched = [section.name for section in self.sections if self._patterns[section.name].search(lowered)]
+        return matched or [section.name for section in self.sections]
+
+    def compose(self, section_names: Sequence[str]) -> str:
+        selected = "".join(section.text for section in self.sections if section.name in section_names)
+        return self.base + selected + self.closing
+
+    def instruction(self, context: ReadonlyContext) -> str:
+        """InstructionProvider for the agent"""
+        names = self.select_sections(_query_text(context))
+        text = self.compose(names)
+        self.calls += 1
+        self.tokens_sent += estimate_tokens(text)
+        logger.debug(f"{self.agent_name} prompt sections {names}: ~{estimate_tokens(text)} of {self.full_tokens} tokens")
+        return text
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "agent": self.agent_name,
+            "budget": self.budget,
+            "full_tokens": self.full_tokens,
+            "base_tokens": self.base_tokens,
+            "section_tokens": dict(self.section_tokens),
+            "calls": self.calls,
+            "average_tokens_sent": round(self.tokens_sent / self.calls) if self.calls else None,
+        }
+
+
+_registry: Dict[str, RegisteredPrompt] = {}
+
+
+def register_prompt(
+    agent_name: str,
+    base: str,
+    sections: Sequence[PromptSection] = (),
+    closing: str = "",
+) -> Union[str, Callable[[ReadonlyContext], str]]:
+    """
+    Register an agent's prompt and return its instruction: the prompt itself, or a provider
+    that assembles the sections the query needs
+    """
+    registered = RegisteredPrompt(agent_name, base, sections, closing)
+    _registry[agent_name] = registered
+    if registered.budget and registered.full_tokens > registered.budget:
+        logger.warning(f"{agent_name} prompt is ~{registered.full_tokens} tokens, over its {registered.budget} budget")
+    return registered.instruction if registered.sections else registered.full_text
+
+
+def registered_prompts() -> Dict[str, RegisteredPrompt]:
+    return dict(_registry)
+
+
+def prompt_report() -> List[Dict[str, Any]]:
+    """Token counts and usage of every registered prompt, largest first"""
+    return sorted((prompt.report() for prompt in _registry.values()), key=lambda r: -r["full_tokens"])
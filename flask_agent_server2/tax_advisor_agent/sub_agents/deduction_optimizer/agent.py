@@ -15,25 +15,23 @@
 """Deduction Optimizer Agent - Maximizing Tax Deductions and Exemptions"""
 
 from google.adk import Agent
-from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset, StdioServerParameters
 from google.adk.tools import google_search
 from google.adk.tools.agent_tool import AgentTool
 
 from . import prompt
+from .allocator import optimize_deduction_allocation
+from ...fi_mcp import get_fi_mcp_toolset
+from ...model_router import model_for, route_model
+from ...prompt_registry import register_prompt
 
-MODEL = "gemini-2.5-pro"
+MODEL = model_for("deduction_optimizer_agent")
 
-# Fi MCP toolset for financial data access
-fi_mcp_toolset = MCPToolset(
-    connection_params=StdioServerParameters(
-        command="npx",
-        args=["mcp-remote", "https://fi-mcp-dev-56426154949.us-central1.run.app/mcp/stream"]
-    )
-)
+# Fi MCP toolset for financial data access (shared connection pool)
+fi_mcp_toolset = get_fi_mcp_toolset()
 
 # Wrap google_search in AgentTool for compatibility
 search_agent = Agent(
-    model="gemini-2.5-flash",
+    model=model_for("deduction_search_agent"),
     name="deduction_search_agent",
     instruction="You're a specialist in tax deduction and exemption related Google Search.",
     tools=[google_search],
@@ -49,7 +47,8 @@ deduction_optimizer_agent = Agent(
         "from available financial data and investment patterns with access to "
         "current tax regulations and deduction rules."
     ),
-    instruction=prompt.DEDUCTION_OPTIMIZER_PROMPT,
+    instruction=register_prompt("deduction_optimizer_agent", prompt.DEDUCTION_OPTIMIZER_PROMPT),
     output_key="deduction_optimizer_output",
-    tools=[fi_mcp_toolset, search_tool],  # Now both are compatible tool types
+    tools=[fi_mcp_toolset, optimize_deduction_allocation, search_tool],
+    before_model_callback=route_model,
 ) 
\ No newline at end of file
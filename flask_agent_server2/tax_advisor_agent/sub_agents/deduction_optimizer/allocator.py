@@ -0,0 +1,356 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Deduction Allocation Optimizer
+Allocates investable cash across tax-saving instruments to minimise old regime tax under section caps and liquidity limits
+"""
+
+import json
+import logging
+import math
+import sys
+from typing import Any, Dict, List, Optional
+
+from ...tax_engine import DEFAULT_ASSESSMENT_YEAR, IncomeTaxEngine, TaxInputError, tax_engine
+
+logger = logging.getLogger(__name__)
+
+# Section caps for cash-funded deductions; 80D doubles for senior citizens
+SECTION_LIMITS = {
+    '80C': 150_000,
+    '80CCD(1B)': 50_000,
+    '80D_self': 25_000,
+    '80D_parents': 25_000,
+}
+SENIOR_80D_LIMIT = 50_000
+NPS_LOCK_IN_AGE = 60
+ALLOCATION_STEP = 100  # Recommended amounts are whole multiples of ₹100
+
+# Instruments in order of preference when lock-in is equal
+INSTRUMENTS = {
+    'health_insurance_self': {'section': '80D_self', 'lock_in_years': 0,
+                              'label': 'Health insurance premium (self/family)'},
+    'health_insurance_parents': {'section': '80D_parents', 'lock_in_years': 0,
+                                 'label': 'Health insurance premium (parents)'},
+    'elss': {'section': '80C', 'lock_in_years': 3, 'label': 'ELSS mutual funds'},
+    'tax_saver_fd': {'section': '80C', 'lock_in_years': 5, 'label': 'Tax-saver fixed deposit'},
+    'ppf': {'section': '80C', 'lock_in_years': 15, 'label': 'Public Provident Fund'},
+    'nps': {'section': '80CCD(1B)', 'lock_in_years': None, 'label': 'NPS Tier I (additional)'},
+}
+
+# Engine field that each section's total is reported under
+_ENGINE_FIELDS = {
+    '80C': 'section_80c',
+    '80CCD(1B)': 'section_80ccd_1b',
+    '80D_self': 'section_80d',
+    '80D_parents': 'section_80d',
+}
+
+_EXISTING_FIELDS = {
+    '80C': 'existing_80c',
+    '80CCD(1B)': 'existing_80ccd_1b',
+    '80D_self': 'existing_80d_self',
+    '80D_parents': 'existing_80d_parents',
+}
+
+
+class AllocationError(Exception):
+    """Custom exception for invalid allocation inputs"""
+    pass
+
+
+class DeductionAllocator:
+    """
+    Greedy allocator over section caps
+    Every cash-funded rupee deducts one rupee and tax depends only on the total, so filling the
+    most liquid instruments first maximises deductions within the caps (the LP optimum). The
+    allocation then stops at the smallest amount that reaches the minimum tax, so no cash is
+    locked away for deductions that save nothing (e.g. below the 87A rebate limit)
+    """
+
+    def __init__(self, engine: Optional[IncomeTaxEngine] = None):
+        self.engine = engine or tax_engine
+
+    def optimize(self, profile: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Optimise one profile
+        profile: gross_salary, available_cash and optionally other_income, existing_80c,
+                 existing_80ccd_1b, existing_80d_self, existing_80d_parents, education_loan_interest,
+                 home_loan_interest, hra_exemption, liquidity_reserve, max_lock_in_years (None for
+                 no limit), age, parents_senior_citizens, assessment_year, user_id
+        """
+        profile = self._validate(profile)
+        age = profile['age']
+        assessment_year = profile['assessment_year']
+
+        capacities = self._capacities(profile)
+        investable = max(0.0, profile['available_cash'] - profile['liquidity_reserve'])
+
+        def old_tax(cash: float) -> int:
+            return self.engine.compute_tax(
+                self._engine_income(profile, self._fill(capacities, cash)), 'old', assessment_year, age
+            )['total_tax']
+
+        total_capacity = sum(capacity for _, capacity in capacities)
+        max_cash = min(investable, total_capacity)
+        tax_before = old_tax(0)
+        tax_at_max = old_tax(max_cash)
+
+        # Smallest step-multiple reaching the minimum tax (tax is non-increasing in cash)
+        low, high = -1, math.ceil(max_cash / ALLOCATION_STEP)
+        while high - low > 1:
+            mid = (low + high) // 2
+            if old_tax(min(mid * ALLOCATION_STEP, max_cash)) <= tax_at_max:
+                high = mid
+            else:
+                low = mid
+        optimal_cash = float(min(high * ALLOCATION_STEP, max_cash))
+
+        allocation = []
+        running_tax = tax_before
+        allocated = 0.0
+        for name, amount in self._fill(capacities, optimal_cash).items():
+            if amount <= 0:
+                continue
+            allocated += amount
+            tax_after = old_tax(allocated)
+            instrument = INSTRUMENTS[name]
+            allocation.append({
+                'instrument': name,
+                'label': instrument['label'],
+                'section': instrument['section'],
+                'amount': round(amount, 2),
+                'lock_in_years': self._lock_in(instrument, age),
+                'tax_saved': running_tax - tax_after,
+                'tax_saved_per_rupee': round((running_tax - tax_after) / amount, 4),
+            })
+            running_tax = tax_after
+
+        tax_after = old_tax(optimal_cash)
+        new_tax = self.engine.compute_tax(
+            self._engine_income(profile, {}), 'new', assessment_year, age
+        )['total_tax']
+        recommended = 'new' if new_tax <= tax_after else 'old'
+
+        # Value of the next ₹1,000 of deduction beyond the plan, if any section capacity is left
+        headroom = min(1_000.0, total_capacity - optimal_cash)
+        next_saving = (tax_after - old_tax(optimal_cash + headroom)) / headroom if headroom > 0 else 0.0
+
+        result = {
+            'status': 'success',
+            'assessment_year': assessment_year,
+            'investable_cash': round(investable, 2),
+            'allocation': allocation,
+            'total_allocated': round(optimal_cash, 2),
+            'unallocated_cash': round(investable - optimal_cash, 2),
+            'remaining_capacity': {
+                section: round(capacity, 2)
+                for section, capacity in self._remaining_by_section(capacities, optimal_cash).items()
+            },
+            'old_regime_tax_before': tax_before,
+            'old_regime_tax_after': tax_after,
+            'tax_saved': tax_before - tax_after,
+            'tax_saved_per_rupee': round((tax_before - tax_after) / optimal_cash, 4) if optimal_cash else 0.0,
+            'marginal_tax_saved_per_rupee': round(next_saving, 4),
+            'new_regime_tax': new_tax,
+            'recommended_regime': recommended,
+        }
+        if recommended == 'new':
+            result['note'] = (
+                'The new regime is cheaper even after this allocation, so these investments '
+                'only reduce tax if the old regime is chosen'
+            )
+        if profile.get('user_id') is not None:
+            result['user_id'] = profile['user_id']
+        return result
+
+    def optimize_batch(self, profiles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Optimise many profiles; invalid ones return an error result instead of stopping the batch"""
+        results = []
+        for profile in profiles:
+            try:
+                results.append(self.optimize(profile))
+            except (AllocationError, TaxInputError) as e:
+                results.append({'status': 'error', 'error_message': str(e), 'user_id': profile.get('user_id')})
+        return results
+
+    def _validate(self, profile: Dict[str, Any]) -> Dict[str, Any]:
+        for field in ('gross_salary', 'available_cash'):
+            if field not in profile:
+                raise AllocationError(f"Missing required field: {field}")
+
+        clean = dict(profile)
+        for field in ('gross_salary', 'available_cash', 'other_income', 'existing_80c', 'existing_80ccd_1b',
+                      'existing_80d_self', 'existing_80d_parents', 'education_loan_interest',
+                      'home_loan_interest', 'hra_exemption', 'liquidity_reserve'):
+            value = float(profile.get(field) or 0.0)
+            if value < 0:
+                raise AllocationError(f"{field} cannot be negative")
+            clean[field] = value
+        clean['age'] = int(profile.get('age', 30))
+        clean['max_lock_in_years'] = profile.get('max_lock_in_years') or None
+        clean['parents_senior_citizens'] = bool(profile.get('parents_senior_citizens', False))
+        clean['assessment_year'] = profile.get('assessment_year') or DEFAULT_ASSESSMENT_YEAR
+        return clean
+
+    @staticmethod
+    def _lock_in(instrument: Dict[str, Any], age: int) -> int:
+        if instrument['lock_in_years'] is None:
+            return max(0, NPS_LOCK_IN_AGE - age)
+        return instrument['lock_in_years']
+
+    def _capacities(self, profile: Dict[str, Any]) -> List[tuple]:
+        """(instrument, capacity) in fill order; instruments sharing a section share its remaining cap"""
+        limits = dict(SECTION_LIMITS)
+        if profile['age'] >= 60:
+            limits['80D_self'] = SENIOR_80D_LIMIT
+        if profile['parents_senior_citizens']:
+            limits['80D_parents'] = SENIOR_80D_LIMIT
+        remaining = {
+            section: max(0.0, limit - profile[_EXISTING_FIELDS[section]]) for section, limit in limits.items()
+        }
+
+        allowed = [
+            (self._lock_in(instrument, profile['age']), index, name)
+            for index, (name, instrument) in enumerate(INSTRUMENTS.items())
+            if profile['max_lock_in_years'] is None
+            or self._lock_in(instrument, profile['age']) <= profile['max_lock_in_years']
+        ]
+        capacities = []
+        for _, _, name in sorted(allowed):
+            section = INSTRUMENTS[name]['section']
+            capacities.append((name, remaining[section]))
+            remaining[section] = 0.0  # later instruments only matter through the cash limit
+        return capacities
+
+    @staticmethod
+    def _fill(capacities: List[tuple], cash: float) -> Dict[str, float]:
+        allocation = {}
+        for name, capacity in capacities:
+            amount = min(capacity, cash)
+            allocation[name] = amount
+            cash -= amount
+        return allocation
+
+    @staticmethod
+    def _remaining_by_section(capacities: List[tuple], cash: float) -> Dict[str, float]:
+        remaining = {}
+        allocation = DeductionAllocator._fill(capacities, cash)
+        for name, capacity in capacities:
+            section = INSTRUMENTS[name]['section']
+            remaining[section] = remaining.get(section, 0.0) + capacity - allocation[name]
+        return remaining
+
+    @staticmethod
+    def _engine_income(profile: Dict[str, Any], allocation: Dict[str, float]) -> Dict[str, float]:
+        income = {
+            'gross_salary': profile['gross_salary'],
+            'other_income': profile['other_income'],
+            'hra_exemption': profile['hra_exemption'],
+            'home_loan_interest': profile['home_loan_interest'],
+            'other_deductions': profile['education_loan_interest'],  # 80E has no cap
+        }
+        for section, field in _ENGINE_FIELDS.items():
+            income[field] = income.get(field, 0.0) + profile[_EXISTING_FIELDS[section]]
+        for name, amount in allocation.items():
+            field = _ENGINE_FIELDS[INSTRUMENTS[name]['section']]
+            income[field] += amount
+        return income
+
+
+# Global allocator instance
+deduction_allocator = DeductionAllocator()
+
+
+def optimize_deduction_allocation(
+    gross_salary: float,
+    available_cash: float,
+    other_income: float = 0.0,
+    existing_80c: float = 0.0,
+    existing_80ccd_1b: float = 0.0,
+    existing_80d_self: float = 0.0,
+    existing_80d_parents: float = 0.0,
+    education_loan_interest: float = 0.0,
+    home_loan_interest: float = 0.0,
+    hra_exemption: float = 0.0,
+    liquidity_reserve: float = 0.0,
+    max_lock_in_years: int = 0,
+    age: int = 30,
+    parents_senior_citizens: bool = False,
+    assessment_year: str = DEFAULT_ASSESSMENT_YEAR,
+) -> Dict[str, Any]:
+    """Finds the allocation of cash across tax-saving instruments that minimises tax.
+
+    Covers 80C (ELSS, tax-saver FD, PPF), 80CCD(1B) NPS and 80D premiums, with 80E and 24(b)
+    interest claimed in full. Amounts are yearly, in rupees. Take existing_80c from the
+    employee EPF contributions in Fi MCP EPF data plus any premiums or ELSS found in transactions.
+
+    Args:
+        gross_salary: Gross salary before the standard deduction.
+        available_cash: Cash the user could invest this financial year.
+        other_income: Other income taxed at slab rates.
+        existing_80c: 80C already used (employee EPF, life insurance, ELSS, principal repayment).
+        existing_80ccd_1b: Own NPS contributions already made under 80CCD(1B).
+        existing_80d_self: Health insurance premiums already paid for self/family.
+        existing_80d_parents: Health insurance premiums already paid for parents.
+        education_loan_interest: Education loan interest paid this year (80E).
+        home_loan_interest: Self-occupied home loan interest paid this year (24(b)).
+        hra_exemption: HRA exemption under Section 10(13A).
+        liquidity_reserve: Cash that must stay liquid and is never allocated.
+        max_lock_in_years: Longest lock-in the user accepts, 0 for no limit (NPS locks until
+            age 60, PPF for 15 years, tax-saver FD for 5 and ELSS for 3).
+        age: Taxpayer age.
+        parents_senior_citizens: Whether the insured parents are 60 or older.
+        assessment_year: Assessment year, e.g. "2026-27".
+
+    Returns:
+        The allocation per instrument with tax saved per rupee, remaining section capacity,
+        old regime tax before and after, the marginal saving of the next rupee, and the
+        regime recommendation against the new regime.
+    """
+    try:
+        return deduction_allocator.optimize({
+            'gross_salary': gross_salary,
+            'available_cash': available_cash,
+            'other_income': other_income,
+            'existing_80c': existing_80c,
+            'existing_80ccd_1b': existing_80ccd_1b,
+            'existing_80d_self': existing_80d_self,
+            'existing_80d_parents': existing_80d_parents,
+            'education_loan_interest': education_loan_interest,
+            'home_loan_interest': home_loan_interest,
+            'hra_exemption': hra_exemption,
+            'liquidity_reserve': liquidity_reserve,
+            'max_lock_in_years': max_lock_in_years,
+            'age': age,
+            'parents_senior_citizens': parents_senior_citizens,
+            'assessment_year': assessment_year,
+        })
+    except (AllocationError, TaxInputError) as e:
+        return {'status': 'error', 'error_message': str(e)}
+
+
+def optimize_deductions_batch(profiles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Optimise many user profiles offline, e.g. to precompute recommendations"""
+    return deduction_allocator.optimize_batch(profiles)
+
+
+if __name__ == '__main__':
+    # Offline precomputation: one JSON profile per input line, one JSON result per output line
+    source = open(sys.argv[1]) if len(sys.argv) > 1 else sys.stdin
+    with source:
+        batch = [json.loads(line) for line in source if line.strip()]
+    for batch_result in optimize_deductions_batch(batch):
+        print(json.dumps(batch_result))
@@ -42,8 +42,9 @@ Deduction Discovery Framework (Adapted for Available Data):
 - Search for education loan interest payments
 
 **Step 3: Optimization Opportunity Assessment**
-- Calculate remaining capacity in major deduction sections
-- Prioritize deduction opportunities by tax benefit and feasibility
+- Call `optimize_deduction_allocation` with the income, existing deductions (employee EPF counts toward 80C), loan interest and the cash the user can invest
+- Use its allocation, remaining_capacity and tax_saved_per_rupee for every recommended amount; do not size investments by hand
+- If it recommends the new regime, say that the investments only help under the old regime
 - Recommend investment restructuring based on available data
 - Suggest data collection for missing deduction areas
 
@@ -112,8 +113,8 @@ Expected Output Structure:
 **Immediate Action Plan** (Next 30 Days):
 
 **High-Confidence Actions**:
-1. **Maximize EPF Voluntary Contribution**: ₹[Amount] to reach 80C limit
-2. **ELSS Investment**: ₹[Amount] for remaining 80C capacity
+1. **Optimal Allocation**: [Each instrument and amount from `optimize_deduction_allocation`] - saves ₹[tax_saved]
+2. **Marginal Benefit**: ₹[tax_saved_per_rupee] saved per rupee invested; next rupee saves ₹[marginal_tax_saved_per_rupee]
 3. **Document Collection**: [Priority documents to gather]
 
 **Medium-Confidence Actions** (Requires Verification):
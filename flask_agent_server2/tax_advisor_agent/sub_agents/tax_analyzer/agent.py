@@ -15,25 +15,23 @@
 """Tax Analyzer Agent - Comprehensive Tax Situation Analysis"""
 
 from google.adk import Agent
-from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset, StdioServerParameters
 from google.adk.tools import google_search
 from google.adk.tools.agent_tool import AgentTool
 
 from . import prompt
+from ...fi_mcp import get_fi_mcp_toolset
+from ...tax_engine import calculate_income_tax
+from ...model_router import model_for, route_model
+from ...prompt_registry import register_prompt
 
-MODEL = "gemini-2.5-pro"
+MODEL = model_for("tax_analyzer_agent")
 
-# Fi MCP toolset for financial data access
-fi_mcp_toolset = MCPToolset(
-    connection_params=StdioServerParameters(
-        command="npx",
-        args=["mcp-remote", "https://fi-mcp-dev-56426154949.us-central1.run.app/mcp/stream"]
-    )
-)
+# Fi MCP toolset for financial data access (shared connection pool)
+fi_mcp_toolset = get_fi_mcp_toolset()
 
 # Wrap google_search in AgentTool for compatibility (like software-bug-assistant)
 search_agent = Agent(
-    model="gemini-2.5-flash",
+    model=model_for("tax_search_agent"),
     name="tax_search_agent",
     instruction="You're a specialist in tax-related Google Search for current regulations and updates.",
     tools=[google_search],
@@ -49,7 +47,8 @@ tax_analyzer_agent = Agent(
         "estimates tax liability, and identifies optimization opportunities "
         "from available financial data."
     ),
-    instruction=prompt.TAX_ANALYZER_PROMPT,
+    instruction=register_prompt("tax_analyzer_agent", prompt.TAX_ANALYZER_PROMPT),
     output_key="tax_analyzer_output",
-    tools=[fi_mcp_toolset, search_tool],  # Now both are compatible tool types
+    tools=[fi_mcp_toolset, calculate_income_tax, search_tool],
+    before_model_callback=route_model,
 ) 
\ No newline at end of file
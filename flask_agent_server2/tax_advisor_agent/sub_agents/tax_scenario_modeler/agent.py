@@ -15,25 +15,25 @@
 """Tax Scenario Modeler Agent - Comparative Tax Impact Analysis"""
 
 from google.adk import Agent
-from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset, StdioServerParameters
 from google.adk.tools import google_search
 from google.adk.tools.agent_tool import AgentTool
 
 from . import prompt
+from ...capital_gains import plan_capital_gains_harvest
+from ...fi_mcp import get_fi_mcp_toolset
+from ...regime_sweep import analyze_regime_breakeven
+from ...tax_engine import calculate_income_tax
+from ...model_router import model_for, route_model
+from ...prompt_registry import register_prompt
 
-MODEL = "gemini-2.5-pro"
+MODEL = model_for("tax_scenario_modeler_agent")
 
-# Fi MCP toolset for financial data access
-fi_mcp_toolset = MCPToolset(
-    connection_params=StdioServerParameters(
-        command="npx",
-        args=["mcp-remote", "https://fi-mcp-dev-56426154949.us-central1.run.app/mcp/stream"]
-    )
-)
+# Fi MCP toolset for financial data access (shared connection pool)
+fi_mcp_toolset = get_fi_mcp_toolset()
 
 # Wrap google_search in AgentTool for compatibility
 search_agent = Agent(
-    model="gemini-2.5-flash",
+    model=model_for("scenario_search_agent"),
     name="scenario_search_agent",
     instruction="You're a specialist in tax scenario and policy related Google Search.",
     tools=[google_search],
@@ -49,7 +49,13 @@ tax_scenario_modeler_agent = Agent(
         "tax outcomes. Includes regime comparisons, capital gains scenarios, and "
         "filing mechanism analysis with access to current tax policy information."
     ),
-    instruction=prompt.TAX_SCENARIO_MODELER_PROMPT,
+    instruction=register_prompt(  # Only the scenario categories the request needs
+        "tax_scenario_modeler_agent",
+        prompt.TAX_SCENARIO_MODELER_BASE_PROMPT,
+        sections=prompt.TAX_SCENARIO_SECTIONS,
+        closing=prompt.TAX_SCENARIO_MODELER_CLOSING_PROMPT,
+    ),
     output_key="tax_scenario_modeler_output",
-    tools=[fi_mcp_toolset, search_tool],  # Now both are compatible tool types
+    tools=[fi_mcp_toolset, calculate_income_tax, plan_capital_gains_harvest, analyze_regime_breakeven, search_tool],
+    before_model_callback=route_model,
 ) 
\ No newline at end of file
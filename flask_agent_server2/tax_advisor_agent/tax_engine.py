@@ -0,0 +1,409 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Indian Income Tax Engine
+Deterministic old/new regime tax computation for resident individuals, shared by the tax sub-agents
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Chapter VI-A and house property caps, identical across the supported years
+DEDUCTION_LIMITS = {
+    'section_80c': 150_000,
+    'section_80d': 100_000,  # self/family + senior citizen parents
+    'section_80ccd_1b': 50_000,
+    'home_loan_interest': 200_000,  # Section 24(b), self-occupied property
+}
+
+_OLD_REGIME_SLABS = {
+    0: [(250_000, 0.0), (500_000, 0.05), (1_000_000, 0.20), (None, 0.30)],
+    60: [(300_000, 0.0), (500_000, 0.05), (1_000_000, 0.20), (None, 0.30)],
+    80: [(500_000, 0.0), (1_000_000, 0.20), (None, 0.30)],
+}
+
+_OLD_REGIME = {
+    'slabs_by_age': _OLD_REGIME_SLABS,
+    'standard_deduction': 50_000,
+    'rebate_87a': {'income_limit': 500_000, 'max_rebate': 12_500, 'marginal_relief': False},
+    'rebate_on_special_income': True,
+    'surcharge': [(5_000_000, 0.10), (10_000_000, 0.15), (20_000_000, 0.25), (50_000_000, 0.37)],
+    'employer_nps_limit': 0.10,
+    'deductions': ('hra_exemption', 'home_loan_interest', 'section_80c', 'section_80d',
+                   'section_80ccd_1b', 'employer_nps_contribution', 'other_deductions'),
+}
+
+_NEW_REGIME_SURCHARGE = [(5_000_000, 0.10), (10_000_000, 0.15), (20_000_000, 0.25)]
+
+# Slabs are (upper limit, rate) with None for the top slab. Years are assessment years.
+TAX_RULES = {
+    '2024-25': {
+        'old': _OLD_REGIME,
+        'new': {
+            'slabs_by_age': {0: [(300_000, 0.0), (600_000, 0.05), (900_000, 0.10), (1_200_000, 0.15),
+                                 (1_500_000, 0.20), (None, 0.30)]},
+            'standard_deduction': 50_000,
+            'rebate_87a': {'income_limit': 700_000, 'max_rebate': 25_000, 'marginal_relief': True},
+            'rebate_on_special_income': False,
+            'surcharge': _NEW_REGIME_SURCHARGE,
+            'employer_nps_limit': 0.10,
+            'deductions': ('employer_nps_contribution',),
+        },
+        'capital_gains': {'stcg_111a_rate': 0.15, 'ltcg_112a_rate': 0.10, 'ltcg_112a_exemption': 100_000},
+        'special_surcharge_cap': 0.15,
+        'cess_rate': 0.04,
+    },
+    '2025-26': {
+        'old': _OLD_REGIME,
+        'new': {
+            'slabs_by_age': {0: [(300_000, 0.0), (700_000, 0.05), (1_000_000, 0.10), (1_200_000, 0.15),
+                                 (1_500_000, 0.20), (None, 0.30)]},
+            'standard_deduction': 75_000,
+            'rebate_87a': {'income_limit': 700_000, 'max_rebate': 25_000, 'marginal_relief': True},
+            'rebate_on_special_income': False,
+            'surcharge': _NEW_REGIME_SURCHARGE,
+            'employer_nps_limit': 0.14,
+            'deductions': ('employer_nps_contribution',),
+        },
+        # Post 23 July 2024 rates; earlier FY 2024-25 transfers were taxed at 15% / 10%
+        'capital_gains': {'stcg_111a_rate': 0.20, 'ltcg_112a_rate': 0.125, 'ltcg_112a_exemption': 125_000},
+        'special_surcharge_cap': 0.15,
+        'cess_rate': 0.04,
+    },
+    '2026-27': {
+        'old': _OLD_REGIME,
+        'new': {
+            'slabs_by_age': {0: [(400_000, 0.0), (800_000, 0.05), (1_200_000, 0.10), (1_600_000, 0.15),
+                                 (2_000_000, 0.20), (2_400_000, 0.25), (None, 0.30)]},
+            'standard_deduction': 75_000,
+            'rebate_87a': {'income_limit': 1_200_000, 'max_rebate': 60_000, 'marginal_relief': True},
+            'rebate_on_special_income': False,
+            'surcharge': _NEW_REGIME_SURCHARGE,
+            'employer_nps_limit': 0.14,
+            'deductions': ('employer_nps_contribution',),
+        },
+        'capital_gains': {'stcg_111a_rate': 0.20, 'ltcg_112a_rate': 0.125, 'ltcg_112a_exemption': 125_000},
+        'special_surcharge_cap': 0.15,
+        'cess_rate': 0.04,
+    },
+}
+
+DEFAULT_ASSESSMENT_YEAR = '2026-27'
+REGIMES = ('old', 'new')
+
+INCOME_FIELDS = ('gross_salary', 'other_income', 'stcg_equity', 'ltcg_equity')
+DEDUCTION_FIELDS = ('hra_exemption', 'home_loan_interest', 'section_80c', 'section_80d',
+                    'section_80ccd_1b', 'employer_nps_contribution', 'other_deductions')
+
+
+class TaxInputError(Exception):
+    """Custom exception for invalid tax engine inputs"""
+    pass
+
+
+def _round_to_ten(amount: float) -> int:
+    """Round to the nearest multiple of ten rupees (Sections 288A/288B)"""
+    return int((amount + 5) // 10 * 10)
+
+
+class IncomeTaxEngine:
+    """
+    Rule-table driven income tax calculator for resident individuals
+    Adding an assessment year only needs a new TAX_RULES entry
+    """
+
+    def __init__(self, rules: Optional[Dict[str, Any]] = None):
+        self.rules = rules or TAX_RULES
+
+    @property
+    def assessment_years(self) -> List[str]:
+        return sorted(self.rules)
+
+    def compute_tax(self, income: Dict[str, float], regime: str = 'new',
+                    assessment_year: str = DEFAULT_ASSESSMENT_YEAR, age: int = 30) -> Dict[str, Any]:
+        """
+        Compute the liability under one regime
+        income: amounts for INCOME_FIELDS and DEDUCTION_FIELDS (missing keys count as zero);
+                deductions are the eligible amounts before statutory caps
+        """
+        amounts = self._validate(income, regime, assessment_year, age)
+        year_rules = self.rules[assessment_year]
+        regime_rules = year_rules[regime]
+        slabs = self._slabs_for_age(regime_rules, age)
+
+        normal_income, deductions = self._taxable_normal_income(amounts, regime_rules)
+        stcg = amounts['stcg_equity']
+        ltcg = amounts['ltcg_equity']
+
+        tax = self._tax_on_income(year_rules, regime_rules, slabs, normal_income, stcg, ltcg)
+        marginal = self._tax_on_income(year_rules, regime_rules, slabs, normal_income + 100, stcg, ltcg)
+
+        gross_total_income = sum(amounts[field] for field in INCOME_FIELDS)
+        total_tax = _round_to_ten(tax['total'])
+
+        return {
+            'regime': regime,
+            'assessment_year': assessment_year,
+            'gross_total_income': round(gross_total_income, 2),
+            'deductions': deductions,
+            'total_deductions': round(sum(deductions.values()), 2),
+            'taxable_normal_income': normal_income,
+            'special_rate_income': {'stcg_111a': stcg, 'ltcg_112a': ltcg},
+            'slab_breakdown': tax['slab_breakdown'],
+            'slab_tax': round(tax['slab_tax'], 2),
+            'capital_gains_tax': round(tax['capital_gains_tax'], 2),
+            'rebate_87a': round(tax['rebate'], 2),
+            'surcharge': round(tax['surcharge'], 2),
+            'surcharge_marginal_relief': round(tax['marginal_relief'], 2),
+            'cess': round(tax['cess'], 2),
+            'total_tax': total_tax,
+            'effective_tax_rate': round(total_tax / gross_total_income * 100, 2) if gross_total_income else 0.0,
+            # Tax on the next ₹100 of slab income, which is already a percentage
+            'marginal_tax_rate': round(marginal['total'] - tax['total'], 2),
+        }
+
+    def compare_regimes(self, income: Dict[str, float], assessment_year: str = DEFAULT_ASSESSMENT_YEAR,
+                        age: int = 30) -> Dict[str, Any]:
+        """Compute both regimes and recommend the cheaper one"""
+        old = self.compute_tax(income, 'old', assessment_year, age)
+        new = self.compute_tax(income, 'new', assessment_year, age)
+        recommended = 'new' if new['total_tax'] <= old['total_tax'] else 'old'
+        return {
+            'status': 'success',
+            'assessment_year': assessment_year,
+            'old_regime': old,
+            'new_regime': new,
+            'recommended_regime': recommended,
+            'tax_savings': abs(old['total_tax'] - new['total_tax']),
+        }
+
+    def _validate(self, income: Dict[str, float], regime: str, assessment_year: str, age: int) -> Dict[str, float]:
+        if assessment_year not in self.rules:
+            raise TaxInputError(
+                f"Unsupported assessment year {assessment_year}; supported: {', '.join(self.assessment_years)}"
+            )
+        if regime not in REGIMES:
+            raise TaxInputError(f"Unknown regime '{regime}'; expected 'old' or 'new'")
+        if age < 0:
+            raise TaxInputError("age cannot be negative")
+
+        unknown = set(income) - set(INCOME_FIELDS) - set(DEDUCTION_FIELDS)
+        if unknown:
+            raise TaxInputError(f"Unknown income fields: {', '.join(sorted(unknown))}")
+
+        amounts = {}
+        for field in INCOME_FIELDS + DEDUCTION_FIELDS:
+            value = float(income.get(field) or 0.0)
+            if value < 0:
+                raise TaxInputError(f"{field} cannot be negative")
+            amounts[field] = value
+        return amounts
+
+    @staticmethod
+    def _slabs_for_age(regime_rules: Dict[str, Any], age: int) -> List[Tuple[Optional[float], float]]:
+        slabs_by_age = regime_rules['slabs_by_age']
+        bracket = max(threshold for threshold in slabs_by_age if threshold <= age)
+        return slabs_by_age[bracket]
+
+    @staticmethod
+    def _taxable_normal_income(amounts: Dict[str, float], regime_rules: Dict[str, Any]) -> Tuple[float, Dict[str, float]]:
+        """Income chargeable at slab rates after the deductions the regime allows"""
+        allowed = regime_rules['deductions']
+        salary = amounts['gross_salary']
+        deductions = {'standard_deduction': min(regime_rules['standard_deduction'], salary)}
+
+        if 'hra_exemption' in allowed:
+            deductions['hra_exemption'] = min(amounts['hra_exemption'], salary - deductions['standard_deduction'])
+        salary_income = salary - sum(deductions.values())
+
+        if 'home_loan_interest' in allowed:
+            deductions['home_loan_interest'] = min(amounts['home_loan_interest'], DEDUCTION_LIMITS['home_loan_interest'])
+        gross_normal = max(0.0, salary_income + amounts['other_income'] - deductions.get('home_loan_interest', 0.0))
+
+        chapter_via = {}
+        for field in ('section_80c', 'section_80d', 'section_80ccd_1b', 'other_deductions'):
+            if field in allowed:
+                chapter_via[field] = min(amounts[field], DEDUCTION_LIMITS.get(field, amounts[field]))
+        if 'employer_nps_contribution' in allowed:
+            chapter_via['employer_nps_contribution'] = min(
+                amounts['employer_nps_contribution'], regime_rules['employer_nps_limit'] * salary
+            )
+
+        # Chapter VI-A deductions cannot exceed the income they are claimed against
+        room = gross_normal
+        for field, value in chapter_via.items():
+            deductions[field] = min(value, room)
+            room -= deductions[field]
+
+        taxable = _round_to_ten(room) if room > 0 else 0
+        return taxable, {field: round(value, 2) for field, value in deductions.items()}
+
+    def _tax_on_income(self, year_rules: Dict[str, Any], regime_rules: Dict[str, Any],
+                       slabs: List[Tuple[Optional[float], float]], normal_income: float,
+                       stcg: float, ltcg: float) -> Dict[str, Any]:
+        """Slab tax, special-rate tax, rebate, surcharge (with marginal relief) and cess"""
+        slab_breakdown = []
+        slab_tax = 0.0
+        lower = 0.0
+        for upper, rate in slabs:
+            if normal_income <= lower:
+                break
+            taxable_in_slab = (normal_income if upper is None else min(normal_income, upper)) - lower
+            slab_tax += taxable_in_slab * rate
+            slab_breakdown.append({
+                'from': lower,
+                'to': upper,
+                'rate': rate * 100,
+                'taxable_amount': round(taxable_in_slab, 2),
+                'tax': round(taxable_in_slab * rate, 2),
+            })
+            lower = upper if upper is not None else normal_income
+
+        # Unused basic exemption absorbs STCG first, then LTCG above the 112A exemption
+        capital_gains = year_rules['capital_gains']
+        basic_exemption = slabs[0][0] if slabs[0][1] == 0 else 0
+        shortfall = max(0.0, basic_exemption - normal_income)
+        stcg_taxable = max(0.0, stcg - shortfall)
+        shortfall = max(0.0, shortfall - stcg)
+        ltcg_taxable = max(0.0, ltcg - capital_gains['ltcg_112a_exemption'] - shortfall)
+        stcg_tax = stcg_taxable * capital_gains['stcg_111a_rate']
+        ltcg_tax = ltcg_taxable * capital_gains['ltcg_112a_rate']
+
+        total_income = normal_income + stcg + ltcg
+
+        # Section 87A: never against 112A tax; against 111A only where the regime allows it
+        rebate_rules = regime_rules['rebate_87a']
+        rebateable_tax = slab_tax + (stcg_tax if regime_rules['rebate_on_special_income'] else 0.0)
+        excess = total_income - rebate_rules['income_limit']
+        if excess <= 0:
+            rebate = min(rebateable_tax, rebate_rules['max_rebate'])
+        elif rebate_rules['marginal_relief']:
+            rebate = max(0.0, rebateable_tax - excess)
+        else:
+            rebate = 0.0
+
+        tax_after_rebate = slab_tax + stcg_tax + ltcg_tax - rebate
+
+        surcharge = 0.0
+        marginal_relief = 0.0
+        threshold, rate = self._surcharge_tier(regime_rules, total_income)
+        if rate:
+            special_rate = min(rate, year_rules['special_surcharge_cap'])
+            surcharge = (slab_tax - rebate) * rate + (stcg_tax + ltcg_tax) * special_rate
+
+            # Tax at exactly the threshold plus the income above it caps the liability
+            at_threshold = self._tax_on_income(
+                year_rules, regime_rules, slabs, *self._scale_to(threshold, normal_income, stcg, ltcg)
+            )
+            cap = at_threshold['tax_before_cess'] + (total_income - threshold)
+            marginal_relief = max(0.0, tax_after_rebate + surcharge - cap)
+
+        tax_before_cess = tax_after_rebate + surcharge - marginal_relief
+        cess = tax_before_cess * year_rules['cess_rate']
+
+        return {
+            'slab_breakdown': slab_breakdown,
+            'slab_tax': slab_tax,
+            'capital_gains_tax': stcg_tax + ltcg_tax,
+            'rebate': rebate,
+            'surcharge': surcharge,
+            'marginal_relief': marginal_relief,
+            'tax_before_cess': tax_before_cess,
+            'cess': cess,
+            'total': tax_before_cess + cess,
+        }
+
+    @staticmethod
+    def _surcharge_tier(regime_rules: Dict[str, Any], total_income: float) -> Tuple[float, float]:
+        tier = (0.0, 0.0)
+        for threshold, rate in regime_rules['surcharge']:
+            if total_income > threshold:
+                tier = (threshold, rate)
+        return tier
+
+    @staticmethod
+    def _scale_to(threshold: float, normal_income: float, stcg: float, ltcg: float) -> Tuple[float, float, float]:
+        """Reduce income to the surcharge threshold, trimming slab income before capital gains"""
+        excess = normal_income + stcg + ltcg - threshold
+        for_normal = min(excess, normal_income)
+        excess -= for_normal
+        for_ltcg = min(excess, ltcg)
+        excess -= for_ltcg
+        return normal_income - for_normal, stcg - excess, ltcg - for_ltcg
+
+
+# Global engine instance
+tax_engine = IncomeTaxEngine()
+
+
+def calculate_income_tax(
+    gross_salary: float,
+    other_income: float = 0.0,
+    stcg_equity: float = 0.0,
+    ltcg_equity: float = 0.0,
+    hra_exemption: float = 0.0,
+    home_loan_interest: float = 0.0,
+    section_80c: float = 0.0,
+    section_80d: float = 0.0,
+    section_80ccd_1b: float = 0.0,
+    employer_nps_contribution: float = 0.0,
+    other_deductions: float = 0.0,
+    age: int = 30,
+    assessment_year: str = DEFAULT_ASSESSMENT_YEAR,
+) -> Dict[str, Any]:
+    """Computes exact Indian income tax under both the old and new regimes.
+
+    Use this instead of calculating tax by hand. Amounts are yearly, in rupees. Deductions
+    are the eligible amounts; statutory caps (80C ₹1.5L, 80CCD(1B) ₹50K, 24(b) ₹2L, ...)
+    and regime restrictions are applied automatically.
+
+    Args:
+        gross_salary: Gross salary income before the standard deduction.
+        other_income: Interest, rent and other income taxed at slab rates.
+        stcg_equity: Short-term gains on listed equity / equity funds (Section 111A).
+        ltcg_equity: Long-term gains on listed equity / equity funds (Section 112A).
+        hra_exemption: HRA exemption already computed under Section 10(13A) (old regime only).
+        home_loan_interest: Interest on a self-occupied home loan, Section 24(b) (old regime only).
+        section_80c: Investments under 80C: EPF, PPF, ELSS, life insurance, principal repayment.
+        section_80d: Health insurance premiums under 80D.
+        section_80ccd_1b: Additional own NPS contribution under 80CCD(1B).
+        employer_nps_contribution: Employer NPS contribution under 80CCD(2) (both regimes).
+        other_deductions: Other eligible Chapter VI-A deductions such as 80E or 80G (old regime only).
+        age: Taxpayer age, which sets the old regime basic exemption (60+ and 80+).
+        assessment_year: Assessment year, e.g. "2026-27" for FY 2025-26.
+
+    Returns:
+        For each regime the deductions applied, slab-wise breakdown, 87A rebate, surcharge,
+        cess, total tax and effective/marginal rates, plus the recommended regime and savings.
+    """
+    income = {
+        'gross_salary': gross_salary,
+        'other_income': other_income,
+        'stcg_equity': stcg_equity,
+        'ltcg_equity': ltcg_equity,
+        'hra_exemption': hra_exemption,
+        'home_loan_interest': home_loan_interest,
+        'section_80c': section_80c,
+        'section_80d': section_80d,
+        'section_80ccd_1b': section_80ccd_1b,
+        'employer_nps_contribution': employer_nps_contribution,
+        'other_deductions': other_deductions,
+    }
+    try:
+        return tax_engine.compare_regimes(income, assessment_year=assessment_year, age=age)
+    except TaxInputError as e:
+        return {'status': 'error', 'error_message': str(e)}
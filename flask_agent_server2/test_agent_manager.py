@@ -0,0 +1,119 @@
+"""
+Tests for running async agents on AgentManager's persistent event loop
+"""
+
+import textwrap
+import threading
+import time
+import uuid
+
+import pytest
+
+from agent_manager import AgentManager
+
+ASYNC_AGENT = '''
+import asyncio
+import threading
+
+
+class SlowAgent:
+    name = 'slow_agent'
+
+    def __init__(self):
+        self.loops = set()
+        self.active = 0
+        self.peak = 0
+        self.cancelled = 0
+        self.lock = threading.Lock()
+
+    async def arun(self, message):
+        self.loops.add(id(asyncio.get_running_loop()))
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(float(message.split()[-1]))
+            return {'response': f'done: {message}'}
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+root_agent = SlowAgent()
+'''
+
+
+@pytest.fixture
+def make_manager(tmp_path):
+    managers = []
+
+    def make(**kwargs):
+        package = tmp_path / f'async_agent_{uuid.uuid4().hex[:8]}'
+        package.mkdir()
+        (package / '__init__.py').write_text('')
+        (package / 'agent.py').write_text(textwrap.dedent(ASYNC_AGENT))
+        manager = AgentManager(agent_path=str(package), **kwargs)
+        managers.append(manager)
+        return manager
+
+    yield make
+    for manager in managers:
+        manager.shutdown()
+
+
+def test_messages_share_one_long_lived_loop(make_manager):
+    manager = make_manager()
+    assert manager.agent_type == 'async'
+    assert manager.get_executor_stats()['running']
+
+    replies = [manager.process_message(f'question {i} 0', 's1')['response'] for i in range(3)]
+
+    assert replies == [f'done: question {i} 0' for i in range(3)]
+    assert len(manager.agent.loops) == 1
+    assert manager.get_executor_stats()['completed'] == 3
+
+
+def test_concurrent_messages_respect_the_limit(make_manager):
+    manager = make_manager(max_concurrency=2)
+    threads = [
+        threading.Thread(target=manager.process_message, args=('wait 0.1', f's{i}'))
+        for i in range(6)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert manager.agent.peak == 2
+    assert manager.get_executor_stats()['completed'] == 6
+
+
+def test_slow_calls_time_out_and_are_cancelled(make_manager):
+    manager = make_manager(timeout=0.1)
+    result = manager.process_message('wait 5', 's1')
+
+    assert result['metadata']['timeout']
+    time.sleep(0.05)
+    assert manager.agent.cancelled == 1
+    assert manager.agent.active == 0
+    stats = manager.get_executor_stats()
+    assert stats['timed_out'] == 1 and stats['in_flight'] == 0
+
+
+def test_cancelling_a_session_stops_its_call(make_manager):
+    manager = make_manager()
+    results = []
+    thread = threading.Thread(target=lambda: results.append(manager.process_message('wait 5', 's1')))
+    thread.start()
+    while not manager.get_executor_stats()['in_flight']:
+        time.sleep(0.01)
+
+    assert manager.cancel('other') == 0
+    assert manager.cancel('s1') == 1
+    thread.join(2)
+
+    assert results[0]['metadata']['cancelled']
+    assert manager.get_executor_stats()['cancelled'] == 1
@@ -0,0 +1,96 @@
+"""
+Tests for the mutual fund lot engine and harvest planner
+"""
+
+import asyncio
+from datetime import date
+
+import numpy as np
+import pytest
+
+import tax_advisor_agent.capital_gains as capital_gains
+from tax_advisor_agent.capital_gains import LotBook, analyze_capital_gains, plan_capital_gains_harvest
+
+PAYLOAD = {
+    'mfTransactions': [
+        {'isinNumber': 'INF_A', 'schemeName': 'Alpha Flexi Cap Fund', 'txns': [
+            [1, '2022-01-10', 100.0, 1000.0, 100000.0],
+            [2, '2025-05-01', 180.0, 200.0, 36000.0],
+            [1, '2025-06-01', 150.0, 500.0, 75000.0],
+        ]},
+        {'isinNumber': 'INF_B', 'schemeName': 'Beta Midcap Fund', 'txns': [
+            [1, '2024-12-01', 500.0, 100.0, 50000.0],
+            [2, '2025-07-01', 900.0, 20.0, 18000.0],
+        ]},
+        {'isinNumber': 'INF_C', 'schemeName': 'Gamma Equity Fund', 'txns': [
+            [1, '2020-03-01', 50.0, 2000.0, 100000.0],
+        ]},
+        {'isinNumber': 'INF_D', 'schemeName': 'Delta Liquid Fund', 'txns': [
+            [1, '2023-01-01', 1000.0, 10.0, 10000.0],
+        ]},
+    ]
+}
+NAVS = {'INF_A': 160.0, 'INF_B': 300.0, 'INF_C': 110.0, 'INF_D': 1100.0}
+AS_OF = date(2025, 9, 1)
+
+
+def test_fifo_lots_and_holding_periods():
+    """Sales consume the oldest lots; gains split by the 12-month rule"""
+    book = LotBook.from_fi_mcp(PAYLOAD)
+    np.testing.assert_allclose(book.lot_remaining, [800, 500, 80, 2000, 10])
+    assert book.realised(date(2025, 4, 1), date(2026, 3, 31)) == {'short_term': 8000.0, 'long_term': 16000.0}
+
+    result = analyze_capital_gains(PAYLOAD, AS_OF, NAVS)
+    alpha = result['holdings'][0]
+    assert alpha['unrealised_long_term_gain'] == 48000
+    assert alpha['unrealised_short_term_gain'] == 5000
+    assert alpha['next_lot_long_term_on'] == '2026-06-02'
+    assert result['holdings'][3]['tax_treatment'] == 'non_equity'
+
+
+def test_harvest_plan_books_losses_then_fills_exemption():
+    """Just enough short-term loss offsets this year's STCG, then LTCG is harvested up to ₹1.25L"""
+    plan = analyze_capital_gains(PAYLOAD, AS_OF, NAVS)['harvest_plan']
+    loss, harvest = plan['actions']
+
+    assert (loss['action'], loss['scheme_name'], loss['units'], loss['short_term_gain']) == \
+        ('book_loss', 'Beta Midcap Fund', 40, -8000)  # the other 40 units stay unsold
+    assert (harvest['action'], harvest['scheme_name'], harvest['units']) == ('harvest_gain', 'Gamma Equity Fund', 1816.666)
+    assert harvest['long_term_gain'] == pytest.approx(109000, abs=0.1)
+    assert plan['tax_before_plan'] == 1600
+    assert plan['tax_after_plan'] == 0
+    assert plan['ltcg_exemption_remaining'] == pytest.approx(0, abs=0.1)
+    assert plan['future_tax_avoided_by_harvest'] == 13625
+
+
+def test_loss_booking_stops_at_the_gain_taxable_after_the_exemption():
+    """₹10,000 of LTCG above the exemption needs ₹10,000 of a ₹15,000 long-term loss"""
+    payload = {'mfTransactions': [
+        {'isinNumber': 'INF_E', 'schemeName': 'Echo Large Cap Fund', 'txns': [
+            [1, '2021-01-01', 100.0, 1350.0, 135000.0],
+            [2, '2025-06-01', 200.0, 1350.0, 270000.0],
+        ]},
+        {'isinNumber': 'INF_F', 'schemeName': 'Foxtrot Value Fund', 'txns': [
+            [1, '2022-01-01', 100.0, 300.0, 30000.0],
+        ]},
+    ]}
+    plan = analyze_capital_gains(payload, AS_OF, {'INF_E': 200.0, 'INF_F': 50.0})['harvest_plan']
+    (loss,) = plan['actions']
+
+    assert (loss['scheme_name'], loss['units'], loss['long_term_gain']) == ('Foxtrot Value Fund', 200, -10000)
+    assert plan['tax_before_plan'] == 1250 and plan['tax_after_plan'] == 0
+
+
+def test_tool_reads_transactions_from_fi_mcp(monkeypatch):
+    async def fake_fetch(tool_name, tool_context, args=None):
+        assert tool_name == 'fetch_mf_transactions'
+        return PAYLOAD
+
+    monkeypatch.setattr(capital_gains, 'fetch_fi_mcp_data', fake_fetch)
+    result = asyncio.run(plan_capital_gains_harvest(
+        tool_context=None, nav_isins=list(NAVS), nav_values=list(NAVS.values()), as_of_date='2025-09-01',
+    ))
+
+    assert result['status'] == 'success'
+    assert result['assessment_year'] == '2026-27'
+    assert result['warnings'] == []
@@ -0,0 +1,155 @@
+"""
+Tests for caching the coordinators' static instructions with the model provider
+"""
+
+import asyncio
+from typing import AsyncGenerator, Dict, List
+
+import pytest
+from google.adk.agents import LlmAgent
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from tax_advisor_agent import context_cache as cache_module
+from tax_advisor_agent import prompt as tax_prompt
+from tax_advisor_agent.context_cache import ContextCacheProvider, ContextCacheRegistry
+
+
+class FakeCacheProvider(ContextCacheProvider):
+    """In-memory stand-in for the provider's cached content API"""
+
+    def __init__(self, fail=False, latency=0.0):
+        self.fail = fail
+        self.latency = latency
+        self.caches: Dict[str, dict] = {}
+        self.created: List[str] = []
+        self.deleted: List[str] = []
+
+    async def create(self, model, system_instruction, tools, tool_config, ttl_seconds, display_name):
+        await asyncio.sleep(self.latency)
+        if self.fail:
+            raise RuntimeError('Cached content is too small')
+        name = f'cachedContents/{len(self.created) + 1}'
+        self.caches[name] = {'model': model, 'system_instruction': system_instruction, 'tools': tools, 'ttl': ttl_seconds}
+        self.created.append(name)
+        return name
+
+    async def delete(self, name):
+        self.caches.pop(name)
+        self.deleted.append(name)
+
+
+class CacheAwareLlm(BaseLlm):
+    """Resolves cached_content like the provider does and reports cached token usage"""
+    provider: FakeCacheProvider
+    requests: List[types.GenerateContentConfig] = []
+
+    async def generate_content_async(self, llm_request: LlmRequest, stream: bool = False) -> AsyncGenerator[LlmResponse, None]:
+        config = llm_request.config
+        self.requests.append(config.model_copy())
+        cached_tokens = None
+        if config.cached_content:
+            assert config.system_instruction is None and config.tools is None  # the API rejects duplicates
+            cache = self.provider.caches[config.cached_content]
+            assert cache['model'] == llm_request.model
+            cached_tokens = len(cache['system_instruction']) // 4
+        yield LlmResponse(
+            content=types.Content(role='model', parts=[types.Part(text='Here is your tax summary')]),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(cached_content_token_count=cached_tokens),
+        )
+
+
+def _chat_sessions(registry, monkeypatch, sessions=2, turns=2, model='gemini-2.5-pro'):
+    monkeypatch.setattr(cache_module, 'context_cache', registry)
+    llm = CacheAwareLlm(model=model, provider=registry.provider, requests=[])
+    agent = LlmAgent(
+        name='tax_advisor_coordinator',
+        model=llm,
+        instruction=tax_prompt.TAX_ADVISOR_COORDINATOR_PROMPT,
+        before_model_callback=cache_module.use_context_cache,
+        after_model_callback=cache_module.record_context_cache_usage,
+    )
+
+    async def run():
+        runner = Runner(app_name='cache_test', agent=agent, session_service=InMemorySessionService())
+        for user in range(sessions):
+            session = await runner.session_service.create_session(app_name='cache_test', user_id=f'u{user}')
+            for turn in range(turns):
+                content = types.Content(role='user', parts=[types.Part(text=f'Question {turn}')])
+                async for _ in runner.run_async(user_id=f'u{user}', session_id=session.id, new_message=content):
+                    pass
+
+    asyncio.run(run())
+    return llm
+
+
+def test_static_prefix_is_cached_once_and_reused_across_sessions(monkeypatch):
+    provider = FakeCacheProvider()
+    registry = ContextCacheRegistry(provider, ttl=3600, min_tokens=1024)
+    llm = _chat_sessions(registry, monkeypatch)
+
+    assert provider.created == ['cachedContents/1']
+    assert tax_prompt.TAX_ADVISOR_COORDINATOR_PROMPT in provider.caches['cachedContents/1']['system_instruction']
+    assert [config.cached_content for config in llm.requests] == ['cachedContents/1'] * 4
+
+    stats = registry.get_stats()
+    assert (stats['hits'], stats['misses'], stats['creations']) == (3, 1, 1)
+    assert stats['hit_rate'] == 0.75
+    assert stats['provider_cached_tokens'] > 4 * 2000
+
+    asyncio.run(registry.clear())
+    assert provider.deleted == ['cachedContents/1'] and registry.get_stats()['handles'] == 0
+
+
+def test_expiring_handles_are_replaced(monkeypatch):
+    provider = FakeCacheProvider()
+    registry = ContextCacheRegistry(provider, ttl=60, min_tokens=1024)  # inside the refresh margin
+    _chat_sessions(registry, monkeypatch, sessions=1)
+    assert len(provider.created) == 2
+    assert provider.deleted == ['cachedContents/1'] and list(provider.caches) == ['cachedContents/2']
+
+
+def test_concurrent_misses_create_one_cache():
+    provider = FakeCacheProvider(latency=0.05)
+    registry = ContextCacheRegistry(provider, ttl=3600, min_tokens=1024)
+
+    def request():
+        return LlmRequest(
+            model='gemini-2.5-pro',
+            config=types.GenerateContentConfig(system_instruction=tax_prompt.TAX_ADVISOR_COORDINATOR_PROMPT),
+        )
+
+    async def burst():
+        requests = [request() for _ in range(5)]
+        applied = await asyncio.gather(*(registry.apply('tax_advisor_coordinator', r) for r in requests))
+        return applied, requests
+
+    applied, requests = asyncio.run(burst())
+    assert applied == [True] * 5
+    assert provider.created == ['cachedContents/1'] and provider.deleted == []
+    assert {r.config.cached_content for r in requests} == {'cachedContents/1'}
+    stats = registry.get_stats()
+    assert (stats['hits'], stats['misses'], stats['creations']) == (4, 1, 1)
+
+
+def test_small_prompts_and_failures_fall_back_to_uncached_requests(monkeypatch):
+    small = ContextCacheRegistry(FakeCacheProvider(), min_tokens=100000)
+    llm = _chat_sessions(small, monkeypatch, sessions=1)
+    assert small.get_stats()['skipped_below_min_tokens'] == 2
+    assert all(config.cached_content is None and config.system_instruction for config in llm.requests)
+
+    failing = ContextCacheRegistry(FakeCacheProvider(fail=True), min_tokens=1024)
+    llm = _chat_sessions(failing, monkeypatch, sessions=2)
+    assert all(config.cached_content is None and config.system_instruction for config in llm.requests)
+    assert failing.get_stats()['failures'] == 1  # not retried on every call
+
+
+def test_incomplete_provider_fails_at_construction():
+    class CreateOnly(ContextCacheProvider):
+        async def create(self, model, system_instruction, tools, tool_config, ttl_seconds, display_name):
+            return 'cachedContents/1'
+
+    with pytest.raises(TypeError, match='delete'):
+        CreateOnly()
@@ -0,0 +1,57 @@
+"""
+Tests for the deduction allocation optimizer
+"""
+
+from tax_advisor_agent.sub_agents.deduction_optimizer.allocator import (
+    deduction_allocator,
+    optimize_deduction_allocation,
+    optimize_deductions_batch,
+)
+
+
+def test_fills_caps_most_liquid_first():
+    """80D premiums, then ELSS for the rest of 80C, then NPS; no section exceeds its cap"""
+    result = optimize_deduction_allocation(1_500_000, 300_000, existing_80c=72_000, age=35)
+    amounts = {item['instrument']: item['amount'] for item in result['allocation']}
+
+    assert amounts == {
+        'health_insurance_self': 25_000,
+        'health_insurance_parents': 25_000,
+        'elss': 78_000,
+        'nps': 50_000,
+    }
+    assert result['unallocated_cash'] == 122_000
+    assert result['tax_saved'] == sum(item['tax_saved'] for item in result['allocation'])
+    assert result['tax_saved'] == result['old_regime_tax_before'] - result['old_regime_tax_after']
+
+
+def test_stops_once_tax_reaches_zero():
+    """Cash beyond what brings taxable income to the 87A limit is left unallocated"""
+    result = optimize_deduction_allocation(700_000, 300_000, existing_80c=20_000)
+
+    assert result['old_regime_tax_after'] == 0
+    assert result['total_allocated'] == 130_000
+    assert result['marginal_tax_saved_per_rupee'] == 0
+
+
+def test_liquidity_limits():
+    """The reserve is never invested and instruments locked beyond the limit are skipped"""
+    result = deduction_allocator.optimize({
+        'gross_salary': 2_000_000, 'available_cash': 200_000, 'liquidity_reserve': 120_000,
+        'max_lock_in_years': 5,
+    })
+    instruments = {item['instrument'] for item in result['allocation']}
+
+    assert result['total_allocated'] == 80_000
+    assert instruments <= {'health_insurance_self', 'health_insurance_parents', 'elss', 'tax_saver_fd'}
+
+
+def test_batch_reports_invalid_profiles_without_stopping():
+    results = optimize_deductions_batch([
+        {'user_id': 'a', 'gross_salary': 1_200_000, 'available_cash': 100_000},
+        {'user_id': 'b', 'gross_salary': -1, 'available_cash': 0},
+        {'user_id': 'c', 'available_cash': 0},
+    ])
+
+    assert [result['status'] for result in results] == ['success', 'error', 'error']
+    assert [result['user_id'] for result in results] == ['a', 'b', 'c']
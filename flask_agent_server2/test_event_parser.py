@@ -0,0 +1,64 @@
+"""
+Tests for incremental ADK event parsing
+"""
+
+import json
+
+import pytest
+
+from event_parser import ADKEventParser, extract_json_block, iter_json_array
+
+
+def _chunked(data: bytes, size: int):
+    return (data[i:i + size] for i in range(0, len(data), size))
+
+
+def test_iter_json_array_decodes_across_chunk_boundaries():
+    """Events split across chunks, including inside multi-byte characters, decode intact"""
+    events = [{'author': 'agent', 'content': {'parts': [{'text': f'₹{i} lakh, "quoted" [{i}]'}]}} for i in range(20)]
+    body = json.dumps(events, ensure_ascii=False, indent=1).encode('utf-8')
+
+    for size in (1, 3, 7, 4096):
+        assert list(iter_json_array(_chunked(body, size))) == events
+
+
+def test_iter_json_array_yields_before_the_body_ends():
+    """Each event is available as soon as it is complete"""
+    def chunks():
+        yield b'[{"id": 1},'
+        yield b' {"id": 2}'
+        raise AssertionError("read past the event that was needed")
+
+    events = iter_json_array(chunks())
+    assert next(events) == {'id': 1}
+    assert next(events) == {'id': 2}
+
+
+def test_iter_json_array_rejects_truncated_body():
+    """A body that ends mid-array raises instead of silently dropping events"""
+    with pytest.raises(ValueError):
+        list(iter_json_array([b'[{"id": 1}, {"id"']))
+
+
+def test_parser_joins_text_and_collects_function_calls():
+    """Final text is joined in order; partial text is returned but not accumulated"""
+    parser = ADKEventParser(keep_events=True)
+    assert parser.feed({'partial': True, 'content': {'parts': [{'text': 'Hel'}]}}) == ['Hel']
+    parser.feed({'content': {'parts': [{'functionCall': {'name': 'fetch_net_worth'}}]}})
+    parser.feed({'content': {'parts': [{'text': 'Hello '}, {'text': 'there'}]}, 'usageMetadata': {'totalTokenCount': 5}})
+
+    assert parser.text == 'Hello there'
+    assert parser.get_metadata() == {
+        'function_calls': [{'name': 'fetch_net_worth'}],
+        'usage': {'totalTokenCount': 5}
+    }
+    assert parser.event_count == len(parser.events) == 3
+
+
+def test_extract_json_block_requires_key():
+    """Only fenced JSON blocks containing the required key are returned"""
+    block = '```json\n{"parallel_universe_analysis": {"universes": []}}\n```'
+    assert extract_json_block(block, 'parallel_universe_analysis') == {'parallel_universe_analysis': {'universes': []}}
+    assert extract_json_block(block, 'other') is None
+    assert extract_json_block('```json\n{not json}\n```', 'parallel_universe_analysis') is None
+    assert extract_json_block('plain text', 'parallel_universe_analysis') is None
@@ -0,0 +1,85 @@
+"""
+Tests for the dependency-aware tax advisor execution plan
+"""
+
+import asyncio
+from typing import Any, AsyncGenerator, Optional
+
+import pytest
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events.event import Event, EventActions
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from tax_advisor_agent.execution_plan import TIMINGS_STATE_KEY, build_execution_plan
+from tax_advisor_agent.fanout import FanOutAgent
+
+
+class StubAgent(BaseAgent):
+    """Meets its stage partners at the barrier, records which outputs it could see, then writes its output_key"""
+    output_key: str
+    barrier: Optional[Any] = None
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        if self.barrier:
+            await asyncio.wait_for(self.barrier.wait(), timeout=5)  # times out unless the stage runs concurrently
+        seen = sorted(key for key in ctx.session.state if key.endswith('_output'))
+        yield Event(
+            invocation_id=ctx.invocation_id, author=self.name, branch=ctx.branch,
+            content=types.Content(role='model', parts=[types.Part(text='done')]),
+            actions=EventActions(state_delta={self.output_key: f"{self.name} saw {seen}"}),
+        )
+
+
+def _stubs(barriers=(None, None)):
+    return [
+        StubAgent(name=name, output_key=f"{name}_output", barrier=barriers[i // 2])
+        for i, name in enumerate(('analyzer', 'deductions', 'planner', 'scenarios'))
+    ]
+
+
+async def _run(agent):
+    runner = Runner(app_name='plan_test', agent=agent, session_service=InMemorySessionService())
+    session = await runner.session_service.create_session(app_name='plan_test', user_id='u1')
+    message = types.Content(role='user', parts=[types.Part(text='Full tax review')])
+    events = [event async for event in runner.run_async(user_id='u1', session_id=session.id, new_message=message)]
+    session = await runner.session_service.get_session(app_name='plan_test', user_id='u1', session_id=session.id)
+    return events, session.state
+
+
+def test_stages_follow_dependencies_and_report_timings():
+    analyzer, deductions, planner, scenarios = _stubs((asyncio.Barrier(2), asyncio.Barrier(2)))
+    plan = build_execution_plan('review', 'test plan', [analyzer, deductions, planner, scenarios], {
+        'planner': ['analyzer', 'deductions'],
+        'scenarios': ['analyzer', 'deductions'],
+    })
+    assert all(isinstance(stage, FanOutAgent) for stage in plan.sub_agents)
+    assert [stage.branch_names for stage in plan.sub_agents] == [['analyzer', 'deductions'], ['planner', 'scenarios']]
+
+    events, state = asyncio.run(_run(plan))
+
+    assert state['planner_output'] == "planner saw ['analyzer_output', 'deductions_output']"
+    assert [t['agents'] for t in state[TIMINGS_STATE_KEY]] == [['analyzer', 'deductions'], ['planner', 'scenarios']]
+    final = events[-1].content.parts[0].text
+    assert events[-1].author == 'review'
+    assert '## scenarios_output' in final and '## Execution timings' in final and '- Total:' in final
+
+
+def test_chain_and_invalid_plans():
+    analyzer, deductions, planner, scenarios = _stubs()
+    chain = build_execution_plan('chain', 'test', [analyzer, deductions], {'deductions': ['analyzer']})
+    assert [stage.branch_names for stage in chain.sub_agents] == [['analyzer'], ['deductions']]
+    _, state = asyncio.run(_run(chain))
+    assert state['deductions_output'] == "deductions saw ['analyzer_output']"
+
+    with pytest.raises(ValueError, match='Circular'):
+        build_execution_plan('loop', 'test', [planner, scenarios], {'planner': ['scenarios'], 'scenarios': ['planner']})
+
+
+def test_coordinator_exposes_full_review():
+    from tax_advisor_agent.agent import full_tax_review_agent, root_agent
+
+    assert 'full_tax_review_agent' in {getattr(tool, 'name', None) for tool in root_agent.tools}
+    assert [len(stage.branch_names) for stage in full_tax_review_agent.sub_agents] == [2, 2]
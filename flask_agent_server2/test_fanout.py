@@ -0,0 +1,62 @@
+"""
+Tests for the concurrent sub-agent fan-out
+"""
+
+import asyncio
+from typing import Any, AsyncGenerator
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events.event import Event, EventActions
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from oracle_agent.fanout import create_fanout_agent
+
+
+class SlowAgent(BaseAgent):
+    """Stands in for an LLM sub-agent: waits for every branch to start, then writes its output_key"""
+    output_key: str
+    barrier: Any
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        await asyncio.wait_for(self.barrier.wait(), timeout=5)  # times out if the branches run one by one
+        yield Event(
+            invocation_id=ctx.invocation_id, author=self.name, branch=ctx.branch,
+            content=types.Content(role='model', parts=[types.Part(text=f"{self.name} done")]),
+            actions=EventActions(state_delta={self.output_key: f"{self.name} result"}),
+        )
+
+
+async def _run(agent):
+    runner = Runner(app_name='fanout_test', agent=agent, session_service=InMemorySessionService())
+    session = await runner.session_service.create_session(app_name='fanout_test', user_id='u1')
+    message = types.Content(role='user', parts=[types.Part(text='Analyse my finances')])
+    events = [event async for event in runner.run_async(user_id='u1', session_id=session.id, new_message=message)]
+    session = await runner.session_service.get_session(app_name='fanout_test', user_id='u1', session_id=session.id)
+    return events, session.state
+
+
+def test_branches_run_concurrently_and_merge_outputs():
+    barrier = asyncio.Barrier(2)
+    fanout = create_fanout_agent('baseline', 'test fan-out', [
+        SlowAgent(name='analyzer', output_key='financial_analysis_output', barrier=barrier),
+        SlowAgent(name='health', output_key='financial_health_score_output', barrier=barrier),
+    ])
+
+    events, state = asyncio.run(_run(fanout))
+    assert state['financial_analysis_output'] == 'analyzer result'
+    assert state['financial_health_score_output'] == 'health result'
+    final = events[-1].content.parts[0].text
+    assert events[-1].author == 'baseline'
+    assert '## financial_analysis_output\nanalyzer result' in final
+    assert '## financial_health_score_output\nhealth result' in final
+
+
+def test_coordinator_exposes_the_fanout():
+    from oracle_agent.agent import financial_baseline_agent, root_agent
+
+    tool_names = {getattr(tool, 'name', None) for tool in root_agent.tools}
+    assert 'financial_baseline_agent' in tool_names
+    assert financial_baseline_agent.output_keys == ['financial_analysis_output', 'financial_health_score_output']
@@ -0,0 +1,69 @@
+"""
+Tests for the batch Financial Health Score calculator
+"""
+
+import pandas as pd
+import pytest
+
+from oracle_agent.sub_agents.financial_health_score.benchmark_batch import make_synthetic_payloads
+from oracle_agent.sub_agents.financial_health_score.mcp_direct_calculator import (
+    DirectMCPCalculator,
+    MCPDataValidationError,
+    METRIC_COLUMNS,
+)
+
+
+@pytest.fixture
+def calculator():
+    return DirectMCPCalculator()
+
+
+def test_batch_matches_scalar_exactly(calculator):
+    """Parsed metrics, factor scores, overall score and grade are identical to the scalar path"""
+    payloads = make_synthetic_payloads(300, seed=7)
+    batch = calculator.calculate_fhs_batch(payloads)
+
+    scored = 0
+    for payload, (_, row) in zip(payloads, batch.iterrows()):
+        try:
+            expected = calculator.calculate_fhs_from_mcp(payload)
+        except MCPDataValidationError as e:
+            assert row['error'] == str(e)
+            continue
+
+        scored += 1
+        assert pd.isna(row['error'])
+        for column in METRIC_COLUMNS:
+            assert row[column] == expected['parsed_metrics'][column]
+        for factor, score in calculator._calculate_all_factors(expected['parsed_metrics']).items():
+            assert row[factor] == score
+        assert row['overall_score'] == expected['overall_score']
+        assert (row['grade'], row['category'], row['score_range']) == (
+            expected['grade'], expected['category'], expected['score_range']
+        )
+    assert scored > 0
+
+
+def test_invalid_payloads_do_not_fail_the_batch(calculator):
+    """Each invalid payload gets the error the scalar path would raise"""
+    payloads = make_synthetic_payloads(2, seed=1) + [
+        {},
+        {'net_worth': {'netWorthResponse': {}}, 'transactions': {'transactionResponse': {'transactions': []}}},
+    ]
+    batch = calculator.calculate_fhs_batch(payloads, user_ids=['a', 'b', 'c', 'd'])
+
+    assert list(batch.index) == ['a', 'b', 'c', 'd']
+    assert batch.loc['c', 'error'] == "No Fi MCP data provided"
+    assert batch.loc['d', 'error'] == "Financial Health Score calculation failed: No transactions found in data"
+    assert pd.isna(batch.loc['c', 'overall_score'])
+
+
+def test_columnar_metrics_input(calculator):
+    """A table of parsed metrics scores the same as the payloads it came from"""
+    payloads = make_synthetic_payloads(50, seed=3)
+    from_payloads = calculator.calculate_fhs_batch(payloads)
+    from_table = calculator.calculate_fhs_batch(from_payloads[METRIC_COLUMNS])
+
+    valid = from_payloads['error'].isna()
+    assert (from_table['overall_score'][valid] == from_payloads['overall_score'][valid]).all()
+    assert (from_table['grade'][valid] == from_payloads['grade'][valid]).all()
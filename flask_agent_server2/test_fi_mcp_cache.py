@@ -0,0 +1,134 @@
+"""
+Tests for the per-user Fi MCP response cache
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from google.adk.tools.base_tool import BaseTool
+
+from oracle_agent import fi_mcp as oracle_fi_mcp
+from parallel_universe_agent import fi_mcp as universe_fi_mcp
+from tax_advisor_agent import fi_mcp as tax_fi_mcp
+
+FI_MCP_MODULES = [oracle_fi_mcp, tax_fi_mcp, universe_fi_mcp]
+
+
+def _response(text, is_error=False):
+    return SimpleNamespace(isError=is_error, content=[SimpleNamespace(text=text)])
+
+
+class FakeMCPTool(BaseTool):
+    """Returns queued responses and counts calls to the MCP server"""
+
+    def __init__(self, responses):
+        super().__init__(name='fetch_net_worth', description='Net worth')
+        self.responses = list(responses)
+        self.calls = 0
+
+    async def run_async(self, *, args, tool_context):
+        self.calls += 1
+        return self.responses.pop(0)
+
+
+def _tool_context(scope=None):
+    state = {} if scope is None else {oracle_fi_mcp.CACHE_SCOPE_STATE_KEY: scope}
+    return SimpleNamespace(state=state)
+
+
+def _call(tool, scope=None, args=None):
+    return asyncio.run(tool.run_async(args=args or {}, tool_context=_tool_context(scope)))
+
+
+@pytest.fixture(params=FI_MCP_MODULES, ids=lambda m: m.__name__.split('.')[0])
+def fi_mcp(request):
+    return request.param
+
+
+def test_entries_are_isolated_between_users(fi_mcp):
+    cache = fi_mcp.FiMCPResponseCache(ttl=60, max_entries=10)
+    cache.put('u1', 'fetch_net_worth', {}, 'u1 net worth')
+
+    assert cache.get('u1', 'fetch_net_worth', {}) == (True, 'u1 net worth')
+    assert cache.get('u2', 'fetch_net_worth', {}) == (False, None)
+    assert cache.get('u1', 'fetch_net_worth', {'period': 'ytd'}) == (False, None)
+
+    tool = fi_mcp.CachedMCPTool(FakeMCPTool([_response('a'), _response('b')]), cache)
+    assert _call(tool, 'u3').content[0].text == 'a'
+    assert _call(tool, 'u4').content[0].text == 'b'
+    assert _call(tool, 'u3').content[0].text == 'a'
+    assert tool._tool.calls == 2
+
+
+def test_refresh_bumps_the_snapshot_version_and_drops_the_users_entries(fi_mcp):
+    cache = fi_mcp.FiMCPResponseCache(ttl=60, max_entries=10)
+    cache.put('u1', 'fetch_net_worth', {}, 'old')
+    cache.put('u2', 'fetch_net_worth', {}, 'other user')
+
+    assert cache.refresh('u1') == 1
+    assert cache.snapshot_version('u1') == 1 and cache.snapshot_version('u2') == 0
+    assert cache.get('u1', 'fetch_net_worth', {}) == (False, None)
+    assert cache.get('u2', 'fetch_net_worth', {}) == (True, 'other user')
+    assert cache.get_stats()['entries'] == 1
+
+
+def test_refresh_tool_uses_the_scope_stamped_by_the_coordinator(fi_mcp, monkeypatch):
+    cache = fi_mcp.FiMCPResponseCache(ttl=60, max_entries=10)
+    monkeypatch.setattr(fi_mcp, 'response_cache', cache)
+    callback_context = SimpleNamespace(_invocation_context=SimpleNamespace(user_id='u1'), state={})
+    fi_mcp.scope_fi_mcp_cache(callback_context)
+    assert callback_context.state == {fi_mcp.CACHE_SCOPE_STATE_KEY: 'u1'}
+
+    cache.put('u1', 'fetch_net_worth', {}, 'old')
+    result = fi_mcp.refresh_fi_mcp_data(SimpleNamespace(state=callback_context.state))
+    assert result['status'] == 'refreshed' and result['snapshot_version'] == 1
+    assert cache.get('u1', 'fetch_net_worth', {}) == (False, None)
+
+    assert fi_mcp.refresh_fi_mcp_data(_tool_context())['status'] == 'nothing_cached'
+
+
+def test_errors_and_login_prompts_are_never_stored(fi_mcp):
+    cache = fi_mcp.FiMCPResponseCache(ttl=60, max_entries=10)
+    tool = fi_mcp.CachedMCPTool(FakeMCPTool([
+        _response('upstream failure', is_error=True),
+        _response('{"status": "login_required", "login_url": "https://fi.money/login"}'),
+        _response('{"netWorth": 100}'),
+        _response('unused'),
+    ]), cache)
+
+    assert _call(tool, 'u1').isError
+    assert 'login_required' in _call(tool, 'u1').content[0].text
+    assert _call(tool, 'u1').content[0].text == '{"netWorth": 100}'
+    assert _call(tool, 'u1').content[0].text == '{"netWorth": 100}'
+    assert tool._tool.calls == 3
+    assert cache.get_stats()['entries'] == 1
+
+
+def test_unscoped_calls_bypass_the_cache(fi_mcp):
+    cache = fi_mcp.FiMCPResponseCache(ttl=60, max_entries=10)
+    tool = fi_mcp.CachedMCPTool(FakeMCPTool([_response('a'), _response('b')]), cache)
+
+    assert _call(tool).content[0].text == 'a'
+    assert _call(tool).content[0].text == 'b'
+    assert cache.get_stats() == {'entries': 0, 'hits': 0, 'misses': 0, 'hit_rate': 0.0, 'ttl_seconds': 60}
+
+
+def test_ttl_expiry_and_lru_eviction(fi_mcp):
+    short_lived = fi_mcp.FiMCPResponseCache(ttl=0.05, max_entries=10)
+    short_lived.put('u1', 'fetch_net_worth', {}, 'stale')
+    time.sleep(0.1)
+    assert short_lived.get('u1', 'fetch_net_worth', {}) == (False, None)
+    assert short_lived.get_stats()['entries'] == 0
+
+    cache = fi_mcp.FiMCPResponseCache(ttl=60, max_entries=2)
+    cache.put('u1', 'fetch_net_worth', {}, 'net worth')
+    cache.put('u1', 'fetch_credit_report', {}, 'credit')
+    cache.get('u1', 'fetch_net_worth', {})  # most recently used
+    cache.put('u1', 'fetch_epf_details', {}, 'epf')
+
+    assert cache.get('u1', 'fetch_credit_report', {}) == (False, None)
+    assert cache.get('u1', 'fetch_net_worth', {}) == (True, 'net worth')
+    assert cache.get('u1', 'fetch_epf_details', {}) == (True, 'epf')
+    assert not fi_mcp.FiMCPResponseCache(ttl=0, max_entries=10).enabled
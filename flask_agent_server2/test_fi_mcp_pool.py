@@ -0,0 +1,141 @@
+"""
+Tests for the pooled Fi MCP toolsets and their health checks
+"""
+
+import asyncio
+import inspect
+
+from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset, StdioServerParameters
+from mcp.types import ListToolsResult, Tool
+
+from oracle_agent.fi_mcp import (
+    CachedMCPTool,
+    FiMCPResponseCache,
+    MCPToolsetRegistry,
+    PooledMCPToolset,
+)
+
+
+class FakeClientSession:
+    """Stands in for mcp.ClientSession: lists one tool and answers pings"""
+
+    def __init__(self, healthy=True):
+        self.healthy = healthy
+        self.pings = 0
+
+    async def send_ping(self):
+        self.pings += 1
+        if not self.healthy:
+            raise ConnectionError('broken pipe')
+
+    async def list_tools(self):
+        return ListToolsResult(tools=[Tool(name='fetch_net_worth', description='Net worth', inputSchema={'type': 'object'})])
+
+
+class FakeSessionManager:
+    """Stands in for MCPSessionManager and records every session it opens"""
+
+    def __init__(self, fail_create=False):
+        self.fail_create = fail_create
+        self.sessions = []
+        self.closed = 0
+
+    async def create_session(self):
+        if self.fail_create:
+            raise ConnectionError('npx mcp-remote exited')
+        self.sessions.append(FakeClientSession())
+        return self.sessions[-1]
+
+    async def close(self):
+        self.closed += 1
+
+
+def _params(url='https://fi.example/mcp'):
+    return StdioServerParameters(command='npx', args=['mcp-remote', url])
+
+
+def _fake(toolset, **kwargs):
+    toolset._mcp_session_manager = FakeSessionManager(**kwargs)
+    return toolset._mcp_session_manager
+
+
+def test_mcp_toolset_internals_used_by_the_pool():
+    """PooledMCPToolset relies on these private MCPToolset details; update it if this fails"""
+    toolset = MCPToolset(connection_params=_params())
+    assert toolset._session is None
+    assert hasattr(toolset, '_mcp_session_manager')
+    assert inspect.iscoroutinefunction(MCPToolset._reinitialize_session)
+
+    manager = _fake(toolset)
+    asyncio.run(toolset.get_tools())
+    assert toolset._session is manager.sessions[0]
+    asyncio.run(toolset._reinitialize_session())
+    assert manager.closed == 1 and toolset._session is manager.sessions[1]
+
+
+def test_pool_hands_out_connections_round_robin_and_shares_by_connection_key():
+    registry = MCPToolsetRegistry(pool_size=2)
+    handed_out = [registry.get_toolset(_params()) for _ in range(5)]
+    first, second = handed_out[:2]
+
+    assert first is not second
+    assert handed_out == [first, second, first, second, first]
+    assert registry.get_toolset(_params('https://other.example/mcp')) not in (first, second)
+    assert registry.get_stats()['connections'] == {
+        'npx mcp-remote https://fi.example/mcp': 2, 'npx mcp-remote https://other.example/mcp': 1,
+    }
+    assert MCPToolsetRegistry(pool_size=0).pool_size == 1
+
+
+def test_idle_connection_is_pinged_and_reconnected_when_the_ping_fails():
+    toolset = PooledMCPToolset(connection_params=_params(), health_check_interval=0, health_check_timeout=1)
+    manager = _fake(toolset)
+
+    asyncio.run(toolset.get_tools())
+    assert len(manager.sessions) == 1  # a fresh connection is not pinged
+
+    asyncio.run(toolset.get_tools())
+    assert manager.sessions[0].pings == 1 and len(manager.sessions) == 1
+
+    manager.sessions[0].healthy = False
+    tools = asyncio.run(toolset.get_tools())
+    assert len(manager.sessions) == 2 and manager.closed == 1
+    assert toolset._session is manager.sessions[1]
+    assert [tool.name for tool in tools] == ['fetch_net_worth']
+
+
+def test_recently_used_connection_is_not_pinged():
+    toolset = PooledMCPToolset(connection_params=_params(), health_check_interval=60, health_check_timeout=1)
+    manager = _fake(toolset)
+    asyncio.run(toolset.get_tools())
+    asyncio.run(toolset.get_tools())
+    assert manager.sessions[0].pings == 0
+
+
+def test_tools_are_wrapped_with_the_response_cache():
+    toolset = PooledMCPToolset(
+        connection_params=_params(), health_check_interval=60, health_check_timeout=1,
+        response_cache=FiMCPResponseCache(ttl=60, max_entries=10),
+    )
+    _fake(toolset)
+    assert all(isinstance(tool, CachedMCPTool) for tool in asyncio.run(toolset.get_tools()))
+
+
+def test_health_check_statuses_and_close():
+    registry = MCPToolsetRegistry(pool_size=4)
+    idle, healthy, reconnected, unhealthy = [registry.get_toolset(_params()) for _ in range(4)]
+    managers = [_fake(toolset) for toolset in (idle, healthy, reconnected, unhealthy)]
+
+    async def scenario():
+        for toolset in (healthy, reconnected, unhealthy):
+            await toolset.get_tools()
+        reconnected._session.healthy = False
+        unhealthy._session.healthy = False
+        managers[3].fail_create = True
+        statuses = await registry.health_check()
+        await registry.close()
+        return statuses
+
+    statuses = asyncio.run(scenario())
+    assert statuses == {'npx mcp-remote https://fi.example/mcp': ['idle', 'healthy', 'reconnected', 'unhealthy']}
+    assert [manager.closed for manager in managers] == [1, 1, 2, 2]
@@ -0,0 +1,73 @@
+"""
+Tests for the goal timeline solver
+"""
+
+import asyncio
+from datetime import date
+
+import numpy as np
+
+from oracle_agent.sub_agents.timeline_predictor.goal_solver import (
+    GoalTimelineSolver,
+    annuity_balances,
+    solve_goal_timelines,
+)
+
+
+def test_closed_form_matches_month_by_month_balance():
+    """Yearly step-ups and month-end contributions agree with a plain loop"""
+    for rate, step_up in [(0.008, 0.1), (0.0, 0.05), (0.01, 0.0)]:
+        closed_form = annuity_balances(np.array([100_000.0]), np.array([20_000.0]), rate, step_up, 100)[0]
+        balance, contribution, expected = 100_000.0, 20_000.0, [100_000.0]
+        for month in range(100):
+            if month and month % 12 == 0:
+                contribution *= 1 + step_up
+            balance = balance * (1 + rate) + contribution
+            expected.append(balance)
+        np.testing.assert_allclose(closed_form, expected, rtol=1e-9)
+
+
+def test_zero_volatility_simulation_matches_deterministic_path():
+    goal = {'name': 'Corpus', 'target_amount': 1_000_000, 'monthly_contribution': 10_000}
+    result = GoalTimelineSolver(num_paths=1_000).solve(
+        [goal], {'annual_return_volatility': 0, 'inflation_volatility': 0}, start_date=date(2025, 1, 1),
+    )['goals'][0]
+
+    assert result['deterministic']['months_to_goal'] == 108
+    assert result['deterministic']['completion_date'] == '2034-01'
+    assert result['deterministic']['milestone_dates'] == result['simulated']['milestone_dates']
+    assert result['paths']['primary'] == {
+        'completion_date': '2034-01', 'confidence_interval_months': 0, 'earliest': '2034-01', 'latest': '2034-01',
+    }
+
+
+def test_many_goals_in_one_call():
+    """Paths are ordered, deadlines report the contribution they need, unreachable goals have no date"""
+    result = asyncio.run(solve_goal_timelines(
+        ['Home', 'Education', 'Moonshot'], [5_000_000, 3_000_000, 1e12],
+        goal_current_amounts=[1_000_000, 200_000, 0], goal_monthly_contributions=[40_000, 15_000, 1_000],
+        goal_target_years=[10, 0, 0], num_paths=2_000,
+    ))
+    home, education, moonshot = result['goals']
+    paths = home['paths']
+
+    assert result['status'] == 'success'
+    assert paths['accelerated']['completion_date'] <= paths['primary']['completion_date'] \
+        <= paths['conservative']['completion_date']
+    assert paths['primary']['confidence_interval_months'] > 0
+    assert home['deadline']['on_track'] and home['deadline']['required_monthly_contribution'] < 40_000
+    assert 'deadline' not in education
+    assert moonshot['deterministic']['completion_date'] is None
+    assert moonshot['simulated']['probability_within_horizon'] == 0
+
+    assert asyncio.run(solve_goal_timelines(['Home'], [5_000_000, 1]))['status'] == 'error'
+    assert asyncio.run(solve_goal_timelines(['Home'], [-1]))['status'] == 'error'
+    assert asyncio.run(solve_goal_timelines(['Home'], []))['status'] == 'error'
+
+
+def test_goal_and_path_caps():
+    too_many_goals = asyncio.run(solve_goal_timelines([f'Goal {i}' for i in range(11)], [1_000_000] * 11))
+    assert too_many_goals['status'] == 'error' and '10 goals' in too_many_goals['error_message']
+
+    too_many_paths = asyncio.run(solve_goal_timelines(['Home'], [5_000_000], num_paths=200_000))
+    assert too_many_paths['status'] == 'error' and '100,000' in too_many_paths['error_message']
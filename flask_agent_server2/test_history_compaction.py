@@ -0,0 +1,95 @@
+"""
+Tests for compacting long conversation histories into a rolling digest
+"""
+
+import asyncio
+from typing import AsyncGenerator, List
+
+from google.adk.agents import LlmAgent
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from tax_advisor_agent import history_compaction
+from tax_advisor_agent.history_compaction import DIGEST_STATE_KEY, compact_history, split_turns
+
+
+class RecordingLlm(BaseLlm):
+    """Echoes a long reply and records the contents of every request"""
+    requests: List[List[types.Content]] = []
+
+    async def generate_content_async(self, llm_request: LlmRequest, stream: bool = False) -> AsyncGenerator[LlmResponse, None]:
+        self.requests.append(list(llm_request.contents))
+        text = f"Reply {len(self.requests)}: " + 'analysis ' * 100
+        yield LlmResponse(content=types.Content(role='model', parts=[types.Part(text=text)]))
+
+
+class DigestLlm(BaseLlm):
+    prompts: List[str] = []
+
+    async def generate_content_async(self, llm_request: LlmRequest, stream: bool = False) -> AsyncGenerator[LlmResponse, None]:
+        self.prompts.append(llm_request.contents[0].parts[0].text)
+        yield LlmResponse(content=types.Content(role='model', parts=[types.Part(text=f'- digest {len(self.prompts)}')]))
+
+
+def _text(content):
+    return ''.join(part.text or '' for part in content.parts)
+
+
+async def _chat(agent, messages, state):
+    runner = Runner(app_name='compaction_test', agent=agent, session_service=InMemorySessionService())
+    session = await runner.session_service.create_session(app_name='compaction_test', user_id='u1', state=state)
+    for message in messages:
+        content = types.Content(role='user', parts=[types.Part(text=message)])
+        async for _ in runner.run_async(user_id='u1', session_id=session.id, new_message=content):
+            pass
+    return await runner.session_service.get_session(app_name='compaction_test', user_id='u1', session_id=session.id)
+
+
+def test_split_turns_keeps_tool_results_with_their_turn():
+    call = types.Content(role='model', parts=[types.Part(function_call=types.FunctionCall(name='fetch', args={}))])
+    result = types.Content(role='user', parts=[types.Part(function_response=types.FunctionResponse(name='fetch', response={'ok': 1}))])
+    contents = [
+        types.Content(role='user', parts=[types.Part(text='q1')]), call, result,
+        types.Content(role='model', parts=[types.Part(text='a1')]),
+        types.Content(role='user', parts=[types.Part(text='q2')]),
+    ]
+    assert [len(turn) for turn in split_turns(contents)] == [4, 1]
+
+
+def test_older_turns_are_folded_into_a_digest(monkeypatch):
+    monkeypatch.setitem(history_compaction.HISTORY_TOKEN_BUDGETS, 'tax_advisor_coordinator', 400)
+    monkeypatch.setattr(history_compaction, 'KEEP_RECENT_TURNS', 2)
+    digest_llm = DigestLlm(model='digest', prompts=[])
+    monkeypatch.setattr(history_compaction.LLMRegistry, 'new_llm', staticmethod(lambda model: digest_llm))
+    llm = RecordingLlm(model='recording', requests=[])
+    agent = LlmAgent(name='tax_advisor_coordinator', model=llm, instruction='Advise', before_model_callback=compact_history)
+
+    analysis = '| Regime | Tax |\n| New | 1,17,000 |'
+    session = asyncio.run(_chat(agent, [f'question {i}' for i in range(1, 7)], {'tax_analyzer_output': analysis}))
+
+    # Short histories are sent untouched
+    assert [_text(c) for c in llm.requests[1] if c.role == 'user'] == ['question 1', 'question 2']
+
+    last = llm.requests[-1]
+    assert 'Summary of the earlier conversation' in _text(last[0])
+    assert analysis in _text(last[0])  # structured output carried verbatim
+    assert [_text(c) for c in last if c.role == 'user'][1:] == ['question 5', 'question 6']
+    assert len(last) < len(llm.requests[-2]) + 2
+
+    digest = session.state[DIGEST_STATE_KEY]
+    assert digest['turns'] == 4
+    assert digest['text'] == f'- digest {len(digest_llm.prompts)}'
+    assert 'Summary so far:\n- digest 1' in digest_llm.prompts[-1]  # the digest rolls forward
+
+
+def test_agents_without_a_budget_are_untouched():
+    request = LlmRequest(contents=[types.Content(role='user', parts=[types.Part(text='q ' * 50000)])])
+
+    class Context:
+        agent_name = 'tax_search_agent'
+        state = {}
+
+    asyncio.run(compact_history(Context(), request))
+    assert len(request.contents) == 1
@@ -0,0 +1,110 @@
+"""
+Tests for the background job queue
+"""
+
+import itertools
+import threading
+import time
+
+from job_queue import JobManager, JobStore, COMPLETED, CANCELLED, ERROR, PROCESSING
+
+
+def _wait_for(job, status, timeout=5):
+    deadline = time.monotonic() + timeout
+    while job.status != status:
+        assert time.monotonic() < deadline, f"job stayed {job.status}, expected {status}"
+        time.sleep(0.01)
+
+
+def test_in_flight_jobs_are_deduplicated_per_user():
+    """A second submission for the same user joins the running job"""
+    release = threading.Event()
+    calls = []
+
+    def work(job):
+        calls.append(job.user_id)
+        release.wait(5)
+        return {'answer': 42}
+
+    manager = JobManager(JobStore(), max_workers=2)
+    first, created_first = manager.submit('analysis', 'user_a', work)
+    second, created_second = manager.submit('analysis', 'user_a', work)
+    other, created_other = manager.submit('analysis', 'user_b', work)
+    release.set()
+    _wait_for(first, COMPLETED)
+    _wait_for(other, COMPLETED)
+
+    assert created_first and not created_second and created_other
+    assert second is first
+    assert sorted(calls) == ['user_a', 'user_b']
+    assert first.result == {'answer': 42}
+
+    third, created_third = manager.submit('analysis', 'user_a', work)
+    assert created_third and third is not first
+    _wait_for(third, COMPLETED)
+
+
+def test_cancel_stops_a_running_job():
+    """Cancelled jobs stop at their next check and never report a result"""
+    def work(job):
+        for _ in job.cancellable(itertools.count()):
+            time.sleep(0.01)
+
+    manager = JobManager(JobStore(), max_workers=1)
+    job, _ = manager.submit('analysis', 'user_a', work)
+    _wait_for(job, PROCESSING)
+    manager.cancel(job.job_id)
+
+    assert job.status == CANCELLED
+    assert job.result is None
+    replacement, created = manager.submit('analysis', 'user_a', lambda job: 'fresh')
+    assert created
+    _wait_for(replacement, COMPLETED)
+
+
+def test_results_are_persisted_and_restored(tmp_path):
+    """Finished jobs survive a restart; interrupted ones are marked as failed"""
+    manager = JobManager(JobStore(str(tmp_path)), max_workers=1)
+    job, _ = manager.submit('analysis', 'user_a', lambda job: {'universes': 5})
+    _wait_for(job, COMPLETED)
+
+    release = threading.Event()
+    running, _ = manager.submit('analysis', 'user_b', lambda job: release.wait(5))
+    _wait_for(running, PROCESSING)
+
+    restored = JobManager(JobStore(str(tmp_path)), max_workers=1)
+    release.set()
+
+    assert restored.get_latest('analysis', 'user_a').result == {'universes': 5}
+    assert restored.get(running.job_id).status == ERROR
+
+
+def test_results_directory_is_created_on_first_write(tmp_path):
+    directory = tmp_path / 'job_results'
+    manager = JobManager(JobStore(str(directory)), max_workers=1)
+    assert not directory.exists()
+
+    job, _ = manager.submit('analysis', 'user_a', lambda job: 'done')
+    _wait_for(job, COMPLETED)
+    assert (directory / f'{job.job_id}.json').exists()
+
+
+def test_listeners_receive_status_and_progress_updates():
+    """Listeners see every status change and progress step, ending with the result"""
+    updates = []
+    manager = JobManager(JobStore(), max_workers=1)
+    manager.add_listener(lambda job: updates.append((job.status, job.progress)))
+
+    def work(job):
+        job.update_progress('step 1')
+        return 'done'
+
+    job, _ = manager.submit('analysis', 'user_a', work)
+    _wait_for(job, COMPLETED)
+
+    assert updates == [
+        ('pending', None),
+        ('processing', None),
+        ('processing', 'step 1'),
+        ('completed', 'step 1'),
+    ]
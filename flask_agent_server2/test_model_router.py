@@ -0,0 +1,105 @@
+"""
+Tests for per-agent model routing and escalation to pro
+"""
+
+import asyncio
+import json
+from typing import AsyncGenerator, List
+
+import pytest
+from google.adk.agents import LlmAgent
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from parallel_universe_agent import model_router
+from parallel_universe_agent.model_router import (
+    COMPLEX, PRO, SIMPLE, STANDARD, TIER_MODELS, classify_request, escalate_invalid_output, model_for, route_model,
+)
+
+VALID_SYNTHESIS = '```json\n' + json.dumps({'parallel_universe_analysis': {'universes': []}}) + '\n```'
+
+
+class ScriptedLlm(BaseLlm):
+    """Replies with a fixed text per model name and records which models were called"""
+    replies: dict
+    calls: List[str] = []
+
+    async def generate_content_async(self, llm_request: LlmRequest, stream: bool = False) -> AsyncGenerator[LlmResponse, None]:
+        self.calls.append(llm_request.model)
+        text = self.replies[llm_request.model]
+        yield LlmResponse(content=types.Content(role='model', parts=[types.Part(text=text)]))
+
+
+async def _run(agent, text):
+    runner = Runner(app_name='routing_test', agent=agent, session_service=InMemorySessionService())
+    session = await runner.session_service.create_session(app_name='routing_test', user_id='u1')
+    message = types.Content(role='user', parts=[types.Part(text=text)])
+    events = [event async for event in runner.run_async(user_id='u1', session_id=session.id, new_message=message)]
+    return events[-1].content.parts[0].text
+
+
+def _synthesizer(llm):
+    return LlmAgent(
+        name='insight_synthesizer_agent', model=llm, instruction='Synthesize',
+        before_model_callback=route_model, after_model_callback=escalate_invalid_output,
+    )
+
+
+def test_classify_request():
+    assert classify_request('thanks!') == SIMPLE
+    assert classify_request('') == SIMPLE
+    assert classify_request('What is my net worth?') == STANDARD
+    assert classify_request('Give me a comprehensive review of my portfolio') == COMPLEX
+    assert classify_request('word ' * 80) == COMPLEX
+
+
+def test_model_for_uses_agent_and_request_class():
+    assert model_for('financial_analysis_coordinator') == TIER_MODELS[PRO]
+    assert model_for('financial_analysis_coordinator', SIMPLE) == TIER_MODELS['flash']
+    assert model_for('future_simulator_agent') == TIER_MODELS['flash']
+    assert model_for('future_simulator_agent', COMPLEX) == TIER_MODELS[PRO]
+    assert model_for('unknown_agent') == TIER_MODELS[PRO]
+
+
+def test_overrides_accept_tiers_and_model_names():
+    routes = {'tax_planner_agent': {'default': 'pro'}}
+    model_router._apply_overrides(routes, 'tax_planner_agent=flash, new_agent:complex=custom-model,broken')
+    assert routes == {
+        'tax_planner_agent': {'default': 'flash'},
+        'new_agent': {'complex': 'custom-model'},
+    }
+
+
+def test_valid_flash_output_is_kept():
+    llm = ScriptedLlm(model='unused', replies={TIER_MODELS['flash']: VALID_SYNTHESIS}, calls=[])
+    text = asyncio.run(_run(_synthesizer(llm), 'Explore my alternative universes'))
+    assert text == VALID_SYNTHESIS
+    assert llm.calls == [TIER_MODELS['flash']]
+
+
+def test_invalid_flash_output_escalates_to_pro(monkeypatch):
+    llm = ScriptedLlm(
+        model='unused', calls=[],
+        replies={TIER_MODELS['flash']: '```json\n{"parallel_universe_analysis": \n```', TIER_MODELS[PRO]: VALID_SYNTHESIS},
+    )
+    monkeypatch.setattr(model_router.LLMRegistry, 'new_llm', staticmethod(lambda model: llm))
+    before = model_router.get_routing_stats()['escalations'].get('insight_synthesizer_agent', 0)
+
+    text = asyncio.run(_run(_synthesizer(llm), 'Explore my alternative universes'))
+
+    assert text == VALID_SYNTHESIS
+    assert llm.calls == [TIER_MODELS['flash'], TIER_MODELS[PRO]]
+    assert model_router.get_routing_stats()['escalations']['insight_synthesizer_agent'] == before + 1
+    assert not model_router._pending
+
+
+@pytest.mark.parametrize('text, valid', [
+    ('**Overall Financial Health Score: 742/1000**\nGrade: A', True),
+    ('Overall Financial Health Score: [XXX]/1000', False),
+    ('⚠️ **Financial Data Access Error**', True),
+    ('Your finances look fine.', False),
+])
+def test_health_score_validator(text, valid):
+    assert model_router.OUTPUT_VALIDATORS['financial_health_score_agent'](text) is valid
@@ -0,0 +1,106 @@
+"""
+Tests for the vectorized Monte Carlo wealth simulator
+"""
+
+import asyncio
+import inspect
+from datetime import date
+
+from oracle_agent.sub_agents.future_simulator.monte_carlo import (
+    MonteCarloSimulator,
+    run_monte_carlo_simulation,
+)
+
+BASELINE = {'current_net_worth': 1_000_000, 'monthly_income': 100_000, 'monthly_expenses': 50_000}
+START = date(2025, 1, 1)
+
+
+def test_same_seed_gives_the_same_projection():
+    goals = [{'name': 'Home', 'target_amount': 5_000_000}]
+    first = MonteCarloSimulator(num_paths=2_000, seed=7).simulate(BASELINE, {}, 10, goals, START)
+    second = MonteCarloSimulator(num_paths=2_000, seed=7).simulate(BASELINE, {}, 10, goals, START)
+    other = MonteCarloSimulator(num_paths=2_000, seed=8).simulate(BASELINE, {}, 10, goals, START)
+
+    assert first == second
+    assert first['percentile_bands'] != other['percentile_bands']
+
+
+def test_percentile_bands_are_yearly_and_ordered():
+    result = MonteCarloSimulator(num_paths=5_000).simulate(BASELINE, {}, 15, start_date=START)
+    bands = result['percentile_bands']
+
+    assert [band['year'] for band in bands] == list(range(1, 16))
+    for band in bands:
+        assert band['p5'] <= band['p25'] <= band['p50'] <= band['p75'] <= band['p95']
+        assert band['real_p50'] < band['p50']  # inflation-adjusted
+    assert bands[-1]['p95'] - bands[-1]['p5'] > bands[0]['p95'] - bands[0]['p5']
+    assert result['final_distribution']['median'] == bands[-1]['p50']
+
+
+def test_goal_probabilities():
+    goals = [
+        {'name': 'Already there', 'target_amount': 500_000},
+        {'name': 'Likely', 'target_amount': 3_000_000},
+        {'name': 'Moonshot', 'target_amount': 1e12},
+    ]
+    reached, likely, moonshot = MonteCarloSimulator(num_paths=5_000).simulate(
+        BASELINE, {}, 10, goals, START
+    )['goals']
+
+    assert reached['probability_by_horizon'] == 1.0
+    assert reached['milestone_dates'] == {'p25': '2025-01', 'p50': '2025-01', 'p75': '2025-01'}
+    assert 0.9 < likely['probability_by_horizon'] <= 1.0
+    assert likely['milestone_dates']['p25'] <= likely['milestone_dates']['p50'] <= likely['milestone_dates']['p75']
+    assert moonshot['probability_by_horizon'] == 0.0
+    assert moonshot['milestone_dates'] == {'p25': None, 'p50': None, 'p75': None}
+
+
+def test_zero_volatility_milestones_match_a_month_by_month_projection():
+    assumptions = {
+        'annual_return_volatility': 0, 'inflation_volatility': 0, 'income_shock_probability': 0,
+    }
+    goal = {'name': 'Corpus', 'target_amount': 5_000_000}
+    result = MonteCarloSimulator(num_paths=1_000).simulate(BASELINE, assumptions, 10, [goal], START)['goals'][0]
+
+    wealth, income, expenses = 1_000_000.0, 100_000.0, 50_000.0
+    monthly_return = 1.10 ** (1 / 12) - 1
+    monthly_inflation = 1.06 ** (1 / 12) - 1
+    month = 0
+    while wealth < goal['target_amount']:
+        if month and month % 12 == 0:
+            income *= 1.05
+        expenses *= 1 + monthly_inflation
+        wealth = wealth * (1 + monthly_return) + income - expenses
+        month += 1
+    expected = f"{2025 + month // 12:04d}-{month % 12 + 1:02d}"
+
+    assert result['probability_by_horizon'] == 1.0
+    assert result['milestone_dates'] == {'p25': expected, 'p50': expected, 'p75': expected}
+
+
+def test_tool_runs_off_the_event_loop_and_reports_input_errors():
+    assert inspect.iscoroutinefunction(run_monte_carlo_simulation)
+
+    async def run_with_ticker():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.001)
+
+        task = asyncio.create_task(ticker())
+        result = await run_monte_carlo_simulation(
+            1_000_000, 100_000, 50_000, horizon_years=30, num_paths=100_000,
+            goal_names=['Home'], goal_amounts=[5_000_000],
+        )
+        task.cancel()
+        return result, ticks
+
+    result, ticks = asyncio.run(run_with_ticker())
+    assert result['status'] == 'success' and result['goals'][0]['name'] == 'Home'
+    assert ticks > 5  # the loop kept running while the simulation did
+
+    error = asyncio.run(run_monte_carlo_simulation(1_000_000, 100_000, 50_000, horizon_years=80))
+    assert error['status'] == 'error' and 'horizon_years' in error['error_message']
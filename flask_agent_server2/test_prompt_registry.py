@@ -0,0 +1,74 @@
+"""
+Tests for instruction prompt budgets and query-dependent prompt sections
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from google.genai import types
+
+import oracle_agent.agent  # noqa: F401  (registers the prompts)
+import parallel_universe_agent.agent  # noqa: F401
+import tax_advisor_agent.agent  # noqa: F401
+from oracle_agent import prompt_registry as oracle_prompts
+from parallel_universe_agent import prompt_registry as universe_prompts
+from tax_advisor_agent import prompt_registry as tax_prompts
+from tax_advisor_agent.sub_agents.tax_scenario_modeler import prompt as scenario_prompt
+from tax_advisor_agent.sub_agents.tax_scenario_modeler.agent import tax_scenario_modeler_agent
+
+REGISTRIES = [oracle_prompts, tax_prompts, universe_prompts]
+
+
+def _context(text):
+    content = types.Content(role='user', parts=[types.Part(text=text)])
+    return SimpleNamespace(user_content=content)
+
+
+@pytest.mark.parametrize('registry', REGISTRIES, ids=lambda r: r.__name__.split('.')[0])
+def test_registered_prompts_fit_their_budgets(registry):
+    prompts = registry.registered_prompts()
+    assert prompts
+    for name, registered in prompts.items():
+        assert registered.budget, f"{name} has no prompt token budget"
+        assert registered.full_tokens <= registered.budget, (
+            f"{name} prompt is ~{registered.full_tokens} tokens, over its {registered.budget} budget"
+        )
+
+
+def test_every_budget_belongs_to_a_registered_prompt():
+    registered = set().union(*(registry.registered_prompts() for registry in REGISTRIES))
+    assert set(tax_prompts.PROMPT_TOKEN_BUDGETS) == registered
+
+
+def test_scenario_modeler_sends_only_the_sections_a_request_needs():
+    registered = tax_prompts.registered_prompts()['tax_scenario_modeler_agent']
+    assert registered.full_text == scenario_prompt.TAX_SCENARIO_MODELER_PROMPT
+
+    regime = registered.instruction(_context('Compare old vs new regime for my income'))
+    harvest = registered.instruction(_context('Should I harvest LTCG on my equity mutual funds this year?'))
+    general = registered.instruction(_context('Model a few tax scenarios for me'))
+
+    assert '**Old vs New Tax Regime Comparison**' in regime
+    assert '**LTCG Harvesting Scenarios**' not in regime
+    assert '**LTCG Harvesting Scenarios**' in harvest
+    assert '**Old vs New Tax Regime Comparison**' not in harvest
+    assert general == registered.full_text
+    for text in (regime, harvest):
+        assert text.startswith(scenario_prompt.TAX_SCENARIO_MODELER_BASE_PROMPT)
+        assert text.endswith(scenario_prompt.TAX_SCENARIO_MODELER_CLOSING_PROMPT)
+        assert tax_prompts.estimate_tokens(text) < registered.full_tokens * 0.6
+
+    assert registered.select_sections('Buying a house with a home loan after marriage') == [
+        'home_and_portfolio', 'life_events'
+    ]
+    assert registered.report()['calls'] >= 3
+
+
+def test_agent_resolves_the_sectioned_instruction():
+    instruction, bypass_state_injection = asyncio.run(
+        tax_scenario_modeler_agent.canonical_instruction(_context('Is the new regime better after my hike?'))
+    )
+    assert bypass_state_injection
+    assert '**Job Change Scenario**' in instruction
+    assert '**Marriage Tax Planning Scenarios**' not in instruction
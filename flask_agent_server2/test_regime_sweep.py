@@ -0,0 +1,55 @@
+"""
+Tests for the vectorized regime breakeven sweep
+"""
+
+import numpy as np
+import pytest
+
+from tax_advisor_agent.regime_sweep import RegimeSweep, analyze_regime_breakeven
+from tax_advisor_agent.tax_engine import tax_engine
+
+
+@pytest.mark.parametrize('assessment_year,age', [('2024-25', 30), ('2025-26', 65), ('2026-27', 85)])
+def test_sweep_matches_scalar_engine(assessment_year, age):
+    """Every grid point equals the scalar engine, across rebate, slab and surcharge boundaries"""
+    salaries = np.array([0, 300_000, 775_000, 1_275_000, 1_300_000, 2_500_000, 5_060_000, 10_100_000, 60_000_000])
+    deductions = np.array([0, 150_000, 425_000, 2_000_000])
+    surface = RegimeSweep(assessment_year, age).savings_surface(salaries, deductions)
+
+    for i, salary in enumerate(salaries):
+        for j, deduction in enumerate(deductions):
+            expected = tax_engine.compare_regimes(
+                {'gross_salary': salary, 'other_deductions': deduction}, assessment_year, age
+            )
+            assert surface['old'][i, j] == expected['old_regime']['total_tax']
+            assert surface['new'][i, j] == expected['new_regime']['total_tax']
+
+
+def test_breakeven_is_the_smallest_winning_deduction():
+    """At the breakeven the old regime is strictly cheaper, one rupee less and it is not"""
+    sweep = RegimeSweep('2026-27')
+    salaries = np.linspace(500_000, 6_000_000, 200)
+    breakeven = sweep.breakeven_deductions(salaries)
+
+    assert np.isnan(breakeven[0])  # no tax under either regime
+    for salary, deduction in zip(salaries, breakeven):
+        if np.isnan(deduction):
+            continue
+        at = sweep.taxes(salary, deduction)
+        below = sweep.taxes(salary, deduction - 1)
+        assert at['old'] < at['new']
+        assert below['old'] >= below['new']
+
+
+def test_tool_projection_and_switch_year():
+    """Deductions that stop growing lose to the new regime as salary rises"""
+    result = analyze_regime_breakeven(1_500_000, 600_000, annual_salary_growth=0.15, projection_years=5)
+    projection = result['projection']
+
+    assert result['status'] == 'success'
+    assert projection['recommended_regime'][0] == result['current']['recommended_regime'] == 'old'
+    assert projection['first_switch_year'] is not None
+    assert projection['total_if_optimal'] <= min(projection['total_if_always_old'], projection['total_if_always_new'])
+    assert len(result['savings_surface']['new_regime_savings']) == len(result['breakeven_curve']['salaries'])
+
+    assert analyze_regime_breakeven(1_000_000, 0, assessment_year='2019-20')['status'] == 'error'
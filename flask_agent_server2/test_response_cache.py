@@ -0,0 +1,116 @@
+"""
+Tests for the semantic response cache
+"""
+
+import time
+
+from response_cache import SemanticResponseCache, normalize_query
+
+
+def test_normalization_ignores_phrasing_and_rejects_follow_ups():
+    assert normalize_query("What's my health score?") == normalize_query('my health score')
+    assert normalize_query('Is the old regime better than the new regime?') == (
+        'old', 'regime', 'better', 'than', 'new', 'regime'
+    )
+    assert normalize_query("Shouldn't I switch regimes") == ('not', 'switch', 'regime')
+    assert normalize_query('What about that one?') is None
+
+
+def test_exact_and_similar_questions_hit():
+    cache = SemanticResponseCache(ttl=60, similarity_threshold=0.8)
+    assert cache.put('oracle_agent', 'u1', "What's my health score?", 'Score: 742/1000')
+
+    exact = cache.get('oracle_agent', 'u1', 'my health score')
+    assert exact['response'] == 'Score: 742/1000'
+    assert exact['similarity'] == 1.0
+
+    similar = cache.get('oracle_agent', 'u1', 'What is my financial health score?')
+    assert similar['response'] == 'Score: 742/1000'
+    assert 0.8 <= similar['similarity'] < 1.0
+    assert cache.get_stats()['similar_hits'] == 1
+
+
+def test_misses_across_apps_users_numbers_and_short_queries():
+    cache = SemanticResponseCache(ttl=60, similarity_threshold=0.5)
+    cache.put('tax_advisor_agent', 'u1', 'Tax if I invest 50000 in ELSS', 'Saves 15,600')
+
+    assert cache.get('oracle_agent', 'u1', 'Tax if I invest 50000 in ELSS') is None
+    assert cache.get('tax_advisor_agent', 'u2', 'Tax if I invest 50000 in ELSS') is None
+    assert cache.get('tax_advisor_agent', 'u1', 'Tax if I invest 150000 in ELSS') is None
+    assert not cache.put('tax_advisor_agent', 'u1', 'yes', 'ok')
+    assert cache.get('tax_advisor_agent', 'u1', 'yes') is None
+
+
+def test_invalidation_and_ttl():
+    cache = SemanticResponseCache(ttl=60)
+    cache.put('oracle_agent', 'u1', 'net worth breakdown', 'Net worth: 12L')
+    cache.put('tax_advisor_agent', 'u1', 'old vs new regime', 'New regime saves 8,000')
+    cache.put('oracle_agent', 'u2', 'net worth breakdown', 'Net worth: 3L')
+
+    assert cache.invalidate_user('u1') == 1
+    assert cache.get('oracle_agent', 'u1', 'net worth breakdown') is None
+    assert cache.get('tax_advisor_agent', 'u1', 'old vs new regime') is None
+    assert cache.get('oracle_agent', 'u2', 'net worth breakdown')['response'] == 'Net worth: 3L'
+
+    short_lived = SemanticResponseCache(ttl=0.05)
+    short_lived.put('oracle_agent', 'u1', 'net worth breakdown', 'Net worth: 12L')
+    time.sleep(0.1)
+    assert short_lived.get('oracle_agent', 'u1', 'net worth breakdown') is None
+    assert len(short_lived) == 0
+
+
+def test_default_threshold_only_serves_exact_normalized_matches():
+    cache = SemanticResponseCache(ttl=60)
+    cache.put('oracle_agent', 'u1', "What's my health score?", 'Score: 742/1000')
+
+    assert cache.get('oracle_agent', 'u1', 'health score of mine')['response'] == 'Score: 742/1000'
+    assert cache.get('oracle_agent', 'u1', 'What is my financial health score?') is None
+
+
+def test_antonym_and_entity_swaps_miss():
+    cache = SemanticResponseCache(ttl=60, similarity_threshold=0.5)
+    cache.put('tax_advisor_agent', 'u1',
+              'Should I sell my equity mutual fund holdings before march for tax harvesting', 'Sell before March')
+    cache.put('tax_advisor_agent', 'u1',
+              'Am I paying more tax under the new regime than the old regime', 'Yes, 8,000 more')
+    cache.put('oracle_agent', 'u1', 'How is my HDFC credit card utilization', 'HDFC: 32%')
+
+    assert cache.get('tax_advisor_agent', 'u1',
+                     'Should I buy my equity mutual fund holdings before march for tax harvesting') is None
+    assert cache.get('tax_advisor_agent', 'u1',
+                     'Am I paying less tax under the new regime than the old regime') is None
+    assert cache.get('oracle_agent', 'u1', 'How is my ICICI credit card utilization') is None
+    assert cache.get_stats()['hits'] == 0
+
+
+def test_reversed_direction_and_order_miss():
+    pairs = [
+        ('Move my savings from FD to equity', 'Move my savings from equity to FD'),
+        ('Should I switch from old regime to new regime', 'Should I switch from new regime to old regime'),
+        ('Should I buy a car before a house', 'Should I buy a house before a car'),
+    ]
+    for threshold in (1.0, 0.5):
+        cache = SemanticResponseCache(ttl=60, similarity_threshold=threshold)
+        for first, second in pairs:
+            assert normalize_query(first) != normalize_query(second)
+            cache.put('oracle_agent', 'u1', first, f'Answer to: {first}')
+            assert cache.get('oracle_agent', 'u1', second) is None
+            assert cache.get('oracle_agent', 'u1', first)['response'] == f'Answer to: {first}'
+
+
+def test_embedder_similarity_and_lru_bound():
+    vectors = {
+        'retirement corpus needed': [1.0, 0.0],
+        'total retirement corpus needed': [0.95, 0.1],
+        'retirement corpus spent': [0.97, 0.05],
+    }
+    cache = SemanticResponseCache(ttl=60, max_entries=2, similarity_threshold=0.9, embedder=vectors.get)
+    cache.put('oracle_agent', 'u1', 'retirement corpus needed', 'About 4.2 Cr')
+    assert cache.get('oracle_agent', 'u1', 'total retirement corpus needed')['response'] == 'About 4.2 Cr'
+    assert cache.get('oracle_agent', 'u1', 'retirement corpus spent') is None  # close vectors, different question
+
+    cache.embedder = None
+    cache.put('oracle_agent', 'u1', 'emergency fund months', '5 months')
+    cache.put('oracle_agent', 'u1', 'credit score summary', '780')
+    assert len(cache) == 2
+    assert cache.get('oracle_agent', 'u1', 'retirement corpus needed') is None
@@ -0,0 +1,95 @@
+"""
+Tests for the batched scenario comparison engine
+"""
+
+import asyncio
+import inspect
+
+import numpy as np
+
+from oracle_agent.sub_agents.scenario_modeler.scenario_engine import ScenarioEngine, compare_financial_scenarios
+
+BASELINE = {'current_net_worth': 2_000_000, 'monthly_income': 150_000, 'monthly_expenses': 80_000}
+
+
+def test_no_change_scenario_matches_baseline_path_for_path():
+    """Scenarios share the market draws, so an empty spec reproduces the baseline exactly"""
+    result = ScenarioEngine(num_paths=1_000).compare(BASELINE, [{'name': 'Status quo'}], {}, horizon_years=5)
+    baseline, same = result['scenarios']
+
+    assert same['long_term'] == baseline['long_term']
+    assert same['versus_baseline']['median_difference'] == 0
+    assert same['versus_baseline']['probability_better_than_baseline'] == 0
+
+
+def test_deterministic_cash_flow_without_volatility():
+    """With no market or inflation noise the short-term cash flow is plain arithmetic"""
+    assumptions = {'equity_volatility': 0, 'debt_volatility': 0, 'inflation_volatility': 0, 'expected_inflation': 0}
+    result = ScenarioEngine(num_paths=1_000).compare(
+        BASELINE,
+        [{'name': 'Raise', 'monthly_income_change': 40_000}, {'name': 'Break', 'income_change_pct': -1.0,
+                                                               'start_month': 6, 'duration_months': 12}],
+        assumptions, horizon_years=3,
+    )
+    baseline, raise_, career_break = result['scenarios']
+
+    assert baseline['short_term']['monthly_cash_flow'] == 70_000
+    assert raise_['short_term']['monthly_cash_flow_change'] == 40_000
+    assert career_break['short_term']['starts_in_month'] == 6
+    assert career_break['short_term']['monthly_cash_flow'] == -80_000
+    assert raise_['versus_baseline']['probability_better_than_baseline'] == 1
+    assert career_break['versus_baseline']['median_difference'] < 0
+
+
+def test_tool_builds_goal_probability_matrix():
+    result = asyncio.run(compare_financial_scenarios(
+        2_000_000, 150_000, 80_000, ['Job switch', 'Home purchase'],
+        monthly_income_changes=[40_000, 0], monthly_expense_changes=[0, 35_000],
+        one_time_costs=[0, 1_500_000], one_time_cost_months=[0, 12],
+        goal_names=['Home', 'Retirement'], goal_amounts=[5_000_000, 30_000_000], goal_years=[5, 10],
+        num_paths=2_000,
+    ))
+    home, retirement = result['goal_probability_matrix']
+
+    assert result['status'] == 'success'
+    assert home['Job switch'] >= home['Baseline'] >= home['Home purchase']
+    assert set(retirement) == {'goal', 'target_amount', 'target_years', 'Baseline', 'Job switch', 'Home purchase'}
+    assert np.isclose(
+        result['scenarios'][1]['versus_baseline']['goal_probability_change_pp']['Home'],
+        (home['Job switch'] - home['Baseline']) * 100, atol=0.1,
+    )
+
+    assert asyncio.run(compare_financial_scenarios(1, 1, 1, ['A'], one_time_costs=[1, 2]))['status'] == 'error'
+    assert asyncio.run(compare_financial_scenarios(1, 1, 1, ['Baseline']))['status'] == 'error'
+
+
+def test_change_windows_outside_the_horizon_are_rejected():
+    for kwargs in ({'change_start_months': [-3]}, {'change_start_months': [120]}, {'change_duration_months': [-1]}):
+        result = asyncio.run(compare_financial_scenarios(1e6, 1e5, 6e4, ['x'], horizon_years=10, **kwargs))
+        assert result['status'] == 'error'
+        assert '_month' in result['error_message']
+
+
+def test_tool_runs_off_the_event_loop():
+    assert inspect.iscoroutinefunction(compare_financial_scenarios)
+
+    async def run_with_ticker():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.001)
+
+        task = asyncio.create_task(ticker())
+        result = await compare_financial_scenarios(
+            2_000_000, 150_000, 80_000, ['Job switch', 'Career break'],
+            monthly_income_changes=[40_000, -150_000], horizon_years=30, num_paths=50_000,
+        )
+        task.cancel()
+        return result, ticks
+
+    result, ticks = asyncio.run(run_with_ticker())
+    assert result['status'] == 'success'
+    assert ticks > 5  # the loop kept running while the scenarios were projected
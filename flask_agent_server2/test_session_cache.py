@@ -0,0 +1,109 @@
+"""
+Tests for the known-session cache and its invalidation by the ADK proxy
+"""
+
+import time
+
+import pytest
+import requests
+
+import app as server
+from session_cache import KnownSessionCache
+
+KEY = ('oracle_agent', 'u1', 's1')
+
+
+class FakeADKClient:
+    """Records ADK calls; /run answers 404 while the session is marked lost"""
+
+    def __init__(self):
+        self.calls = []
+        self.lost_sessions = set()
+        self.existing = set()
+
+    def request(self, method, endpoint, **kwargs):
+        self.calls.append((method, endpoint))
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b'[]' if endpoint == '/run' else b'{}'
+        if endpoint == '/run':
+            key = (kwargs['json']['appName'], kwargs['json']['userId'], kwargs['json']['sessionId'])
+            if key in self.lost_sessions:
+                self.lost_sessions.discard(key)
+                response.status_code = 404
+        elif method == 'GET' and endpoint not in self.existing:
+            response.status_code = 404
+        elif method == 'POST':
+            self.existing.add(endpoint)
+        if response.status_code >= 400:
+            raise requests.exceptions.HTTPError(response=response)
+        return response
+
+
+@pytest.fixture
+def proxy(monkeypatch):
+    adk = FakeADKClient()
+    monkeypatch.setattr(server, 'adk_client', adk)
+    monkeypatch.setattr(server, 'known_sessions', KnownSessionCache(max_size=10, ttl=60))
+    return adk
+
+
+def _run(client):
+    return client.post('/run', json={'appName': KEY[0], 'userId': KEY[1], 'sessionId': KEY[2], 'newMessage': {}})
+
+
+def test_entries_expire_after_the_ttl():
+    cache = KnownSessionCache(ttl=0.05)
+    cache.add(KEY)
+    assert cache.contains(KEY)
+    time.sleep(0.1)
+    assert not cache.contains(KEY)
+    assert len(cache) == 0
+    assert cache.get_stats()['hits'] == 1 and cache.get_stats()['misses'] == 1
+
+
+def test_size_is_bounded_by_evicting_the_least_recently_used():
+    cache = KnownSessionCache(max_size=2, ttl=60)
+    cache.add(('a', 'u', '1'))
+    cache.add(('a', 'u', '2'))
+    cache.contains(('a', 'u', '1'))
+    cache.add(('a', 'u', '3'))
+
+    assert len(cache) == 2
+    assert not cache.contains(('a', 'u', '2'))
+    assert cache.contains(('a', 'u', '1')) and cache.contains(('a', 'u', '3'))
+
+    disabled = KnownSessionCache(max_size=0)
+    disabled.add(KEY)
+    assert len(disabled) == 0
+
+
+def test_known_sessions_skip_the_existence_check(proxy):
+    client = server.app.test_client()
+    assert _run(client).status_code == 200
+    assert _run(client).status_code == 200
+
+    session_path = f'/apps/{KEY[0]}/users/{KEY[1]}/sessions/{KEY[2]}'
+    assert proxy.calls == [('GET', session_path), ('POST', session_path), ('POST', '/run'), ('POST', '/run')]
+
+
+def test_delete_proxy_route_invalidates_the_session(proxy):
+    client = server.app.test_client()
+    _run(client)
+    assert server.known_sessions.contains(KEY)
+
+    assert client.delete(f'/apps/{KEY[0]}/users/{KEY[1]}/sessions/{KEY[2]}').status_code == 200
+    assert not server.known_sessions.contains(KEY)
+
+
+def test_run_404_invalidates_and_recreates_the_session(proxy):
+    client = server.app.test_client()
+    _run(client)
+    proxy.calls.clear()
+    proxy.existing.clear()  # ADK restarted and forgot the session
+    proxy.lost_sessions.add(KEY)
+
+    assert _run(client).status_code == 200
+    session_path = f'/apps/{KEY[0]}/users/{KEY[1]}/sessions/{KEY[2]}'
+    assert proxy.calls == [('POST', '/run'), ('GET', session_path), ('POST', session_path), ('POST', '/run')]
+    assert server.known_sessions.contains(KEY)
@@ -0,0 +1,63 @@
+"""
+Tests for the bounded in-memory session store
+"""
+
+import time
+
+import pytest
+
+from session_store import InMemorySessionStore, SessionStore
+
+
+def test_lru_eviction_keeps_recently_used_sessions():
+    """Least recently used sessions are evicted once max_sessions is exceeded"""
+    store = InMemorySessionStore(max_sessions=2, max_age=60, max_messages=10)
+    store.create('a', {'user_id': 'user_a'})
+    store.create('b', {'user_id': 'user_b'})
+    store.get('a')
+    store.create('c', {'user_id': 'user_c'})
+
+    assert 'a' in store
+    assert 'b' not in store
+    assert 'c' in store
+    assert len(store) == 2
+
+
+def test_idle_sessions_expire():
+    """Sessions idle for longer than max_age are dropped"""
+    store = InMemorySessionStore(max_sessions=10, max_age=0.05, max_messages=10)
+    store.create('a', {'user_id': 'user_a'})
+    time.sleep(0.1)
+
+    assert store.get('a') is None
+    assert len(store) == 0
+
+
+def test_messages_are_capped_per_session():
+    """Only the most recent max_messages messages are kept"""
+    store = InMemorySessionStore(max_sessions=10, max_age=60, max_messages=3)
+    store.create('a', {'user_id': 'user_a'})
+    store.append_messages('a', [{'role': 'user', 'content': str(i)} for i in range(5)])
+
+    messages = store.get_messages('a')
+    assert [message['content'] for message in messages] == ['2', '3', '4']
+    assert set(messages[0]) == {'role', 'content', 'timestamp'}
+
+
+def test_append_to_unknown_session_is_ignored():
+    """Appending to a missing session does not create it"""
+    store = InMemorySessionStore(max_sessions=10, max_age=60, max_messages=3)
+    store.append_messages('missing', [{'role': 'user', 'content': 'hi'}])
+
+    assert 'missing' not in store
+
+
+def test_incomplete_backend_fails_at_construction():
+    class NoMessages(SessionStore):
+        def create(self, key, data): pass
+        def get(self, key): return None
+        def delete(self, key): pass
+        def __len__(self): return 0
+
+    with pytest.raises(TypeError, match='append_messages'):
+        NoMessages(max_age=60, max_messages=10)
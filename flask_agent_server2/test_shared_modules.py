@@ -0,0 +1,36 @@
+"""
+Tests that the modules each agent package carries its own copy of stay identical
+ADK loads every agent directory as a separate app, so shared helpers are copied rather than imported
+"""
+
+import filecmp
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parent
+SHARED_MODULES = {
+    'model_router.py': ('oracle_agent', 'tax_advisor_agent', 'parallel_universe_agent'),
+    'history_compaction.py': ('oracle_agent', 'tax_advisor_agent', 'parallel_universe_agent'),
+    'prompt_registry.py': ('oracle_agent', 'tax_advisor_agent', 'parallel_universe_agent'),
+    'context_cache.py': ('oracle_agent', 'tax_advisor_agent'),
+    'fanout.py': ('oracle_agent', 'tax_advisor_agent'),
+}
+
+
+@pytest.mark.parametrize('module', sorted(SHARED_MODULES))
+def test_copies_are_identical(module):
+    first, *others = [ROOT / package / module for package in SHARED_MODULES[module]]
+    differing = [str(path.relative_to(ROOT)) for path in others if not filecmp.cmp(first, path, shallow=False)]
+    assert not differing, f"{', '.join(differing)} differ from {first.relative_to(ROOT)}; edit every copy together"
+
+
+def test_every_copied_module_is_listed():
+    packages = ('oracle_agent', 'tax_advisor_agent', 'parallel_universe_agent')
+    per_package = ('__init__.py', 'agent.py', 'prompt.py', 'fi_mcp.py')  # deliberately package-specific
+    seen = {}
+    for package in packages:
+        for path in (ROOT / package).glob('*.py'):
+            seen.setdefault(path.name, []).append(package)
+    copied = {name for name, owners in seen.items() if len(owners) > 1 and name not in per_package}
+    assert copied == set(SHARED_MODULES)
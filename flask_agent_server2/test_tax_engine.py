@@ -0,0 +1,63 @@
+"""
+Tests for the Indian income tax engine
+"""
+
+import pytest
+
+from tax_advisor_agent.tax_engine import IncomeTaxEngine, TaxInputError, calculate_income_tax
+
+
+@pytest.fixture
+def engine():
+    return IncomeTaxEngine()
+
+
+def test_new_regime_rebate_and_marginal_relief(engine):
+    """Income up to ₹12L is tax free under AY 2026-27; just above it tax is capped at the excess"""
+    at_limit = engine.compute_tax({'gross_salary': 1_275_000}, 'new', '2026-27')
+    assert at_limit['taxable_normal_income'] == 1_200_000
+    assert at_limit['total_tax'] == 0
+
+    above = engine.compute_tax({'gross_salary': 1_300_000}, 'new', '2026-27')
+    assert above['slab_tax'] == 63_750
+    assert above['rebate_87a'] == 38_750
+    assert above['total_tax'] == 26_000
+
+
+def test_slab_rates_and_deduction_caps(engine):
+    """Hand-computed liabilities for AY 2025-26; 80C is capped at ₹1.5L in the old regime only"""
+    new = engine.compute_tax({'gross_salary': 1_000_000, 'section_80c': 200_000}, 'new', '2025-26')
+    old = engine.compute_tax({'gross_salary': 1_000_000, 'section_80c': 200_000}, 'old', '2025-26')
+
+    assert new['total_tax'] == 44_200
+    assert 'section_80c' not in new['deductions']
+    assert old['deductions']['section_80c'] == 150_000
+    assert old['total_tax'] == 75_400
+
+
+def test_surcharge_marginal_relief(engine):
+    """Surcharge just above ₹50L is limited to the income above the threshold"""
+    result = engine.compute_tax({'gross_salary': 5_060_000}, 'old', '2025-26')
+    assert result['surcharge'] == 131_550
+    assert result['surcharge_marginal_relief'] == 124_550
+    assert result['total_tax'] == 1_375_400
+
+
+def test_equity_gains_use_special_rates_without_rebate(engine):
+    """112A gains above the exemption are taxed at 12.5% even when slab income is rebated"""
+    result = engine.compute_tax({'gross_salary': 800_000, 'ltcg_equity': 300_000}, 'new', '2026-27')
+    assert result['slab_tax'] == result['rebate_87a']
+    assert result['capital_gains_tax'] == 21_875
+    assert result['total_tax'] == 22_750
+
+
+def test_tool_recommends_cheaper_regime_and_reports_errors():
+    result = calculate_income_tax(1_800_000, section_80c=150_000, employer_nps_contribution=100_000)
+    assert result['status'] == 'success'
+    cheaper = min(('old', 'new'), key=lambda regime: result[f'{regime}_regime']['total_tax'])
+    assert result['recommended_regime'] == cheaper
+    assert result['tax_savings'] == abs(result['old_regime']['total_tax'] - result['new_regime']['total_tax'])
+
+    assert calculate_income_tax(1_000_000, assessment_year='2019-20')['status'] == 'error'
+    with pytest.raises(TaxInputError):
+        IncomeTaxEngine().compute_tax({'gross_salary': -1})
@@ -0,0 +1,151 @@
+"""
+Tests for the counterfactual universe replay engine
+"""
+
+import asyncio
+
+import numpy as np
+
+import parallel_universe_agent.replay as replay
+from parallel_universe_agent.replay import (
+    POLICIES,
+    CashFlowHistory,
+    UniverseReplayer,
+    format_inr,
+    replay_parallel_universes,
+    replay_universes,
+    return_series,
+)
+
+
+def _bank_row(amount, narration, day, txn_type, balance):
+    return [str(amount), narration, day, txn_type, 'NEFT', str(balance)]
+
+
+ZERO_RETURNS = {'equity_annual_return': 0.0, 'fd_annual_return': 0.0, 'savings_annual_return': 0.0}
+
+
+def _payloads(months=24, purchase_month=6):
+    rows, balance, mf_rows = [], 500_000, []
+    for m in range(months):
+        month = f"{2022 + m // 12}-{m % 12 + 1:02d}"
+        balance += 100_000
+        rows.append(_bank_row(100_000, 'SALARY', f"{month}-01", 1, balance))
+        balance -= 45_000
+        rows.append(_bank_row(45_000, 'UPI SPENDS', f"{month}-05", 2, balance))
+        balance -= 20_000
+        rows.append(_bank_row(20_000, 'SIP', f"{month}-10", 2, balance))
+        mf_rows.append([1, f"{month}-10", 50.0, 400.0, 20_000.0])
+        if m == purchase_month:
+            balance -= 300_000
+            rows.append(_bank_row(300_000, 'CAR PURCHASE', f"{month}-20", 2, balance))
+    bank = {'bankTransactions': [{'bank': 'HDFC', 'txns': rows}]}
+    mf = {'mfTransactions': [{'isinNumber': 'INF_A', 'schemeName': 'Alpha Index Fund', 'txns': mf_rows}]}
+    return bank, mf
+
+
+def _net_worth(mutual_funds, fixed_deposit):
+    return {
+        'netWorthResponse': {'assetValues': [
+            {'netWorthAttribute': 'ASSET_TYPE_MUTUAL_FUND', 'value': {'currencyCode': 'INR', 'units': str(mutual_funds)}},
+            {'netWorthAttribute': 'ASSET_TYPE_EPF', 'value': {'currencyCode': 'INR', 'units': '90000'}},
+        ]},
+        'accountDetailsBulkResponse': {'accountDetailsMap': {'fd_1': {
+            'accountDetails': {'accountType': {'depositAccountType': 'DEPOSIT_ACCOUNT_TYPE_FIXED'}},
+            'depositSummary': {'currentBalance': {'currencyCode': 'INR', 'units': str(fixed_deposit)}},
+        }}},
+    }
+
+
+def test_history_separates_investments_and_big_purchases():
+    history = CashFlowHistory.from_fi_mcp(*_payloads())
+
+    assert history.months == 24
+    assert history.opening_cash == 500_000
+    np.testing.assert_allclose(history.equity_investment, 20_000)
+    np.testing.assert_allclose(history.regular_expenses, 45_000)
+    assert history.large_purchases.nonzero()[0].tolist() == [6]
+
+
+def test_actual_universe_matches_month_by_month_replay():
+    history = CashFlowHistory.from_fi_mcp(*_payloads())
+    returns = return_series(history.start_month, history.months, {}, {2022: -0.10})
+    result = replay_universes(history, universe_ids=list(POLICIES), historical_equity_returns={2022: -0.10})
+
+    equity, cash = 0.0, history.opening_cash
+    for m in range(history.months):
+        equity = equity * (1 + returns[0, m]) + history.equity_investment[m]
+        cash = cash * (1 + returns[2, m]) + history.surplus[m] - history.equity_investment[m]
+    assert result['actual_journey']['current_net_worth'] == round(equity + cash)
+
+    universes = {u['universe_id']: u for u in result['alternative_universes']}
+    assert universes['idle_cash']['final_allocation']['equity'] == 0
+    assert universes['conservative']['final_allocation']['equity'] == 0
+    assert universes['frugal']['wealth_difference'] > 0
+    assert universes['aggressive']['wealth_difference_display'].startswith(('+₹', '-₹'))
+    assert result['metadata']['universes_generated'] == len(POLICIES)
+
+
+def test_universes_are_independent_rows():
+    """Replaying a universe alone or among fifty gives the same path"""
+    history = CashFlowHistory.from_fi_mcp(*_payloads())
+    replayer = UniverseReplayer(history, return_series(history.start_month, history.months, {}))
+    policies = [{'surplus_equity': share / 49, 'surplus_fd': 1 - share / 49} for share in range(50)]
+
+    together = replayer.replay(replayer.flows(policies))['net_worth']
+    alone = replayer.replay(replayer.flows(policies[17:18]))['net_worth']
+    np.testing.assert_allclose(together[17], alone[0])
+
+
+def test_tool_reads_fi_mcp_and_formats_inr(monkeypatch):
+    bank, mf = _payloads()
+
+    async def fake_fetch(tool_name, tool_context, args=None):
+        return {
+            'fetch_bank_transactions': bank, 'fetch_mf_transactions': mf, 'fetch_net_worth': _net_worth(800_000, 0),
+        }[tool_name]
+
+    monkeypatch.setattr(replay, 'fetch_fi_mcp_data', fake_fetch)
+    result = asyncio.run(replay_parallel_universes(tool_context=None, surplus_equity_shares=[0.25, 0.75]))
+
+    assert result['status'] == 'success'
+    assert result['actual_journey']['starting_net_worth'] > 500_000  # seeded with the mutual fund holdings
+    assert [u['universe_id'] for u in result['alternative_universes']][-2:] == ['equity_25', 'equity_75']
+    assert asyncio.run(replay_parallel_universes(tool_context=None, universe_ids=['lottery']))['status'] == 'error'
+    assert format_inr(1297285) == '₹12,97,285'
+    assert format_inr(-250000, signed=True) == '-₹2,50,000'
+
+
+def test_opening_balances_are_seeded_from_current_holdings():
+    bank, mf = _payloads()
+    history = CashFlowHistory.from_fi_mcp(bank, mf, net_worth_payload=_net_worth(800_000, 200_000))
+    assert (history.current_equity, history.current_fd) == (800_000, 200_000)
+
+    result = replay_universes(history, universe_ids=['idle_cash'], assumptions=ZERO_RETURNS)
+    journey = result['actual_journey']
+    invested = history.equity_investment.sum()
+    assert journey['starting_net_worth'] == 500_000 + (800_000 - invested) + 200_000
+    cash = history.opening_cash + (history.surplus - history.equity_investment).sum()
+    assert journey['current_net_worth'] == round(cash + 800_000 + 200_000)  # ends at today's holdings
+
+
+def test_purchases_postponed_past_the_history_are_still_owed():
+    late = CashFlowHistory.from_fi_mcp(*_payloads(purchase_month=20))
+    result = replay_universes(late, universe_ids=['delayed_purchase'], assumptions=ZERO_RETURNS)
+    delayed = result['alternative_universes'][0]
+    assert delayed['deferred_purchases'] == 300_000
+    assert delayed['wealth_difference'] == 0  # parking the money earns nothing at zero rates
+    assert delayed['final_net_worth'] == sum(delayed['final_allocation'].values()) - 300_000
+
+    early = CashFlowHistory.from_fi_mcp(*_payloads(purchase_month=6))
+    result = replay_universes(early, universe_ids=['delayed_purchase'], assumptions=ZERO_RETURNS)
+    assert result['alternative_universes'][0]['deferred_purchases'] == 0
+
+
+def test_short_histories_report_the_period_return_instead_of_cagr():
+    short = replay_universes(CashFlowHistory.from_fi_mcp(*_payloads(months=3)))['actual_journey']
+    assert short['cagr'] is None
+    assert short['period_return'] == round(short['current_net_worth'] / short['starting_net_worth'] - 1, 4)
+
+    full = replay_universes(CashFlowHistory.from_fi_mcp(*_payloads()))['actual_journey']
+    assert full['cagr'] is not None
@@ -15,24 +15,22 @@
 """Financial Analyzer Agent with Fi MCP integration"""
 
 from google.adk import Agent
-from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset, StdioServerParameters
 
 from . import prompt
+from ...fi_mcp import get_fi_mcp_toolset
+from ...model_router import model_for, route_model
+from ...prompt_registry import register_prompt
 
-MODEL = "gemini-2.5-pro"
+MODEL = model_for("financial_analyzer_agent")
 
-# Fi MCP toolset for financial data access
-fi_mcp_toolset = MCPToolset(
-    connection_params=StdioServerParameters(
-        command="npx",
-        args=["mcp-remote", "https://fi-mcp-dev-56426154949.us-central1.run.app/mcp/stream"]
-    )
-)
+# Fi MCP toolset for financial data access (shared connection pool)
+fi_mcp_toolset = get_fi_mcp_toolset()
 
 financial_analyzer_agent = Agent(
     model=MODEL,
     name="financial_analyzer_agent", 
-    instruction=prompt.FINANCIAL_ANALYZER_PROMPT,
+    instruction=register_prompt("financial_analyzer_agent", prompt.FINANCIAL_ANALYZER_PROMPT),
     output_key="financial_analysis_output",
     tools=[fi_mcp_toolset],
+    before_model_callback=route_model,
 ) 
\ No newline at end of file
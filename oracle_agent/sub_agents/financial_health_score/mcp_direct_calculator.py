@@ -1,16 +1,39 @@
 """Direct MCP Data Parser and Score Calculator - Requires Valid Fi MCP Data"""
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Sequence, Union
 from datetime import datetime, timedelta
 import json
 import statistics
 
+import numpy as np
+import pandas as pd
+
 
 class MCPDataValidationError(Exception):
     """Raised when Fi MCP data is missing or invalid"""
     pass
 
 
+# Parsed metric columns, in the order produced by _parse_mcp_structure
+METRIC_COLUMNS = [
+    'total_net_worth', 'total_assets', 'total_liabilities', 'liquid_cash',
+    'investment_value', 'epf_balance', 'monthly_income', 'monthly_expenses',
+    'asset_types_count', 'account_count', 'savings_accounts_balance', 'current_accounts_balance'
+]
+
+# Asset categories used when parsing netWorthAttribute values
+_ASSET_OTHER, _ASSET_INVESTMENT, _ASSET_LIQUID, _ASSET_EPF = range(4)
+
+
+def _sequential_sum(index: List[int], values: List[float], size: int) -> np.ndarray:
+    """Per-index sums accumulated in input order, matching a Python += loop bit for bit"""
+    return np.bincount(
+        np.asarray(index, dtype=np.intp),
+        weights=np.asarray(values, dtype=np.float64),
+        minlength=size
+    )
+
+
 class DirectMCPCalculator:
     """
     Direct calculator that parses MCP data structure and calculates scores
@@ -426,10 +449,339 @@ class DirectMCPCalculator:
         
         return recommendations
 
+    def calculate_fhs_batch(
+        self,
+        mcp_data: Union[Sequence[Dict[str, Any]], pd.DataFrame],
+        user_ids: Optional[Sequence[Any]] = None
+    ) -> pd.DataFrame:
+        """
+        Batch version of calculate_fhs_from_mcp for scoring many users at once
+        Accepts a list of MCP payloads or a columnar table with METRIC_COLUMNS.
+        Returns one row per user with parsed metrics, factor scores, overall_score,
+        grade, category, score_range and error (the message the scalar path would raise,
+        missing for scored rows)
+        """
+        if isinstance(mcp_data, pd.DataFrame):
+            missing_columns = [column for column in METRIC_COLUMNS if column not in mcp_data.columns]
+            if missing_columns:
+                raise MCPDataValidationError(f"Missing metric columns: {missing_columns}")
+            metrics = mcp_data[METRIC_COLUMNS].copy()
+            errors = np.full(len(metrics), None, dtype=object)
+            if user_ids is not None:
+                metrics.index = pd.Index(user_ids)
+        else:
+            metrics, errors = self._parse_mcp_batch(list(mcp_data))
+            if user_ids is not None:
+                metrics.index = pd.Index(user_ids)
+
+        return self._score_metrics_batch(metrics, errors)
+
+    def _parse_mcp_batch(self, payloads: List[Dict[str, Any]]) -> tuple:
+        """
+        Flatten MCP payloads into per-item arrays and aggregate them per user
+        Mirrors _parse_mcp_structure; sums are accumulated in the same order so
+        results are identical to the scalar path
+        """
+        n = len(payloads)
+        errors = np.full(n, None, dtype=object)
+        total_net_worth = np.zeros(n)
+        has_asset_values = np.zeros(n, dtype=bool)
+        account_count = np.zeros(n, dtype=np.int64)
+        transaction_count = np.zeros(n, dtype=np.int64)
+        has_epf = np.zeros(n, dtype=bool)
+
+        asset_users, asset_values, asset_type_codes = [], [], []
+        liability_users, liability_values = [], []
+        deposit_users, deposit_values, deposit_is_savings = [], [], []
+        transaction_users, transaction_amounts = [], []
+        epf_users, epf_values = [], []
+        type_codes = {}
+
+        for i, payload in enumerate(payloads):
+            try:
+                self._validate_mcp_data(payload)
+            except MCPDataValidationError as e:
+                errors[i] = str(e)
+                continue
+
+            try:
+                items = self._extract_mcp_items(payload, type_codes)
+            except Exception as e:
+                errors[i] = f"Financial Health Score calculation failed: {str(e)}"
+                continue
+
+            total_net_worth[i] = items['total_net_worth']
+            has_asset_values[i] = items['has_asset_values']
+            account_count[i] = items['account_count']
+            transaction_count[i] = len(items['transactions'])
+            has_epf[i] = items['epf'] is not None
+
+            asset_users.extend([i] * len(items['assets']))
+            for value, type_code in items['assets']:
+                asset_values.append(value)
+                asset_type_codes.append(type_code)
+            liability_users.extend([i] * len(items['liabilities']))
+            liability_values.extend(items['liabilities'])
+            deposit_users.extend([i] * len(items['deposits']))
+            for balance, is_savings in items['deposits']:
+                deposit_values.append(balance)
+                deposit_is_savings.append(is_savings)
+            transaction_users.extend([i] * len(items['transactions']))
+            transaction_amounts.extend(items['transactions'])
+            if items['epf'] is not None:
+                epf_users.extend([i] * len(items['epf']))
+                epf_values.extend(items['epf'])
+
+        # Categorize each distinct asset type once, then map per asset
+        type_categories = np.full(max(len(type_codes), 1), _ASSET_OTHER)
+        for asset_type, code in type_codes.items():
+            type_categories[code] = self._categorize_asset_type(asset_type)
+
+        asset_users = np.asarray(asset_users, dtype=np.intp)
+        asset_values = np.asarray(asset_values, dtype=np.float64)
+        asset_type_codes = np.asarray(asset_type_codes, dtype=np.intp)
+        asset_categories = type_categories[asset_type_codes]
+
+        deposit_users = np.asarray(deposit_users, dtype=np.intp)
+        deposit_values = np.asarray(deposit_values, dtype=np.float64)
+        deposit_is_savings = np.asarray(deposit_is_savings, dtype=bool)
+
+        # Liquid cash adds savings-type assets first, then deposit balances, as in the scalar loop
+        is_liquid_asset = asset_categories == _ASSET_LIQUID
+        liquid_cash = _sequential_sum(
+            np.concatenate([asset_users[is_liquid_asset], deposit_users]),
+            np.concatenate([asset_values[is_liquid_asset], deposit_values]),
+            n
+        )
+
+        distinct_types = np.unique(asset_users * max(len(type_codes), 1) + asset_type_codes)
+        asset_types_count = np.bincount(distinct_types // max(len(type_codes), 1), minlength=n)
+
+        amounts = np.asarray(transaction_amounts, dtype=np.float64)
+        months = np.maximum(1, transaction_count // 30)
+        monthly_income = _sequential_sum(transaction_users, np.where(amounts > 0, amounts, 0.0), n) / months
+        monthly_expenses = _sequential_sum(transaction_users, np.where(amounts > 0, 0.0, np.abs(amounts)), n) / months
+
+        is_epf_asset = asset_categories == _ASSET_EPF
+        epf_balance = _sequential_sum(asset_users[is_epf_asset], asset_values[is_epf_asset], n)
+        epf_accounts_balance = _sequential_sum(epf_users, epf_values, n)
+        epf_balance = np.where(has_epf & (epf_accounts_balance > epf_balance), epf_accounts_balance, epf_balance)
+
+        is_investment = asset_categories == _ASSET_INVESTMENT
+        metrics = pd.DataFrame({
+            'total_net_worth': total_net_worth,
+            'total_assets': _sequential_sum(asset_users, asset_values, n),
+            'total_liabilities': _sequential_sum(liability_users, liability_values, n),
+            'liquid_cash': liquid_cash,
+            'investment_value': _sequential_sum(asset_users[is_investment], asset_values[is_investment], n),
+            'epf_balance': epf_balance,
+            'monthly_income': monthly_income,
+            'monthly_expenses': monthly_expenses,
+            'asset_types_count': np.where(has_asset_values, asset_types_count, 0),
+            'account_count': account_count,
+            'savings_accounts_balance': _sequential_sum(
+                deposit_users[deposit_is_savings], deposit_values[deposit_is_savings], n
+            ),
+            'current_accounts_balance': _sequential_sum(
+                deposit_users[~deposit_is_savings], deposit_values[~deposit_is_savings], n
+            )
+        })
+        return metrics, errors
+
+    def _extract_mcp_items(self, mcp_data: Dict[str, Any], type_codes: Dict[str, int]) -> Dict[str, Any]:
+        """Extract the raw values of one payload without aggregating them"""
+        net_worth = mcp_data['net_worth']
+        nw_response = net_worth['netWorthResponse']
+        items = {
+            'total_net_worth': 0.0,
+            'has_asset_values': 'assetValues' in nw_response,
+            'assets': [],
+            'liabilities': [],
+            'account_count': 0,
+            'deposits': [],
+            'transactions': [],
+            'epf': None
+        }
+
+        if 'totalNetWorthValue' in nw_response:
+            items['total_net_worth'] = float(nw_response['totalNetWorthValue'].get('units', 0))
+
+        for asset in nw_response.get('assetValues', []):
+            value = float(asset.get('value', {}).get('units', 0))
+            asset_type = asset.get('netWorthAttribute', '')
+            items['assets'].append((value, type_codes.setdefault(asset_type, len(type_codes))))
+
+        for liability in nw_response.get('liabilityValues', []):
+            items['liabilities'].append(float(liability.get('value', {}).get('units', 0)))
+
+        if 'accountDetailsBulkResponse' in net_worth:
+            accounts = net_worth['accountDetailsBulkResponse'].get('accountDetailsMap', {})
+            items['account_count'] = len(accounts)
+            for account_data in accounts.values():
+                account_type = account_data.get('accountDetails', {}).get('accountType', {})
+                if 'depositAccountType' in account_type:
+                    deposit_type = account_type['depositAccountType']
+                    deposit_summary = account_data.get('depositSummary', {})
+                    balance = float(deposit_summary.get('currentBalance', {}).get('units', 0))
+                    if deposit_type in ('DEPOSIT_ACCOUNT_TYPE_SAVINGS', 'DEPOSIT_ACCOUNT_TYPE_CURRENT'):
+                        items['deposits'].append((balance, deposit_type == 'DEPOSIT_ACCOUNT_TYPE_SAVINGS'))
+
+        transactions_data = mcp_data['transactions']
+        if not transactions_data or 'transactionResponse' not in transactions_data:
+            raise MCPDataValidationError("Invalid transaction data structure")
+        transactions = transactions_data['transactionResponse'].get('transactions', [])
+        if not transactions:
+            raise MCPDataValidationError("No transactions found in data")
+        items['transactions'] = [
+            float(transaction.get('amount', {}).get('units', 0))
+            for transaction in transactions[-90:]
+        ]
+
+        if 'epf' in mcp_data:
+            items['epf'] = [
+                float(account.get('rawDetails', {}).get('overall_pf_balance', {}).get('current_pf_balance', 0))
+                for account in mcp_data['epf'].get('uanAccounts', [])
+            ]
+
+        return items
+
+    def _categorize_asset_type(self, asset_type: str) -> int:
+        """Map a netWorthAttribute to the asset category used by _parse_mcp_structure"""
+        if 'MUTUAL_FUND' in asset_type:
+            return _ASSET_INVESTMENT
+        elif 'SECURITIES' in asset_type or 'EQUITIES' in asset_type:
+            return _ASSET_INVESTMENT
+        elif 'SAVINGS' in asset_type:
+            return _ASSET_LIQUID
+        elif 'EPF' in asset_type:
+            return _ASSET_EPF
+        return _ASSET_OTHER
+
+    def _score_metrics_batch(self, metrics: pd.DataFrame, errors: np.ndarray) -> pd.DataFrame:
+        """Vectorized _validate_parsed_metrics, factor scores, weighted score and grades"""
+        failed = "Financial Health Score calculation failed: "
+        income = metrics['monthly_income'].to_numpy(dtype=np.float64)
+        expenses = metrics['monthly_expenses'].to_numpy(dtype=np.float64)
+        assets = metrics['total_assets'].to_numpy(dtype=np.float64)
+        liabilities = metrics['total_liabilities'].to_numpy(dtype=np.float64)
+
+        # Same checks and precedence as the scalar path, first failure wins
+        checks = [
+            (expenses <= 0, failed + "No valid expense data found in transactions - cannot calculate liquidity or savings rate"),
+            (income <= 0, failed + "No valid income data found in transactions - cannot calculate financial health score"),
+            ((assets <= 0) & (liabilities <= 0), failed + "No valid asset or liability data found - cannot assess net worth"),
+            (assets <= 0, failed + "No asset data available for net worth calculation")
+        ]
+        errors = errors.copy()
+        for mask, message in checks:
+            errors[mask & pd.isna(errors)] = message
+        valid = pd.isna(errors)
+
+        result = metrics.copy()
+        factor_scores = self._calculate_all_factors_batch(metrics[valid])
+        overall = np.zeros(int(valid.sum()))
+        for factor, weight in self.weights.items():
+            scores = np.full(len(result), np.nan)
+            scores[valid] = factor_scores[factor]
+            result[factor] = scores
+            overall = overall + factor_scores[factor] * weight
+
+        overall_score = np.clip(np.trunc(overall * 10), 0, 1000).astype(np.int64)
+        overall_scores = pd.array([pd.NA] * len(result), dtype='Int64')
+        overall_scores[valid] = overall_score
+        result['overall_score'] = overall_scores
+
+        grades = self._get_grade_category_batch(overall_score)
+        for column in ('grade', 'category', 'score_range'):
+            values = np.full(len(result), None, dtype=object)
+            values[valid] = grades[column]
+            result[column] = values
+        result['error'] = errors
+        return result
+
+    def _calculate_all_factors_batch(self, metrics: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Vectorized _calculate_all_factors; formulas match the scalar rules term for term"""
+        income = metrics['monthly_income'].to_numpy(dtype=np.float64)
+        expenses = metrics['monthly_expenses'].to_numpy(dtype=np.float64)
+        asset_types = metrics['asset_types_count'].to_numpy(dtype=np.int64)
+
+        months_coverage = metrics['liquid_cash'].to_numpy(dtype=np.float64) / expenses
+        liquidity = np.select(
+            [months_coverage >= 6, months_coverage >= 3, months_coverage >= 1],
+            [100.0, 70.0 + (months_coverage - 3) * 10.0, 40.0 + (months_coverage - 1) * 15.0],
+            months_coverage * 40.0
+        )
+
+        savings_rate = ((income - expenses) / income) * 100
+        savings = np.select(
+            [savings_rate >= 30, savings_rate >= 20, savings_rate >= 10, savings_rate >= 0],
+            [100.0, 80.0 + (savings_rate - 20) * 2.0, 60.0 + (savings_rate - 10) * 2.0, 20.0 + savings_rate * 4.0],
+            np.maximum(0, 20.0 + savings_rate * 2.0)
+        )
+
+        debt_ratio = metrics['total_liabilities'].to_numpy(dtype=np.float64) / metrics['total_assets'].to_numpy(dtype=np.float64)
+        net_worth = np.select(
+            [debt_ratio <= 0.1, debt_ratio <= 0.3, debt_ratio <= 0.5],
+            [100.0, 80.0 - (debt_ratio - 0.1) * 100.0, 60.0 - (debt_ratio - 0.3) * 100.0],
+            np.maximum(0, 40.0 - (debt_ratio - 0.5) * 80.0)
+        )
+
+        savings_amount = income - expenses
+        stability = np.where(
+            savings_amount > 0,
+            np.minimum(100.0, 60.0 + ((savings_amount / income) * 100) * 1.5),
+            np.maximum(10.0, 50.0 - (np.abs(savings_amount / income) * 100) * 2.0)
+        )
+
+        retirement_ratio = metrics['epf_balance'].to_numpy(dtype=np.float64) / (income * 12)
+        retirement = np.select(
+            [retirement_ratio >= 5, retirement_ratio >= 3, retirement_ratio >= 1],
+            [100.0, 70.0 + (retirement_ratio - 3) * 15.0, 40.0 + (retirement_ratio - 1) * 15.0],
+            retirement_ratio * 40.0
+        )
+
+        diversification = np.select(
+            [asset_types >= 5, asset_types >= 3, asset_types >= 1],
+            [100.0, 70.0 + (asset_types - 3) * 15.0, 40.0 + (asset_types - 1) * 15.0],
+            20.0
+        )
+
+        employment = np.select([income > 50000, income > 25000], [90.0, 70.0], 50.0)
+
+        return {
+            'liquidity_ratio': liquidity,
+            'savings_rate': savings,
+            'net_worth_growth': net_worth,
+            'spending_stability': stability,
+            'retirement_readiness': retirement,
+            'diversification_score': diversification,
+            'employment_stability': employment
+        }
+
+    def _get_grade_category_batch(self, scores: np.ndarray) -> Dict[str, np.ndarray]:
+        """Vectorized _get_grade_category"""
+        conditions = [scores >= 900, scores >= 800, scores >= 700, scores >= 600, scores >= 500]
+        return {
+            'grade': np.select(conditions, ['A+', 'A', 'B', 'C', 'D'], 'F').astype(object),
+            'category': np.select(
+                conditions, ['Excellent', 'Very Good', 'Good', 'Fair', 'Needs Improvement'], 'Poor'
+            ).astype(object),
+            'score_range': np.select(
+                conditions, ['900-1000', '800-899', '700-799', '600-699', '500-599'], '0-499'
+            ).astype(object)
+        }
+
 
 # Initialize calculator instance
 direct_calculator = DirectMCPCalculator()
 
 def calculate_fhs_direct(mcp_data: Dict[str, Any]) -> Dict[str, Any]:
     """Direct calculation function for use by agent tools"""
-    return direct_calculator.calculate_fhs_from_mcp(mcp_data) 
\ No newline at end of file
+    return direct_calculator.calculate_fhs_from_mcp(mcp_data) 
+
+def calculate_fhs_direct_batch(
+    mcp_data: Union[Sequence[Dict[str, Any]], pd.DataFrame],
+    user_ids: Optional[Sequence[Any]] = None
+) -> pd.DataFrame:
+    """Batch calculation function for nightly recomputation across many users"""
+    return direct_calculator.calculate_fhs_batch(mcp_data, user_ids)
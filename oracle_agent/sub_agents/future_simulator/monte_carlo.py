@@ -0,0 +1,266 @@
+"""Vectorized Monte Carlo Wealth Simulator - Deterministic Projections for the Future Simulator"""
+
+from typing import Dict, Any, List, Optional
+from datetime import date
+import asyncio
+import math
+
+import numpy as np
+
+
+class SimulationInputError(Exception):
+    """Raised when simulation inputs are missing or outside supported ranges"""
+    pass
+
+
+MIN_PATHS = 1_000
+MAX_PATHS = 1_000_000
+MAX_HORIZON_YEARS = 50
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def _add_months(start: date, months: int) -> str:
+    """Return the YYYY-MM month that lies `months` after `start`"""
+    month_index = start.year * 12 + (start.month - 1) + int(months)
+    return f"{month_index // 12:04d}-{month_index % 12 + 1:02d}"
+
+
+class MonteCarloSimulator:
+    """
+    Monthly-step wealth simulator vectorized across paths
+    Each path draws its own market returns, yearly inflation and income shocks;
+    only per-path state vectors are kept, so memory is O(num_paths)
+    """
+
+    def __init__(self, num_paths: int = 10_000, seed: int = 42):
+        if not MIN_PATHS <= num_paths <= MAX_PATHS:
+            raise SimulationInputError(f"num_paths must be between {MIN_PATHS:,} and {MAX_PATHS:,}")
+        self.num_paths = int(num_paths)
+        self.seed = int(seed)
+
+    def simulate(
+        self,
+        baseline: Dict[str, float],
+        assumptions: Dict[str, float],
+        horizon_years: int,
+        goals: Optional[List[Dict[str, Any]]] = None,
+        start_date: Optional[date] = None,
+    ) -> Dict[str, Any]:
+        """
+        Run the simulation
+        baseline: current_net_worth, monthly_income, monthly_expenses
+        assumptions: expected_annual_return, annual_return_volatility, expected_inflation,
+                     inflation_volatility, annual_income_growth, income_shock_probability,
+                     income_shock_months, income_shock_severity
+        goals: [{'name': str, 'target_amount': float}]
+        """
+        self._validate(baseline, horizon_years)
+        goals = goals or []
+        start_date = start_date or date.today()
+        rng = np.random.default_rng(self.seed)
+
+        n = self.num_paths
+        months = int(horizon_years) * 12
+
+        annual_return = assumptions.get('expected_annual_return', 0.10)
+        monthly_mu = (1 + annual_return) ** (1 / 12) - 1
+        monthly_sigma = assumptions.get('annual_return_volatility', 0.15) / math.sqrt(12)
+        inflation_mean = assumptions.get('expected_inflation', 0.06)
+        inflation_vol = assumptions.get('inflation_volatility', 0.015)
+        income_growth = assumptions.get('annual_income_growth', 0.05)
+        monthly_shock_probability = assumptions.get('income_shock_probability', 0.05) / 12
+        shock_months = int(assumptions.get('income_shock_months', 6))
+        shock_severity = assumptions.get('income_shock_severity', 1.0)
+
+        initial_wealth = float(baseline['current_net_worth'])
+        wealth = np.full(n, initial_wealth)
+        income = np.full(n, float(baseline['monthly_income']))
+        expenses = np.full(n, float(baseline['monthly_expenses']))
+        price_level = np.ones(n)
+        shock_remaining = np.zeros(n, dtype=np.int32)
+        ever_depleted = wealth < 0
+
+        targets = np.array([float(goal['target_amount']) for goal in goals])
+        first_hit = np.full((len(goals), n), -1, dtype=np.int32)
+        if len(goals):
+            first_hit[wealth[None, :] >= targets[:, None]] = 0
+
+        percentile_bands = []
+        monthly_inflation = None
+        for month in range(months):
+            if month % 12 == 0:
+                yearly_inflation = rng.normal(inflation_mean, inflation_vol, n)
+                monthly_inflation = (1 + yearly_inflation) ** (1 / 12) - 1
+                if month > 0:
+                    income *= 1 + income_growth
+
+            returns = rng.normal(monthly_mu, monthly_sigma, n)
+
+            new_shock = (shock_remaining == 0) & (rng.random(n) < monthly_shock_probability)
+            shock_remaining[new_shock] = shock_months
+            effective_income = np.where(shock_remaining > 0, income * (1 - shock_severity), income)
+            np.maximum(shock_remaining - 1, 0, out=shock_remaining)
+
+            expenses *= 1 + monthly_inflation
+            price_level *= 1 + monthly_inflation
+            wealth = wealth * (1 + returns) + effective_income - expenses
+            ever_depleted |= wealth < 0
+
+            if len(goals):
+                newly_hit = (first_hit < 0) & (wealth[None, :] >= targets[:, None])
+                first_hit[newly_hit] = month + 1
+
+            if (month + 1) % 12 == 0:
+                nominal = np.percentile(wealth, PERCENTILES)
+                real = np.percentile(wealth / price_level, PERCENTILES)
+                band = {'year': (month + 1) // 12}
+                for p, value in zip(PERCENTILES, nominal):
+                    band[f'p{p}'] = round(float(value))
+                band['real_p50'] = round(float(real[PERCENTILES.index(50)]))
+                percentile_bands.append(band)
+
+        final_median = float(np.median(wealth))
+        return {
+            'status': 'success',
+            'simulation_parameters': {
+                'num_paths': n,
+                'seed': self.seed,
+                'horizon_years': int(horizon_years),
+                'start_month': _add_months(start_date, 0),
+                'baseline': {k: float(v) for k, v in baseline.items()},
+                'assumptions': {
+                    'expected_annual_return': annual_return,
+                    'annual_return_volatility': assumptions.get('annual_return_volatility', 0.15),
+                    'expected_inflation': inflation_mean,
+                    'inflation_volatility': inflation_vol,
+                    'annual_income_growth': income_growth,
+                    'income_shock_probability': monthly_shock_probability * 12,
+                    'income_shock_months': shock_months,
+                    'income_shock_severity': shock_severity,
+                },
+            },
+            'percentile_bands': percentile_bands,
+            'final_distribution': {
+                'median': round(final_median),
+                'mean': round(float(wealth.mean())),
+                'probability_of_loss': round(float((wealth < initial_wealth).mean()), 4),
+                'probability_of_depletion': round(float(ever_depleted.mean()), 4),
+                'median_cagr': self._cagr(initial_wealth, final_median, horizon_years),
+            },
+            'goals': [
+                self._summarize_goal(goal, first_hit[i], start_date)
+                for i, goal in enumerate(goals)
+            ],
+        }
+
+    def _validate(self, baseline: Dict[str, float], horizon_years: int) -> None:
+        """Validate required baseline values and horizon"""
+        required = ['current_net_worth', 'monthly_income', 'monthly_expenses']
+        missing = [key for key in required if baseline.get(key) is None]
+        if missing:
+            raise SimulationInputError(f"Missing baseline values: {missing}")
+        if baseline['monthly_income'] < 0 or baseline['monthly_expenses'] < 0:
+            raise SimulationInputError("Monthly income and expenses must be non-negative")
+        if not 1 <= horizon_years <= MAX_HORIZON_YEARS:
+            raise SimulationInputError(f"horizon_years must be between 1 and {MAX_HORIZON_YEARS}")
+
+    def _cagr(self, start: float, end: float, years: int) -> Optional[float]:
+        """Compound annual growth rate, undefined for non-positive endpoints"""
+        if start <= 0 or end <= 0:
+            return None
+        return round((end / start) ** (1 / years) - 1, 4)
+
+    def _summarize_goal(self, goal: Dict[str, Any], first_hit: np.ndarray, start_date: date) -> Dict[str, Any]:
+        """Hit probability and the months by which 25/50/75% of paths reached the goal"""
+        n = first_hit.size
+        hit_months = np.sort(first_hit[first_hit >= 0])
+        milestone_dates = {}
+        for share in (25, 50, 75):
+            rank = math.ceil(share / 100 * n)
+            milestone_dates[f'p{share}'] = (
+                _add_months(start_date, hit_months[rank - 1]) if rank <= hit_months.size else None
+            )
+
+        return {
+            'name': goal.get('name', f"₹{goal['target_amount']:,.0f}"),
+            'target_amount': float(goal['target_amount']),
+            'probability_by_horizon': round(hit_months.size / n, 4),
+            'milestone_dates': milestone_dates,
+        }
+
+
+async def run_monte_carlo_simulation(
+    current_net_worth: float,
+    monthly_income: float,
+    monthly_expenses: float,
+    horizon_years: int = 10,
+    expected_annual_return: float = 0.10,
+    annual_return_volatility: float = 0.15,
+    expected_inflation: float = 0.06,
+    inflation_volatility: float = 0.015,
+    annual_income_growth: float = 0.05,
+    income_shock_probability: float = 0.05,
+    income_shock_months: int = 6,
+    goal_names: Optional[List[str]] = None,
+    goal_amounts: Optional[List[float]] = None,
+    num_paths: int = 10000,
+    seed: int = 42,
+) -> Dict[str, Any]:
+    """Runs a reproducible Monte Carlo projection of the user's net worth.
+
+    Use the baseline values from financial_analysis_output. Amounts are in rupees and
+    rates are decimals (0.10 means 10%). The same inputs and seed always give the same result.
+
+    Args:
+        current_net_worth: Current total net worth in rupees.
+        monthly_income: Current monthly take-home income in rupees.
+        monthly_expenses: Current monthly expenses in rupees.
+        horizon_years: Number of years to project (1-50).
+        expected_annual_return: Expected annual portfolio return.
+        annual_return_volatility: Annual standard deviation of portfolio returns.
+        expected_inflation: Expected annual expense inflation.
+        inflation_volatility: Standard deviation of yearly inflation.
+        annual_income_growth: Yearly income growth rate.
+        income_shock_probability: Yearly probability of losing income (job loss, illness).
+        income_shock_months: Months of lost income per shock.
+        goal_names: Names of net-worth goals, e.g. ["Home down payment", "₹1 Crore"].
+        goal_amounts: Target net worth for each goal, in the same order as goal_names.
+        num_paths: Number of simulated paths (1,000 - 1,000,000).
+        seed: Random seed for reproducibility.
+
+    Returns:
+        Yearly percentile bands (p5-p95, nominal and inflation-adjusted median), the final
+        distribution, and per goal the hit probability and the months by which 25/50/75% of
+        paths reached it.
+    """
+    goal_amounts = goal_amounts or []
+    goal_names = goal_names or []
+    goals = [
+        {'name': goal_names[i] if i < len(goal_names) else f"₹{amount:,.0f}", 'target_amount': amount}
+        for i, amount in enumerate(goal_amounts)
+    ]
+
+    try:
+        simulator = MonteCarloSimulator(num_paths=num_paths, seed=seed)
+        # Large runs take seconds; a worker thread keeps the agent's event loop serving other requests
+        return await asyncio.to_thread(
+            simulator.simulate,
+            baseline={
+                'current_net_worth': current_net_worth,
+                'monthly_income': monthly_income,
+                'monthly_expenses': monthly_expenses,
+            },
+            assumptions={
+                'expected_annual_return': expected_annual_return,
+                'annual_return_volatility': annual_return_volatility,
+                'expected_inflation': expected_inflation,
+                'inflation_volatility': inflation_volatility,
+                'annual_income_growth': annual_income_growth,
+                'income_shock_probability': income_shock_probability,
+                'income_shock_months': income_shock_months,
+            },
+            horizon_years=horizon_years,
+            goals=goals,
+        )
+    except SimulationInputError as e:
+        return {'status': 'error', 'error_message': str(e)}
@@ -27,6 +27,15 @@ Input Requirements:
 
 Simulation Framework:
 
+**Simulation Tool (run_monte_carlo_simulation):**
+All projected numbers MUST come from the run_monte_carlo_simulation tool. Never estimate or invent wealth values, probabilities or dates yourself.
+- Call it with current_net_worth, monthly_income and monthly_expenses from financial_analysis_output
+- Pass the user's goals as goal_names and goal_amounts (plus ₹1 Crore, ₹2 Crore and ₹5 Crore wealth milestones)
+- Keep the default seed so repeated runs give identical results; use num_paths=10000 unless the user asks for more precision
+- For market and inflation scenarios, call the tool again with adjusted expected_annual_return, expected_inflation or income_shock_probability and compare the results
+- percentile_bands gives p5/p25/p50/p75/p95 net worth per year (real_p50 is the inflation-adjusted median); goals gives probability_by_horizon and milestone_dates (the months by which 25%/50%/75% of paths reached the goal, null if not reached)
+- If the tool returns status "error", report the error_message and the baseline data that is missing
+
 **Monte Carlo Projection Logic:**
 
 1. **Base Case Parameters** (from financial_analysis_output):
@@ -51,7 +60,7 @@ Required Output Structure:
 **📊 Financial Projection Analysis**
 
 **Simulation Parameters**:
-- **Scenarios Analyzed**: 1,000 financial trajectories modeled
+- **Scenarios Analyzed**: [num_paths] simulated trajectories (seed [seed])
 - **Time Horizon**: [Specified timeframe]
 - **Base Assumptions**: [Key starting parameters with values]
 
@@ -17,12 +17,17 @@
 from google.adk import Agent
 
 from . import prompt
+from .scenario_engine import compare_financial_scenarios
+from ...model_router import model_for, route_model
+from ...prompt_registry import register_prompt
 
-MODEL = "gemini-2.5-pro"
+MODEL = model_for("scenario_modeler_agent")
 
 scenario_modeler_agent = Agent(
     model=MODEL,
     name="scenario_modeler_agent",
-    instruction=prompt.SCENARIO_MODELER_PROMPT,
+    instruction=register_prompt("scenario_modeler_agent", prompt.SCENARIO_MODELER_PROMPT),
     output_key="scenario_analysis_output",
+    tools=[compare_financial_scenarios],
+    before_model_callback=route_model,
 ) 
\ No newline at end of file
@@ -17,12 +17,17 @@
 from google.adk import Agent
 
 from . import prompt
+from .goal_solver import solve_goal_timelines
+from ...model_router import model_for, route_model
+from ...prompt_registry import register_prompt
 
-MODEL = "gemini-2.5-pro"
+MODEL = model_for("timeline_predictor_agent")
 
 timeline_predictor_agent = Agent(
     model=MODEL,
     name="timeline_predictor_agent", 
-    instruction=prompt.TIMELINE_PREDICTOR_PROMPT,
+    instruction=register_prompt("timeline_predictor_agent", prompt.TIMELINE_PREDICTOR_PROMPT),
     output_key="timeline_predictions_output",
+    tools=[solve_goal_timelines],
+    before_model_callback=route_model,
 ) 
\ No newline at end of file
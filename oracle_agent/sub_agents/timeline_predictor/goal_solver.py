@@ -0,0 +1,362 @@
+"""Goal Timeline Solver - Milestone Crossing Dates for the Timeline Predictor"""
+
+from typing import Dict, Any, List, Optional
+from datetime import date
+import asyncio
+import math
+
+import numpy as np
+
+
+class GoalTimelineError(Exception):
+    """Raised when goal inputs are missing or outside supported ranges"""
+    pass
+
+
+MIN_PATHS = 1_000
+# The simulation holds a (goals, milestones, paths) array, so both caps match the scenario engine's scale
+MAX_PATHS = 100_000
+MAX_GOALS = 10
+MAX_HORIZON_YEARS = 50
+MILESTONES = (0.25, 0.5, 0.75, 1.0)
+COMPLETION_PERCENTILES = (10, 25, 50, 75, 90)
+# Primary path is the central two-thirds of outcomes, the accelerated and
+# conservative paths are the fastest and slowest deciles
+PRIMARY_BAND = (16.5, 83.5)
+
+
+def _add_months(start: date, months: int) -> str:
+    """Return the YYYY-MM month that lies `months` after `start`"""
+    month_index = start.year * 12 + (start.month - 1) + int(months)
+    return f"{month_index // 12:04d}-{month_index % 12 + 1:02d}"
+
+
+def annuity_balances(
+    current: np.ndarray, contribution: np.ndarray, monthly_rate: float, step_up: float, months: int
+) -> np.ndarray:
+    """
+    Closed-form balance after 0..months months for each goal, shape (goals, months + 1)
+    Contributions are paid at month end and stepped up by `step_up` every 12 months:
+    FV(12Y + s) = P·a^n + C·a^(n-12)·S12·(1 - q^Y)/(1 - q) + C·(1+g)^Y·Ss,  q = (1+g)/a^12
+    """
+    a = 1 + monthly_rate
+    n = np.arange(months + 1)
+    years, rest = np.divmod(n, 12)
+
+    if monthly_rate == 0:
+        year_annuity = 12.0
+        partial_annuity = rest.astype(float)
+    else:
+        year_annuity = (a ** 12 - 1) / monthly_rate
+        partial_annuity = (a ** rest - 1) / monthly_rate
+
+    q = (1 + step_up) / a ** 12
+    if math.isclose(q, 1.0):
+        full_years = a ** (n - 12) * year_annuity * years
+    else:
+        full_years = a ** (n - 12) * year_annuity * (1 - q ** years) / (1 - q)
+    per_rupee = full_years + (1 + step_up) ** years * partial_annuity
+
+    return current[:, None] * a ** n[None, :] + contribution[:, None] * per_rupee[None, :]
+
+
+class GoalTimelineSolver:
+    """
+    Solves when each goal crosses 25/50/75/100% of its target
+    The deterministic path uses closed-form annuity balances; the probability paths
+    simulate all goals at once against shared market and inflation draws, so the
+    goals of one user see the same market history within a path
+    """
+
+    def __init__(self, num_paths: int = 10_000, seed: int = 42):
+        if not MIN_PATHS <= num_paths <= MAX_PATHS:
+            raise GoalTimelineError(f"num_paths must be between {MIN_PATHS:,} and {MAX_PATHS:,}")
+        self.num_paths = int(num_paths)
+        self.seed = int(seed)
+
+    def solve(
+        self,
+        goals: List[Dict[str, Any]],
+        assumptions: Dict[str, Any],
+        start_date: Optional[date] = None,
+    ) -> Dict[str, Any]:
+        """
+        Solve the timelines
+        goals: [{'name', 'target_amount', 'current_amount', 'monthly_contribution', 'target_years'}]
+        assumptions: expected_annual_return, annual_return_volatility, expected_inflation,
+                     inflation_volatility, annual_contribution_step_up, inflation_adjust_targets
+        """
+        self._validate(goals)
+        start_date = start_date or date.today()
+
+        targets = np.array([float(goal['target_amount']) for goal in goals])
+        current = np.array([float(goal.get('current_amount') or 0.0) for goal in goals])
+        contributions = np.array([float(goal.get('monthly_contribution') or 0.0) for goal in goals])
+        deadlines = [int(round(float(goal.get('target_years') or 0) * 12)) for goal in goals]
+
+        annual_return = assumptions.get('expected_annual_return', 0.10)
+        inflation = assumptions.get('expected_inflation', 0.06)
+        step_up = assumptions.get('annual_contribution_step_up', 0.0)
+        inflate_targets = assumptions.get('inflation_adjust_targets', True)
+        monthly_rate = (1 + annual_return) ** (1 / 12) - 1
+        horizon = MAX_HORIZON_YEARS * 12
+
+        balances = annuity_balances(current, contributions, monthly_rate, step_up, horizon)
+        growth = (1 + inflation) ** (np.arange(horizon + 1) / 12) if inflate_targets else np.ones(horizon + 1)
+        target_path = targets[:, None] * growth[None, :]
+        per_rupee = annuity_balances(np.zeros(1), np.ones(1), monthly_rate, step_up, horizon)[0]
+
+        crossings = self._simulate(current, contributions, targets, assumptions, horizon)
+
+        results = []
+        for i, goal in enumerate(goals):
+            deterministic = {}
+            for fraction in MILESTONES:
+                hits = np.flatnonzero(balances[i] >= fraction * target_path[i])
+                deterministic[fraction] = int(hits[0]) if hits.size else None
+            results.append(self._summarize_goal(
+                goal, deterministic, balances[i], target_path[i], per_rupee, crossings[i], deadlines[i], start_date,
+            ))
+
+        return {
+            'status': 'success',
+            'solver_parameters': {
+                'num_paths': self.num_paths,
+                'seed': self.seed,
+                'start_month': _add_months(start_date, 0),
+                'horizon_years': MAX_HORIZON_YEARS,
+                'assumptions': {
+                    'expected_annual_return': annual_return,
+                    'annual_return_volatility': assumptions.get('annual_return_volatility', 0.15),
+                    'expected_inflation': inflation,
+                    'inflation_volatility': assumptions.get('inflation_volatility', 0.015),
+                    'annual_contribution_step_up': step_up,
+                    'inflation_adjust_targets': bool(inflate_targets),
+                },
+            },
+            'goals': results,
+        }
+
+    def _simulate(
+        self,
+        current: np.ndarray,
+        contributions: np.ndarray,
+        targets: np.ndarray,
+        assumptions: Dict[str, Any],
+        horizon: int,
+    ) -> np.ndarray:
+        """First month each path crosses each milestone, shape (goals, milestones, paths); horizon + 1 if never"""
+        rng = np.random.default_rng(self.seed)
+        n = self.num_paths
+        monthly_mu = (1 + assumptions.get('expected_annual_return', 0.10)) ** (1 / 12) - 1
+        monthly_sigma = assumptions.get('annual_return_volatility', 0.15) / math.sqrt(12)
+        inflation_mean = assumptions.get('expected_inflation', 0.06)
+        inflation_vol = assumptions.get('inflation_volatility', 0.015)
+        step_up = assumptions.get('annual_contribution_step_up', 0.0)
+        inflate_targets = assumptions.get('inflation_adjust_targets', True)
+
+        fractions = np.array(MILESTONES)[None, :, None]
+        wealth = np.repeat(current[:, None], n, axis=1)
+        contribution = contributions.copy()
+        price_level = np.ones(n)
+        first_hit = np.full((len(targets), len(MILESTONES), n), horizon + 1, dtype=np.int32)
+        first_hit[wealth[:, None, :] >= fractions * targets[:, None, None]] = 0
+
+        monthly_inflation = None
+        for month in range(horizon):
+            if (first_hit <= horizon).all():
+                break
+            if month % 12 == 0:
+                yearly_inflation = rng.normal(inflation_mean, inflation_vol, n)
+                monthly_inflation = (1 + yearly_inflation) ** (1 / 12) - 1
+                if month > 0:
+                    contribution *= 1 + step_up
+
+            returns = rng.normal(monthly_mu, monthly_sigma, n)
+            if inflate_targets:
+                price_level *= 1 + monthly_inflation
+            wealth = wealth * (1 + returns)[None, :] + contribution[:, None]
+
+            progress = wealth / (targets[:, None] * price_level[None, :])
+            newly_hit = (first_hit > horizon) & (progress[:, None, :] >= fractions)
+            first_hit[newly_hit] = month + 1
+
+        return first_hit
+
+    def _summarize_goal(
+        self,
+        goal: Dict[str, Any],
+        deterministic: Dict[float, Optional[int]],
+        balances: np.ndarray,
+        target_path: np.ndarray,
+        per_rupee: np.ndarray,
+        crossings: np.ndarray,
+        deadline: int,
+        start_date: date,
+    ) -> Dict[str, Any]:
+        """Deterministic milestones, simulated percentiles and the three achievement paths for one goal"""
+        horizon = balances.size - 1
+        target = float(goal['target_amount'])
+        current = float(goal.get('current_amount') or 0.0)
+
+        def month_label(months: Optional[float]) -> Optional[str]:
+            return None if months is None or months > horizon else _add_months(start_date, months)
+
+        def percentile(values: np.ndarray, q: float) -> Optional[int]:
+            value = int(np.percentile(values, q, method='inverted_cdf'))
+            return value if value <= horizon else None
+
+        completion = crossings[-1]
+        months = {q: percentile(completion, q) for q in COMPLETION_PERCENTILES}
+        low, high = (percentile(completion, q) for q in PRIMARY_BAND)
+        median = months[50]
+        done = deterministic[1.0]
+
+        summary = {
+            'name': goal['name'],
+            'target_amount': target,
+            'current_amount': current,
+            'monthly_contribution': float(goal.get('monthly_contribution') or 0.0),
+            'progress_pct': round(min(current / target, 1.0) * 100, 1),
+            'deterministic': {
+                'months_to_goal': done,
+                'completion_date': month_label(done),
+                'target_at_completion': round(float(target_path[done])) if done is not None else None,
+                'milestone_dates': {
+                    f'{fraction:.0%}': month_label(deterministic[fraction]) for fraction in MILESTONES[:-1]
+                },
+            },
+            'simulated': {
+                'probability_within_horizon': round(float((completion <= horizon).mean()), 4),
+                'completion_dates': {f'p{q}': month_label(months[q]) for q in COMPLETION_PERCENTILES},
+                'milestone_dates': {
+                    f'{fraction:.0%}': month_label(percentile(crossings[j], 50))
+                    for j, fraction in enumerate(MILESTONES[:-1])
+                },
+            },
+            'paths': {
+                'primary': {
+                    'completion_date': month_label(median),
+                    'confidence_interval_months': (
+                        math.ceil((high - low) / 2) if low is not None and high is not None else None
+                    ),
+                    'earliest': month_label(low),
+                    'latest': month_label(high),
+                },
+                'accelerated': {
+                    'completion_date': month_label(months[10]),
+                    'months_ahead': median - months[10] if median is not None else None,
+                },
+                'conservative': {
+                    'completion_date': month_label(months[90]),
+                    'months_behind': months[90] - median if months[90] is not None and median is not None else None,
+                },
+            },
+        }
+
+        if deadline:
+            from_savings = balances[deadline] - summary['monthly_contribution'] * per_rupee[deadline]
+            shortfall = max(target_path[deadline] - from_savings, 0.0)
+            summary['deadline'] = {
+                'target_date': _add_months(start_date, deadline),
+                'probability_by_target_date': round(float((completion <= deadline).mean()), 4),
+                'required_monthly_contribution': round(float(shortfall / per_rupee[deadline])),
+                'on_track': done is not None and done <= deadline,
+            }
+        return summary
+
+    def _validate(self, goals: List[Dict[str, Any]]) -> None:
+        """Validate goal amounts and deadlines"""
+        if not goals:
+            raise GoalTimelineError("At least one goal is required")
+        if len(goals) > MAX_GOALS:
+            raise GoalTimelineError(f"At most {MAX_GOALS} goals can be solved per call")
+        for goal in goals:
+            if not goal.get('target_amount') or goal['target_amount'] <= 0:
+                raise GoalTimelineError(f"Goal '{goal.get('name')}' needs a positive target_amount")
+            if (goal.get('current_amount') or 0) < 0 or (goal.get('monthly_contribution') or 0) < 0:
+                raise GoalTimelineError(f"Goal '{goal.get('name')}' has a negative amount or contribution")
+            if not 0 <= (goal.get('target_years') or 0) <= MAX_HORIZON_YEARS:
+                raise GoalTimelineError(f"target_years must be between 0 and {MAX_HORIZON_YEARS}")
+
+
+async def solve_goal_timelines(
+    goal_names: List[str],
+    goal_amounts: List[float],
+    goal_current_amounts: Optional[List[float]] = None,
+    goal_monthly_contributions: Optional[List[float]] = None,
+    goal_target_years: Optional[List[float]] = None,
+    annual_contribution_step_up: float = 0.0,
+    expected_annual_return: float = 0.10,
+    annual_return_volatility: float = 0.15,
+    expected_inflation: float = 0.06,
+    inflation_volatility: float = 0.015,
+    inflation_adjust_targets: bool = True,
+    num_paths: int = 10000,
+    seed: int = 42,
+) -> Dict[str, Any]:
+    """Computes completion and milestone dates for several financial goals at once.
+
+    All lists follow the order of goal_names. Amounts are in rupees and rates are
+    decimals (0.10 means 10%). The same inputs and seed always give the same result.
+
+    Args:
+        goal_names: Names of up to 10 goals, e.g. ["Home down payment", "Child education"].
+        goal_amounts: Target amount for each goal in today's rupees.
+        goal_current_amounts: Savings already set aside for each goal.
+        goal_monthly_contributions: Monthly investment going to each goal.
+        goal_target_years: Desired years to reach each goal, 0 if the user has no deadline.
+        annual_contribution_step_up: Yearly increase of the monthly contributions (0.10 for a 10% step-up SIP).
+        expected_annual_return: Expected annual portfolio return.
+        annual_return_volatility: Annual standard deviation of portfolio returns.
+        expected_inflation: Expected annual inflation of the goal amounts.
+        inflation_volatility: Standard deviation of yearly inflation.
+        inflation_adjust_targets: Grow the targets with inflation (True for goals priced in today's rupees).
+        num_paths: Number of simulated paths (1,000 - 100,000).
+        seed: Random seed for reproducibility.
+
+    Returns:
+        Per goal the deterministic completion and 25/50/75% milestone dates, simulated
+        completion percentiles, the primary path with its ±months confidence interval,
+        the accelerated and conservative paths, and for goals with a deadline the
+        probability of meeting it and the monthly contribution it requires.
+    """
+    count = len(goal_names)
+    optional = {
+        'goal_current_amounts': goal_current_amounts,
+        'goal_monthly_contributions': goal_monthly_contributions,
+        'goal_target_years': goal_target_years,
+    }
+    mismatched = ['goal_amounts'] if len(goal_amounts or []) != count else []
+    mismatched += [key for key, values in optional.items() if values and len(values) != count]
+    if mismatched:
+        return {'status': 'error', 'error_message': f"{mismatched} must have one value per goal name"}
+
+    goals = [
+        {
+            'name': name,
+            'target_amount': goal_amounts[i],
+            'current_amount': goal_current_amounts[i] if goal_current_amounts else 0.0,
+            'monthly_contribution': goal_monthly_contributions[i] if goal_monthly_contributions else 0.0,
+            'target_years': goal_target_years[i] if goal_target_years else 0,
+        }
+        for i, name in enumerate(goal_names)
+    ]
+
+    try:
+        solver = GoalTimelineSolver(num_paths=num_paths, seed=seed)
+        # Large runs take seconds; a worker thread keeps the agent's event loop serving other requests
+        return await asyncio.to_thread(
+            solver.solve,
+            goals,
+            assumptions={
+                'expected_annual_return': expected_annual_return,
+                'annual_return_volatility': annual_return_volatility,
+                'expected_inflation': expected_inflation,
+                'inflation_volatility': inflation_volatility,
+                'annual_contribution_step_up': annual_contribution_step_up,
+                'inflation_adjust_targets': inflation_adjust_targets,
+            },
+        )
+    except GoalTimelineError as e:
+        return {'status': 'error', 'error_message': str(e)}
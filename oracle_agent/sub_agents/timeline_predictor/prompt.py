@@ -26,6 +26,17 @@ Input Requirements:
 - scenario_analysis_output (from state key): Comparative scenario analysis results
 - Specific goal parameters from user (target amount, timeframe, priority level)
 
+**Goal Solver Tool (solve_goal_timelines):**
+All completion dates, milestone dates, probabilities and required contributions MUST come from the solve_goal_timelines tool. Never estimate or invent dates yourself.
+- Call it once with all of the user's goals: goal_names, goal_amounts (in today's rupees), goal_current_amounts, goal_monthly_contributions and goal_target_years (0 when the user has no deadline)
+- Take current savings and monthly surplus from financial_analysis_output and the expected return and inflation assumptions used in future_scenarios_output
+- Keep the default seed so repeated runs give identical results; set annual_contribution_step_up when the user plans a step-up SIP
+- deterministic gives the closed-form completion date and 25%/50%/75% milestone dates at the expected return
+- paths.primary gives the Target Completion Date with its ±confidence_interval_months; paths.accelerated and paths.conservative give the accelerated and extended target dates (fastest and slowest 10% of simulated paths)
+- deadline gives probability_by_target_date and required_monthly_contribution for goals with a target year
+- A null date means the goal is not reached within 50 years at the given contribution; say so and recommend a higher contribution
+- If the tool returns status "error", report the error_message and the goal parameters that are missing
+
 Timeline Forecasting Framework:
 
 **1. Goal Classification System**:
@@ -17,10 +17,9 @@
 from google.adk.agents import SequentialAgent
 from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset, StdioServerParameters
 
+from .fi_mcp import scope_fi_mcp_cache
 from .sub_agents.insight_synthesizer.agent import insight_synthesizer_agent
 
-MODEL = "gemini-2.5-pro"
-
 # The Sequential Agent now only uses the insight synthesizer:
 # - Main agent handles data extraction and analysis
 # - Insight Synthesizer generates final JSON with insights and recommendations
@@ -37,6 +36,7 @@ parallel_universe_pipeline = SequentialAgent(
         "insight synthesizer generating the final output."
     ),
     # The insight synthesizer will receive all data from the main agent
+    before_agent_callback=scope_fi_mcp_cache,  # Keys cached Fi MCP responses to this user
 )
 
 # For ADK tools compatibility, the root agent must be named `root_agent`
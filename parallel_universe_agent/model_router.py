@@ -0,0 +1,226 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Per-agent model routing between flash and pro, with escalation to pro on invalid output"""
+
+import json
+import logging
+import os
+import re
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LLMRegistry, LlmRequest, LlmResponse
+
+logger = logging.getLogger(__name__)
+
+FLASH = "flash"
+PRO = "pro"
+TIER_MODELS = {
+    FLASH: os.environ.get("FLASH_MODEL", "gemini-2.5-flash"),
+    PRO: os.environ.get("PRO_MODEL", "gemini-2.5-pro"),
+}
+
+# Request classes, derived from the latest user turn
+SIMPLE = "simple"
+STANDARD = "standard"
+COMPLEX = "complex"
+
+# Tier per agent and request class; "default" covers classes not listed, unlisted agents get pro
+AGENT_ROUTES: Dict[str, Dict[str, str]] = {
+    # Coordinators choose tools and write the answer; greetings and acknowledgements don't need pro
+    "financial_analysis_coordinator": {"default": PRO, SIMPLE: FLASH},
+    "tax_advisor_coordinator": {"default": PRO, SIMPLE: FLASH},
+    # Extraction and formatting stages whose numbers come from tools
+    "financial_analyzer_agent": {"default": FLASH, COMPLEX: PRO},
+    "financial_health_score_agent": {"default": FLASH},
+    "future_simulator_agent": {"default": FLASH, COMPLEX: PRO},
+    "scenario_modeler_agent": {"default": FLASH, COMPLEX: PRO},
+    "timeline_predictor_agent": {"default": FLASH, COMPLEX: PRO},
+    "insight_synthesizer_agent": {"default": FLASH},
+    "tax_analyzer_agent": {"default": FLASH, COMPLEX: PRO},
+    "deduction_optimizer_agent": {"default": FLASH, COMPLEX: PRO},
+    "tax_scenario_modeler_agent": {"default": FLASH, COMPLEX: PRO},
+    # Multi-year planning reasons over regulations rather than tool output
+    "tax_planner_agent": {"default": PRO},
+    "tax_search_agent": {"default": FLASH},
+    "tax_planning_search_agent": {"default": FLASH},
+    "scenario_search_agent": {"default": FLASH},
+    "deduction_search_agent": {"default": FLASH},
+}
+
+ROUTING_ENABLED = os.environ.get("MODEL_ROUTING_ENABLED", "true").lower() == "true"
+
+_COMPLEX_HINTS = (
+    "comprehensive", "complete", "detailed", "full ", "compare", "strategy",
+    "what if", "multi-year", "retire", "step by step",
+)
+_SIMPLE_PATTERN = re.compile(
+    r"^(hi|hello|hey|thanks|thank you|ok|okay|yes|no|sure|great|cool|got it|bye)\b[\s!.?]*", re.IGNORECASE
+)
+_COMPLEX_WORDS = 60
+
+# Requests sent to flash by agents with a validator, kept until the response is checked
+_MAX_PENDING = 256
+_pending: "OrderedDict[Tuple[str, str], LlmRequest]" = OrderedDict()
+_route_counts: Counter = Counter()
+_escalations: Counter = Counter()
+
+
+def _apply_overrides(routes: Dict[str, Dict[str, str]], spec: str) -> None:
+    """
+    Apply MODEL_ROUTES overrides, e.g. "tax_planner_agent=flash,financial_analysis_coordinator:complex=pro"
+    A value may be a tier or a full model name
+    """
+    for entry in filter(None, (item.strip() for item in spec.split(","))):
+        target, _, value = entry.partition("=")
+        agent_name, _, request_class = target.strip().partition(":")
+        if not agent_name or not value.strip():
+            logger.warning(f"Ignoring malformed MODEL_ROUTES entry: {entry}")
+            continue
+        routes.setdefault(agent_name, {})[request_class or "default"] = value.strip()
+
+
+_apply_overrides(AGENT_ROUTES, os.environ.get("MODEL_ROUTES", ""))
+
+
+def classify_request(text: str) -> str:
+    """Bucket a user turn into simple, standard or complex"""
+    stripped = text.strip()
+    if not stripped:
+        return SIMPLE
+    lowered = stripped.lower()
+    if len(stripped.split()) > _COMPLEX_WORDS or any(hint in lowered for hint in _COMPLEX_HINTS):
+        return COMPLEX
+    match = _SIMPLE_PATTERN.match(stripped)
+    if match and match.end() == len(stripped):
+        return SIMPLE
+    return STANDARD
+
+
+def model_for(agent_name: str, request_class: str = STANDARD) -> str:
+    """Model name for an agent and request class"""
+    routes = AGENT_ROUTES.get(agent_name, {})
+    tier = routes.get(request_class) or routes.get("default") or PRO
+    return TIER_MODELS.get(tier, tier)
+
+
+def _latest_user_text(llm_request: LlmRequest) -> str:
+    for content in reversed(llm_request.contents or []):
+        if content.role != "user":
+            continue
+        texts = [part.text for part in content.parts or [] if part.text]
+        if texts:
+            return "\n".join(texts)
+    return ""
+
+
+def _response_text(llm_response: LlmResponse) -> Optional[str]:
+    """Text of a final response, or None when it is a tool call"""
+    parts = llm_response.content.parts if llm_response.content else None
+    if any(part.function_call for part in parts or []):
+        return None
+    return "".join(part.text for part in parts or [] if part.text and not part.thought)
+
+
+def _json_object(text: str) -> Optional[Dict[str, Any]]:
+    stripped = text.strip()
+    fenced = re.match(r"^```(?:json)?\s*(.*?)\s*```$", stripped, re.DOTALL)
+    candidate = fenced.group(1) if fenced else stripped
+    try:
+        parsed = json.loads(candidate)
+    except json.JSONDecodeError:
+        return None
+    return parsed if isinstance(parsed, dict) else None
+
+
+def _valid_synthesis(text: str) -> bool:
+    parsed = _json_object(text)
+    return parsed is not None and "parallel_universe_analysis" in parsed
+
+
+_HEALTH_SCORE = re.compile(r"Overall Financial Health Score:?\**:?\s*\**\s*(\d{1,4})\s*/\s*1000")
+
+
+def _valid_health_score(text: str) -> bool:
+    # A data access error is a legitimate answer that a stronger model would not change
+    if "Financial Data Access Error" in text:
+        return True
+    match = _HEALTH_SCORE.search(text)
+    return bool(match) and int(match.group(1)) <= 1000
+
+
+# Final-output checks; a failure on a flash response re-runs the request on pro
+OUTPUT_VALIDATORS: Dict[str, Callable[[str], bool]] = {
+    "financial_health_score_agent": _valid_health_score,
+    "insight_synthesizer_agent": _valid_synthesis,
+}
+
+
+def route_model(callback_context: CallbackContext, llm_request: LlmRequest) -> Optional[LlmResponse]:
+    """before_model_callback: pick the model for this agent and request class"""
+    if not ROUTING_ENABLED:
+        return None
+    agent_name = callback_context.agent_name
+    request_class = classify_request(_latest_user_text(llm_request))
+    llm_request.model = model_for(agent_name, request_class)
+    _route_counts[(agent_name, llm_request.model)] += 1
+    logger.debug(f"Routing {agent_name} ({request_class}) to {llm_request.model}")
+
+    if agent_name in OUTPUT_VALIDATORS and llm_request.model != TIER_MODELS[PRO]:
+        _pending[(callback_context.invocation_id, agent_name)] = llm_request
+        while len(_pending) > _MAX_PENDING:
+            _pending.popitem(last=False)
+    return None
+
+
+async def escalate_invalid_output(
+    callback_context: CallbackContext, llm_response: LlmResponse
+) -> Optional[LlmResponse]:
+    """after_model_callback: re-run a flash request on pro when its final output fails validation"""
+    validator = OUTPUT_VALIDATORS.get(callback_context.agent_name)
+    if validator is None or llm_response.partial or llm_response.error_code:
+        return None
+    text = _response_text(llm_response)
+    if text is None:
+        return None
+
+    key = (callback_context.invocation_id, callback_context.agent_name)
+    llm_request = _pending.pop(key, None)
+    if validator(text):
+        return None
+    if llm_request is None:
+        logger.warning(f"{callback_context.agent_name} produced output that failed validation")
+        return None
+
+    llm_request.model = TIER_MODELS[PRO]
+    logger.info(f"Escalating {callback_context.agent_name} to {llm_request.model} after invalid output")
+    _escalations[callback_context.agent_name] += 1
+    escalated = None
+    try:
+        async for response in LLMRegistry.new_llm(llm_request.model).generate_content_async(llm_request):
+            escalated = response
+    except Exception as e:
+        logger.error(f"Escalation of {callback_context.agent_name} failed, keeping the original output: {e}")
+        return None
+    return escalated
+
+
+def get_routing_stats() -> Dict[str, Any]:
+    """Calls per agent and model, and escalations per agent, since startup"""
+    calls: Dict[str, Dict[str, int]] = {}
+    for (agent_name, model), count in _route_counts.items():
+        calls.setdefault(agent_name, {})[model] = count
+    return {"enabled": ROUTING_ENABLED, "calls": calls, "escalations": dict(_escalations)}
@@ -0,0 +1,564 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Counterfactual Universe Replay Engine
+Re-runs the user's actual monthly cash flows from Fi MCP under alternative saving and investing policies
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from google.adk.tools.tool_context import ToolContext
+
+from .fi_mcp import FiMCPDataError, fetch_fi_mcp_data
+
+logger = logging.getLogger(__name__)
+
+MAX_UNIVERSES = 50
+ASSETS = ('equity', 'fixed_deposit', 'cash')
+EQUITY, FD, CASH = range(3)
+
+# Fi MCP bank transaction types: 1 credit, 2 debit, 3 opening, 4 interest, 5 TDS, 6 installment, 7 closing, 8 others
+CREDIT_TYPES = ('1', '4', 'CREDIT', 'INTEREST')
+DEBIT_TYPES = ('2', '5', '6', 'DEBIT', 'TDS', 'INSTALLMENT')
+MF_SELL_TYPES = ('2', 'SELL', 'REDEEM', 'REDEMPTION')
+# Fi MCP net worth holdings replayed as equity; fixed deposits come from the deposit accounts
+EQUITY_ASSET_TYPES = ('ASSET_TYPE_MUTUAL_FUND', 'ASSET_TYPE_INDIAN_SECURITIES', 'ASSET_TYPE_US_SECURITIES')
+FD_ACCOUNT_TYPES = ('DEPOSIT_ACCOUNT_TYPE_FIXED',)
+
+# Alternative policies replayed against the actual history. Unset fields keep what the user did:
+#   equity_to       where the user's equity investments go instead ('fixed_deposit' or 'cash')
+#   surplus_equity  share of each month's surplus invested in equity (surplus_fd in fixed deposits, rest cash)
+#   expense_cut     cut in regular spending; freed_to is where the saved money goes
+#   delay_purchases postpone purchases above the threshold, parking the money in freed_to meanwhile
+POLICIES = {
+    'conservative': {
+        'name': 'Conservative Decisions',
+        'description': 'Every equity investment placed in fixed deposits instead',
+        'equity_to': 'fixed_deposit',
+    },
+    'aggressive': {
+        'name': 'Aggressive Growth',
+        'description': "Each month's entire surplus invested in equity",
+        'surplus_equity': 1.0,
+    },
+    'balanced': {
+        'name': 'Balanced Allocation',
+        'description': "60% of each month's surplus in equity and 40% in fixed deposits",
+        'surplus_equity': 0.6,
+        'surplus_fd': 0.4,
+    },
+    'idle_cash': {
+        'name': 'Never Invested',
+        'description': 'All savings left in the savings account',
+        'equity_to': 'cash',
+    },
+    'delayed_purchase': {
+        'name': 'Delayed Big Purchases',
+        'description': 'Large purchases postponed, with the money held in fixed deposits meanwhile',
+        'delay_purchases': True,
+        'freed_to': 'fixed_deposit',
+    },
+    'frugal': {
+        'name': 'Frugal Spending',
+        'description': 'Lower regular spending, with the difference invested in equity',
+        'expense_cut': True,
+        'freed_to': 'equity',
+    },
+}
+DEFAULT_UNIVERSES = ('conservative', 'aggressive', 'balanced', 'delayed_purchase', 'frugal')
+
+
+class ReplayInputError(Exception):
+    """Custom exception for unusable histories and universe definitions"""
+    pass
+
+
+def format_inr(amount: float, signed: bool = False) -> str:
+    """Rupee amount with Indian digit grouping, e.g. ₹12,97,285"""
+    value = int(round(abs(amount)))
+    digits = str(value)
+    if len(digits) > 3:
+        head, tail = digits[:-3], digits[-3:]
+        groups = []
+        while len(head) > 2:
+            groups.insert(0, head[-2:])
+            head = head[:-2]
+        digits = ','.join([head] + groups + [tail])
+    sign = '-' if amount < 0 and value else ('+' if signed else '')
+    return f"{sign}₹{digits}"
+
+
+def _month_index(days: np.ndarray) -> np.ndarray:
+    """Months since 1970-01 for an array of dates"""
+    return days.astype('datetime64[M]').astype(np.int64)
+
+
+def _month_label(index: int) -> str:
+    return str(np.datetime64(int(index), 'M'))
+
+
+def _units(money: Any) -> float:
+    return float((money or {}).get('units') or 0)
+
+
+def holdings_from_fi_mcp(net_worth_payload: Any) -> Tuple[float, float]:
+    """Current equity and fixed deposit holdings from a Fi MCP fetch_net_worth payload"""
+    if not isinstance(net_worth_payload, dict):
+        return 0.0, 0.0
+    assets = (net_worth_payload.get('netWorthResponse') or {}).get('assetValues') or []
+    equity = sum(_units(asset.get('value')) for asset in assets if asset.get('netWorthAttribute') in EQUITY_ASSET_TYPES)
+    accounts = (net_worth_payload.get('accountDetailsBulkResponse') or {}).get('accountDetailsMap') or {}
+    fixed_deposits = sum(
+        _units((account.get('depositSummary') or {}).get('currentBalance'))
+        for account in accounts.values()
+        if ((account.get('accountDetails') or {}).get('accountType') or {}).get('depositAccountType') in FD_ACCOUNT_TYPES
+    )
+    return equity, fixed_deposits
+
+
+def _parse_days(values) -> np.ndarray:
+    try:
+        return np.array(values, dtype='datetime64[D]')
+    except ValueError:
+        return np.array([str(value)[:10] for value in values], dtype='datetime64[D]')
+
+
+class CashFlowHistory:
+    """
+    Monthly income, spending and equity investment from Fi MCP bank and mutual fund feeds
+    Money moved into mutual funds is an investment, not spending; single debits at or above
+    the purchase threshold are tracked separately so they can be postponed.
+    current_equity and current_fd are today's holdings, used to seed the opening balances
+    """
+
+    def __init__(
+        self,
+        start_month: int,
+        income: np.ndarray,
+        regular_expenses: np.ndarray,
+        large_purchases: np.ndarray,
+        equity_investment: np.ndarray,
+        opening_cash: float = 0.0,
+        current_equity: float = 0.0,
+        current_fd: float = 0.0,
+    ):
+        self.start_month = int(start_month)
+        self.income = income
+        self.regular_expenses = regular_expenses
+        self.large_purchases = large_purchases
+        self.equity_investment = equity_investment
+        self.opening_cash = float(opening_cash)
+        self.current_equity = float(current_equity)
+        self.current_fd = float(current_fd)
+
+    @property
+    def months(self) -> int:
+        return self.income.size
+
+    @property
+    def surplus(self) -> np.ndarray:
+        return self.income - self.regular_expenses - self.large_purchases
+
+    @classmethod
+    def from_fi_mcp(cls, bank_payload: Any, mf_payload: Any = None,
+                    large_purchase_threshold: float = 100_000,
+                    net_worth_payload: Any = None) -> 'CashFlowHistory':
+        """
+        Build from Fi MCP fetch_bank_transactions, fetch_mf_transactions and fetch_net_worth payloads
+        Bank txns rows are [amount, narration, date, type, mode, balance];
+        mutual fund txns rows are [orderType, date, price, units, amount]
+        """
+        bank_days, bank_amounts, bank_types = [], [], []
+        opening_cash = 0.0
+        banks = bank_payload.get('bankTransactions', []) if isinstance(bank_payload, dict) else bank_payload or []
+        for bank in banks:
+            rows = bank.get('txns') or []
+            if not rows:
+                continue
+            amounts_col, _, dates_col, types_col = list(zip(*rows))[:4]
+            days = _parse_days(dates_col)
+            amounts = np.abs(np.array(amounts_col, dtype=float))
+            types = np.char.upper(np.array(types_col, dtype=str))
+            bank_days.append(days)
+            bank_amounts.append(amounts)
+            bank_types.append(types)
+
+            first = int(np.argmin(days))
+            if len(rows[first]) > 5 and rows[first][5] not in (None, ''):
+                signed = amounts[first] * ((types[first] in CREDIT_TYPES) - (types[first] in DEBIT_TYPES))
+                opening_cash += float(rows[first][5]) - signed
+
+        if not bank_days:
+            raise ReplayInputError("No bank transactions to replay")
+        days = np.concatenate(bank_days)
+        amounts = np.concatenate(bank_amounts)
+        types = np.concatenate(bank_types)
+
+        mf_days, mf_flows = [], []
+        entries = mf_payload.get('mfTransactions', []) if isinstance(mf_payload, dict) else mf_payload or []
+        for entry in entries:
+            rows = entry.get('txns') or []
+            if not rows:
+                continue
+            order_types = np.char.upper(np.array([row[0] for row in rows], dtype=str))
+            flows = np.abs(np.array([row[4] or 0.0 for row in rows], dtype=float))
+            mf_days.append(_parse_days([row[1] for row in rows]))
+            mf_flows.append(np.where(np.isin(order_types, MF_SELL_TYPES), -flows, flows))
+        mf_days = np.concatenate(mf_days) if mf_days else np.array([], dtype='datetime64[D]')
+        mf_flows = np.concatenate(mf_flows) if mf_flows else np.array([])
+
+        bank_month = _month_index(days)
+        mf_month = _month_index(mf_days)
+        start = int(min(bank_month.min(), mf_month.min() if mf_month.size else bank_month.min()))
+        end = int(max(bank_month.max(), mf_month.max() if mf_month.size else bank_month.max()))
+        size = end - start + 1
+
+        def monthly(month: np.ndarray, weights: np.ndarray) -> np.ndarray:
+            return np.bincount(month - start, weights=weights, minlength=size)
+
+        is_credit = np.isin(types, CREDIT_TYPES)
+        is_debit = np.isin(types, DEBIT_TYPES)
+        credits = monthly(bank_month, amounts * is_credit)
+        debits = monthly(bank_month, amounts * is_debit)
+        large = monthly(bank_month, amounts * (is_debit & (amounts >= large_purchase_threshold)))
+        bought = monthly(mf_month, np.maximum(mf_flows, 0))
+        lump_sums = monthly(mf_month, mf_flows * (mf_flows >= large_purchase_threshold))
+        sold = monthly(mf_month, np.maximum(-mf_flows, 0))
+
+        # Redemptions land in the bank as credits and purchases leave it as debits;
+        # lump-sum fund purchases are large debits but not big purchases
+        income = np.maximum(credits - sold, 0)
+        expenses = np.maximum(debits - bought, 0)
+        large = np.minimum(np.maximum(large - lump_sums, 0), expenses)
+        current_equity, current_fd = holdings_from_fi_mcp(net_worth_payload)
+        return cls(start, income, expenses - large, large, bought - sold, opening_cash, current_equity, current_fd)
+
+
+def return_series(
+    start_month: int,
+    months: int,
+    assumptions: Dict[str, float],
+    historical_equity_returns: Optional[Dict[int, float]] = None,
+) -> np.ndarray:
+    """
+    Monthly returns per asset, shape (3, months)
+    Equity uses the calendar-year return from historical_equity_returns where given,
+    otherwise the parametric expected_annual_return; deposits accrue at fixed rates
+    """
+    years = (start_month + np.arange(months)) // 12 + 1970
+    annual = np.empty((3, months))
+    annual[EQUITY] = assumptions.get('equity_annual_return', 0.12)
+    annual[FD] = assumptions.get('fd_annual_return', 0.07)
+    annual[CASH] = assumptions.get('savings_annual_return', 0.03)
+    for year, value in (historical_equity_returns or {}).items():
+        annual[EQUITY, years == int(year)] = value
+    return (1 + annual) ** (1 / 12) - 1
+
+
+class UniverseReplayer:
+    """
+    Replays one cash-flow history under many policies at once
+    Every universe is a row of the (assets, universes) balance matrix, so a month of
+    replay is a handful of vector operations whatever the number of universes
+    """
+
+    def __init__(self, history: CashFlowHistory, returns: np.ndarray):
+        if returns.shape != (3, history.months):
+            raise ReplayInputError("Return series must cover every month of the history")
+        self.history = history
+        self.returns = returns
+
+    def opening_balances(self) -> np.ndarray:
+        """
+        Balances at the start of the history, shape (3,)
+        Today's holdings are discounted back through the return series, net of the equity
+        invested since, so replaying the actual history ends at today's holdings
+        """
+        h = self.history
+        # growth[:, k] is what one rupee added at the end of month k - 1 is worth today
+        growth = np.ones((3, h.months + 1))
+        growth[:, :-1] = np.cumprod((1 + self.returns)[:, ::-1], axis=1)[:, ::-1]
+        opening = np.zeros(3)
+        opening[EQUITY] = max((h.current_equity - h.equity_investment @ growth[EQUITY, 1:]) / growth[EQUITY, 0], 0.0)
+        opening[FD] = h.current_fd / growth[FD, 0]
+        opening[CASH] = h.opening_cash
+        return opening
+
+    @staticmethod
+    def _delays(policies: List[Dict[str, Any]], purchase_delay_months: int) -> np.ndarray:
+        return np.array([purchase_delay_months if p.get('delay_purchases') else 0 for p in policies])
+
+    def deferred_purchases(self, policies: List[Dict[str, Any]], purchase_delay_months: int = 12) -> np.ndarray:
+        """Big purchases each universe has postponed past the end of the history, shape (universes,)"""
+        h = self.history
+        due = np.arange(h.months)[None, :] + self._delays(policies, purchase_delay_months)[:, None]
+        return (h.large_purchases * (due >= h.months)).sum(axis=1)
+
+    def flows(self, policies: List[Dict[str, Any]], expense_cut: float = 0.10,
+              purchase_delay_months: int = 12) -> np.ndarray:
+        """Monthly flow into each asset for each universe, shape (3, universes, months)"""
+        h = self.history
+        n, m = len(policies), h.months
+        asset = {name: i for i, name in enumerate(ASSETS)}
+
+        def column(values: List[float]) -> np.ndarray:
+            return np.array(values, dtype=float)[:, None]
+
+        uses_shares = np.array([p.get('surplus_equity') is not None for p in policies])[:, None]
+        equity_share = column([p.get('surplus_equity') or 0.0 for p in policies])
+        fd_share = column([p.get('surplus_fd', 0.0) for p in policies])
+        equity_to = np.array([asset[p.get('equity_to', 'equity')] for p in policies])[:, None]
+        freed_to = np.array([asset[p.get('freed_to', 'cash')] for p in policies])
+        cut = column([expense_cut if p.get('expense_cut') else 0.0 for p in policies])
+        delay = self._delays(policies, purchase_delay_months)
+
+        purchases = np.zeros((n, m))
+        target = np.arange(m)[None, :] + delay[:, None]
+        rows = np.broadcast_to(np.arange(n)[:, None], target.shape)
+        inside = target < m  # purchases postponed past today are still owed, see deferred_purchases
+        np.add.at(purchases, (rows[inside], target[inside]), np.broadcast_to(h.large_purchases, (n, m))[inside])
+        freed = h.regular_expenses * cut + h.large_purchases - purchases
+
+        surplus = np.maximum(h.surplus, 0)
+        flows = np.zeros((3, n, m))
+        flows[EQUITY] = np.where(uses_shares, equity_share * surplus, (equity_to == EQUITY) * h.equity_investment)
+        flows[FD] = np.where(uses_shares, fd_share * surplus, (equity_to == FD) * h.equity_investment)
+        flows[CASH] = h.surplus - flows[EQUITY] - flows[FD]
+        flows[freed_to, np.arange(n)] += freed
+        return flows
+
+    def replay(self, flows: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Month-end balances for every universe
+        Returns net_worth (universes, months + 1) and the final balances (3, universes);
+        shortfalls are met from cash, then fixed deposits, then equity
+        """
+        n = flows.shape[1]
+        balances = np.repeat(self.opening_balances()[:, None], n, axis=1)
+        net_worth = np.empty((n, self.history.months + 1))
+        net_worth[:, 0] = balances.sum(axis=0)
+
+        for month in range(self.history.months):
+            balances = balances * (1 + self.returns[:, month, None]) + flows[:, :, month]
+            shortfall = -np.minimum(balances, 0).sum(axis=0)
+            np.maximum(balances, 0, out=balances)
+            for i in (CASH, FD, EQUITY):
+                taken = np.minimum(balances[i], shortfall)
+                balances[i] -= taken
+                shortfall -= taken
+            balances[CASH] -= shortfall  # overdrawn once every asset is exhausted
+            net_worth[:, month + 1] = balances.sum(axis=0)
+
+        return {'net_worth': net_worth, 'balances': balances}
+
+
+def _max_drawdown(net_worth: np.ndarray) -> np.ndarray:
+    """Largest peak-to-trough fall of each universe's net worth"""
+    peaks = np.maximum.accumulate(net_worth, axis=1)
+    drawdown = np.where(peaks > 0, 1 - net_worth / np.where(peaks > 0, peaks, 1), 0.0)
+    return np.clip(drawdown.max(axis=1), 0, 1)
+
+
+def replay_universes(
+    history: CashFlowHistory,
+    universe_ids: Optional[List[str]] = None,
+    surplus_equity_shares: Optional[List[float]] = None,
+    assumptions: Optional[Dict[str, float]] = None,
+    historical_equity_returns: Optional[Dict[int, float]] = None,
+) -> Dict[str, Any]:
+    """Replay the actual history and each alternative universe, in parallel_universe_analysis terms"""
+    assumptions = assumptions or {}
+    universe_ids = list(universe_ids or DEFAULT_UNIVERSES)
+    unknown = [uid for uid in universe_ids if uid not in POLICIES]
+    if unknown:
+        raise ReplayInputError(f"Unknown universes {unknown}; choose from {sorted(POLICIES)}")
+
+    universes = [{'universe_id': uid, **POLICIES[uid]} for uid in universe_ids]
+    for share in surplus_equity_shares or []:
+        if not 0 <= share <= 1:
+            raise ReplayInputError("surplus_equity_shares must be between 0 and 1")
+        universes.append({
+            'universe_id': f"equity_{round(share * 100)}",
+            'name': f"{share:.0%} Equity Saver",
+            'description': f"{share:.0%} of each month's surplus in equity, the rest in fixed deposits",
+            'surplus_equity': share,
+            'surplus_fd': 1 - share,
+        })
+    if len(universes) > MAX_UNIVERSES:
+        raise ReplayInputError(f"At most {MAX_UNIVERSES} universes can be replayed per call")
+
+    returns = return_series(history.start_month, history.months, assumptions, historical_equity_returns)
+    replayer = UniverseReplayer(history, returns)
+    policies = [{'universe_id': 'actual'}] + universes
+    purchase_delay_months = int(assumptions.get('purchase_delay_months', 12))
+    flows = replayer.flows(
+        policies,
+        expense_cut=assumptions.get('expense_cut', 0.10),
+        purchase_delay_months=purchase_delay_months,
+    )
+    result = replayer.replay(flows)
+    net_worth, balances = result['net_worth'], result['balances']
+    # A purchase still postponed at the end of the history is owed, not saved
+    deferred = replayer.deferred_purchases(policies, purchase_delay_months)
+    net_worth[:, -1] -= deferred
+    drawdowns = _max_drawdown(net_worth)
+
+    checkpoints = list(range(3, history.months + 1, 3))
+    if not checkpoints or checkpoints[-1] != history.months:
+        checkpoints.append(history.months)
+
+    def progression(u: int) -> List[Dict[str, Any]]:
+        return [
+            {'date': _month_label(history.start_month + month - 1), 'net_worth': round(float(net_worth[u, month]))}
+            for month in checkpoints
+        ]
+
+    start, actual = float(net_worth[0, 0]), float(net_worth[0, -1])
+    years = history.months / 12
+    journey = {
+        'start_date': _month_label(history.start_month),
+        'end_date': _month_label(history.start_month + history.months - 1),
+        'starting_net_worth': round(start),
+        'current_net_worth': round(actual),
+        'wealth_created': round(actual - start),
+        'cagr': round((actual / start) ** (1 / years) - 1, 4) if years >= 1 and start > 0 and actual > 0 else None,
+        'period_return': round(actual / start - 1, 4) if start > 0 else None,
+        'total_income': round(float(history.income.sum())),
+        'total_spending': round(float((history.regular_expenses + history.large_purchases).sum())),
+        'net_equity_invested': round(float(history.equity_investment.sum())),
+        'max_drawdown': round(float(drawdowns[0]), 4),
+        'net_worth_progression': progression(0),
+    }
+
+    alternatives = []
+    for u, universe in enumerate(universes, start=1):
+        final = float(net_worth[u, -1])
+        difference = final - actual
+        pct = difference / abs(actual) * 100 if actual else None
+        alternatives.append({
+            'universe_id': universe['universe_id'],
+            'name': universe['name'],
+            'description': universe['description'],
+            'final_net_worth': round(final),
+            'final_net_worth_display': format_inr(final),
+            'wealth_difference': round(difference),
+            'wealth_difference_pct': round(pct, 1) if pct is not None else None,
+            'wealth_difference_display': format_inr(difference, signed=True) + (f" ({pct:+.1f}%)" if pct is not None else ''),
+            'max_drawdown': round(float(drawdowns[u]), 4),
+            'deferred_purchases': round(float(deferred[u])),
+            'final_allocation': {asset: round(float(balances[i, u])) for i, asset in enumerate(ASSETS)},
+            'timeline_progression': progression(u),
+        })
+
+    best = max(alternatives, key=lambda universe: universe['final_net_worth'], default=None)
+    return {
+        'status': 'success',
+        'metadata': {
+            'data_period': f"{journey['start_date']} to {journey['end_date']}",
+            'months_replayed': history.months,
+            'universes_generated': len(alternatives),
+            'currency': 'INR',
+            'return_assumptions': {
+                'equity_annual_return': assumptions.get('equity_annual_return', 0.12),
+                'fd_annual_return': assumptions.get('fd_annual_return', 0.07),
+                'savings_annual_return': assumptions.get('savings_annual_return', 0.03),
+                'historical_equity_years': sorted(int(year) for year in (historical_equity_returns or {})),
+            },
+        },
+        'actual_journey': journey,
+        'alternative_universes': alternatives,
+        'best_universe_id': best['universe_id'] if best and best['final_net_worth'] > actual else 'actual',
+    }
+
+
+async def replay_parallel_universes(
+    tool_context: ToolContext,
+    universe_ids: Optional[List[str]] = None,
+    surplus_equity_shares: Optional[List[float]] = None,
+    equity_annual_return: float = 0.12,
+    fd_annual_return: float = 0.07,
+    savings_annual_return: float = 0.03,
+    history_years: Optional[List[int]] = None,
+    history_equity_returns: Optional[List[float]] = None,
+    large_purchase_threshold: float = 100000.0,
+    purchase_delay_months: int = 12,
+    expense_cut: float = 0.10,
+) -> Dict[str, Any]:
+    """Replays the user's real cash-flow history from Fi MCP under alternative financial policies.
+
+    Reads bank and mutual fund transactions and current holdings from Fi MCP directly,
+    replays what actually happened, and replays the same months again for each alternative
+    universe. Use its numbers for actual_journey and alternative_universes instead of
+    estimating them.
+
+    Args:
+        universe_ids: Universes to replay: conservative, aggressive, balanced, idle_cash,
+            delayed_purchase and frugal. Defaults to all but idle_cash.
+        surplus_equity_shares: Extra universes investing this share of each month's surplus
+            in equity and the rest in fixed deposits, e.g. [0.2, 0.4, 0.8].
+        equity_annual_return: Annual equity return for years without historical data.
+        fd_annual_return: Annual fixed deposit rate.
+        savings_annual_return: Annual savings account rate.
+        history_years: Calendar years with a known equity index return, e.g. [2020, 2021].
+        history_equity_returns: Equity return of each year in history_years (0.15 means 15%).
+        large_purchase_threshold: Single debits at or above this amount count as big purchases.
+        purchase_delay_months: How long the delayed_purchase universe postpones big purchases.
+        expense_cut: Share of regular spending the frugal universe saves.
+
+    Returns:
+        metadata (data period, universes generated), the replayed actual_journey (starting and
+        current net worth, wealth created, period return, CAGR for histories of a year or more,
+        quarterly progression), and for every alternative universe its final net worth net of
+        purchases still postponed, wealth difference versus the actual journey (with display
+        strings), max drawdown, deferred purchases, final allocation and quarterly progression.
+    """
+    history_years = history_years or []
+    history_equity_returns = history_equity_returns or []
+    if len(history_years) != len(history_equity_returns):
+        return {'status': 'error', 'error_message': "history_years and history_equity_returns must have the same length"}
+
+    try:
+        bank_payload = await fetch_fi_mcp_data('fetch_bank_transactions', tool_context)
+        try:
+            mf_payload = await fetch_fi_mcp_data('fetch_mf_transactions', tool_context)
+        except FiMCPDataError as e:
+            logger.warning(f"Replaying without mutual fund transactions: {e}")
+            mf_payload = None
+        try:
+            net_worth_payload = await fetch_fi_mcp_data('fetch_net_worth', tool_context)
+        except FiMCPDataError as e:
+            logger.warning(f"Replaying from bank cash only, without current holdings: {e}")
+            net_worth_payload = None
+
+        history = CashFlowHistory.from_fi_mcp(
+            bank_payload, mf_payload, large_purchase_threshold, net_worth_payload=net_worth_payload,
+        )
+        return replay_universes(
+            history,
+            universe_ids=universe_ids,
+            surplus_equity_shares=surplus_equity_shares,
+            assumptions={
+                'equity_annual_return': equity_annual_return,
+                'fd_annual_return': fd_annual_return,
+                'savings_annual_return': savings_annual_return,
+                'purchase_delay_months': purchase_delay_months,
+                'expense_cut': expense_cut,
+            },
+            historical_equity_returns=dict(zip(history_years, history_equity_returns)),
+        )
+    except (FiMCPDataError, ReplayInputError) as e:
+        return {'status': 'error', 'error_message': str(e)}
@@ -1,12 +1,19 @@
 from google.adk import Agent
 
 from . import prompt
+from ...replay import replay_parallel_universes
+from ...history_compaction import compact_history
+from ...model_router import escalate_invalid_output, model_for, route_model
+from ...prompt_registry import register_prompt
 
-MODEL = "gemini-2.5-pro"
+MODEL = model_for("insight_synthesizer_agent")
 
 insight_synthesizer_agent = Agent(
     model=MODEL,
     name="insight_synthesizer_agent", 
-    instruction=prompt.INSIGHT_SYNTHESIZER_PROMPT,
+    instruction=register_prompt("insight_synthesizer_agent", prompt.INSIGHT_SYNTHESIZER_PROMPT),
     output_key="insight_synthesis_output",
+    tools=[replay_parallel_universes],
+    before_model_callback=[compact_history, route_model],  # Digest of older turns, then model choice
+    after_model_callback=escalate_invalid_output,  # Re-runs on pro if the output does not parse
 )
\ No newline at end of file
@@ -19,6 +19,16 @@ Ready for insight synthesis and final JSON generation.
 
 **Task:** Create the final comprehensive JSON that combines all analyses into actionable insights and patterns.
 
+**Universe Replay Tool (replay_parallel_universes):**
+All net worth figures for the actual journey and the alternative universes MUST come from the replay_parallel_universes tool. It replays the user's real Fi MCP bank and mutual fund history month by month. Never estimate or invent these values yourself.
+- Call it once before writing the JSON; keep the default universes unless the user asked about specific alternatives
+- metadata.data_period and metadata.universes_generated come from the tool's metadata
+- financial_timeline.actual_journey start_date, end_date, starting_net_worth, current_net_worth, wealth_created and cagr come from actual_journey (format amounts in rupees, cagr as a percentage)
+- cagr is null for histories shorter than a year; then report period_return as the return over the period instead of annualizing it
+- Each alternative_universes entry uses the tool's universe_id, name and description; final_net_worth is final_net_worth_display and wealth_difference is wealth_difference_display
+- Base pros, cons and key_characteristics on the replayed numbers (max_drawdown, final_allocation, deferred_purchases still owed at the end) and the transformation_potential on best_universe_id
+- If the tool returns status "error", report the error_message in summary_insights and do not invent universe values
+
 Synthesis Framework:
 
 1. **Pattern Recognition**:
@@ -0,0 +1,516 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Capital Gains Lot Engine
+FIFO mutual fund lots as sorted arrays, unrealised LTCG/STCG and a harvest / loss-booking plan for the financial year
+"""
+
+import logging
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from google.adk.tools.tool_context import ToolContext
+
+from .fi_mcp import FiMCPDataError, fetch_fi_mcp_data
+from .tax_engine import TAX_RULES
+
+logger = logging.getLogger(__name__)
+
+BUY = 1
+SELL = 2
+_SCHEME_KEY_SCALE = 10_000_000  # > days since epoch, so (scheme, date) packs into one int64
+
+# Scheme name fragments of funds that are not taxed as equity (Sections 111A/112A)
+NON_EQUITY_KEYWORDS = (
+    'debt', 'liquid', 'gilt', 'bond', 'money market', 'overnight', 'banking & psu', 'banking and psu',
+    'corporate', 'credit risk', 'duration', 'treasury', 'fixed maturity', 'floater', 'income fund',
+)
+
+
+class LotEngineError(Exception):
+    """Custom exception for unusable transaction feeds"""
+    pass
+
+
+def _one_year_before(days: np.ndarray) -> np.ndarray:
+    """Same calendar day a year earlier (29 Feb maps to 1 Mar)"""
+    months = days.astype('datetime64[M]')
+    day_of_month = days - months.astype('datetime64[D]')
+    return (months - 12).astype('datetime64[D]') + day_of_month
+
+
+def financial_year_of(day: date) -> Tuple[date, date, str]:
+    """Start, end and assessment year of the financial year containing day"""
+    start_year = day.year if day.month >= 4 else day.year - 1
+    return date(start_year, 4, 1), date(start_year + 1, 3, 31), f"{start_year + 1}-{(start_year + 2) % 100:02d}"
+
+
+def _set_off(short_term: float, long_term: float) -> Tuple[float, float, float]:
+    """Net gains after Section 70/74 set-off: (taxable STCG, LTCG before exemption, loss carried forward)"""
+    carried = 0.0
+    if short_term < 0:
+        long_term += short_term
+        short_term = 0.0
+    if long_term < 0:
+        carried = -long_term
+        long_term = 0.0
+    return short_term, long_term, carried
+
+
+class LotBook:
+    """
+    FIFO lot ledger for a mutual fund portfolio
+    Transactions are sorted once by (scheme, date); within a scheme, FIFO consumption is a
+    range on the cumulative bought-units axis, so realised gains, holding periods and open lots
+    all come from cumsum / searchsorted / interp instead of walking transactions one by one
+    """
+
+    def __init__(self, schemes: List[Dict[str, Any]], scheme_idx: np.ndarray, days: np.ndarray,
+                 order_types: np.ndarray, units: np.ndarray, prices: np.ndarray):
+        if len(scheme_idx) == 0:
+            raise LotEngineError("No mutual fund transactions to analyse")
+        if np.any(units <= 0) or np.any(prices < 0):
+            raise LotEngineError("Transactions need positive units and non-negative prices")
+
+        self.schemes = schemes
+        self.warnings = []
+        order = np.lexsort((order_types, days, scheme_idx))  # buys before sells on the same day
+        scheme_idx, days, order_types = scheme_idx[order], days[order], order_types[order]
+        units, prices = units[order], prices[order]
+        is_buy = order_types == BUY
+        num_schemes = len(schemes)
+
+        # Open lots (one per buy), with global cumulative units/cost as the FIFO axis
+        self.lot_scheme = scheme_idx[is_buy]
+        self.lot_date = days[is_buy]
+        self.lot_units = units[is_buy]
+        self.lot_price = prices[is_buy]
+        cum_units = np.cumsum(self.lot_units)
+        self._axis_units = np.concatenate(([0.0], cum_units))
+        self._axis_cost = np.concatenate(([0.0], np.cumsum(self.lot_units * self.lot_price)))
+        self._lot_keys = self.lot_scheme.astype(np.int64) * _SCHEME_KEY_SCALE + self.lot_date.astype(np.int64)
+
+        scheme_start = np.searchsorted(self.lot_scheme, np.arange(num_schemes), side='left')
+        scheme_end = np.searchsorted(self.lot_scheme, np.arange(num_schemes), side='right')
+        bought = self._axis_units[scheme_end] - self._axis_units[scheme_start]
+
+        # Sells: FIFO consumes [before, after) of the scheme's cumulative bought units
+        sell_scheme = scheme_idx[~is_buy]
+        sell_units = units[~is_buy]
+        self.sell_scheme = sell_scheme
+        self.sell_date = days[~is_buy]
+        cum_sold = np.cumsum(sell_units)
+        sold_start = np.concatenate(([0.0], cum_sold))[np.searchsorted(sell_scheme, sell_scheme, side='left')]
+        sold_after = cum_sold - sold_start
+        sold_before = sold_after - sell_units
+
+        oversold = sold_after > bought[sell_scheme] * (1 + 1e-9) + 1e-6
+        if oversold.any():
+            names = sorted({schemes[i]['scheme_name'] for i in sell_scheme[oversold]})
+            self.warnings.append(f"Sales exceed recorded purchases (incomplete history?): {', '.join(names)}")
+        base = self._axis_units[scheme_start][sell_scheme]
+        start = base + np.minimum(sold_before, bought[sell_scheme])
+        end = base + np.minimum(sold_after, bought[sell_scheme])
+
+        # Units bought on or before a year earlier are long-term; they are the oldest, i.e. consumed first
+        cutoff_keys = sell_scheme.astype(np.int64) * _SCHEME_KEY_SCALE + _one_year_before(self.sell_date).astype(np.int64)
+        long_term_limit = self._axis_units[np.searchsorted(self._lot_keys, cutoff_keys, side='left')]
+        long_term_end = np.clip(long_term_limit, start, end)
+
+        sale_price = prices[~is_buy]
+        matched = end - start
+        self.sell_long_term_gain = (long_term_end - start) * sale_price - (self._cost(long_term_end) - self._cost(start))
+        self.sell_short_term_gain = (end - long_term_end) * sale_price - (self._cost(end) - self._cost(long_term_end))
+        self.sell_units = matched
+
+        # Remaining units per lot after every sale
+        sold_total = np.bincount(sell_scheme, weights=sell_units, minlength=num_schemes)
+        consumed_to = self._axis_units[scheme_start] + np.minimum(sold_total, bought)
+        self.lot_remaining = np.clip(cum_units - consumed_to[self.lot_scheme], 0.0, self.lot_units)
+
+    def _cost(self, position: np.ndarray) -> np.ndarray:
+        """Cost of the first `position` units on the global FIFO axis"""
+        return np.interp(position, self._axis_units, self._axis_cost)
+
+    @classmethod
+    def from_fi_mcp(cls, payload: Any, equity_isins: Optional[List[str]] = None) -> 'LotBook':
+        """
+        Build from a Fi MCP fetch_mf_transactions payload
+        Each scheme has isinNumber, schemeName and txns rows of
+        [orderType (1 buy, 2 sell), transactionDate, purchasePrice, purchaseUnits, transactionAmount];
+        dict-shaped rows with the same field names are accepted too
+        """
+        if isinstance(payload, dict):
+            entries = payload.get('mfTransactions') or payload.get('transactions') or []
+        else:
+            entries = payload or []
+
+        schemes, scheme_idx, days, order_types, units, prices = [], [], [], [], [], []
+        for entry in entries:
+            rows = entry.get('txns') or entry.get('transactions') or []
+            if not rows:
+                continue
+            if isinstance(rows[0], dict):
+                rows = [
+                    [row.get('orderType', row.get('transactionType')), row.get('transactionDate'),
+                     row.get('purchasePrice', row.get('nav')), row.get('purchaseUnits', row.get('units')),
+                     row.get('transactionAmount', row.get('amount'))]
+                    for row in rows
+                ]
+            types_col, dates_col, price_col, units_col, amount_col = zip(*rows)
+
+            isin = entry.get('isinNumber') or entry.get('isin') or ''
+            name = entry.get('schemeName') or isin or f"Scheme {len(schemes) + 1}"
+            if equity_isins is not None:
+                is_equity = isin in equity_isins
+            else:
+                is_equity = not any(keyword in name.lower() for keyword in NON_EQUITY_KEYWORDS)
+            schemes.append({'isin': isin, 'scheme_name': name, 'is_equity': is_equity})
+
+            count = len(rows)
+            scheme_idx.append(np.full(count, len(schemes) - 1, dtype=np.int64))
+            try:
+                days.append(np.array(dates_col, dtype='datetime64[D]'))
+            except ValueError:
+                days.append(np.array([str(value)[:10] for value in dates_col], dtype='datetime64[D]'))
+            type_names = np.char.upper(np.array(types_col, dtype=str))
+            order_types.append(np.where(np.isin(type_names, ('2', 'SELL', 'REDEEM', 'REDEMPTION')), SELL, BUY))
+            unit_values = np.abs(np.array(units_col, dtype=float))
+            price_values = np.array([value or 0.0 for value in price_col], dtype=float)
+            amounts = np.abs(np.array([value or 0.0 for value in amount_col], dtype=float))
+            # Fall back to amount / units where the NAV is missing
+            price_values = np.where(price_values > 0, price_values, amounts / np.maximum(unit_values, 1e-12))
+            units.append(unit_values)
+            prices.append(price_values)
+
+        if not schemes:
+            raise LotEngineError("No mutual fund transactions to analyse")
+        return cls(schemes, np.concatenate(scheme_idx), np.concatenate(days), np.concatenate(order_types),
+                   np.concatenate(units), np.concatenate(prices))
+
+    def latest_prices(self) -> np.ndarray:
+        """Price of each scheme's most recent buy, used when no current NAV is known"""
+        scheme_ids = np.arange(len(self.schemes))
+        first = np.searchsorted(self.lot_scheme, scheme_ids, side='left')
+        last = np.searchsorted(self.lot_scheme, scheme_ids, side='right') - 1  # lots are date-sorted
+        return np.where(last >= first, self.lot_price[np.maximum(last, 0)], 0.0)
+
+    def realised(self, start: date, end: date) -> Dict[str, float]:
+        """Realised equity STCG/LTCG from sales between start and end inclusive"""
+        in_period = (self.sell_date >= np.datetime64(start)) & (self.sell_date <= np.datetime64(end))
+        equity = np.array([scheme['is_equity'] for scheme in self.schemes], dtype=bool)[self.sell_scheme]
+        mask = in_period & equity
+        return {
+            'short_term': float(self.sell_short_term_gain[mask].sum()),
+            'long_term': float(self.sell_long_term_gain[mask].sum()),
+        }
+
+    def unrealised(self, navs: np.ndarray, as_of: date) -> Dict[str, np.ndarray]:
+        """Per-lot value, gain and holding class at as_of"""
+        as_of_day = np.datetime64(as_of)
+        open_lots = self.lot_remaining > 1e-9
+        long_term = self.lot_date < _one_year_before(np.array([as_of_day]))[0]
+        gain = self.lot_remaining * (navs[self.lot_scheme] - self.lot_price)
+        return {
+            'open': open_lots,
+            'long_term': long_term,
+            'gain': np.where(open_lots, gain, 0.0),
+            'cost': self.lot_remaining * self.lot_price,
+            'value': self.lot_remaining * navs[self.lot_scheme],
+        }
+
+
+class HarvestPlanner:
+    """
+    Financial-year harvest plan for equity funds
+    Sales within a scheme are FIFO, so every candidate sale is a prefix of the scheme's open lots.
+    Loss-booking sells the shortest prefix that brings this year's tax to its lowest, splitting the
+    last lot so only the gain still taxable after the LTCG exemption is offset; gain harvesting
+    then realises long-term prefixes up to the remaining exemption
+    """
+
+    def __init__(self, book: LotBook, navs: np.ndarray, as_of: date, assessment_year: Optional[str] = None):
+        self.book = book
+        self.navs = navs
+        self.as_of = as_of
+        self.fy_start, self.fy_end, derived_year = financial_year_of(as_of)
+        self.assessment_year = assessment_year or derived_year
+        if self.assessment_year not in TAX_RULES:
+            raise LotEngineError(
+                f"No capital gains rules for assessment year {self.assessment_year}; "
+                f"supported: {', '.join(sorted(TAX_RULES))}"
+            )
+        rules = TAX_RULES[self.assessment_year]['capital_gains']
+        self.stcg_rate = rules['stcg_111a_rate']
+        self.ltcg_rate = rules['ltcg_112a_rate']
+        self.exemption = rules['ltcg_112a_exemption']
+
+    def tax(self, short_term: float, long_term: float) -> float:
+        taxable_short, taxable_long, _ = _set_off(short_term, long_term)
+        return taxable_short * self.stcg_rate + max(0.0, taxable_long - self.exemption) * self.ltcg_rate
+
+    def _tax_along(self, short_term: np.ndarray, long_term: np.ndarray) -> np.ndarray:
+        """tax for arrays of short- and long-term year totals, e.g. along a prefix"""
+        taxable_long = long_term + np.minimum(short_term, 0.0)
+        return (np.maximum(short_term, 0.0) * self.stcg_rate
+                + np.maximum(taxable_long - self.exemption, 0.0) * self.ltcg_rate)
+
+    def _prefixes(self, lots: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+        """Per equity scheme: cumulative units, gains and values along its open lots in FIFO order"""
+        book = self.book
+        open_idx = np.flatnonzero(lots['open'])
+        prefixes = []
+        boundaries = np.flatnonzero(np.diff(book.lot_scheme[open_idx])) + 1
+        for group in np.split(open_idx, boundaries):
+            if group.size == 0:
+                continue
+            scheme = int(book.lot_scheme[group[0]])
+            if not book.schemes[scheme]['is_equity']:
+                continue
+            long_term = lots['long_term'][group]
+            gains = lots['gain'][group]
+            prefixes.append({
+                'scheme': scheme,
+                'lots': group,
+                'units': np.cumsum(book.lot_remaining[group]),
+                'value': np.cumsum(lots['value'][group]),
+                'short_term': np.cumsum(np.where(long_term, 0.0, gains)),
+                'long_term': np.cumsum(np.where(long_term, gains, 0.0)),
+                'long_term_count': int(long_term.sum()),  # long-term lots are the oldest prefix
+            })
+        return prefixes
+
+    def _action(self, action: str, prefix: Dict[str, Any], count: int, units: float, value: float,
+                short_term: float, long_term: float) -> Dict[str, Any]:
+        scheme = self.book.schemes[prefix['scheme']]
+        return {
+            'action': action,
+            'scheme_name': scheme['scheme_name'],
+            'isin': scheme['isin'],
+            'lots': count,
+            'units': float(round(units, 3)),
+            'sale_value': float(round(value, 2)),
+            'short_term_gain': float(round(short_term, 2)),
+            'long_term_gain': float(round(long_term, 2)),
+        }
+
+    def _loss_booking(self, prefix: Dict[str, Any], short_term: float, long_term: float) -> Optional[Dict[str, Any]]:
+        """Smallest sale from the prefix that reaches its lowest tax, or None if no sale lowers the tax"""
+        taxes = self._tax_along(short_term + prefix['short_term'], long_term + prefix['long_term'])
+        lowest = taxes.min()
+        if lowest >= self.tax(short_term, long_term) - 0.005:
+            return None
+        # The first lot reaching the lowest tax is a loss; sell only the part of it still needed
+        cut = int(np.argmax(taxes <= lowest + 0.005))
+        prev = {key: prefix[key][cut - 1] if cut else 0.0 for key in ('units', 'value', 'short_term', 'long_term')}
+        lot = {key: prefix[key][cut] - prev[key] for key in prev}
+        taxable_short, taxable_long, _ = _set_off(short_term + prev['short_term'], long_term + prev['long_term'])
+        needed = max(0.0, taxable_long - self.exemption) + (taxable_short if lot['short_term'] < 0 else 0.0)
+        fraction = min(1.0, needed / -(lot['short_term'] + lot['long_term']))
+        units = min(lot['units'], np.ceil(lot['units'] * fraction * 1000) / 1000)
+        share = units / lot['units']
+        return {
+            'count': cut + 1,
+            'units': prev['units'] + units,
+            'value': prev['value'] + lot['value'] * share,
+            'short_term': prev['short_term'] + lot['short_term'] * share,
+            'long_term': prev['long_term'] + lot['long_term'] * share,
+        }
+
+    def plan(self) -> Dict[str, Any]:
+        lots = self.book.unrealised(self.navs, self.as_of)
+        realised = self.book.realised(self.fy_start, self.fy_end)
+        short_term, long_term = realised['short_term'], realised['long_term']
+        tax_before = self.tax(short_term, long_term)
+        prefixes = self._prefixes(lots)
+        actions = []
+
+        # 1. Loss booking: largest tax reduction first, each scheme selling only the loss still needed
+        candidates = [prefix for prefix in prefixes if (prefix['short_term'] + prefix['long_term']).min() < 0]
+        booked = set()
+        while candidates:
+            sales = [(prefix, self._loss_booking(prefix, short_term, long_term)) for prefix in candidates]
+            sales = [(prefix, sale) for prefix, sale in sales if sale]
+            if not sales:
+                break
+            prefix, sale = min(sales, key=lambda item: self.tax(short_term + item[1]['short_term'],
+                                                                 long_term + item[1]['long_term']))
+            candidates.remove(prefix)
+            booked.add(prefix['scheme'])
+            short_term += sale['short_term']
+            long_term += sale['long_term']
+            actions.append(self._action('book_loss', prefix, sale['count'], sale['units'], sale['value'],
+                                        sale['short_term'], sale['long_term']))
+
+        # 2. Gain harvesting: long-term prefixes up to the unused exemption, without adding STCG
+        _, taxable_long, _ = _set_off(short_term, long_term)
+        room = max(0.0, self.exemption - taxable_long)
+        harvest_candidates = []
+        for prefix in prefixes:
+            count = prefix['long_term_count']
+            if count == 0 or prefix['scheme'] in booked:
+                continue
+            gains = prefix['long_term'][:count]
+            cut = int(np.argmax(gains))
+            if gains[cut] > 0:
+                harvest_candidates.append((gains[cut], prefix, cut))
+        harvested = 0.0
+        for best_gain, prefix, cut in sorted(harvest_candidates, key=lambda item: -item[0]):
+            if room <= 0:
+                break
+            if best_gain <= room:
+                target_cut, units, value, gain = cut, prefix['units'][cut], prefix['value'][cut], best_gain
+            else:
+                # First lot where the cumulative gain passes the room; sell only part of it
+                gains = prefix['long_term'][:cut + 1]
+                target_cut = int(np.argmax(gains >= room))
+                prev_gain = gains[target_cut - 1] if target_cut else 0.0
+                prev_units = prefix['units'][target_cut - 1] if target_cut else 0.0
+                prev_value = prefix['value'][target_cut - 1] if target_cut else 0.0
+                fraction = (room - prev_gain) / (gains[target_cut] - prev_gain)
+                lot_units = prefix['units'][target_cut] - prev_units
+                units = prev_units + np.floor(lot_units * fraction * 1000) / 1000
+                value = prev_value + (prefix['value'][target_cut] - prev_value) * (units - prev_units) / lot_units
+                gain = prev_gain + (gains[target_cut] - prev_gain) * (units - prev_units) / lot_units
+                if units <= 0:
+                    continue
+            room -= gain
+            harvested += gain
+            long_term += gain
+            actions.append(self._action('harvest_gain', prefix, target_cut + 1, units, value, 0.0, gain))
+
+        tax_after = self.tax(short_term, long_term)
+        _, _, carried_forward = _set_off(short_term, long_term)
+        return {
+            'realised_this_year': {key: round(value, 2) for key, value in realised.items()},
+            'actions': actions,
+            'tax_before_plan': round(tax_before, 2),
+            'tax_after_plan': round(tax_after, 2),
+            'tax_saved_this_year': round(tax_before - tax_after, 2),
+            'ltcg_harvested_tax_free': round(harvested, 2),
+            'future_tax_avoided_by_harvest': round(harvested * self.ltcg_rate, 2),
+            'loss_carried_forward': round(carried_forward, 2),
+            'ltcg_exemption_remaining': round(room, 2),
+        }
+
+
+def summarize_holdings(book: LotBook, navs: np.ndarray, as_of: date) -> List[Dict[str, Any]]:
+    """Per-scheme units, cost, value, unrealised STCG/LTCG and next long-term date"""
+    lots = book.unrealised(navs, as_of)
+    num_schemes = len(book.schemes)
+    open_lots = lots['open']
+    weights = {
+        'units': np.where(open_lots, book.lot_remaining, 0.0),
+        'cost': np.where(open_lots, lots['cost'], 0.0),
+        'value': np.where(open_lots, lots['value'], 0.0),
+        'short_term_gain': np.where(open_lots & ~lots['long_term'], lots['gain'], 0.0),
+        'long_term_gain': np.where(open_lots & lots['long_term'], lots['gain'], 0.0),
+    }
+    totals = {key: np.bincount(book.lot_scheme, weights=value, minlength=num_schemes) for key, value in weights.items()}
+
+    # Earliest short-term open lot per scheme becomes long-term the day after its anniversary
+    pending = open_lots & ~lots['long_term']
+    first_pending = np.full(num_schemes, np.datetime64('NaT'), dtype='datetime64[D]')
+    pending_idx = np.flatnonzero(pending)
+    scheme_of_pending = book.lot_scheme[pending_idx]
+    first_idx = pending_idx[np.unique(scheme_of_pending, return_index=True)[1]]
+    first_pending[book.lot_scheme[first_idx]] = book.lot_date[first_idx]
+    anniversary = (first_pending.astype('datetime64[M]') + 12).astype('datetime64[D]') + (
+        first_pending - first_pending.astype('datetime64[M]').astype('datetime64[D]')
+    )
+
+    holdings = []
+    for i, scheme in enumerate(book.schemes):
+        if totals['units'][i] <= 1e-9:
+            continue
+        holdings.append({
+            'scheme_name': scheme['scheme_name'],
+            'isin': scheme['isin'],
+            'tax_treatment': 'equity' if scheme['is_equity'] else 'non_equity',
+            'units': float(round(totals['units'][i], 3)),
+            'cost': float(round(totals['cost'][i], 2)),
+            'current_value': float(round(totals['value'][i], 2)),
+            'unrealised_short_term_gain': float(round(totals['short_term_gain'][i], 2)),
+            'unrealised_long_term_gain': float(round(totals['long_term_gain'][i], 2)),
+            'next_lot_long_term_on': None if np.isnat(anniversary[i]) else str(anniversary[i] + 1),
+        })
+    return holdings
+
+
+def analyze_capital_gains(payload: Any, as_of: date, current_navs: Optional[Dict[str, float]] = None,
+                          assessment_year: Optional[str] = None,
+                          equity_isins: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Holdings summary and harvest plan from a Fi MCP mutual fund transaction payload"""
+    book = LotBook.from_fi_mcp(payload, equity_isins=equity_isins)
+    navs = book.latest_prices()
+    priced = np.zeros(len(book.schemes), dtype=bool)
+    for i, scheme in enumerate(book.schemes):
+        nav = (current_navs or {}).get(scheme['isin'])
+        if nav:
+            navs[i] = nav
+            priced[i] = True
+
+    planner = HarvestPlanner(book, navs, as_of, assessment_year)
+    result = {
+        'status': 'success',
+        'as_of_date': as_of.isoformat(),
+        'assessment_year': planner.assessment_year,
+        'rates': {'stcg': planner.stcg_rate, 'ltcg': planner.ltcg_rate, 'ltcg_exemption': planner.exemption},
+        'holdings': summarize_holdings(book, navs, as_of),
+        'harvest_plan': planner.plan(),
+        'warnings': list(book.warnings),
+    }
+    unpriced = [scheme['scheme_name'] for i, scheme in enumerate(book.schemes) if not priced[i]]
+    if unpriced:
+        result['warnings'].append(
+            f"No current NAV for {len(unpriced)} scheme(s); valued at their last purchase NAV: {', '.join(unpriced[:10])}"
+        )
+    return result
+
+
+async def plan_capital_gains_harvest(
+    tool_context: ToolContext,
+    nav_isins: Optional[List[str]] = None,
+    nav_values: Optional[List[float]] = None,
+    as_of_date: str = '',
+) -> Dict[str, Any]:
+    """Computes lot-level mutual fund capital gains and this financial year's harvest plan.
+
+    Reads the user's full mutual fund transaction history from Fi MCP directly, builds FIFO
+    lots, and plans loss booking and tax-free LTCG harvesting (sell and immediately rebuy).
+    Use it for every LTCG/STCG figure, exemption utilisation and loss-booking recommendation.
+
+    Args:
+        nav_isins: ISINs whose current NAV is known, e.g. from the net worth data.
+        nav_values: Current NAV for each ISIN, in the same order as nav_isins.
+        as_of_date: Valuation date as YYYY-MM-DD; defaults to today.
+
+    Returns:
+        Per-scheme units, cost, value, unrealised STCG/LTCG and the date the next lot turns
+        long-term, plus the harvest plan: each sale (scheme, units, gains), tax before and
+        after, LTCG harvested within the exemption, and losses carried forward.
+    """
+    try:
+        as_of = date.fromisoformat(as_of_date) if as_of_date else date.today()
+    except ValueError:
+        return {'status': 'error', 'error_message': f"Invalid as_of_date '{as_of_date}', expected YYYY-MM-DD"}
+    current_navs = dict(zip(nav_isins or [], nav_values or []))
+
+    try:
+        payload = await fetch_fi_mcp_data('fetch_mf_transactions', tool_context)
+        return analyze_capital_gains(payload, as_of, current_navs)
+    except (FiMCPDataError, LotEngineError) as e:
+        return {'status': 'error', 'error_message': str(e)}
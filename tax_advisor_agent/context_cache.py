@@ -0,0 +1,243 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Provider-side context caching of static agent instructions and tool declarations"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+from google.genai import types
+
+logger = logging.getLogger(__name__)
+
+CONTEXT_CACHE_ENABLED = os.environ.get("CONTEXT_CACHE_ENABLED", "true").lower() == "true"
+CONTEXT_CACHE_TTL = int(os.environ.get("CONTEXT_CACHE_TTL", "3600"))
+# Gemini rejects caches below a minimum size (2048 tokens for 2.5 Pro, 1024 for Flash)
+CONTEXT_CACHE_MIN_TOKENS = int(os.environ.get("CONTEXT_CACHE_MIN_TOKENS", "2048"))
+# A handle is replaced this many seconds before it expires, so no request uses an expired cache
+REFRESH_MARGIN_SECONDS = 120
+# After a failed creation the same prefix is sent uncached for this long before retrying
+RETRY_AFTER_SECONDS = 600
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough Gemini token count (about four characters per token)"""
+    return (len(text) + 3) // 4
+
+
+class ContextCacheProvider(ABC):
+    """Creates and deletes cached content holding a static request prefix"""
+
+    @abstractmethod
+    async def create(
+        self,
+        model: str,
+        system_instruction: str,
+        tools: Optional[List[types.Tool]],
+        tool_config: Optional[types.ToolConfig],
+        ttl_seconds: int,
+        display_name: str,
+    ) -> str:
+        """Cache the prefix and return its handle (the cached content name)"""
+
+    @abstractmethod
+    async def delete(self, name: str) -> None:
+        """Delete a cached content by its handle"""
+
+
+class GeminiContextCacheProvider(ContextCacheProvider):
+    """Gemini API / Vertex AI explicit context caching through google-genai"""
+
+    def __init__(self):
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            from google import genai
+            self._client = genai.Client()
+        return self._client
+
+    async def create(self, model, system_instruction, tools, tool_config, ttl_seconds, display_name) -> str:
+        cache = await self.client.aio.caches.create(
+            model=model,
+            config=types.CreateCachedContentConfig(
+                system_instruction=system_instruction,
+                tools=tools,
+                tool_config=tool_config,
+                ttl=f"{ttl_seconds}s",
+                display_name=display_name,
+            ),
+        )
+        return cache.name
+
+    async def delete(self, name: str) -> None:
+        await self.client.aio.caches.delete(name=name)
+
+
+class ContextCacheRegistry:
+    """
+    Cache handles keyed by model and static prefix (system instruction, tools, tool config)
+    Handles are process-wide, so every session of an agent reuses the same cached prefix.
+    Creation is serialised per key, so concurrent misses create one cache; replaced handles are deleted.
+    A request using a handle must not repeat the cached fields, so they are moved out of its config
+    """
+
+    def __init__(
+        self,
+        provider: ContextCacheProvider,
+        ttl: int = CONTEXT_CACHE_TTL,
+        min_tokens: int = CONTEXT_CACHE_MIN_TOKENS,
+    ):
+        self.provider = provider
+        self.ttl = ttl
+        self.min_tokens = min_tokens
+        self._handles: Dict[str, Tuple[str, float]] = {}  # key -> (name, expires_at)
+        self._retry_at: Dict[str, float] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+        self.creations = 0
+        self.failures = 0
+        self.skipped = 0
+        self.cached_prefix_tokens = 0
+        self.provider_cached_tokens = 0
+
+    @staticmethod
+    def _prefix(llm_request: LlmRequest) -> Tuple[str, str]:
+        """Cache key and the serialized prefix it covers"""
+        config = llm_request.config
+        prefix = json.dumps({
+            "system_instruction": config.system_instruction,
+            "tools": [tool.model_dump(mode="json", exclude_none=True) for tool in config.tools or []],
+            "tool_config": config.tool_config.model_dump(mode="json", exclude_none=True) if config.tool_config else None,
+        }, sort_keys=True, default=str)
+        key = hashlib.sha256(f"{llm_request.model}\n{prefix}".encode()).hexdigest()
+        return key, prefix
+
+    async def apply(self, agent_name: str, llm_request: LlmRequest) -> bool:
+        """Point the request at the cached prefix, creating the cache on a miss; returns whether it did"""
+        config = llm_request.config
+        if config is None or config.cached_content or not isinstance(config.system_instruction, str):
+            return False
+        key, prefix = self._prefix(llm_request)
+        prefix_tokens = estimate_tokens(prefix)
+        if prefix_tokens < self.min_tokens:
+            self.skipped += 1
+            return False
+
+        name = self._fresh_handle(key)
+        if name is None:
+            async with self._locks.setdefault(key, asyncio.Lock()):
+                # Requests that waited for the lock use the cache the first one created
+                name = self._fresh_handle(key) or await self._create(key, agent_name, llm_request, prefix_tokens)
+            if name is None:
+                return False
+
+        self.cached_prefix_tokens += prefix_tokens
+        config.cached_content = name
+        config.system_instruction = None
+        config.tools = None
+        config.tool_config = None
+        return True
+
+    def _fresh_handle(self, key: str) -> Optional[str]:
+        """Handle for the key unless it is missing or about to expire; counts a hit"""
+        handle = self._handles.get(key)
+        if handle and handle[1] - REFRESH_MARGIN_SECONDS > time.monotonic():
+            self.hits += 1
+            return handle[0]
+        return None
+
+    async def _create(self, key: str, agent_name: str, llm_request: LlmRequest, prefix_tokens: int) -> Optional[str]:
+        """Create the cache for a missed key, replacing and deleting an expiring handle; None on failure"""
+        config = llm_request.config
+        now = time.monotonic()
+        self.misses += 1
+        if self._retry_at.get(key, 0) > now:
+            return None
+        try:
+            name = await self.provider.create(
+                llm_request.model, config.system_instruction, config.tools, config.tool_config,
+                self.ttl, display_name=f"{agent_name}-{key[:12]}",
+            )
+        except Exception as e:
+            self.failures += 1
+            self._retry_at[key] = now + RETRY_AFTER_SECONDS
+            logger.warning(f"Context cache creation for {agent_name} failed, sending the prompt uncached: {e}")
+            return None
+        replaced = self._handles.get(key)
+        self._handles[key] = (name, now + self.ttl)
+        self.creations += 1
+        logger.info(f"Cached ~{prefix_tokens} prefix tokens of {agent_name} on {llm_request.model} as {name}")
+        if replaced:
+            await self._delete(replaced[0])
+        return name
+
+    async def _delete(self, name: str) -> None:
+        try:
+            await self.provider.delete(name)
+        except Exception as e:
+            logger.warning(f"Could not delete context cache {name}: {e}")
+
+    def record_usage(self, llm_response: LlmResponse) -> None:
+        usage = llm_response.usage_metadata
+        if usage and usage.cached_content_token_count:
+            self.provider_cached_tokens += usage.cached_content_token_count
+
+    async def clear(self) -> None:
+        """Delete every cache this process created"""
+        handles, self._handles = self._handles, {}
+        for name, _ in handles.values():
+            await self._delete(name)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get handle count and hit/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": CONTEXT_CACHE_ENABLED,
+            "handles": len(self._handles),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "creations": self.creations,
+            "failures": self.failures,
+            "skipped_below_min_tokens": self.skipped,
+            "cached_prefix_tokens": self.cached_prefix_tokens,
+            "provider_cached_tokens": self.provider_cached_tokens,
+        }
+
+
+context_cache = ContextCacheRegistry(GeminiContextCacheProvider())
+
+
+async def use_context_cache(callback_context: CallbackContext, llm_request: LlmRequest) -> Optional[LlmResponse]:
+    """before_model_callback: send the static prefix as a cache handle (run after model routing)"""
+    if CONTEXT_CACHE_ENABLED:
+        await context_cache.apply(callback_context.agent_name, llm_request)
+    return None
+
+
+def record_context_cache_usage(callback_context: CallbackContext, llm_response: LlmResponse) -> Optional[LlmResponse]:
+    """after_model_callback: count the prefix tokens the provider reports as served from cache"""
+    context_cache.record_usage(llm_response)
+    return None
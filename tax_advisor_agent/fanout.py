@@ -0,0 +1,77 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Concurrent fan-out of independent sub-agents for the coordinator"""
+
+import logging
+import time
+from typing import Any, AsyncGenerator, Dict, List, Mapping
+
+from google.adk.agents import BaseAgent, ParallelAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events.event import Event
+from google.genai import types
+
+logger = logging.getLogger(__name__)
+
+
+def format_outputs(state: Mapping[str, Any], keys: List[str]) -> str:
+    """One markdown section per output_key, in the given order"""
+    return "\n\n".join(f"## {key}\n{state.get(key) or 'No output produced'}" for key in keys)
+
+
+class FanOutAgent(BaseAgent):
+    """
+    Runs independent sub-agents concurrently and merges their output_key state
+    The branches run under a ParallelAgent; once all finish, a final event carries every
+    branch's output, so an AgentTool wrapping this agent returns all of them at once
+    """
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        parallel = self.sub_agents[0]
+        started = time.perf_counter()
+        finished_at: Dict[str, float] = {}
+
+        async for event in parallel.run_async(ctx):
+            finished_at[event.author] = time.perf_counter() - started
+            yield event
+
+        elapsed = time.perf_counter() - started
+        timings = ", ".join(f"{name} {finished_at.get(name, 0.0):.1f}s" for name in self.branch_names)
+        logger.info(f"{self.name} finished in {elapsed:.1f}s ({timings})")
+
+        text = format_outputs(ctx.session.state, self.output_keys)
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=text)]),
+        )
+
+    @property
+    def branch_names(self) -> List[str]:
+        return [agent.name for agent in self.sub_agents[0].sub_agents]
+
+    @property
+    def output_keys(self) -> List[str]:
+        return [agent.output_key for agent in self.sub_agents[0].sub_agents if getattr(agent, "output_key", None)]
+
+
+def create_fanout_agent(name: str, description: str, agents: List[BaseAgent]) -> FanOutAgent:
+    """Wrap agents that do not read each other's output so they run concurrently"""
+    return FanOutAgent(
+        name=name,
+        description=description,
+        sub_agents=[ParallelAgent(name=f"{name}_branches", sub_agents=agents)],
+    )
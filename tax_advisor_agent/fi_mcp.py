@@ -0,0 +1,378 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Shared Fi MCP connection pool for the tax advisor coordinator and all sub-agents"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset, StdioServerParameters
+from google.adk.tools.tool_context import ToolContext
+
+logger = logging.getLogger(__name__)
+
+FI_MCP_URL = os.environ.get(
+    "FI_MCP_URL", "https://fi-mcp-dev-56426154949.us-central1.run.app/mcp/stream"
+)
+FI_MCP_POOL_SIZE = int(os.environ.get("FI_MCP_POOL_SIZE", "1"))
+FI_MCP_HEALTH_CHECK_INTERVAL = float(os.environ.get("FI_MCP_HEALTH_CHECK_INTERVAL", "60"))
+FI_MCP_HEALTH_CHECK_TIMEOUT = float(os.environ.get("FI_MCP_HEALTH_CHECK_TIMEOUT", "5"))
+FI_MCP_CACHE_TTL = float(os.environ.get("FI_MCP_CACHE_TTL", "300"))  # 0 disables caching
+FI_MCP_CACHE_MAX_ENTRIES = int(os.environ.get("FI_MCP_CACHE_MAX_ENTRIES", "1024"))
+
+# State key identifying whose Fi MCP data a cached response belongs to.
+# Sub-agents run under AgentTool with a temporary user id, so the scope is stamped
+# into state by the coordinator and inherited through the copied state.
+CACHE_SCOPE_STATE_KEY = "fi_mcp_cache_scope"
+
+
+class FiMCPResponseCache:
+    """
+    TTL cache of Fi MCP tool responses keyed by scope (user), snapshot version,
+    tool name and arguments. Refreshing a scope bumps its snapshot version, so
+    every response fetched before the refresh is ignored and later evicted
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def snapshot_version(self, scope: str) -> int:
+        """Current snapshot version of a scope's data"""
+        return self._versions.get(scope, 0)
+
+    def _key(self, scope: str, tool_name: str, args: Dict[str, Any]) -> tuple:
+        return (scope, self.snapshot_version(scope), tool_name, json.dumps(args or {}, sort_keys=True, default=str))
+
+    def get(self, scope: str, tool_name: str, args: Dict[str, Any]):
+        """Return (hit, response) for a tool call"""
+        key = self._key(scope, tool_name, args)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[1]
+
+    def put(self, scope: str, tool_name: str, args: Dict[str, Any], response: Any) -> None:
+        """Store a tool response under the scope's current snapshot version"""
+        key = self._key(scope, tool_name, args)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def refresh(self, scope: str) -> int:
+        """Invalidate a scope's cached data by starting a new snapshot version"""
+        with self._lock:
+            self._versions[scope] = self._versions.get(scope, 0) + 1
+            for key in [k for k in self._entries if k[0] == scope]:
+                del self._entries[key]
+            return self._versions[scope]
+
+    def clear(self) -> None:
+        """Drop every cached response for all scopes"""
+        with self._lock:
+            self._entries.clear()
+            self._versions = {scope: version + 1 for scope, version in self._versions.items()}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache size and hit/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "ttl_seconds": self.ttl,
+        }
+
+
+def _is_cacheable(response: Any) -> bool:
+    """Only cache successful data responses, never errors or login prompts"""
+    if getattr(response, "isError", False):
+        return False
+    for content in getattr(response, "content", None) or []:
+        if "login_required" in (getattr(content, "text", "") or ""):
+            return False
+    return True
+
+
+class CachedMCPTool(BaseTool):
+    """MCP tool wrapper that serves repeated calls from the Fi MCP response cache"""
+
+    def __init__(self, tool: BaseTool, cache: FiMCPResponseCache):
+        super().__init__(name=tool.name, description=tool.description)
+        self._tool = tool
+        self._cache = cache
+
+    def _get_declaration(self):
+        return self._tool._get_declaration()
+
+    async def run_async(self, *, args, tool_context: ToolContext):
+        scope = tool_context.state.get(CACHE_SCOPE_STATE_KEY) if tool_context else None
+        if scope is None:
+            # Without a known owner the response must not be shared
+            return await self._tool.run_async(args=args, tool_context=tool_context)
+
+        hit, response = self._cache.get(scope, self.name, args)
+        if hit:
+            logger.info(f"Fi MCP cache hit: {self.name} ({scope})")
+            return response
+
+        response = await self._tool.run_async(args=args, tool_context=tool_context)
+        if _is_cacheable(response):
+            self._cache.put(scope, self.name, args, response)
+        return response
+
+
+class PooledMCPToolset(MCPToolset):
+    """
+    MCPToolset shared between agents, with a ping-based health check
+    An idle connection is pinged before reuse and reconnected if the ping fails
+    """
+
+    def __init__(
+        self,
+        *,
+        connection_params,
+        health_check_interval: float,
+        health_check_timeout: float,
+        response_cache: Optional[FiMCPResponseCache] = None,
+    ):
+        super().__init__(connection_params=connection_params)
+        self._health_check_interval = health_check_interval
+        self._health_check_timeout = health_check_timeout
+        self._response_cache = response_cache
+        self._last_healthy = 0.0
+
+    async def get_tools(self, readonly_context=None):
+        idle_for = time.monotonic() - self._last_healthy
+        if self._session is not None and idle_for > self._health_check_interval:
+            if not await self.is_healthy():
+                logger.warning("Fi MCP connection failed health check, reconnecting")
+                await self.reconnect()
+
+        tools = await super().get_tools(readonly_context)
+        self._last_healthy = time.monotonic()
+        if self._response_cache is not None and self._response_cache.enabled:
+            tools = [CachedMCPTool(tool, self._response_cache) for tool in tools]
+        return tools
+
+    async def is_healthy(self) -> bool:
+        """Ping the MCP server over the existing session"""
+        if self._session is None:
+            return False
+        try:
+            await asyncio.wait_for(self._session.send_ping(), self._health_check_timeout)
+        except Exception as e:
+            logger.warning(f"Fi MCP ping failed: {e}")
+            return False
+        self._last_healthy = time.monotonic()
+        return True
+
+    async def reconnect(self) -> None:
+        """Replace the current MCP session with a fresh one"""
+        await self._reinitialize_session()
+        self._last_healthy = time.monotonic()
+
+
+def _connection_key(connection_params) -> tuple:
+    """Build a hashable key identifying an MCP server connection"""
+    if isinstance(connection_params, StdioServerParameters):
+        env = tuple(sorted((connection_params.env or {}).items()))
+        return ("stdio", connection_params.command, tuple(connection_params.args), env)
+    return (type(connection_params).__name__, repr(connection_params))
+
+
+def _connection_label(key: tuple) -> str:
+    """Readable connection name for stats, e.g. 'npx mcp-remote https://...'"""
+    if key[0] == "stdio":
+        return " ".join([key[1], *key[2]])
+    return key[1]
+
+
+class MCPToolsetRegistry:
+    """
+    Process-wide registry of pooled MCP toolsets, keyed by connection params
+    Agents asking for the same server share up to `pool_size` connections,
+    handed out round-robin, instead of each spawning its own MCP process
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 1,
+        health_check_interval: float = 60,
+        health_check_timeout: float = 5,
+        response_cache: Optional[FiMCPResponseCache] = None,
+    ):
+        self.pool_size = max(1, pool_size)
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        self.response_cache = response_cache
+        self._pools: Dict[tuple, List[PooledMCPToolset]] = {}
+        self._next_index: Dict[tuple, int] = {}
+        self._lock = threading.Lock()
+
+    def get_toolset(self, connection_params) -> PooledMCPToolset:
+        """Get a pooled toolset for the given connection params"""
+        key = _connection_key(connection_params)
+        with self._lock:
+            pool = self._pools.setdefault(key, [])
+            if len(pool) < self.pool_size:
+                toolset = PooledMCPToolset(
+                    connection_params=connection_params,
+                    health_check_interval=self.health_check_interval,
+                    health_check_timeout=self.health_check_timeout,
+                    response_cache=self.response_cache,
+                )
+                pool.append(toolset)
+                return toolset
+
+            index = self._next_index.get(key, 0)
+            self._next_index[key] = (index + 1) % len(pool)
+            return pool[index]
+
+    async def health_check(self) -> Dict[str, List[str]]:
+        """Ping every open connection, reconnecting the ones that fail"""
+        results = {}
+        for key, pool in list(self._pools.items()):
+            statuses = []
+            for toolset in pool:
+                if toolset._session is None:
+                    statuses.append("idle")
+                elif await toolset.is_healthy():
+                    statuses.append("healthy")
+                else:
+                    try:
+                        await toolset.reconnect()
+                        statuses.append("reconnected")
+                    except Exception as e:
+                        logger.error(f"Fi MCP reconnect failed: {e}")
+                        statuses.append("unhealthy")
+            results[_connection_label(key)] = statuses
+        return results
+
+    async def close(self) -> None:
+        """Close every pooled connection"""
+        for pool in list(self._pools.values()):
+            for toolset in pool:
+                await toolset.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the number of pooled toolsets per connection"""
+        return {
+            "pool_size": self.pool_size,
+            "connections": {_connection_label(key): len(pool) for key, pool in self._pools.items()},
+            "response_cache": self.response_cache.get_stats() if self.response_cache else None,
+        }
+
+
+response_cache = FiMCPResponseCache(ttl=FI_MCP_CACHE_TTL, max_entries=FI_MCP_CACHE_MAX_ENTRIES)
+
+mcp_registry = MCPToolsetRegistry(
+    pool_size=FI_MCP_POOL_SIZE,
+    health_check_interval=FI_MCP_HEALTH_CHECK_INTERVAL,
+    health_check_timeout=FI_MCP_HEALTH_CHECK_TIMEOUT,
+    response_cache=response_cache,
+)
+
+
+def get_fi_mcp_toolset(url: Optional[str] = None) -> PooledMCPToolset:
+    """Get a pooled Fi MCP toolset (via the mcp-remote stdio bridge)"""
+    return mcp_registry.get_toolset(
+        StdioServerParameters(
+            command="npx",
+            args=["mcp-remote", url or FI_MCP_URL]
+        )
+    )
+
+
+class FiMCPDataError(Exception):
+    """Raised when a Fi MCP tool call returns no usable data"""
+    pass
+
+
+async def fetch_fi_mcp_data(tool_name: str, tool_context: ToolContext, args: Optional[Dict[str, Any]] = None) -> Any:
+    """
+    Call a Fi MCP tool from inside a function tool and parse its JSON payload
+    Uses the shared pool and response cache, so large feeds never pass through the model
+    """
+    toolset = get_fi_mcp_toolset()
+    tools = {tool.name: tool for tool in await toolset.get_tools()}
+    if tool_name not in tools:
+        raise FiMCPDataError(f"Fi MCP tool {tool_name} is not available")
+
+    response = await tools[tool_name].run_async(args=args or {}, tool_context=tool_context)
+    text = "".join(getattr(content, "text", "") or "" for content in getattr(response, "content", None) or [])
+    if not _is_cacheable(response):
+        raise FiMCPDataError(text or f"Fi MCP tool {tool_name} failed")
+    try:
+        return json.loads(text)
+    except ValueError as e:
+        raise FiMCPDataError(f"Fi MCP tool {tool_name} returned non-JSON data") from e
+
+
+def scope_fi_mcp_cache(callback_context: CallbackContext) -> None:
+    """
+    before_agent_callback for coordinators: record whose data this run reads,
+    so sub-agents invoked through AgentTool share the user's cached responses
+    """
+    user_id = callback_context._invocation_context.user_id
+    if callback_context.state.get(CACHE_SCOPE_STATE_KEY) != user_id:
+        callback_context.state[CACHE_SCOPE_STATE_KEY] = user_id
+    return None
+
+
+def refresh_fi_mcp_data(tool_context: ToolContext) -> Dict[str, Any]:
+    """Discard cached Fi MCP data for the current user so the next Fi MCP calls fetch fresh data.
+
+    Call this when the user says their accounts changed or asks for up-to-date figures.
+
+    Returns:
+        The new snapshot version and the cache hit/miss statistics.
+    """
+    scope = tool_context.state.get(CACHE_SCOPE_STATE_KEY)
+    if scope is None:
+        return {"status": "nothing_cached", "cache_stats": response_cache.get_stats()}
+
+    version = response_cache.refresh(scope)
+    logger.info(f"Fi MCP cache refreshed for {scope}, snapshot version {version}")
+    return {
+        "status": "refreshed",
+        "snapshot_version": version,
+        "cache_stats": response_cache.get_stats(),
+    }
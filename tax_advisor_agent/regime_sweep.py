@@ -0,0 +1,273 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Regime Breakeven Sweep
+Vectorized old vs new regime comparison over salary x deduction grids, using the tax engine's rule tables
+"""
+
+import logging
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from .tax_engine import DEFAULT_ASSESSMENT_YEAR, TAX_RULES, IncomeTaxEngine, TaxInputError
+
+logger = logging.getLogger(__name__)
+
+MAX_GRID_POINTS = 1_000_000
+MAX_PROJECTION_YEARS = 30
+_BISECTION_STEPS = 40  # Resolves deductions of up to ~₹1 trillion to under ₹1
+
+
+def _round_to_ten(amount: np.ndarray) -> np.ndarray:
+    """Vectorized Sections 288A/288B rounding, matching the scalar engine"""
+    return np.floor((amount + 5) / 10) * 10
+
+
+class _RegimeVector:
+    """Slab-income tax for one regime as array operations over any input shape"""
+
+    def __init__(self, year_rules: Dict[str, Any], regime: str, age: int):
+        regime_rules = year_rules[regime]
+        slabs = IncomeTaxEngine._slabs_for_age(regime_rules, age)
+        uppers = np.array([np.inf if upper is None else upper for upper, _ in slabs], dtype=float)
+        self.lowers = np.concatenate(([0.0], uppers[:-1]))
+        self.widths = uppers - self.lowers
+        self.rates = np.array([rate for _, rate in slabs])
+
+        self.standard_deduction = regime_rules['standard_deduction']
+        self.allows_deductions = 'other_deductions' in regime_rules['deductions']
+        rebate = regime_rules['rebate_87a']
+        self.rebate_limit = rebate['income_limit']
+        self.max_rebate = rebate['max_rebate']
+        self.rebate_marginal_relief = rebate['marginal_relief']
+        self.cess_rate = year_rules['cess_rate']
+
+        # Tier 0 is "no surcharge"; tax at each threshold is built bottom-up for marginal relief
+        self.thresholds = np.array([0.0] + [threshold for threshold, _ in regime_rules['surcharge']])
+        self.surcharge_rates = np.array([0.0] + [rate for _, rate in regime_rules['surcharge']])
+        self.tax_at_threshold = np.zeros(len(self.thresholds))
+        for tier in range(1, len(self.thresholds)):
+            self.tax_at_threshold[tier] = self.tax_before_cess(self.thresholds[tier:tier + 1])[0]
+
+    def taxable_income(self, salary: np.ndarray, deductions: np.ndarray) -> np.ndarray:
+        income = salary - np.minimum(self.standard_deduction, salary)
+        if self.allows_deductions:
+            income = income - deductions
+        return np.where(income > 0, _round_to_ten(income), 0.0)
+
+    def tax_before_cess(self, income: np.ndarray) -> np.ndarray:
+        slab_tax = np.clip(income[..., None] - self.lowers, 0.0, self.widths) @ self.rates
+
+        excess = income - self.rebate_limit
+        if self.rebate_marginal_relief:
+            over_limit_rebate = np.maximum(0.0, slab_tax - excess)
+        else:
+            over_limit_rebate = 0.0
+        rebate = np.where(excess <= 0, np.minimum(slab_tax, self.max_rebate), over_limit_rebate)
+        tax = slab_tax - rebate
+
+        tier = np.searchsorted(self.thresholds, income, side='left') - 1
+        tier = np.maximum(tier, 0)
+        surcharge = tax * self.surcharge_rates[tier]
+        cap = self.tax_at_threshold[tier] + income - self.thresholds[tier]
+        relief = np.where(tier > 0, np.maximum(0.0, tax + surcharge - cap), 0.0)
+        return tax + surcharge - relief
+
+    def total_tax(self, salary: np.ndarray, deductions: np.ndarray) -> np.ndarray:
+        tax = self.tax_before_cess(self.taxable_income(salary, deductions))
+        return _round_to_ten(tax * (1 + self.cess_rate))
+
+
+class RegimeSweep:
+    """
+    Old vs new regime comparison for salary income, vectorized across any number of scenarios
+    Deductions are the total old regime deductions beyond the standard deduction (HRA, 24(b),
+    Chapter VI-A) after statutory caps; the new regime ignores them
+    """
+
+    def __init__(self, assessment_year: str = DEFAULT_ASSESSMENT_YEAR, age: int = 30,
+                 rules: Optional[Dict[str, Any]] = None):
+        rules = rules or TAX_RULES
+        if assessment_year not in rules:
+            raise TaxInputError(
+                f"Unsupported assessment year {assessment_year}; supported: {', '.join(sorted(rules))}"
+            )
+        if age < 0:
+            raise TaxInputError("age cannot be negative")
+        self.assessment_year = assessment_year
+        self.old = _RegimeVector(rules[assessment_year], 'old', age)
+        self.new = _RegimeVector(rules[assessment_year], 'new', age)
+
+    def taxes(self, salary, deductions) -> Dict[str, np.ndarray]:
+        """Old and new regime tax for broadcastable salary and deduction arrays"""
+        salary, deductions = np.broadcast_arrays(np.asarray(salary, dtype=float), np.asarray(deductions, dtype=float))
+        if np.any(salary < 0) or np.any(deductions < 0):
+            raise TaxInputError("salary and deductions cannot be negative")
+        return {'old': self.old.total_tax(salary, deductions), 'new': self.new.total_tax(salary, deductions)}
+
+    def savings_surface(self, salaries, deductions) -> Dict[str, np.ndarray]:
+        """Tax saved by the new regime (old - new) on the salaries x deductions grid"""
+        salaries = np.asarray(salaries, dtype=float)
+        deductions = np.asarray(deductions, dtype=float)
+        if salaries.size * deductions.size > MAX_GRID_POINTS:
+            raise TaxInputError(f"Grid is limited to {MAX_GRID_POINTS:,} points")
+        taxes = self.taxes(salaries[:, None], deductions[None, :])
+        return {'old': taxes['old'], 'new': taxes['new'], 'new_regime_savings': taxes['old'] - taxes['new']}
+
+    def breakeven_deductions(self, salaries) -> np.ndarray:
+        """
+        Smallest whole-rupee deduction at which the old regime becomes strictly cheaper, per salary
+        NaN where the old regime cannot win even with deductions equal to the whole salary
+        """
+        salaries = np.asarray(salaries, dtype=float)
+        new_tax = self.taxes(salaries, 0.0)['new']
+
+        def old_wins(deductions):
+            return self.old.total_tax(salaries, deductions) < new_tax
+
+        upper = np.ceil(salaries)
+        reachable = old_wins(upper)
+        low = np.full(salaries.shape, -1.0)  # old regime does not win at `low`
+        high = upper.copy()                  # old regime wins at `high` (where reachable)
+        for _ in range(_BISECTION_STEPS):
+            active = high - low > 1
+            if not active.any():
+                break
+            mid = np.floor((low + high) / 2)
+            wins = old_wins(np.maximum(mid, 0.0))
+            high = np.where(active & wins, mid, high)
+            low = np.where(active & ~wins, mid, low)
+        return np.where(reachable, high, np.nan)
+
+    def project(self, salary: float, deductions: float, years: int = 5,
+                salary_growth: float = 0.08, deduction_growth: float = 0.0) -> Dict[str, np.ndarray]:
+        """Year-by-year taxes under both regimes with the current rules held constant"""
+        if not 1 <= years <= MAX_PROJECTION_YEARS:
+            raise TaxInputError(f"years must be between 1 and {MAX_PROJECTION_YEARS}")
+        offsets = np.arange(years)
+        salaries = salary * (1 + salary_growth) ** offsets
+        deduction_path = deductions * (1 + deduction_growth) ** offsets
+        taxes = self.taxes(salaries, deduction_path)
+        return {'salary': salaries, 'deductions': deduction_path, 'old': taxes['old'], 'new': taxes['new']}
+
+
+def _to_int_list(values: np.ndarray) -> list:
+    return [None if np.isnan(value) else int(value) for value in np.asarray(values, dtype=float).ravel()]
+
+
+def analyze_regime_breakeven(
+    gross_salary: float,
+    old_regime_deductions: float,
+    annual_salary_growth: float = 0.08,
+    annual_deduction_growth: float = 0.0,
+    projection_years: int = 5,
+    salary_range_min: float = 0.0,
+    salary_range_max: float = 0.0,
+    salary_steps: int = 41,
+    deduction_steps: int = 11,
+    age: int = 30,
+    assessment_year: str = DEFAULT_ASSESSMENT_YEAR,
+) -> Dict[str, Any]:
+    """Computes the exact old vs new regime breakeven, savings surface and multi-year projection.
+
+    Use this for breakeven analysis, regime switch triggers and multi-year regime impact
+    instead of estimating them. Amounts are yearly, in rupees.
+
+    Args:
+        gross_salary: Current gross salary before the standard deduction.
+        old_regime_deductions: Total old regime deductions beyond the standard deduction
+            (HRA exemption, home loan interest, 80C, 80D, 80CCD(1B), ...) after statutory caps.
+        annual_salary_growth: Expected yearly salary growth (0.08 means 8%).
+        annual_deduction_growth: Expected yearly growth of the deductions.
+        projection_years: Number of years to project (1-30).
+        salary_range_min: Lowest salary on the sweep grid (0 means half the current salary).
+        salary_range_max: Highest salary on the sweep grid (0 means three times the current salary).
+        salary_steps: Number of salary points on the grid.
+        deduction_steps: Number of deduction points on the grid, from zero to ₹5L or twice
+            the current deductions, whichever is larger.
+        age: Taxpayer age, which sets the old regime basic exemption.
+        assessment_year: Assessment year whose rules are applied, e.g. "2026-27".
+
+    Returns:
+        Current taxes and breakeven deductions, the breakeven curve (deductions needed for the
+        old regime to win at each grid salary, null where it never wins), the new regime
+        savings surface (old minus new, rows are salaries), and the year-by-year projection
+        with the first year the recommended regime changes.
+    """
+    try:
+        if gross_salary < 0 or old_regime_deductions < 0:
+            raise TaxInputError("gross_salary and old_regime_deductions cannot be negative")
+        if salary_steps < 2 or deduction_steps < 2:
+            raise TaxInputError("salary_steps and deduction_steps must be at least 2")
+
+        sweep = RegimeSweep(assessment_year=assessment_year, age=age)
+        salary_min = salary_range_min or gross_salary * 0.5
+        salary_max = salary_range_max or max(gross_salary * 3, salary_min + 100_000)
+        if salary_max <= salary_min:
+            raise TaxInputError("salary_range_max must be greater than salary_range_min")
+
+        salaries = np.round(np.linspace(salary_min, salary_max, int(salary_steps)), -3)
+        deductions = np.round(
+            np.linspace(0.0, max(500_000.0, old_regime_deductions * 2), int(deduction_steps)), -3
+        )
+        surface = sweep.savings_surface(salaries, deductions)
+        curve = sweep.breakeven_deductions(salaries)
+
+        current = sweep.taxes(gross_salary, old_regime_deductions)
+        current_breakeven = sweep.breakeven_deductions(np.array([gross_salary]))
+        projection = sweep.project(
+            gross_salary, old_regime_deductions, int(projection_years),
+            annual_salary_growth, annual_deduction_growth,
+        )
+    except TaxInputError as e:
+        return {'status': 'error', 'error_message': str(e)}
+
+    best = np.where(projection['new'] <= projection['old'], 'new', 'old')
+    switches = np.flatnonzero(best != best[0])
+    recommended_now = 'new' if current['new'] <= current['old'] else 'old'
+
+    return {
+        'status': 'success',
+        'assessment_year': assessment_year,
+        'current': {
+            'old_regime_tax': int(current['old']),
+            'new_regime_tax': int(current['new']),
+            'recommended_regime': recommended_now,
+            'tax_savings': int(abs(current['old'] - current['new'])),
+            'breakeven_deductions': _to_int_list(current_breakeven)[0],
+        },
+        'breakeven_curve': {
+            'salaries': _to_int_list(salaries),
+            'breakeven_deductions': _to_int_list(curve),
+        },
+        'savings_surface': {
+            'salaries': _to_int_list(salaries),
+            'deductions': _to_int_list(deductions),
+            'new_regime_savings': surface['new_regime_savings'].astype(int).tolist(),
+        },
+        'projection': {
+            'years': list(range(1, int(projection_years) + 1)),
+            'salary': _to_int_list(np.round(projection['salary'])),
+            'deductions': _to_int_list(np.round(projection['deductions'])),
+            'old_regime_tax': _to_int_list(projection['old']),
+            'new_regime_tax': _to_int_list(projection['new']),
+            'recommended_regime': best.tolist(),
+            'first_switch_year': int(switches[0]) + 1 if switches.size else None,
+            'total_if_always_old': int(projection['old'].sum()),
+            'total_if_always_new': int(projection['new'].sum()),
+            'total_if_optimal': int(np.minimum(projection['old'], projection['new']).sum()),
+        },
+    }
@@ -39,16 +39,15 @@ Tax Analysis Framework (Adapted for Available Data):
 - Calculate estimated monthly/annual income from transaction patterns
 
 **Step 2: Tax Liability Estimation**
-- Apply current year tax slabs to estimated income
-- Calculate gross tax liability before deductions
 - Estimate potential deductions from available investment data (EPF, MF investments)
+- Call `calculate_income_tax` with the estimated income and deductions; never apply tax slabs by hand
+- Report the tool's slab breakdown, rebate, surcharge, cess and total tax for each regime
 - Provide preliminary tax payable estimate with confidence level
 
 **CRITICAL: Tax Regime Selection Analysis**
-- Calculate tax liability under Old Regime (with deductions)
-- Calculate tax liability under New Regime (lower rates, limited deductions)
-- Determine optimal regime choice based on available data
-- Provide breakeven analysis for regime selection
+- Use the old_regime and new_regime results from `calculate_income_tax`
+- Determine optimal regime choice from its recommended_regime and tax_savings
+- For breakeven analysis, call the tool again with different income or deduction amounts
 
 **Step 3: Investment and Deduction Analysis**
 - Analyze EPF contributions for Section 80C eligibility
@@ -83,7 +82,7 @@ Expected Output Structure:
 - **Potential Tax After Standard Deduction**: ₹[Y]
 - **Estimated Effective Tax Rate**: [Z]% (preliminary estimate)
 
-**CRITICAL: Tax Regime Selection Analysis (AY 2024-25)**:
+**CRITICAL: Tax Regime Selection Analysis (AY [Assessment Year])**:
 
 **Old Regime Calculation**:
 - **Gross Tax Liability**: ₹[Amount] (at old regime rates)
@@ -15,25 +15,24 @@
 """Tax Planner Agent - Strategic Multi-year Tax Optimization"""
 
 from google.adk import Agent
-from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset, StdioServerParameters  
 from google.adk.tools import google_search
 from google.adk.tools.agent_tool import AgentTool
 
 from . import prompt
+from ...capital_gains import plan_capital_gains_harvest
+from ...fi_mcp import get_fi_mcp_toolset
+from ...tax_engine import calculate_income_tax
+from ...model_router import model_for, route_model
+from ...prompt_registry import register_prompt
 
-MODEL = "gemini-2.5-pro"
+MODEL = model_for("tax_planner_agent")
 
-# Fi MCP toolset for financial data access
-fi_mcp_toolset = MCPToolset(
-    connection_params=StdioServerParameters(
-        command="npx",
-        args=["mcp-remote", "https://fi-mcp-dev-56426154949.us-central1.run.app/mcp/stream"]
-    )
-)
+# Fi MCP toolset for financial data access (shared connection pool)
+fi_mcp_toolset = get_fi_mcp_toolset()
 
 # Wrap google_search in AgentTool for compatibility
 search_agent = Agent(
-    model="gemini-2.5-flash",
+    model=model_for("tax_planning_search_agent"),
     name="tax_planning_search_agent",
     instruction="You're a specialist in tax planning and strategy related Google Search.",
     tools=[google_search],
@@ -50,7 +49,8 @@ tax_planner_agent = Agent(
         "Includes tax regime selection, capital gains optimization, and "
         "filing mechanism strategies with access to latest tax regulations."
     ),
-    instruction=prompt.TAX_PLANNER_PROMPT,
+    instruction=register_prompt("tax_planner_agent", prompt.TAX_PLANNER_PROMPT),
     output_key="tax_planner_output",
-    tools=[fi_mcp_toolset, search_tool],  # Now both are compatible tool types
+    tools=[fi_mcp_toolset, calculate_income_tax, plan_capital_gains_harvest, search_tool],
+    before_model_callback=route_model,
 ) 
\ No newline at end of file
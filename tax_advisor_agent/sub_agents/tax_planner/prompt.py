@@ -29,8 +29,8 @@ Input Requirements:
 Strategic Planning Framework:
 
 **Step 1: Fundamental Tax Strategy Selection**
-- Analyze optimal tax regime choice (Old vs New) based on income and deductions
-- Design capital gains optimization strategies (LTCG, STCG, tax-loss harvesting)
+- Analyze optimal tax regime choice (Old vs New) based on income and deductions, using `calculate_income_tax` for every tax figure
+- Design capital gains optimization strategies (LTCG, STCG, tax-loss harvesting) from `plan_capital_gains_harvest`, which computes lot-level gains from the full mutual fund history; pass current NAVs from the net worth data when available
 - Plan optimal filing mechanisms and ITR strategies
 - Establish tax-efficient investment frameworks
 
@@ -70,7 +70,7 @@ Expected Output Structure:
 
 **CRITICAL: Tax Regime Selection Strategy**:
 
-**Tax Regime Analysis (AY 2024-25)**:
+**Tax Regime Analysis (AY [Assessment Year])**:
 - **Current Income Level**: ₹[X]L (from tax analysis)
 - **Old Regime Tax Calculation**:
   - Gross Tax: ₹[Amount] 
@@ -14,7 +14,10 @@
 
 """Tax Scenario Modeler Agent - Comparative Tax Impact Analysis"""
 
-TAX_SCENARIO_MODELER_PROMPT = """
+from ...prompt_registry import PromptSection
+
+# Always sent: role, framework, output structure and the category heading
+TAX_SCENARIO_MODELER_BASE_PROMPT = """
 Agent Role: tax_scenario_modeler
 Data Sources: All previous tax analyses + Fi MCP financial data + Specific user scenarios + Market assumptions
 
@@ -35,7 +38,9 @@ Scenario Modeling Framework:
 - Establish comparison metrics and evaluation criteria
 
 **Step 2: Tax Impact Calculation**
-- Calculate tax implications for each scenario
+- Calculate tax for each scenario by calling `calculate_income_tax` with that scenario's income and deductions
+- For regime breakeven, regime switch triggers and multi-year regime impact, call `analyze_regime_breakeven` once and cite its results
+- For LTCG harvesting and loss-booking scenarios, call `plan_capital_gains_harvest` and cite its lot-level gains and harvest plan
 - Model both immediate and long-term effects
 - Account for compounding effects over time
 - Include opportunity costs and trade-offs
@@ -82,7 +87,9 @@ Expected Output Structure:
 
 **Common Scenario Categories**:
 
-**CRITICAL: Tax Regime Selection Scenarios**:
+"""
+
+_REGIME_SCENARIOS = """**CRITICAL: Tax Regime Selection Scenarios**:
 
 **Old vs New Tax Regime Comparison**:
 - **Baseline (Current Choice)**: [Current regime selection]
@@ -99,17 +106,19 @@ Expected Output Structure:
     - Effective Tax Rate: [X]%
     - Benefits: [Lower paperwork, simpler compliance, lower base rates]
     - Drawbacks: [Limited deduction benefits]
-- **Breakeven Analysis**: [Income level where choice switches]
-- **Multi-year Impact**: [5-year projection of regime choice]
+- **Breakeven Analysis**: [Deductions needed for the old regime to win, from `analyze_regime_breakeven` breakeven_curve]
+- **Multi-year Impact**: [5-year projection of regime choice from its projection results]
 - **Optimal Choice**: [Recommended regime] - **Saves ₹[Amount] annually**
 
 **Income Growth Regime Strategy**:
 - **Current Income (₹[X]L)**: [Optimal regime choice and savings]
 - **Higher Income (₹[Y]L)**: [How optimal choice changes with income growth]
 - **Peak Income (₹[Z]L)**: [30% bracket optimization strategies]
-- **Regime Switch Trigger**: [When to switch regimes as income grows]
+- **Regime Switch Trigger**: [When to switch regimes as income grows: first_switch_year and breakeven_curve]
+
+"""
 
-**Capital Gains Optimization Scenarios**:
+_CAPITAL_GAINS_SCENARIOS = """**Capital Gains Optimization Scenarios**:
 
 **LTCG Harvesting Scenarios**:
 - **No Harvesting Scenario**:
@@ -136,7 +145,9 @@ Expected Output Structure:
   - Trading vs Investment Classification: [Optimization strategy]
 - **Tax-Loss Harvesting Calendar**: [Optimal timing for loss booking]
 
-**Investment Tax Efficiency Scenarios**:
+"""
+
+_INVESTMENT_PRODUCTS_SCENARIOS = """**Investment Tax Efficiency Scenarios**:
 
 **Debt Fund vs Fixed Deposit Scenario** (Post-2023):
 - **Fixed Deposit Scenario**:
@@ -166,7 +177,9 @@ Expected Output Structure:
   - Optimal risk-return-liquidity balance
 - **Recommendation**: [Based on risk profile and liquidity needs]
 
-**Filing Mechanism Optimization Scenarios**:
+"""
+
+_FILING_SCENARIOS = """**Filing Mechanism Optimization Scenarios**:
 
 **ITR Form Selection Impact**:
 - **ITR-1 Scenario** (Salary + Basic Investments):
@@ -196,7 +209,9 @@ Expected Output Structure:
   - Compliance: [Quarterly payment discipline required]
 - **Optimal Strategy**: [Recommendation for cash flow and compliance balance]
 
-**Career & Income Scenarios**:
+"""
+
+_CAREER_SCENARIOS = """**Career & Income Scenarios**:
 
 **Job Change Scenario**:
 - **Current Job**: ₹[X]L salary
@@ -230,7 +245,9 @@ Expected Output Structure:
 - **5-Year Tax Projection**: [Long-term implications of each structure]
 - **Optimal Recommendation**: [Based on income level and complexity]
 
-**Investment & Wealth Scenarios**:
+"""
+
+_HOME_AND_PORTFOLIO_SCENARIOS = """**Investment & Wealth Scenarios**:
 
 **Home Purchase Scenarios**:
 - **Continue Renting Scenario**:
@@ -266,7 +283,9 @@ Expected Output Structure:
   - Regime Neutral Strategy: [Works under both tax regimes]
   - Tax Efficiency: [Z]%
 
-**Life Event Tax Scenarios**:
+"""
+
+_LIFE_EVENTS_SCENARIOS = """**Life Event Tax Scenarios**:
 
 **Marriage Tax Planning Scenarios**:
 - **Individual Filing Scenario**:
@@ -325,7 +344,9 @@ Expected Output Structure:
 - **Return Planning Scenario**: [Tax implications of returning to India]
 - **Optimal Strategy**: [Recommendation for specific situation]
 
-**Tax Policy Change Scenarios**:
+"""
+
+_POLICY_CHANGES_SCENARIOS = """**Tax Policy Change Scenarios**:
 
 **Tax Rate Increase Scenario**:
 - **Current Tax Rates Scenario**: [Existing liability calculation]
@@ -346,7 +367,33 @@ Expected Output Structure:
   - Timing Considerations: [When to implement changes]
 - **Comparative Analysis**: [New benefits vs existing strategies]
 
-**Sensitivity Analysis**:
+"""
+
+# Scenario categories, each sent only when the request mentions it (all of them for general requests)
+TAX_SCENARIO_SECTIONS = (
+    PromptSection("regime", _REGIME_SCENARIOS, ("regime", "old vs new", "new vs old", "115bac", "breakeven")),
+    PromptSection("capital_gains", _CAPITAL_GAINS_SCENARIOS, (
+        "capital gain", "ltcg", "stcg", "harvest", "shares", "stock", "equity", "mutual fund", "redeem", "redemption",
+    )),
+    PromptSection("investment_products", _INVESTMENT_PRODUCTS_SCENARIOS, (
+        "debt fund", "fixed deposit", "fd", "elss", "80c", "ppf", "nps", "tax saving", "tax-saving",
+    )),
+    PromptSection("filing", _FILING_SCENARIOS, ("itr", "filing", "advance tax", "tds", "refund")),
+    PromptSection("career", _CAREER_SCENARIOS, (
+        "job", "hike", "career", "business", "freelanc", "consult", "startup", "self-employ",
+    )),
+    PromptSection("home_and_portfolio", _HOME_AND_PORTFOLIO_SCENARIOS, (
+        "home", "house", "property", "rent", "hra", "portfolio", "asset allocation", "investment mix",
+    )),
+    PromptSection("life_events", _LIFE_EVENTS_SCENARIOS, (
+        "marriage", "married", "spouse", "wife", "husband", "child", "education", "retire", "nri", "abroad", "relocat",
+    )),
+    PromptSection("policy_changes", _POLICY_CHANGES_SCENARIOS, (
+        "union budget", "policy", "tax rate", "new benefit", "amendment", "finance act",
+    )),
+)
+
+TAX_SCENARIO_MODELER_CLOSING_PROMPT = """**Sensitivity Analysis**:
 
 **Key Variable Impact**:
 - **Income Growth Rate**: [Impact of different growth assumptions]
@@ -409,4 +456,11 @@ Expected Output Structure:
 - **Lowest Risk Approach**: [Scenario with minimal implementation risk]
 
 Remember: Every scenario should be realistic, implementable, and aligned with the user's broader financial goals. Provide both optimistic and conservative estimates, and always highlight the key assumptions driving each analysis.
-""" 
\ No newline at end of file
+"""
+
+# The complete prompt, with every scenario category
+TAX_SCENARIO_MODELER_PROMPT = (
+    TAX_SCENARIO_MODELER_BASE_PROMPT
+    + "".join(section.text for section in TAX_SCENARIO_SECTIONS)
+    + TAX_SCENARIO_MODELER_CLOSING_PROMPT
+)